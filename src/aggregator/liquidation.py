@@ -1,4 +1,5 @@
 # src/aggregator/liquidation.py
+from collections import deque
 from dataclasses import dataclass
 
 from src.storage.models import Liquidation
@@ -24,3 +25,95 @@ def calculate_liquidations(liqs: list[Liquidation]) -> LiqStats:
     short_liq = sum(liq.value_usd for liq in liqs if liq.side == "buy")
 
     return LiqStats(long=long_liq, short=short_liq)
+
+
+@dataclass
+class CascadeSignal:
+    """全市场连环爆仓信号"""
+
+    total: LiqStats
+    symbols: int  # 窗口内发生爆仓的币种数
+    window_seconds: float
+    top: list[tuple[str, float]]  # 爆仓金额最大的币种
+
+
+class LiquidationWindow:
+    """
+    全市场爆仓滑动窗口（内存）
+
+    按事件时间维护最近 window_seconds 内的爆仓，增量更新全市场和各币种的多空合计，
+    add / 查询均为均摊 O(1)，可直接挂在全市场 forceOrder 流上。
+    """
+
+    def __init__(self, window_seconds: float = 300.0):
+        self.window_ms = int(window_seconds * 1000)
+        self._events: deque[Liquidation] = deque()
+        self._market = LiqStats()
+        self._symbols: dict[str, LiqStats] = {}
+        self._counts: dict[str, int] = {}
+        self._latest = 0
+
+    def add(self, liq: Liquidation) -> None:
+        self._events.append(liq)
+        _apply(self._market, liq, 1)
+        stats = self._symbols.get(liq.symbol)
+        if stats is None:
+            stats = self._symbols[liq.symbol] = LiqStats()
+        _apply(stats, liq, 1)
+        self._counts[liq.symbol] = self._counts.get(liq.symbol, 0) + 1
+        self._latest = max(self._latest, liq.timestamp)
+        self._evict(self._latest)
+
+    def _evict(self, now_ms: int) -> None:
+        cutoff = now_ms - self.window_ms
+        while self._events and self._events[0].timestamp < cutoff:
+            old = self._events.popleft()
+            _apply(self._market, old, -1)
+            _apply(self._symbols[old.symbol], old, -1)
+            self._counts[old.symbol] -= 1
+            if not self._counts[old.symbol]:
+                del self._symbols[old.symbol], self._counts[old.symbol]
+        if not self._events:
+            # 清除浮点累计误差
+            self._market = LiqStats()
+
+    def market(self, now_ms: int | None = None) -> LiqStats:
+        if now_ms is not None:
+            self._evict(now_ms)
+        return LiqStats(self._market.long, self._market.short)
+
+    def symbol(self, symbol: str, now_ms: int | None = None) -> LiqStats:
+        if now_ms is not None:
+            self._evict(now_ms)
+        stats = self._symbols.get(symbol)
+        return LiqStats(stats.long, stats.short) if stats else LiqStats()
+
+    def top(self, n: int = 5) -> list[tuple[str, float]]:
+        ranked = sorted(self._symbols.items(), key=lambda item: item[1].total, reverse=True)
+        return [(symbol, stats.total) for symbol, stats in ranked[:n]]
+
+    @property
+    def symbol_count(self) -> int:
+        return len(self._symbols)
+
+    def detect_cascade(
+        self, min_total_usd: float, min_symbols: int, now_ms: int | None = None
+    ) -> CascadeSignal | None:
+        """窗口内全市场爆仓金额和涉及币种数同时超过阈值时返回信号"""
+        total = self.market(now_ms)
+        if total.total < min_total_usd or self.symbol_count < min_symbols:
+            return None
+        return CascadeSignal(
+            total=total,
+            symbols=self.symbol_count,
+            window_seconds=self.window_ms / 1000,
+            top=self.top(),
+        )
+
+
+def _apply(stats: LiqStats, liq: Liquidation, sign: int) -> None:
+    # sell = 多头爆仓, buy = 空头爆仓
+    if liq.side == "sell":
+        stats.long += sign * liq.value_usd
+    else:
+        stats.short += sign * liq.value_usd
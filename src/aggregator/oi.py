@@ -1,4 +1,7 @@
 # src/aggregator/oi.py
+from bisect import bisect_right
+
+from src.aggregator.series import HOUR_MS
 from src.storage.models import OISnapshot
 
 
@@ -19,3 +22,24 @@ def interpret_oi_price(oi_change: float, price_change: float) -> str:
         return "多头平仓"
     else:
         return "持仓稳定"
+
+
+def oi_at(snapshots: list[OISnapshot], timestamp_ms: int) -> OISnapshot | None:
+    """timestamp_ms 及之前最近的一条快照（同 Database.get_oi_at），snapshots 按时间升序"""
+    index = bisect_right(snapshots, timestamp_ms, key=lambda s: s.timestamp)
+    return snapshots[index - 1] if index else None
+
+
+def oi_changes(snapshots: list[OISnapshot], now_ms: int, hours: int) -> list[float]:
+    """过去 hours 小时逐小时的 OI 变化 (%)，snapshots 来自 Database.get_oi_history(hours + 1)"""
+    changes = []
+    for h in range(1, hours):
+        oi_h = oi_at(snapshots, now_ms - h * HOUR_MS)
+        oi_prev = oi_at(snapshots, now_ms - (h + 1) * HOUR_MS)
+        if oi_h and oi_prev and oi_prev.open_interest_usd > 0:
+            changes.append(
+                (oi_h.open_interest_usd - oi_prev.open_interest_usd)
+                / oi_prev.open_interest_usd
+                * 100
+            )
+    return changes
@@ -0,0 +1,194 @@
+# src/aggregator/orderbook.py
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+
+class BookSide:
+    """
+    订单簿单侧
+
+    有序价格数组 + 价格 -> 数量字典。bids 以负价格作为排序键，两侧最优价都在数组头部；
+    数量更新为 O(1)，新增/删除价位为 O(log n) 查找 + 数组移动（千级价位下远快于树结构）。
+    """
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self._keys: list[float] = []
+        self._qty: dict[float, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, price: float) -> float:
+        return -price if self.descending else price
+
+    def set(self, price: float, quantity: float) -> None:
+        """设置价位数量，数量为 0 时删除该价位"""
+        if quantity == 0:
+            if self._qty.pop(price, None) is not None:
+                key = self._key(price)
+                del self._keys[bisect_left(self._keys, key)]
+            return
+        if price not in self._qty:
+            insort(self._keys, self._key(price))
+        self._qty[price] = quantity
+
+    def load(self, levels: Iterable[tuple[float, float]]) -> None:
+        self._qty = {price: qty for price, qty in levels if qty}
+        self._keys = sorted(self._key(price) for price in self._qty)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._qty.clear()
+
+    def best(self) -> tuple[float, float] | None:
+        if not self._keys:
+            return None
+        price = self._key(self._keys[0])
+        return price, self._qty[price]
+
+    def levels(self, n: int | None = None) -> list[tuple[float, float]]:
+        """从最优价开始的前 n 档 [(价格, 数量)]"""
+        keys = self._keys if n is None else self._keys[:n]
+        prices = [-k for k in keys] if self.descending else keys
+        return [(price, self._qty[price]) for price in prices]
+
+    def notional_until(self, limit_price: float) -> float:
+        """最优价到 limit_price（含）之间的挂单金额"""
+        end = bisect_right(self._keys, self._key(limit_price))
+        total = 0.0
+        for key in self._keys[:end]:
+            price = self._key(key)
+            total += price * self._qty[price]
+        return total
+
+
+class OrderBook:
+    """L2 订单簿"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id = 0
+        self.updated_at = 0  # 最近一次更新的事件时间 (ms)
+
+    def load_snapshot(
+        self,
+        last_update_id: int,
+        bids: Iterable[tuple[float, float]],
+        asks: Iterable[tuple[float, float]],
+    ) -> None:
+        self.bids.load(bids)
+        self.asks.load(asks)
+        self.last_update_id = last_update_id
+
+    def apply(
+        self,
+        bids: Iterable[tuple[float, float]],
+        asks: Iterable[tuple[float, float]],
+        update_id: int,
+        event_time: int = 0,
+    ) -> None:
+        for price, qty in bids:
+            self.bids.set(price, qty)
+        for price, qty in asks:
+            self.asks.set(price, qty)
+        self.last_update_id = update_id
+        self.updated_at = event_time
+
+    def clear(self) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        self.last_update_id = 0
+
+    @property
+    def mid(self) -> float | None:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    @property
+    def spread_bps(self) -> float | None:
+        bid, ask = self.bids.best(), self.asks.best()
+        mid = self.mid
+        if bid is None or ask is None or not mid:
+            return None
+        return (ask[0] - bid[0]) / mid * 10_000
+
+
+@dataclass
+class Wall:
+    """大额挂单墙"""
+
+    side: str  # bid / ask
+    price: float
+    notional: float
+    distance_bps: float  # 距中间价
+
+
+@dataclass
+class BookMetrics:
+    mid: float
+    spread_bps: float
+    imbalance: float  # 前 N 档 (买 - 卖) / (买 + 卖)，按金额，范围 [-1, 1]
+    depth: dict[int, tuple[float, float]] = field(default_factory=dict)  # bps -> (买, 卖) 金额
+    walls: list[Wall] = field(default_factory=list)
+
+
+def imbalance(book: OrderBook, levels: int = 20) -> float:
+    """前 N 档买卖挂单金额失衡度"""
+    bid = sum(p * q for p, q in book.bids.levels(levels))
+    ask = sum(p * q for p, q in book.asks.levels(levels))
+    total = bid + ask
+    return (bid - ask) / total if total else 0.0
+
+
+def depth_within_bps(book: OrderBook, bps: float) -> tuple[float, float]:
+    """中间价 ± bps 范围内的买卖挂单金额"""
+    mid = book.mid
+    if mid is None:
+        return 0.0, 0.0
+    offset = mid * bps / 10_000
+    return book.bids.notional_until(mid - offset), book.asks.notional_until(mid + offset)
+
+
+def find_walls(book: OrderBook, levels: int = 50, multiple: float = 5.0) -> list[Wall]:
+    """前 N 档中挂单金额超过该侧中位数 multiple 倍的价位"""
+    mid = book.mid
+    if mid is None:
+        return []
+    walls = []
+    for side_name, side in (("bid", book.bids), ("ask", book.asks)):
+        notionals = [(price, price * qty) for price, qty in side.levels(levels)]
+        if len(notionals) < 3:
+            continue
+        ordered = sorted(n for _, n in notionals)
+        median = ordered[len(ordered) // 2]
+        for price, notional in notionals:
+            if median and notional >= median * multiple:
+                distance = abs(price - mid) / mid * 10_000
+                walls.append(Wall(side_name, price, notional, distance))
+    return sorted(walls, key=lambda w: w.notional, reverse=True)
+
+
+def book_metrics(
+    book: OrderBook,
+    imbalance_levels: int = 20,
+    depth_bps: Iterable[int] = (10, 50),
+    wall_levels: int = 50,
+    wall_multiple: float = 5.0,
+) -> BookMetrics | None:
+    """计算盘口衍生指标，订单簿为空时返回 None"""
+    mid, spread = book.mid, book.spread_bps
+    if mid is None or spread is None:
+        return None
+    return BookMetrics(
+        mid=mid,
+        spread_bps=spread,
+        imbalance=imbalance(book, imbalance_levels),
+        depth={bps: depth_within_bps(book, bps) for bps in depth_bps},
+        walls=find_walls(book, wall_levels, wall_multiple),
+    )
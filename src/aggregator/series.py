@@ -0,0 +1,17 @@
+# src/aggregator/series.py
+from src.storage.models import Series
+
+HOUR_MS = 3600 * 1000
+
+
+def hourly_sums(series: Series) -> list[float]:
+    """按整点小时聚合求和（只包含有数据的小时，按时间升序），可在进程池中执行"""
+    sums: list[float] = []
+    current = None
+    for timestamp, value in zip(series.timestamps, series.values, strict=True):
+        hour = timestamp // HOUR_MS
+        if hour != current:
+            sums.append(0.0)
+            current = hour
+        sums[-1] += value
+    return sums
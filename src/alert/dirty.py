@@ -0,0 +1,93 @@
+# src/alert/dirty.py
+import asyncio
+import time
+from collections.abc import Callable, Iterable
+
+# 不针对单个币种的事件（如全市场爆仓）使用的占位符
+MARKET = "*"
+
+
+class DirtySet:
+    """
+    单个告警评估任务的待评估币种集合
+
+    首个变更到达后再等待 debounce 秒收集同一批次的后续变更，然后一次性交给评估任务；
+    每隔 fallback 秒无论有无变更都返回一次 None，由调用方做全量评估
+    （冷却到期、窗口滑出等不由采集事件触发的状态变化仍然会被发现）。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kinds: Iterable[str],
+        debounce: float,
+        fallback: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.kinds = frozenset(kinds)
+        self.debounce = debounce
+        self.fallback = fallback
+        self._clock = clock
+        self._dirty: set[str] = set()
+        self._event = asyncio.Event()
+        self._next_full = clock() + fallback
+
+        self.marks = 0
+        self.batches = 0  # 事件触发的评估批次
+        self.full_runs = 0  # 兜底的全量评估次数
+
+    def mark(self, symbol: str) -> None:
+        self.marks += 1
+        self._dirty.add(symbol)
+        self._event.set()
+
+    async def next_batch(self) -> set[str] | None:
+        """等待下一批变更的币种；到达兜底时间时返回 None"""
+        remaining = self._next_full - self._clock()
+        if remaining > 0 and not self._event.is_set():
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=remaining)
+            except TimeoutError:
+                pass
+        now = self._clock()
+        if now >= self._next_full:
+            # 全量评估覆盖所有币种，已标记的变更一并清空；事件持续到达时兜底也不会被饿死
+            self._next_full = now + self.fallback
+            self._dirty.clear()
+            self._event.clear()
+            self.full_runs += 1
+            return None
+        if self.debounce > 0:
+            await asyncio.sleep(self.debounce)
+        batch, self._dirty = self._dirty, set()
+        self._event.clear()
+        self.batches += 1
+        return batch
+
+
+class DirtyTracker:
+    """
+    采集事件 -> 告警评估的分发器
+
+    采集回调调用 mark(symbol, kind) 标记币种数据有变化，每个评估任务通过 subscribe
+    声明关心的事件类型并得到独立的 DirtySet。enabled=False 时不分发任何事件，
+    评估任务退化为按 fallback 周期轮询。
+    """
+
+    def __init__(self, enabled: bool = True, debounce: float = 0.25):
+        self.enabled = enabled
+        self.debounce = debounce
+        self.subscribers: list[DirtySet] = []
+
+    def subscribe(self, name: str, kinds: Iterable[str], fallback: float) -> DirtySet:
+        dirty = DirtySet(name, kinds, self.debounce, fallback)
+        self.subscribers.append(dirty)
+        return dirty
+
+    def mark(self, symbol: str, kind: str) -> None:
+        if not self.enabled:
+            return
+        for dirty in self.subscribers:
+            if kind in dirty.kinds:
+                dirty.mark(symbol)
@@ -0,0 +1,526 @@
+# src/alert/features.py
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from src.aggregator.flow import FlowResult, calculate_flow
+from src.aggregator.liquidation import LiqStats, calculate_liquidations
+from src.aggregator.oi import calculate_oi_change, oi_at, oi_changes
+from src.aggregator.orderbook import BookMetrics
+from src.aggregator.percentile import calculate_percentile
+from src.aggregator.series import hourly_sums
+from src.collector.indicator_fetcher import Indicators
+from src.storage.database import Database
+from src.storage.models import Liquidation, MarketIndicator, OISnapshot, Series, Trade
+from src.utils.compute import ComputeExecutor
+
+HOUR_MS = 3600 * 1000
+# OI 变化历史：绝对值历史最多 7 天，带方向的历史最多 48 小时
+OI_HISTORY_HOURS = 168
+OI_SIGNED_HISTORY_HOURS = 48
+# 资金费率记录不足时使用的业界标准范围 (%)
+DEFAULT_FUNDING_HISTORY = [-0.01, 0, 0.01, 0.02, 0.03, 0.05]
+# 盘口深度特征统计的中间价范围 (bps)，与 depth.depth_bps 合并计算
+BOOK_DEPTH_BPS = (10, 50)
+
+
+class IndicatorSource(Protocol):
+    async def fetch_indicators(self, symbol: str) -> Indicators | None: ...
+
+
+BookSource = Callable[[str], BookMetrics | None]
+
+
+@dataclass
+class FeatureSources:
+    """
+    一次评估的数据来源，window_hours 为百分位历史窗口，compute 执行 offload 特征，
+    book 返回本地订单簿的盘口指标（未启用订单簿或未同步时为 None）
+    """
+
+    db: Database
+    fetcher: IndicatorSource
+    window_hours: int
+    now_ms: int
+    compute: ComputeExecutor | None = None
+    book: BookSource | None = None
+
+
+@dataclass
+class Feature:
+    """
+    特征节点
+
+    source=True 的节点直接读取数据源（查询数据库 / 拉取指标），compute(sources, symbol)；
+    其余节点由依赖计算，compute(*依赖值)，任一依赖为 None 时结果为 None（缺少数据的规则跳过）。
+    value_of 标记百分位特征对应的原始值特征。
+    offload=True 的节点是处理整个历史窗口的纯计算，交给 ComputeExecutor 执行（不阻塞事件循环），
+    依赖应为紧凑数组（Series）以便在进程池中执行。
+    hourly=True 的节点是按小时粒度变化的历史，同一小时内可由 HistoryCache 复用。
+    """
+
+    name: str
+    deps: tuple[str, ...]
+    compute: Callable[..., Any]
+    source: bool = False
+    value_of: str | None = None
+    offload: bool = False
+    hourly: bool = False
+
+
+FEATURES: dict[str, Feature] = {}
+
+
+def _register(feature: Feature) -> None:
+    if feature.name in FEATURES:
+        raise ValueError(f"Duplicate feature: {feature.name}")
+    FEATURES[feature.name] = feature
+
+
+def source(
+    name: str, hourly: bool = False
+) -> Callable[[Callable[[FeatureSources, str], Awaitable[Any]]], Callable[..., Any]]:
+    def decorator(
+        fn: Callable[[FeatureSources, str], Awaitable[Any]],
+    ) -> Callable[..., Any]:
+        _register(Feature(name, (), fn, source=True, hourly=hourly))
+        return fn
+
+    return decorator
+
+
+def feature(
+    name: str, *deps: str, offload: bool = False, hourly: bool = False
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        _register(Feature(name, deps, fn, offload=offload, hourly=hourly))
+        return fn
+
+    return decorator
+
+
+def percentile(name: str, value: str, history: str) -> None:
+    """当前值在历史中的百分位（calculate_percentile 按绝对值比较）"""
+    _register(Feature(name, (value, history), calculate_percentile, value_of=value))
+
+
+def resolve(names: list[str]) -> list[Feature]:
+    """names 及其全部依赖，按依赖顺序排列（拓扑序）"""
+    order: list[Feature] = []
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Feature dependency cycle at {name}")
+        if name not in FEATURES:
+            raise ValueError(f"Unknown feature: {name}")
+        visiting.add(name)
+        node = FEATURES[name]
+        for dep in node.deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(node)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+class HistoryCache:
+    """
+    hourly 特征的按币种缓存
+
+    历史窗口按整点小时聚合，同一小时内的重复评估（如大额成交触发）直接复用，
+    只重新读取最近 1 小时的数据；跨过整点后第一次评估时重新计算。
+    历史数据整体变化（启动回填完成）时调用 clear。
+    """
+
+    def __init__(self) -> None:
+        self._hours: dict[str, int] = {}
+        self._values: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol: str, hour: int) -> dict[str, Any]:
+        """symbol 在 hour 小时内已缓存的特征（跨小时自动清空），计算结果直接写入返回的 dict"""
+        if self._hours.get(symbol) != hour:
+            self._hours[symbol] = hour
+            self._values[symbol] = {}
+        return self._values[symbol]
+
+    def clear(self) -> None:
+        self._hours.clear()
+        self._values.clear()
+
+
+def _required(plan: list[Feature], targets: Iterable[str], cached: Mapping[str, Any]) -> set[str]:
+    """计算 targets 需要的节点：已缓存的节点不再需要其依赖"""
+    required = set(targets)
+    for node in reversed(plan):
+        if node.name in required and node.name not in cached:
+            required.update(node.deps)
+    return required
+
+
+async def compute_plan(
+    plan: list[Feature],
+    sources: FeatureSources,
+    symbol: str,
+    cache: HistoryCache | None = None,
+    targets: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """
+    按拓扑序计算，每个特征只计算一次
+
+    传入 cache 时 hourly 特征同一小时内复用缓存，只被缓存特征依赖的数据源不再读取；
+    targets 为调用方需要的特征（默认计划中的全部特征）。
+    """
+    cached: dict[str, Any] = {}
+    if cache is not None:
+        cached = cache.get(symbol, sources.now_ms // HOUR_MS)
+    required = _required(plan, targets or [node.name for node in plan], cached)
+
+    values: dict[str, Any] = {}
+    for node in plan:
+        if node.name in cached:
+            values[node.name] = cached[node.name]
+            assert cache is not None
+            cache.hits += 1
+            continue
+        if node.name not in required:
+            continue
+        if node.source:
+            values[node.name] = await node.compute(sources, symbol)
+        else:
+            args = [values[dep] for dep in node.deps]
+            if any(a is None for a in args):
+                values[node.name] = None
+            elif node.offload and sources.compute is not None:
+                values[node.name] = await sources.compute.run(node.compute, *args)
+            else:
+                values[node.name] = node.compute(*args)
+        # 缺少数据（None）不缓存，数据到达后下一次评估即可用上
+        if cache is not None and node.hourly and values[node.name] is not None:
+            cached[node.name] = values[node.name]
+            cache.misses += 1
+    return values
+
+
+# ==================== 数据源 ====================
+
+
+@source("now_ms")
+async def _now_ms(src: FeatureSources, symbol: str) -> int:
+    return src.now_ms
+
+
+@source("window_hours")
+async def _window_hours(src: FeatureSources, symbol: str) -> int:
+    return src.window_hours
+
+
+@source("trades_1h")
+async def _trades_1h(src: FeatureSources, symbol: str) -> list[Trade]:
+    trades = await src.db.get_trades(symbol, hours=1)
+    return [t for t in trades if t.timestamp >= src.now_ms - HOUR_MS]
+
+
+@source("trade_series")
+async def _trade_series(src: FeatureSources, symbol: str) -> Series:
+    # 历史窗口只取时间戳和带方向金额，不构造 Trade 对象
+    return await src.db.get_trade_series(symbol, hours=src.window_hours)
+
+
+@source("liqs_1h")
+async def _liqs_1h(src: FeatureSources, symbol: str) -> list[Liquidation]:
+    liqs = await src.db.get_liquidations(symbol, hours=1)
+    return [liq for liq in liqs if liq.timestamp >= src.now_ms - HOUR_MS]
+
+
+@source("liq_series")
+async def _liq_series(src: FeatureSources, symbol: str) -> Series:
+    return await src.db.get_liquidation_series(symbol, hours=src.window_hours)
+
+
+@source("oi_recent")
+async def _oi_recent(src: FeatureSources, symbol: str) -> list[OISnapshot]:
+    # 包含 1 小时前的最近一条，用于当前 OI 和 1h 变化
+    return await src.db.get_oi_history(symbol, hours=1)
+
+
+@source("oi_window")
+async def _oi_window(src: FeatureSources, symbol: str) -> list[OISnapshot]:
+    # 一次查询覆盖全部 get_oi_at 时间点（最早一个时间点为 hours_ago = N + 1）
+    hours = min(src.window_hours, OI_HISTORY_HOURS) + 1
+    return await src.db.get_oi_history(symbol, hours=hours)
+
+
+@source("indicators")
+async def _indicators(src: FeatureSources, symbol: str) -> Indicators | None:
+    return await src.fetcher.fetch_indicators(symbol)
+
+
+@source("ls_latest")
+async def _ls_latest(src: FeatureSources, symbol: str) -> dict[str, Any] | None:
+    # 多空比由逐币种采集写入数据库，规则评估不再请求 REST
+    return await src.db.get_latest_long_short_snapshot(symbol, "global")
+
+
+@source("market_indicator")
+async def _market_indicator(src: FeatureSources, symbol: str) -> MarketIndicator | None:
+    return await src.db.get_latest_market_indicator(symbol)
+
+
+@source("mi_history")
+async def _mi_history(src: FeatureSources, symbol: str) -> list[MarketIndicator]:
+    return await src.db.get_market_indicator_history(symbol, hours=src.window_hours)
+
+
+@source("ls_history", hourly=True)
+async def _ls_history(src: FeatureSources, symbol: str) -> list[float]:
+    snapshots = await src.db.get_long_short_snapshots(symbol, "global", hours=src.window_hours)
+    return [s["long_short_ratio"] for s in snapshots]
+
+
+@source("funding_history", hourly=True)
+async def _funding_history(src: FeatureSources, symbol: str) -> list[float]:
+    return await funding_history(src.db, symbol, src.window_hours)
+
+
+@source("book")
+async def _book(src: FeatureSources, symbol: str) -> BookMetrics | None:
+    return src.book(symbol) if src.book else None
+
+
+@source("price_1h_ago")
+async def _price_1h_ago(src: FeatureSources, symbol: str) -> float:
+    # 缺少 K 线时为 0（涨跌幅按 0 处理，不影响规则评估）
+    return await src.db.get_price_at(symbol, src.now_ms - HOUR_MS) or 0.0
+
+
+async def funding_history(db: Database, symbol: str, hours: int) -> list[float]:
+    """
+    历史资金费率 (%)，数据不足时退回业界标准范围
+
+    历史为各期已结算费率，当前值为当期预测费率（结算时即成为该期的已结算费率），
+    两者口径一致，可直接用历史分布计算当前值的百分位。
+    """
+    records = await db.get_funding_rates(symbol, hours)
+    if len(records) < 10:
+        return DEFAULT_FUNDING_HISTORY
+    return [r.funding_rate * 100 for r in records]
+
+
+# ==================== 资金流向 ====================
+
+
+@feature("flow", "trades_1h")
+def _flow(trades: list[Trade]) -> FlowResult:
+    return calculate_flow(trades)
+
+
+@feature("flow_1h", "flow")
+def _flow_1h(flow: FlowResult) -> float:
+    return flow.net
+
+
+@feature("flow_binance", "flow")
+def _flow_binance(flow: FlowResult) -> float:
+    return flow.by_exchange.get("binance", 0)
+
+
+# 按小时聚合的净流入（带方向）
+feature("flow_history", "trade_series", offload=True, hourly=True)(hourly_sums)
+
+
+@feature("flow_history_abs", "flow_history", hourly=True)
+def _flow_history_abs(history: list[float]) -> list[float]:
+    return [abs(v) for v in history]
+
+
+percentile("flow_1h_pct", "flow_1h", "flow_history")
+percentile("flow_1h_abs_pct", "flow_1h", "flow_history_abs")
+
+
+# ==================== 爆仓 ====================
+
+
+@feature("liq_stats", "liqs_1h")
+def _liq_stats(liqs: list[Liquidation]) -> LiqStats:
+    return calculate_liquidations(liqs)
+
+
+@feature("liq_1h", "liq_stats")
+def _liq_1h(stats: LiqStats) -> float:
+    return stats.total
+
+
+@feature("liq_1h_long", "liq_stats")
+def _liq_1h_long(stats: LiqStats) -> float:
+    return stats.long
+
+
+@feature("liq_1h_short", "liq_stats")
+def _liq_1h_short(stats: LiqStats) -> float:
+    return stats.short
+
+
+@feature("liq_long_ratio", "liq_stats")
+def _liq_long_ratio(stats: LiqStats) -> float:
+    return stats.long / stats.total if stats.total > 0 else 0.5
+
+
+feature("liq_history", "liq_series", offload=True, hourly=True)(hourly_sums)
+
+
+percentile("liq_1h_pct", "liq_1h", "liq_history")
+
+
+# ==================== 持仓量 ====================
+
+
+@feature("oi_value", "oi_recent")
+def _oi_value(snapshots: list[OISnapshot]) -> float:
+    return snapshots[-1].open_interest_usd if snapshots else 0
+
+
+@feature("oi_change_1h", "oi_recent", "now_ms")
+def _oi_change_1h(snapshots: list[OISnapshot], now_ms: int) -> float:
+    current = snapshots[-1] if snapshots else None
+    return calculate_oi_change(current, oi_at(snapshots, now_ms - HOUR_MS))
+
+
+@feature("oi_change_history", "oi_window", "now_ms", "window_hours", hourly=True)
+def _oi_change_history(snapshots: list[OISnapshot], now_ms: int, window: int) -> list[float]:
+    return oi_changes(snapshots, now_ms, min(window, OI_SIGNED_HISTORY_HOURS))
+
+
+@feature("oi_change_history_abs", "oi_window", "now_ms", "window_hours", hourly=True)
+def _oi_change_history_abs(snapshots: list[OISnapshot], now_ms: int, window: int) -> list[float]:
+    return [abs(c) for c in oi_changes(snapshots, now_ms, min(window, OI_HISTORY_HOURS))]
+
+
+percentile("oi_change_1h_pct", "oi_change_1h", "oi_change_history")
+percentile("oi_change_1h_abs_pct", "oi_change_1h", "oi_change_history_abs")
+
+
+# ==================== 价格 / 资金费率 / 多空比 ====================
+
+
+@feature("price", "indicators")
+def _price(indicators: Indicators) -> float:
+    return indicators.futures_price
+
+
+@feature("price_change_1h", "price", "price_1h_ago")
+def _price_change_1h(price: float, past: float) -> float:
+    if not price or not past:
+        return 0.0
+    return (price - past) / past * 100
+
+
+@feature("funding_rate", "indicators")
+def _funding_rate(indicators: Indicators) -> float:
+    return indicators.funding_rate
+
+
+@feature("long_short_ratio", "ls_latest")
+def _long_short_ratio(snapshot: dict[str, Any]) -> float:
+    return float(snapshot["long_short_ratio"])
+
+
+percentile("funding_rate_pct", "funding_rate", "funding_history")
+percentile("long_short_ratio_pct", "long_short_ratio", "ls_history")
+
+
+# ==================== 大户 / 散户 / 主动买卖 ====================
+
+
+@feature("top_position_ratio", "market_indicator")
+def _top_position_ratio(mi: MarketIndicator) -> float:
+    return mi.top_position_ratio
+
+
+@feature("global_account_ratio", "market_indicator")
+def _global_account_ratio(mi: MarketIndicator) -> float:
+    return mi.global_account_ratio
+
+
+@feature("taker_ratio", "market_indicator")
+def _taker_ratio(mi: MarketIndicator) -> float:
+    return mi.taker_buy_sell_ratio
+
+
+@feature("divergence", "top_position_ratio", "global_account_ratio")
+def _divergence(top: float, global_: float) -> float:
+    """大户与散户分歧度（正 = 大户更看多）"""
+    return top - global_
+
+
+@feature("top_position_history", "mi_history", hourly=True)
+def _top_position_history(history: list[MarketIndicator]) -> list[float]:
+    return [mi.top_position_ratio for mi in history]
+
+
+@feature("global_account_history", "mi_history", hourly=True)
+def _global_account_history(history: list[MarketIndicator]) -> list[float]:
+    return [mi.global_account_ratio for mi in history]
+
+
+@feature("taker_history", "mi_history", hourly=True)
+def _taker_history(history: list[MarketIndicator]) -> list[float]:
+    return [mi.taker_buy_sell_ratio for mi in history]
+
+
+@feature("divergence_history", "mi_history", hourly=True)
+def _divergence_history(history: list[MarketIndicator]) -> list[float]:
+    return [abs(mi.top_position_ratio - mi.global_account_ratio) for mi in history]
+
+
+percentile("top_position_pct", "top_position_ratio", "top_position_history")
+percentile("global_account_pct", "global_account_ratio", "global_account_history")
+percentile("taker_ratio_pct", "taker_ratio", "taker_history")
+percentile("divergence_pct", "divergence", "divergence_history")
+
+
+# ==================== 盘口（本地订单簿） ====================
+
+
+@feature("book_imbalance", "book")
+def _book_imbalance(book: BookMetrics) -> float:
+    """前 N 档买卖挂单金额失衡度，范围 [-1, 1]（正 = 买盘更厚）"""
+    return book.imbalance
+
+
+@feature("book_spread_bps", "book")
+def _book_spread_bps(book: BookMetrics) -> float:
+    return book.spread_bps
+
+
+def _depth_feature(side: int, bps: int) -> Callable[[BookMetrics], float | None]:
+    def compute(book: BookMetrics) -> float | None:
+        depth = book.depth.get(bps)
+        return depth[side] if depth else None
+
+    return compute
+
+
+for _bps in BOOK_DEPTH_BPS:
+    feature(f"bid_depth_{_bps}bps", "book")(_depth_feature(0, _bps))
+    feature(f"ask_depth_{_bps}bps", "book")(_depth_feature(1, _bps))
+
+
+@feature("bid_wall", "book")
+def _bid_wall(book: BookMetrics) -> float:
+    """最大买方挂单墙金额，没有挂单墙时为 0"""
+    return max((w.notional for w in book.walls if w.side == "bid"), default=0.0)
+
+
+@feature("ask_wall", "book")
+def _ask_wall(book: BookMetrics) -> float:
+    """最大卖方挂单墙金额，没有挂单墙时为 0"""
+    return max((w.notional for w in book.walls if w.side == "ask"), default=0.0)
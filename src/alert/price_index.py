@@ -0,0 +1,125 @@
+# src/alert/price_index.py
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from src.storage.models import PriceAlert
+
+
+@dataclass
+class PriceCrossing:
+    alert: PriceAlert
+    type: str  # "breakout" | "breakdown"
+    price: float  # 触发时的成交价
+    notify: bool  # 冷却期内的穿越只更新方向，不推送
+
+
+class PriceLevelIndex:
+    """
+    关注价位的内存索引，逐笔价格检测穿越
+
+    每个币种维护有序价位数组；新价格到达时在上一价格与当前价格之间二分查找，
+    复杂度 O(log n + k)（k 为区间内的价位数），价位数量再多也不影响行情处理。
+    last_position / last_triggered_at 以内存为准，调用方负责把返回的穿越写回数据库。
+    币种使用价位监控的存储格式（币种简称，如 BTC）。
+    """
+
+    def __init__(self, cooldown_seconds: int):
+        self.cooldown_seconds = cooldown_seconds
+        self._prices: dict[str, list[float]] = {}
+        self._alerts: dict[str, dict[float, list[PriceAlert]]] = {}
+        self._last: dict[str, float] = {}
+        self._updated_at: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self._prices.values())
+
+    def load(self, alerts: Iterable[PriceAlert]) -> None:
+        self._prices.clear()
+        self._alerts.clear()
+        for alert in alerts:
+            self.add(alert)
+
+    def add(self, alert: PriceAlert) -> None:
+        by_price = self._alerts.setdefault(alert.symbol, {})
+        if alert.price not in by_price:
+            insort(self._prices.setdefault(alert.symbol, []), alert.price)
+            by_price[alert.price] = []
+        by_price[alert.price].append(alert)
+
+    def remove(self, symbol: str, price: float, chat_id: str | None = None) -> None:
+        """删除该价位的监控，指定 chat_id 时只删除该会话的（与数据库语义一致）"""
+        by_price = self._alerts.get(symbol)
+        if not by_price or price not in by_price:
+            return
+        if chat_id is not None:
+            by_price[price] = [a for a in by_price[price] if a.chat_id != chat_id]
+            if by_price[price]:
+                return
+        del by_price[price]
+        prices = self._prices[symbol]
+        del prices[bisect_left(prices, price)]
+        if not prices:
+            del self._prices[symbol]
+            del self._alerts[symbol]
+
+    def symbols(self) -> list[str]:
+        return sorted(self._prices)
+
+    def alerts(self, symbol: str, chat_id: str | None = None) -> list[PriceAlert]:
+        """按价格升序，指定 chat_id 时只返回该会话的"""
+        by_price = self._alerts.get(symbol, {})
+        return [
+            alert
+            for price in self._prices.get(symbol, [])
+            for alert in by_price[price]
+            if chat_id is None or alert.chat_id == chat_id
+        ]
+
+    def seconds_since_update(self, symbol: str, now: float | None = None) -> float:
+        """距离该币种最近一次价格更新的秒数，从未更新时为 inf"""
+        updated = self._updated_at.get(symbol)
+        if updated is None:
+            return float("inf")
+        return (time.monotonic() if now is None else now) - updated
+
+    def on_price(self, symbol: str, price: float, now: int | None = None) -> list[PriceCrossing]:
+        """处理一笔新价格，返回穿越的价位"""
+        prices = self._prices.get(symbol)
+        last = self._last.get(symbol)
+        self._last[symbol] = price
+        self._updated_at[symbol] = time.monotonic()
+        if not prices or price == last:
+            return []
+
+        if last is None:
+            # 首笔价格：以存储的方向为准，补上离线期间发生的穿越
+            low, high = 0, len(prices)
+        elif price > last:
+            low, high = bisect_left(prices, last), bisect_right(prices, price)
+        else:
+            low, high = bisect_left(prices, price), bisect_right(prices, last)
+        if low == high:
+            return []
+
+        now = int(time.time()) if now is None else now
+        crossings = []
+        by_price = self._alerts[symbol]
+        for level in prices[low:high]:
+            for alert in by_price[level]:
+                # 只在价格从关注价位一侧移动到另一侧时触发
+                if alert.last_position == "below" and price >= level:
+                    kind, alert.last_position = "breakout", "above"
+                elif alert.last_position == "above" and price <= level:
+                    kind, alert.last_position = "breakdown", "below"
+                else:
+                    continue
+                notify = (
+                    not alert.last_triggered_at
+                    or now - alert.last_triggered_at >= self.cooldown_seconds
+                )
+                if notify:
+                    alert.last_triggered_at = now
+                crossings.append(PriceCrossing(alert, kind, price, notify))
+        return crossings
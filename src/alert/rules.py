@@ -0,0 +1,344 @@
+# src/alert/rules.py
+import logging
+import string
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.config import Config, RuleConfig
+
+from .features import FEATURES, Feature, FeatureSources, HistoryCache, compute_plan, resolve
+
+logger = logging.getLogger(__name__)
+
+# 分级告警的七个维度：维度名 -> 百分位特征
+TIERED_DIMENSIONS = {
+    "主力资金": "flow_1h_abs_pct",
+    "OI变化": "oi_change_1h_abs_pct",
+    "爆仓": "liq_1h_pct",
+    "资金费率": "funding_rate_pct",
+    "多空比": "long_short_ratio_pct",
+    "大户持仓": "top_position_pct",
+    "散户持仓": "global_account_pct",
+}
+# 历史数据不足时跳过分级告警（需要至少 10 个数据点才能计算有意义的百分位）
+TIERED_REQUIRES = {"oi_change_history_abs": 10, "ls_history": 10}
+ABSOLUTE_COOLDOWN_MINUTES = 30
+
+
+@dataclass
+class RuleEvent:
+    rule: RuleConfig
+    symbol: str
+    message: str
+    dimensions: list[tuple[str, float]] = field(default_factory=list)  # confluence 的极端维度
+    # 用于订阅门槛比较的数值：threshold / crossover 为特征值，percentile 为百分位，
+    # confluence 为极端维度数
+    value: float | None = None
+
+
+def default_rules(config: Config) -> list[RuleConfig]:
+    """由 alerts / insight 配置生成的内置规则（原绝对阈值、分级、异动告警）"""
+    alerts = config.alerts
+    rules: list[RuleConfig] = []
+
+    if alerts.whale_flow.enabled and alerts.whale_flow.threshold_usd:
+        rules.append(
+            RuleConfig(
+                name="whale_flow",
+                type="threshold",
+                feature="flow_1h",
+                absolute=True,
+                above=alerts.whale_flow.threshold_usd,
+                cooldown_minutes=ABSOLUTE_COOLDOWN_MINUTES,
+                format="whale_flow",
+            )
+        )
+    if alerts.oi_change.enabled and alerts.oi_change.threshold_pct:
+        rules.append(
+            RuleConfig(
+                name="oi_change",
+                type="threshold",
+                feature="oi_change_1h",
+                absolute=True,
+                above=alerts.oi_change.threshold_pct,
+                cooldown_minutes=ABSOLUTE_COOLDOWN_MINUTES,
+                format="oi_change",
+            )
+        )
+    if alerts.liquidation.enabled and alerts.liquidation.threshold_usd:
+        rules.append(
+            RuleConfig(
+                name="liquidation",
+                type="threshold",
+                feature="liq_1h",
+                above=alerts.liquidation.threshold_usd,
+                cooldown_minutes=ABSOLUTE_COOLDOWN_MINUTES,
+                format="liquidation",
+            )
+        )
+
+    # 观察提醒：1 ~ (min_dimensions - 1) 个维度极端；重要提醒：至少 min_dimensions 个
+    min_dims = alerts.important.min_dimensions
+    if alerts.observe.enabled:
+        rules.append(
+            RuleConfig(
+                name="observe",
+                type="confluence",
+                dimensions=TIERED_DIMENSIONS,
+                above=alerts.observe.percentile_threshold,
+                min_dimensions=1,
+                max_dimensions=min_dims - 1,
+                requires=TIERED_REQUIRES,
+                cooldown_minutes=alerts.observe.cooldown_minutes,
+                format="observe",
+            )
+        )
+    if alerts.important.enabled:
+        rules.append(
+            RuleConfig(
+                name="important",
+                type="confluence",
+                dimensions=TIERED_DIMENSIONS,
+                above=alerts.important.percentile_threshold,
+                min_dimensions=min_dims,
+                requires=TIERED_REQUIRES,
+                cooldown_minutes=alerts.important.cooldown_minutes,
+                format="important",
+            )
+        )
+
+    insight = config.insight
+    if insight.enabled:
+        toggles = insight.alerts
+        cooldown = toggles.cooldown_minutes
+        if toggles.divergence_spike:
+            rules.append(
+                RuleConfig(
+                    name="divergence_spike",
+                    type="crossover",
+                    feature="divergence_pct",
+                    level=insight.divergence.strong_percentile,
+                    direction="up",
+                    cooldown_minutes=cooldown,
+                    format="insight",
+                    message="大户散户分歧加剧",
+                )
+            )
+        if toggles.whale_flip:
+            rules.append(
+                RuleConfig(
+                    name="whale_flip",
+                    type="crossover",
+                    feature="top_position_ratio",
+                    level=1,
+                    cooldown_minutes=cooldown,
+                    format="insight",
+                    message="大户方向反转：{direction}",
+                    up_label="转多",
+                    down_label="转空",
+                )
+            )
+        if toggles.flow_reversal:
+            rules.append(
+                RuleConfig(
+                    name="flow_reversal",
+                    type="crossover",
+                    feature="flow_1h",
+                    level=0,
+                    min_abs=toggles.flow_threshold_usd,
+                    cooldown_minutes=cooldown,
+                    format="insight",
+                    message="资金流向反转：{direction}",
+                    up_label="转为流入",
+                    down_label="转为流出",
+                )
+            )
+        rules.append(
+            RuleConfig(
+                name="taker_extreme",
+                type="percentile",
+                feature="taker_ratio",
+                above=90,
+                level=1,
+                cooldown_minutes=cooldown,
+                format="insight",
+                message="{direction}",
+                up_label="主动买入极端",
+                down_label="主动卖出极端",
+            )
+        )
+    return rules
+
+
+class RuleEngine:
+    """
+    声明式规则引擎
+
+    规则编译为共享的特征计划：所有规则（及消息格式）用到的特征连同依赖按拓扑序排列，
+    每个币种每次评估只计算一次，数据库查询次数与规则数量无关。
+    evaluate 只做内存判断，并维护冷却时间和穿越规则的上一次取值。
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[RuleConfig],
+        format_features: Mapping[str, Iterable[str]] | None = None,
+    ):
+        self.rules = [rule for rule in rules if rule.enabled]
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate rule names: {', '.join(duplicates)}")
+
+        format_features = format_features or {}
+        self._needs: dict[str, list[str]] = {}
+        for rule in self.rules:
+            if format_features and rule.format not in format_features:
+                raise ValueError(f"Rule {rule.name}: unknown format {rule.format}")
+            needs = _rule_features(rule) + list(format_features.get(rule.format, ()))
+            self._needs[rule.name] = list(dict.fromkeys(needs))
+        self._targets = list(dict.fromkeys(f for needs in self._needs.values() for f in needs))
+        self.plan: list[Feature] = resolve(self._targets)
+        # 历史特征同一小时内复用，事件触发的评估只重新读取最近 1 小时的数据
+        self.history = HistoryCache()
+
+        self._last_sent: dict[tuple[str, str], float] = {}
+        self._previous: dict[tuple[str, str], float] = {}
+        self.evaluations = 0
+        self.events = 0
+
+    @property
+    def sources(self) -> list[str]:
+        """计划中的数据源节点（每个币种每次评估各读取一次）"""
+        return [node.name for node in self.plan if node.source]
+
+    async def compute(self, sources: FeatureSources, symbol: str) -> dict[str, Any]:
+        return await compute_plan(self.plan, sources, symbol, self.history, self._targets)
+
+    def evaluate(
+        self, symbol: str, values: Mapping[str, Any], now: float | None = None
+    ) -> list[RuleEvent]:
+        """按规则顺序评估，返回触发且不在冷却期内的事件"""
+        now = time.time() if now is None else now
+        self.evaluations += 1
+        events = []
+        for rule in self.rules:
+            if not self._ready(rule, values):
+                continue
+            event = self._check(rule, symbol, values)
+            if event is None:
+                continue
+            key = (rule.name, symbol)
+            elapsed = now - self._last_sent.get(key, float("-inf"))
+            if elapsed < rule.cooldown_minutes * 60:
+                logger.debug(f"Skip rule {rule.name} {symbol}: cooldown {int(elapsed)}s")
+                continue
+            self._last_sent[key] = now
+            self.events += 1
+            events.append(event)
+        return events
+
+    def extremes(
+        self, values: Mapping[str, Any], threshold: float = 90
+    ) -> list[tuple[str, float, float]]:
+        """confluence 规则各维度中百分位 >= threshold 的 [(原始值特征, 值, 百分位)]"""
+        found: dict[str, tuple[str, float, float]] = {}
+        for rule in self.rules:
+            if rule.type != "confluence" or not self._ready(rule, values):
+                continue
+            for pct_feature in rule.dimensions.values():
+                value_of = FEATURES[pct_feature].value_of
+                pct = values[pct_feature]
+                if value_of and pct >= threshold:
+                    found[pct_feature] = (value_of, values[value_of], pct)
+        return list(found.values())
+
+    def _ready(self, rule: RuleConfig, values: Mapping[str, Any]) -> bool:
+        """所需特征齐全且历史数据充足"""
+        if any(values.get(name) is None for name in self._needs[rule.name]):
+            return False
+        return all(len(values[name]) >= n for name, n in rule.requires.items())
+
+    def _check(self, rule: RuleConfig, symbol: str, values: Mapping[str, Any]) -> RuleEvent | None:
+        if rule.type == "confluence":
+            threshold = 90 if rule.above is None else rule.above
+            extreme = [
+                (label, values[name])
+                for label, name in rule.dimensions.items()
+                if values[name] > threshold
+            ]
+            count = len(extreme)
+            if count < max(rule.min_dimensions, 1):
+                return None
+            if rule.max_dimensions is not None and count > rule.max_dimensions:
+                return None
+            message = ", ".join(f"{label} P{int(pct)}" for label, pct in extreme)
+            return RuleEvent(
+                rule, symbol, self._message(rule, values, None, message), extreme, count
+            )
+
+        value = values[rule.feature]
+        if rule.type == "crossover":
+            key = (rule.name, symbol)
+            previous = self._previous.get(key)
+            self._previous[key] = value
+            if previous is None:
+                return None
+            up = previous < rule.level <= value
+            down = previous > rule.level >= value
+            if not (up and rule.direction != "down" or down and rule.direction != "up"):
+                return None
+            if rule.min_abs is not None and abs(value) < rule.min_abs:
+                return None
+            return RuleEvent(
+                rule, symbol, self._message(rule, values, up, f"{value:,.4g}"), value=value
+            )
+
+        if rule.type == "percentile":
+            pct = values[f"{rule.feature}_pct"]
+            if pct <= (90 if rule.above is None else rule.above):
+                return None
+            message = self._message(rule, values, value > rule.level, f"P{int(pct)}")
+            return RuleEvent(rule, symbol, message, value=pct)
+
+        checked = abs(value) if rule.absolute else value
+        if rule.above is not None and checked < rule.above:
+            return None
+        if rule.below is not None and checked > rule.below:
+            return None
+        message = self._message(rule, values, value > rule.level, f"{value:,.4g}")
+        return RuleEvent(rule, symbol, message, value=value)
+
+    @staticmethod
+    def _message(rule: RuleConfig, values: Mapping[str, Any], up: bool | None, default: str) -> str:
+        if rule.message is None:
+            return f"{rule.feature or rule.name}: {default}"
+        direction = "" if up is None else rule.up_label if up else rule.down_label
+        return rule.message.format_map({**values, "direction": direction})
+
+
+def _rule_features(rule: RuleConfig) -> list[str]:
+    """规则直接引用的特征（不含依赖）"""
+    if rule.type == "confluence":
+        if not rule.dimensions:
+            raise ValueError(f"Rule {rule.name}: confluence rule needs dimensions")
+        needs = list(rule.dimensions.values())
+    elif not rule.feature:
+        raise ValueError(f"Rule {rule.name}: {rule.type} rule needs a feature")
+    elif rule.type == "percentile":
+        needs = [rule.feature, f"{rule.feature}_pct"]
+    else:
+        needs = [rule.feature]
+    needs += list(rule.requires)
+    if rule.message:
+        needs += [
+            name
+            for _, name, _, _ in string.Formatter().parse(rule.message)
+            if name and name in FEATURES
+        ]
+    for name in needs:
+        if name not in FEATURES:
+            raise ValueError(f"Rule {rule.name}: unknown feature {name}")
+    return needs
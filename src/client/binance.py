@@ -2,42 +2,144 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from collections.abc import Awaitable, Callable
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
 
+from src.client.cache import ResponseCache
+from src.client.http import HttpPool, create_session
+from src.client.rate_limiter import (
+    DATA_ENDPOINT_PREFIX,
+    DATA_LIMIT_PER_5MIN,
+    Priority,
+    WeightLimiter,
+    current_priority,
+    request_weight,
+)
+from src.client.resilience import (
+    DEFAULT_TIMEOUT_SECONDS,
+    ENDPOINT_TIMEOUTS,
+    CircuitBreaker,
+    LatencyTracker,
+    RetryPolicy,
+    hedged,
+)
+
 if TYPE_CHECKING:
+    from src.client.journal import Recorder
     from src.client.models import (
+        DepthSnapshot,
         FundingRate,
         Kline,
         LongShortRatio,
         OpenInterest,
+        PremiumIndex,
+        SymbolInfo,
         TakerRatio,
     )
 
 TradeCallback = Callable[[dict[str, Any]], Awaitable[None]]
 LiquidationCallback = Callable[[dict[str, Any]], Awaitable[None]]
 
+logger = logging.getLogger(__name__)
+
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+# 429 后最多自动重试次数
+MAX_RATE_LIMIT_RETRIES = 2
+# 未返回 Retry-After 时的默认等待
+DEFAULT_RETRY_AFTER_SECONDS = 5.0
+
+
+# 多空比类型 -> 统计接口
+LONG_SHORT_RATIO_ENDPOINTS = {
+    "global": "/futures/data/globalLongShortAccountRatio",
+    "top_account": "/futures/data/topLongShortAccountRatio",
+    "top_position": "/futures/data/topLongShortPositionRatio",
+}
+
+
+def _hist_params(
+    symbol: str, period: str, limit: int, start_time: int | None, end_time: int | None
+) -> dict[str, str | int]:
+    """统计接口的公共查询参数"""
+    params: dict[str, str | int] = {"symbol": symbol, "period": period, "limit": limit}
+    if start_time is not None:
+        params["startTime"] = start_time
+    if end_time is not None:
+        params["endTime"] = end_time
+    return params
+
+
+def _header_number(headers: Mapping[str, Any], name: str) -> float | None:
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
 
 class BinanceAPIError(Exception):
     """Binance API 错误"""
 
-    def __init__(self, code: int, message: str):
+    def __init__(self, code: int, message: str, status: int = 0):
         self.code = code
         self.message = message
+        self.status = status  # HTTP 状态码，非 HTTP 错误时为 0
         super().__init__(message)
 
 
+class CircuitOpenError(BinanceAPIError):
+    """接口熔断中，请求未发出"""
+
+    def __init__(self, endpoint: str):
+        super().__init__(-1, f"Circuit open for {endpoint}")
+        self.endpoint = endpoint
+
+
+def _is_retryable(error: Exception) -> bool:
+    """网络错误、超时和 5xx 可重试；4xx（含 418/429）和熔断不重试"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, BinanceAPIError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, TimeoutError))
+
+
 @dataclass
 class BinanceClient:
     """Binance Futures API 客户端"""
 
     base_url: str = "https://fapi.binance.com"
     ws_url: str = "wss://fstream.binance.com"
+    weight_limiter: WeightLimiter = field(default_factory=WeightLimiter)
+    data_limiter: WeightLimiter = field(
+        default_factory=lambda: WeightLimiter(DATA_LIMIT_PER_5MIN, window_seconds=300)
+    )
+    cache: ResponseCache = field(default_factory=ResponseCache)
+    # 共享连接池；未提供时客户端自建并持有会话
+    pool: HttpPool | None = None
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    timeouts: dict[str, float] = field(default_factory=lambda: dict(ENDPOINT_TIMEOUTS))
+    # ALERT 优先级的请求超过 p95 耗时未返回时发出对冲请求
+    hedge_alerts: bool = True
+    breaker_failures: int = 5
+    breaker_reset_seconds: float = 30.0
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+    breakers: dict[str, CircuitBreaker] = field(default_factory=dict, repr=False)
+    # 可选的 WebSocket 原始消息录制
+    recorder: Recorder | None = None
+    retries: int = field(default=0, init=False)
+    hedges: int = field(default=0, init=False)
     _session: aiohttp.ClientSession | None = field(default=None, repr=False)
+    _owns_session: bool = field(default=False, repr=False)
 
     async def _request(
         self,
@@ -45,36 +147,165 @@ class BinanceClient:
         endpoint: str,
         params: dict[str, Any] | None = None,
     ) -> Any:
-        """发送 HTTP 请求"""
-        if self._session is None:
-            raise RuntimeError("Session not initialized. Use 'async with' context.")
-
-        url = f"{self.base_url}{endpoint}"
-
+        """发送 HTTP 请求（GET 响应按接口 TTL 缓存，并合并相同的在途请求）"""
         if method == "GET":
-            response = await self._session.get(url, params=params)
-        else:
-            response = await self._session.post(url, data=params)
+            return await self.cache.get_or_fetch(
+                endpoint, params, lambda: self._call(method, endpoint, params)
+            )
+        # 非幂等请求不重试
+        return await self._send(method, endpoint, params)
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(
+                self.breaker_failures, self.breaker_reset_seconds
+            )
+        return breaker
 
-        if response.status != 200:
-            error_text = await response.text()
+    async def _call(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """熔断检查 + 抖动退避重试"""
+        breaker = self._breaker(endpoint)
+        delays = self.retry_policy.delays()
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(endpoint)
+            attempt += 1
             try:
-                error_data = json.loads(error_text)
-                raise BinanceAPIError(error_data.get("code", -1), error_data.get("msg", error_text))
-            except json.JSONDecodeError:
-                raise BinanceAPIError(-1, error_text)
+                result = await self._attempt(method, endpoint, params)
+            except Exception as e:
+                if not _is_retryable(e):
+                    # 接口可达，只是请求本身被拒绝
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt >= self.retry_policy.max_attempts:
+                    raise
+                delay = next(delays)
+                self.retries += 1
+                logger.warning(
+                    f"Request {endpoint} failed ({type(e).__name__}: {e}), "
+                    f"retry {attempt}/{self.retry_policy.max_attempts - 1} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # 被取消（如超出告警时间预算）时释放探测名额，否则熔断器一直拒绝该接口
+                breaker.release()
+                raise
+            breaker.record_success()
+            return result
+
+    async def _attempt(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """单次尝试；告警路径上的请求超过 p95 耗时后发出对冲请求"""
+        hedge_after = None
+        if self.hedge_alerts and current_priority() == Priority.ALERT:
+            hedge_after = self.latency.p95(endpoint)
+        if hedge_after is None:
+            return await self._send(method, endpoint, params)
+
+        launched = 0
+
+        def attempt() -> Awaitable[Any]:
+            nonlocal launched
+            launched += 1
+            if launched == 2:
+                self.hedges += 1
+            return self._send(method, endpoint, params)
 
-        return await response.json()
+        return await hedged(attempt, hedge_after)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """发送 HTTP 请求（按权重限流，429 时按 Retry-After 等待后重试）"""
+        if self._session is None:
+            raise RuntimeError("Session not initialized. Use 'async with' context.")
+
+        url = f"{self.base_url}{endpoint}"
+        limiter = self._limiter_for(endpoint)
+        weight = request_weight(endpoint, params)
+        timeout = self.timeouts.get(endpoint, DEFAULT_TIMEOUT_SECONDS)
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await limiter.acquire(weight)
+
+            # 超时只计算网络交互，不包括限流排队
+            started = time.monotonic()
+            async with asyncio.timeout(timeout):
+                if method == "GET":
+                    response = await self._session.get(url, params=params)
+                else:
+                    response = await self._session.post(url, data=params)
+                # 无论重试、报错还是正常返回，都把连接交还共享连接池
+                try:
+                    used = _header_number(response.headers, USED_WEIGHT_HEADER)
+                    if used is not None:
+                        self.weight_limiter.sync_used(int(used))
+
+                    if response.status in (418, 429):
+                        retry_after = _header_number(response.headers, "Retry-After")
+                        limiter.pause(retry_after or DEFAULT_RETRY_AFTER_SECONDS)
+                        # 418 表示 IP 已被封禁，不再重试
+                        if response.status == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+                            logger.warning(
+                                f"Rate limited on {endpoint}, retrying after "
+                                f"{retry_after or DEFAULT_RETRY_AFTER_SECONDS:.0f}s"
+                            )
+                            continue
+
+                    if response.status != 200:
+                        error_text = await response.text()
+                        try:
+                            error_data = json.loads(error_text)
+                        except json.JSONDecodeError:
+                            raise BinanceAPIError(-1, error_text, response.status)
+                        raise BinanceAPIError(
+                            error_data.get("code", -1),
+                            error_data.get("msg", error_text),
+                            response.status,
+                        )
+
+                    data = await response.json()
+                finally:
+                    response.release()
+            self.latency.record(endpoint, time.monotonic() - started)
+            return data
+
+    def _limiter_for(self, endpoint: str) -> WeightLimiter:
+        if endpoint.startswith(DATA_ENDPOINT_PREFIX):
+            return self.data_limiter
+        return self.weight_limiter
 
     async def init(self) -> None:
         """初始化 HTTP 会话"""
         if self._session is None:
-            self._session = aiohttp.ClientSession()
+            if self.pool is not None:
+                self._session = self.pool.session()
+                self._owns_session = False
+            else:
+                self._session = create_session()
+                self._owns_session = True
 
     async def close(self) -> None:
-        """关闭 HTTP 会话"""
+        """关闭 HTTP 会话（共享连接池的会话由连接池负责关闭）"""
         if self._session:
-            await self._session.close()
+            if self._owns_session:
+                await self._session.close()
             self._session = None
 
     async def __aenter__(self) -> BinanceClient:
@@ -135,34 +366,92 @@ class BinanceClient:
         symbol: str,
         period: str,
         limit: int = 30,
+        start_time: int | None = None,
+        end_time: int | None = None,
     ) -> list[OpenInterest]:
-        """获取历史持仓量"""
+        """获取历史持仓量（仅保留最近 30 天）"""
         from src.client.models import OpenInterest
 
-        data = await self._request(
-            "GET",
-            "/futures/data/openInterestHist",
-            {"symbol": symbol, "period": period, "limit": limit},
-        )
+        params = _hist_params(symbol, period, limit, start_time, end_time)
+        data = await self._request("GET", "/futures/data/openInterestHist", params)
         return [
             OpenInterest(
                 symbol=d["symbol"],
                 open_interest=float(d["sumOpenInterest"]),
                 timestamp=int(d["timestamp"]),
+                open_interest_value=float(d.get("sumOpenInterestValue", 0)),
             )
             for d in data
         ]
 
-    async def get_funding_rate(self, symbol: str) -> FundingRate:
-        """获取当前资金费率"""
+    async def get_premium_index(self, symbol: str) -> PremiumIndex:
+        """获取标记价格、指数价格和当期预测资金费率（markPrice 流的 REST 版本）"""
+        from src.client.models import PremiumIndex
+
+        data = await self._request("GET", "/fapi/v1/premiumIndex", {"symbol": symbol})
+        return PremiumIndex(
+            symbol=data["symbol"],
+            mark_price=float(data["markPrice"]),
+            index_price=float(data["indexPrice"]),
+            funding_rate=float(data["lastFundingRate"]),
+            next_funding_time=int(data["nextFundingTime"]),
+            timestamp=int(data["time"]),
+        )
+
+    async def get_funding_rate_hist(
+        self,
+        symbol: str,
+        limit: int = 1000,
+        start_time: int | None = None,
+        end_time: int | None = None,
+    ) -> list[FundingRate]:
+        """获取历史资金费率（按结算时间升序）"""
         from src.client.models import FundingRate
 
-        data = await self._request("GET", "/fapi/v1/fundingRate", {"symbol": symbol, "limit": 1})
-        latest = data[0]
-        return FundingRate(
-            symbol=latest["symbol"],
-            funding_rate=float(latest["fundingRate"]),
-            funding_time=int(latest["fundingTime"]),
+        params: dict[str, str | int] = {"symbol": symbol, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        data = await self._request("GET", "/fapi/v1/fundingRate", params)
+        return [
+            FundingRate(
+                symbol=d["symbol"],
+                funding_rate=float(d["fundingRate"]),
+                funding_time=int(d["fundingTime"]),
+            )
+            for d in data
+        ]
+
+    async def get_exchange_info(self) -> list[SymbolInfo]:
+        """获取全部合约元数据（权重 1，响应缓存 1 小时）"""
+        from src.client.models import SymbolInfo
+
+        data = await self._request("GET", "/fapi/v1/exchangeInfo")
+        return [
+            SymbolInfo(
+                symbol=s["symbol"],
+                base_asset=s["baseAsset"],
+                quote_asset=s["quoteAsset"],
+                margin_asset=s.get("marginAsset", s["quoteAsset"]),
+                contract_type=s.get("contractType", ""),
+                status=s.get("status", ""),
+                onboard_date=int(s.get("onboardDate", 0)),
+            )
+            for s in data["symbols"]
+        ]
+
+    async def get_depth(self, symbol: str, limit: int = 1000) -> DepthSnapshot:
+        """获取订单簿快照（limit=1000 时权重 20）"""
+        from src.client.models import DepthSnapshot
+
+        data = await self._request("GET", "/fapi/v1/depth", {"symbol": symbol, "limit": limit})
+        return DepthSnapshot(
+            symbol=symbol,
+            last_update_id=int(data["lastUpdateId"]),
+            bids=[(float(p), float(q)) for p, q in data["bids"]],
+            asks=[(float(p), float(q)) for p, q in data["asks"]],
+            timestamp=int(data.get("T", 0)),
         )
 
     async def get_global_long_short_ratio(
@@ -188,6 +477,37 @@ class BinanceClient:
             timestamp=int(latest["timestamp"]),
         )
 
+    async def get_long_short_ratio_hist(
+        self,
+        ratio_type: str,
+        symbol: str,
+        period: str,
+        limit: int = 500,
+        start_time: int | None = None,
+        end_time: int | None = None,
+    ) -> list[LongShortRatio]:
+        """
+        获取多空比历史（仅保留最近 30 天）
+
+        Args:
+            ratio_type: global / top_account / top_position
+        """
+        from src.client.models import LongShortRatio
+
+        endpoint = LONG_SHORT_RATIO_ENDPOINTS[ratio_type]
+        params = _hist_params(symbol, period, limit, start_time, end_time)
+        data = await self._request("GET", endpoint, params)
+        return [
+            LongShortRatio(
+                symbol=d["symbol"],
+                long_ratio=float(d["longAccount"]),
+                short_ratio=float(d["shortAccount"]),
+                long_short_ratio=float(d["longShortRatio"]),
+                timestamp=int(d["timestamp"]),
+            )
+            for d in data
+        ]
+
     async def get_top_long_short_account_ratio(
         self,
         symbol: str,
@@ -257,6 +577,30 @@ class BinanceClient:
             timestamp=int(latest["timestamp"]),
         )
 
+    async def get_taker_long_short_ratio_hist(
+        self,
+        symbol: str,
+        period: str,
+        limit: int = 500,
+        start_time: int | None = None,
+        end_time: int | None = None,
+    ) -> list[TakerRatio]:
+        """获取 Taker 买卖比历史（仅保留最近 30 天）"""
+        from src.client.models import TakerRatio
+
+        params = _hist_params(symbol, period, limit, start_time, end_time)
+        data = await self._request("GET", "/futures/data/takerlongshortRatio", params)
+        return [
+            TakerRatio(
+                symbol=symbol,  # API 不返回 symbol，使用请求参数
+                buy_sell_ratio=float(d["buySellRatio"]),
+                buy_vol=float(d["buyVol"]),
+                sell_vol=float(d["sellVol"]),
+                timestamp=int(d["timestamp"]),
+            )
+            for d in data
+        ]
+
     async def _process_ws_message(
         self,
         message: str,
@@ -308,29 +652,27 @@ class BinanceClient:
         symbol: str,
         callback: TradeCallback,
     ) -> None:
-        """订阅聚合交易流"""
-        import websockets
+        """订阅聚合交易流（连接到期前主动轮换）"""
+        from src.client.stream import RotatingStream, agg_trade_key
 
         stream = f"{symbol.lower()}@aggTrade"
         url = f"{self.ws_url}/ws/{stream}"
 
-        async with websockets.connect(url) as ws:
-            async for message in ws:
-                if isinstance(message, bytes):
-                    message = message.decode("utf-8")
-                await self._process_ws_message(message, callback)
+        async def on_message(message: str) -> None:
+            await self._process_ws_message(message, callback)
+
+        await RotatingStream(url, on_message, agg_trade_key, recorder=self.recorder).run()
 
     async def subscribe_force_order(
         self,
         callback: LiquidationCallback,
     ) -> None:
-        """订阅全市场爆仓流"""
-        import websockets
+        """订阅全市场爆仓流（连接到期前主动轮换）"""
+        from src.client.stream import RotatingStream, force_order_key
 
         url = f"{self.ws_url}/ws/!forceOrder@arr"
 
-        async with websockets.connect(url) as ws:
-            async for message in ws:
-                if isinstance(message, bytes):
-                    message = message.decode("utf-8")
-                await self._process_force_order_message(message, callback)
+        async def on_message(message: str) -> None:
+            await self._process_force_order_message(message, callback)
+
+        await RotatingStream(url, on_message, force_order_key, recorder=self.recorder).run()
@@ -0,0 +1,117 @@
+"""REST 响应 TTL 缓存与并发请求合并"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from src.client.rate_limiter import Priority, current_priority
+
+# 各接口缓存时间（秒），与数据本身的更新周期对应
+ENDPOINT_TTLS: dict[str, float] = {
+    "/fapi/v1/klines": 5.0,  # 当前 K 线持续变化，仅合并同一轮检查内的重复请求
+    "/fapi/v1/openInterest": 5.0,
+    "/fapi/v1/premiumIndex": 5.0,  # 标记价格持续变化，仅合并同一轮检查内的重复请求
+    "/fapi/v1/fundingRate": 60.0,  # 已结算费率每 8h 更新一次
+    "/fapi/v1/exchangeInfo": 3600.0,
+    "/futures/data/openInterestHist": 60.0,  # 统计接口最小粒度 5m
+    "/futures/data/globalLongShortAccountRatio": 60.0,
+    "/futures/data/topLongShortAccountRatio": 60.0,
+    "/futures/data/topLongShortPositionRatio": 60.0,
+    "/futures/data/takerlongshortRatio": 60.0,
+}
+
+MAX_ENTRIES = 4096
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def cache_key(endpoint: str, params: Mapping[str, Any] | None) -> CacheKey:
+    return endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+
+class ResponseCache:
+    """
+    按接口 TTL 缓存 GET 响应
+
+    同一个 key 的并发请求只发出一次 HTTP 调用，其余等待方共享结果；
+    失败结果不缓存。在途请求按发起方的优先级在限流器中排队，
+    只有优先级不高于它的调用方才会合并；更紧急的调用方按自己的优先级另发一次，
+    并成为之后调用方合并的对象，告警请求不会被排队中的回填请求拖住。
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttls = dict(ENDPOINT_TTLS if ttls is None else ttls)
+        self._clock = clock
+        self._entries: dict[CacheKey, tuple[float, Any]] = {}
+        self._inflight: dict[CacheKey, tuple[Priority, asyncio.Future[Any]]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, 0.0)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    async def get_or_fetch(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return await fetch()
+
+        key = cache_key(endpoint, params)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self._clock():
+            self.hits += 1
+            return entry[1]
+
+        priority = current_priority()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] <= priority:
+            self.coalesced += 1
+            # shield: 单个等待方取消不影响共享请求
+            return await asyncio.shield(inflight[1])
+
+        self.misses += 1
+        # fetch 在新任务中按当前上下文（即本调用方的优先级）申请限流额度
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = (priority, task)
+        task.add_done_callback(lambda t: self._on_done(key, ttl, t))
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: CacheKey, ttl: float, task: asyncio.Future[Any]) -> None:
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[1] is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if len(self._entries) >= MAX_ENTRIES:
+            self._evict()
+        self._entries[key] = (self._clock() + ttl, task.result())
+
+    def _evict(self) -> None:
+        now = self._clock()
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        # 仍然过多时丢弃最早写入的一半
+        if len(self._entries) >= MAX_ENTRIES:
+            for key in list(self._entries)[: MAX_ENTRIES // 2]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
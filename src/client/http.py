@@ -0,0 +1,115 @@
+"""共享 HTTP 连接池"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HttpSettings:
+    """连接池与超时参数"""
+
+    limit: int = 100  # 连接池总连接数
+    limit_per_host: int = 20  # 单个 host 的并发连接数（fapi 只有一个 host）
+    keepalive_timeout: float = 60.0  # 空闲连接保活时间
+    dns_cache_ttl: int = 300  # DNS 缓存时间（秒）
+    connect_timeout: float = 5.0  # 建立 TCP/TLS 连接超时
+    read_timeout: float = 10.0  # 两次读取之间的最长等待
+    total_timeout: float = 30.0  # 单个请求总超时（含排队等待连接）
+    compress: bool = True  # 是否请求 gzip/deflate 压缩响应
+
+
+@dataclass
+class ConnectionStats:
+    """连接复用统计（由 aiohttp TraceConfig 采集）"""
+
+    requests: int = 0
+    errors: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+
+class HttpPool:
+    """
+    进程内共享的 aiohttp 会话
+
+    所有访问 fapi 的 BinanceClient 共用同一个连接池，复用已建立的 TLS 连接；
+    会话由连接池持有，客户端关闭时不会关闭共享会话。
+    """
+
+    def __init__(self, settings: HttpSettings | None = None):
+        self.settings = settings or HttpSettings()
+        self.stats = ConnectionStats()
+        self._session: aiohttp.ClientSession | None = None
+
+    def session(self) -> aiohttp.ClientSession:
+        """获取共享会话（首次调用时创建）"""
+        if self._session is None or self._session.closed:
+            self._session = create_session(self.settings, self.stats)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def create_session(
+    settings: HttpSettings | None = None, stats: ConnectionStats | None = None
+) -> aiohttp.ClientSession:
+    """按 settings 创建会话；传入 stats 时记录连接复用情况"""
+    settings = settings or HttpSettings()
+    connector = aiohttp.TCPConnector(
+        limit=settings.limit,
+        limit_per_host=settings.limit_per_host,
+        keepalive_timeout=settings.keepalive_timeout,
+        ttl_dns_cache=settings.dns_cache_ttl,
+        use_dns_cache=True,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings.total_timeout,
+        sock_connect=settings.connect_timeout,
+        sock_read=settings.read_timeout,
+    )
+    headers = {"Accept-Encoding": "gzip, deflate" if settings.compress else "identity"}
+    trace_configs = [_trace_config(stats)] if stats is not None else None
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers=headers,
+        trace_configs=trace_configs,
+    )
+
+
+def _trace_config(stats: ConnectionStats) -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_end(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        stats.requests += 1
+
+    async def on_request_exception(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        stats.errors += 1
+
+    async def on_connection_create_end(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        stats.connections_created += 1
+
+    async def on_connection_reuseconn(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        stats.connections_reused += 1
+
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace
@@ -0,0 +1,174 @@
+"""WebSocket 原始消息录制与回放"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+# 文件格式: 每行 "<接收时间 unix 秒>\t<来源>\t<原始消息>"，gzip 压缩
+JOURNAL_GLOB = "journal-*.tsv.gz"
+# 缓冲数据最长多久落盘一次
+FLUSH_INTERVAL_SECONDS = 1.0
+# 最大速度回放时每多少条消息让出一次事件循环
+MAX_SPEED_YIELD_EVERY = 1000
+
+
+class Recorder(Protocol):
+    def record(self, source: str, message: str) -> None: ...
+
+
+@dataclass
+class JournalEntry:
+    received_at: float
+    source: str
+    message: str
+
+
+class JournalWriter:
+    """
+    追加写入的压缩日志，按大小或时间轮换
+
+    record() 为同步调用且只做缓冲写入，可直接放在消息处理路径上。
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age_seconds: float = 3600.0,
+        max_files: int = 48,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.max_files = max_files
+        self._clock = clock
+        self._file: gzip.GzipFile | None = None
+        self.path: Path | None = None
+        self._opened_at = 0.0
+        self._last_flush = 0.0
+        self._written = 0
+        self._seq = 0
+
+        self.messages = 0
+
+    def record(self, source: str, message: str) -> None:
+        now = self._clock()
+        if (
+            self._file is None
+            or self._written >= self.max_bytes
+            or now - self._opened_at >= self.max_age_seconds
+        ):
+            self._rotate(now)
+        assert self._file is not None
+
+        # Binance 消息为单行紧凑 JSON，不含制表符和换行
+        line = f"{now:.6f}\t{source}\t{message}\n".encode()
+        self._file.write(line)
+        self._written += len(line)
+        self.messages += 1
+        if now - self._last_flush >= FLUSH_INTERVAL_SECONDS:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self, now: float) -> None:
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._seq += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(now))
+        path = self.directory / f"journal-{stamp}-{self._seq:04d}.tsv.gz"
+        self._file = gzip.open(path, "ab")
+        self.path = path
+        self._opened_at = now
+        self._last_flush = now
+        self._written = 0
+        self._prune()
+        logger.info(f"Journal rotated: {path}")
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob(JOURNAL_GLOB))
+        for old in files[: max(0, len(files) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+
+def journal_files(path: str | Path) -> list[Path]:
+    """目录则返回其中所有日志文件（按时间排序），文件则原样返回"""
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.glob(JOURNAL_GLOB))
+    return [path]
+
+
+def read_journal(paths: Iterable[str | Path]) -> Iterator[JournalEntry]:
+    """顺序读取日志；末尾未完整写入的压缩块（进程异常退出）会被忽略"""
+    for path in paths:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    received_at, source, message = line.rstrip("\n").split("\t", 2)
+                    yield JournalEntry(float(received_at), source, message)
+        except EOFError:
+            logger.warning(f"Journal truncated: {path}")
+
+
+@dataclass
+class ReplayStats:
+    messages: int = 0
+    elapsed: float = 0.0
+    journal_span: float = 0.0  # 日志覆盖的原始时长
+
+    @property
+    def rate(self) -> float:
+        return self.messages / self.elapsed if self.elapsed > 0 else 0.0
+
+
+async def replay(
+    entries: Iterable[JournalEntry],
+    handler: Callable[[JournalEntry], Awaitable[None]],
+    speed: float | None = 1.0,
+) -> ReplayStats:
+    """
+    按原始时间间隔回放日志
+
+    Args:
+        speed: 回放倍速，1.0 为原速，None 或 0 表示不等待、尽可能快
+    """
+    loop = asyncio.get_running_loop()
+    stats = ReplayStats()
+    started = loop.time()
+    first: float | None = None
+
+    for entry in entries:
+        if first is None:
+            first = entry.received_at
+        offset = entry.received_at - first
+        if speed:
+            delay = started + offset / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif stats.messages % MAX_SPEED_YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+
+        try:
+            await handler(entry)
+        except Exception as e:
+            logger.error(f"Replay handler error ({entry.source}): {e}")
+        stats.messages += 1
+        stats.journal_span = offset
+
+    stats.elapsed = loop.time() - started
+    return stats
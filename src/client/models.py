@@ -23,6 +23,7 @@ class OpenInterest:
     symbol: str
     open_interest: float
     timestamp: int
+    open_interest_value: float = 0.0  # 持仓价值 (USDT)，仅历史接口返回
 
 
 @dataclass
@@ -34,6 +35,18 @@ class FundingRate:
     funding_time: int
 
 
+@dataclass
+class PremiumIndex:
+    """标记价格、指数价格与当期预测资金费率（与 markPrice 流同源）"""
+
+    symbol: str
+    mark_price: float
+    index_price: float
+    funding_rate: float  # 当期预测资金费率（小数），结算时即为该期已结算费率
+    next_funding_time: int
+    timestamp: int
+
+
 @dataclass
 class LongShortRatio:
     """多空比数据"""
@@ -54,3 +67,27 @@ class TakerRatio:
     buy_vol: float
     sell_vol: float
     timestamp: int
+
+
+@dataclass
+class SymbolInfo:
+    """合约元数据（来自 exchangeInfo）"""
+
+    symbol: str  # 交易所原始代码，如 BTCUSDT
+    base_asset: str
+    quote_asset: str
+    margin_asset: str
+    contract_type: str  # PERPETUAL / CURRENT_QUARTER / ...
+    status: str  # TRADING / SETTLING / ...
+    onboard_date: int = 0
+
+
+@dataclass
+class DepthSnapshot:
+    """订单簿快照（REST /fapi/v1/depth）"""
+
+    symbol: str
+    last_update_id: int
+    bids: list[tuple[float, float]]  # [(价格, 数量)]，价格降序
+    asks: list[tuple[float, float]]  # 价格升序
+    timestamp: int = 0
@@ -0,0 +1,196 @@
+"""Binance 请求权重限流与优先级调度"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any
+
+# 合约 REST 默认 IP 限额: 2400 权重 / 分钟
+WEIGHT_LIMIT_PER_MINUTE = 2400
+# /futures/data/* 统计接口单独限额: 1000 次 / 5 分钟
+DATA_LIMIT_PER_5MIN = 1000
+
+# 固定权重的接口
+ENDPOINT_WEIGHTS: dict[str, int] = {
+    "/fapi/v1/openInterest": 1,
+    "/fapi/v1/fundingRate": 1,
+    "/fapi/v1/premiumIndex": 1,
+    "/fapi/v1/exchangeInfo": 1,
+    "/fapi/v1/ticker/price": 1,
+}
+
+# 按 limit 分档计权的接口: [(limit 上界, 权重), ...]
+LIMIT_TIERED_WEIGHTS: dict[str, list[tuple[int, int]]] = {
+    "/fapi/v1/klines": [(99, 1), (499, 2), (1000, 5), (1500, 10)],
+    "/fapi/v1/depth": [(50, 2), (100, 5), (500, 10), (1000, 20)],
+}
+
+DATA_ENDPOINT_PREFIX = "/futures/data/"
+
+
+class Priority(IntEnum):
+    """请求优先级，数值越小越先调度"""
+
+    ALERT = 0  # 告警检测
+    REPORT = 1  # 报告、定时采集
+    BACKFILL = 2  # 回填、历史补全
+
+
+_request_priority: ContextVar[Priority] = ContextVar("request_priority", default=Priority.REPORT)
+
+
+def current_priority() -> Priority:
+    return _request_priority.get()
+
+
+def set_request_priority(priority: Priority) -> None:
+    """设置当前任务（及其派生任务）的请求优先级"""
+    _request_priority.set(priority)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """在代码块内临时使用指定优先级"""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def request_weight(endpoint: str, params: Mapping[str, Any] | None = None) -> int:
+    """计算请求权重"""
+    tiers = LIMIT_TIERED_WEIGHTS.get(endpoint)
+    if tiers is not None:
+        limit = int((params or {}).get("limit", 500))
+        for upper, weight in tiers:
+            if limit <= upper:
+                return weight
+        return tiers[-1][1]
+    return ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+
+class WeightLimiter:
+    """
+    固定窗口权重桶
+
+    与 Binance 一致按整分钟（window_seconds）对齐重置；服务端返回的
+    已用权重头会校正本地计数。额度不足时请求按优先级排队，
+    同优先级先到先得。reserved 为每个窗口留给 ALERT / REPORT 请求的额度，
+    BACKFILL 请求最多使用其余部分，大批量回填不会占满窗口、让周期采集排队到下一个窗口。
+    """
+
+    def __init__(
+        self,
+        limit: int = WEIGHT_LIMIT_PER_MINUTE,
+        window_seconds: float = 60.0,
+        safety_ratio: float = 0.9,
+        clock: Callable[[], float] = time.time,
+        reserved: int = 0,
+    ):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        # 预留余量给同 IP 的其他进程和计权误差
+        self.budget = max(1, int(limit * safety_ratio))
+        self.reserved = reserved
+        self._clock = clock
+        self._window = self._current_window()
+        self._used = 0
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._drainer: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
+
+        self.throttled = 0
+        self.retry_after_events = 0
+
+    @property
+    def used_weight(self) -> int:
+        self._roll()
+        return self._used
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    def _current_window(self) -> int:
+        return int(self._clock() // self.window_seconds)
+
+    def _roll(self) -> None:
+        window = self._current_window()
+        if window != self._window:
+            self._window = window
+            self._used = 0
+
+    def _available(self, weight: int, priority: Priority = Priority.REPORT) -> bool:
+        if self._clock() < self._paused_until:
+            return False
+        self._roll()
+        budget = self.budget
+        if priority >= Priority.BACKFILL:
+            # 回填至少保留 10% 的额度，避免预留过大时永远无法执行
+            budget -= min(self.reserved, int(budget * 0.9))
+        return self._used + weight <= budget
+
+    def _wait_seconds(self) -> float:
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        window_end = (self._window + 1) * self.window_seconds
+        return max(window_end - now, 0.0) + 0.01
+
+    async def acquire(self, weight: int, priority: Priority | None = None) -> None:
+        """申请权重，额度不足时排队等待"""
+        if priority is None:
+            priority = current_priority()
+        weight = min(weight, self.budget)
+
+        if not self._waiters and self._available(weight, priority):
+            self._used += weight
+            return
+
+        self.throttled += 1
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), weight, fut))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        else:
+            # 新请求可能排到队首（优先级更高），可以使用回填用不了的预留额度
+            self._wakeup.set()
+        await fut
+
+    async def _drain(self) -> None:
+        while self._waiters:
+            priority, _, weight, fut = self._waiters[0]
+            if fut.done():
+                # 等待方已取消
+                heapq.heappop(self._waiters)
+                continue
+            if self._available(weight, Priority(priority)):
+                heapq.heappop(self._waiters)
+                self._used += weight
+                fut.set_result(None)
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._wait_seconds())
+            except TimeoutError:
+                pass
+
+    def sync_used(self, used: int) -> None:
+        """用响应头中的已用权重校正本地计数"""
+        self._roll()
+        self._used = max(self._used, used)
+
+    def pause(self, seconds: float) -> None:
+        """收到 429/418 后暂停发送"""
+        self.retry_after_events += 1
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
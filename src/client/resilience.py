@@ -0,0 +1,161 @@
+"""REST 请求容错：超时、抖动重试、对冲请求与熔断"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from typing import TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT_SECONDS = 5.0
+
+# 各接口单次请求超时（秒）；统计接口明显慢于行情接口
+ENDPOINT_TIMEOUTS: dict[str, float] = {
+    "/fapi/v1/klines": 5.0,
+    "/fapi/v1/openInterest": 3.0,
+    "/fapi/v1/fundingRate": 5.0,
+    "/fapi/v1/premiumIndex": 3.0,
+    "/fapi/v1/exchangeInfo": 15.0,
+    "/fapi/v1/depth": 5.0,
+    "/futures/data/openInterestHist": 8.0,
+    "/futures/data/globalLongShortAccountRatio": 8.0,
+    "/futures/data/topLongShortAccountRatio": 8.0,
+    "/futures/data/topLongShortPositionRatio": 8.0,
+    "/futures/data/takerlongshortRatio": 8.0,
+}
+
+# p95 统计的滑动样本数，以及开始对冲前需要的最少样本
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+class RetryPolicy:
+    """
+    有界重试，退避间隔使用 decorrelated jitter
+
+    sleep = min(max_delay, uniform(base_delay, 上次间隔 * 3))，
+    避免多个请求在同一时刻集中重试。
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 5.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delays(self) -> Iterator[float]:
+        delay = self.base_delay
+        while True:
+            delay = min(self.max_delay, random.uniform(self.base_delay, delay * 3))
+            yield delay
+
+
+class LatencyTracker:
+    """按接口记录最近的成功请求耗时，用于计算对冲延迟"""
+
+    def __init__(self, window: int = LATENCY_WINDOW, min_samples: int = MIN_LATENCY_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def p95(self, endpoint: str) -> float | None:
+        """样本不足时返回 None"""
+        samples = self._samples.get(endpoint)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class CircuitBreaker:
+    """
+    单个接口的熔断器
+
+    连续失败 failure_threshold 次后打开，reset_timeout 秒内直接拒绝请求；
+    之后进入半开状态放行一个探测请求，成功则关闭，失败则重新打开。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.state = self.CLOSED
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        self.state = self.CLOSED
+
+    def release(self) -> None:
+        """请求被取消、没有结果时调用：不计成功或失败，只释放半开状态的探测名额"""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+
+
+async def hedged(make_attempt: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+    """
+    对冲请求：首个请求在 hedge_after 秒内未返回时再发一个相同请求，取先成功的结果
+
+    任一请求成功即取消另一个；全部失败时抛出最后一个异常。
+    """
+    tasks = [asyncio.ensure_future(make_attempt())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            tasks.append(asyncio.ensure_future(make_attempt()))
+
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                exc = task.exception()
+                if exc is None:
+                    return task.result()
+                error = exc
+        assert error is not None
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
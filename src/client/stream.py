@@ -0,0 +1,269 @@
+"""WebSocket 长连接流（主动轮换）"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.client.journal import Recorder
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str], Awaitable[None]]
+KeyFunc = Callable[[str], Hashable | None]
+Connector = Callable[[str], Awaitable[Any]]
+
+# Binance 合约 WebSocket 连接 24h 后被服务端强制断开，提前 1h 主动轮换
+ROTATE_AFTER_SECONDS = 23 * 3600
+# 轮换失败后重试建立新连接的间隔（旧连接 1h 后就会被服务端断开，不能等下一个轮换周期）
+ROTATE_RETRY_SECONDS = 30.0
+# 新旧连接重叠的最长时间，超时后无论是否对齐都关闭旧连接
+OVERLAP_TIMEOUT_SECONDS = 10.0
+# 去重表最大条目数
+DEDUP_MAX_KEYS = 10_000
+# 断线重连的指数退避；连接存活超过 STABLE_AFTER_SECONDS 才重置为基础间隔
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+STABLE_AFTER_SECONDS = 60.0
+
+
+def agg_trade_key(message: str) -> Hashable | None:
+    """aggTrade 事件去重键: (symbol, 聚合成交 ID)"""
+    data = json.loads(message)
+    if data.get("e") != "aggTrade":
+        return None
+    return ("aggTrade", data["s"], data["a"])
+
+
+def force_order_key(message: str) -> Hashable | None:
+    """forceOrder 事件去重键: (symbol, 成交时间, 方向, 数量)"""
+    data = json.loads(message)
+    if data.get("e") != "forceOrder":
+        return None
+    order = data["o"]
+    return ("forceOrder", order["s"], order["T"], order["S"], order["q"])
+
+
+def mark_price_key(message: str) -> Hashable | None:
+    """markPriceUpdate 事件去重键: (symbol, 事件时间)"""
+    data = json.loads(message)
+    if data.get("e") != "markPriceUpdate":
+        return None
+    return ("markPrice", data["s"], data["E"])
+
+
+def depth_key(message: str) -> Hashable | None:
+    """depthUpdate 事件去重键: (symbol, 最后更新 ID)"""
+    data = json.loads(message)
+    if data.get("e") != "depthUpdate":
+        return None
+    return ("depth", data["s"], data["u"])
+
+
+class ReconnectBackoff:
+    """
+    流式连接的重连间隔
+
+    无论连接是异常断开还是被服务端正常关闭，重连前都至少等待 base_delay；
+    连接存活不足 stable_after 秒就结束时间隔翻倍，避免连上即断时无间隔地反复重连。
+    """
+
+    def __init__(
+        self,
+        base_delay: float = RECONNECT_BASE_DELAY,
+        max_delay: float = RECONNECT_MAX_DELAY,
+        stable_after: float = STABLE_AFTER_SECONDS,
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stable_after = stable_after
+        self._delay = base_delay
+
+    def next_delay(self, lifetime: float) -> float:
+        """本次连接存活 lifetime 秒后结束，返回重连前的等待时间"""
+        if lifetime >= self.stable_after:
+            self._delay = self.base_delay
+        delay = self._delay
+        self._delay = min(self._delay * 2, self.max_delay)
+        return delay
+
+
+class RotatingStream:
+    """
+    先建后拆的 WebSocket 连接
+
+    连接存活 rotate_after 秒后，先建立新连接并与旧连接并行接收，
+    重叠期内按事件键去重；一旦两条连接收到同一事件（说明已对齐）或超时，
+    再关闭旧连接，实现无缺口轮换。新连接建立失败时每 rotate_retry 秒重试，
+    直到轮换成功或旧连接断开。
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_message: MessageHandler,
+        key_func: KeyFunc,
+        rotate_after: float = ROTATE_AFTER_SECONDS,
+        overlap_timeout: float = OVERLAP_TIMEOUT_SECONDS,
+        rotate_retry: float = ROTATE_RETRY_SECONDS,
+        connect: Connector | None = None,
+        recorder: Recorder | None = None,
+        source: str | None = None,
+    ):
+        self.url = url
+        self.on_message = on_message
+        self.key_func = key_func
+        self.rotate_after = rotate_after
+        self.overlap_timeout = overlap_timeout
+        self.rotate_retry = rotate_retry
+        self._connect = connect or _default_connect
+        # 可选的原始消息录制，source 默认取 URL 中的流名称
+        self.recorder = recorder
+        self.source = source or url.rsplit("/", 1)[-1]
+        self._seen: OrderedDict[Hashable, None] = OrderedDict()
+        self._dedup_until = 0.0
+        self._aligned: asyncio.Event | None = None
+        self._sockets: list[Any] = []
+
+        self.rotations = 0
+        self.rotation_failures = 0
+        self.duplicates = 0
+
+    async def run(self) -> None:
+        """
+        运行直到连接断开
+
+        连接异常断开时向上抛出异常，由调用方负责重连。
+        """
+        ws = await self._open()
+        reader = asyncio.create_task(self._read(ws))
+        timeout = self.rotate_after
+        try:
+            while True:
+                done, _ = await asyncio.wait({reader}, timeout=timeout)
+                if reader in done:
+                    reader.result()
+                    return
+                previous = reader
+                ws, reader = await self._rotate(ws, reader)
+                if reader is previous:
+                    self.rotation_failures += 1
+                    timeout = self.rotate_retry
+                else:
+                    timeout = self.rotate_after
+        finally:
+            reader.cancel()
+            await self.close()
+
+    async def close(self) -> None:
+        """关闭所有连接"""
+        sockets, self._sockets = self._sockets, []
+        for ws in sockets:
+            await ws.close()
+
+    async def _open(self) -> Any:
+        ws = await self._connect(self.url)
+        self._sockets.append(ws)
+        return ws
+
+    async def _retire(self, ws: Any) -> None:
+        if ws in self._sockets:
+            self._sockets.remove(ws)
+        await ws.close()
+
+    async def _rotate(
+        self, old_ws: Any, old_reader: asyncio.Task[None]
+    ) -> tuple[Any, asyncio.Task[None]]:
+        """建立新连接，等待与旧连接对齐后关闭旧连接"""
+        loop = asyncio.get_running_loop()
+        self._seen.clear()
+        self._dedup_until = float("inf")
+        self._aligned = asyncio.Event()
+
+        try:
+            new_ws = await self._open()
+        except Exception as e:
+            # 新连接失败时保留旧连接，rotate_retry 秒后重试
+            logger.warning(f"Stream rotation failed for {self.url}: {e}")
+            self._dedup_until = 0.0
+            return old_ws, old_reader
+
+        new_reader = asyncio.create_task(self._read(new_ws))
+        aligned = asyncio.create_task(self._aligned.wait())
+        await asyncio.wait(
+            {aligned, old_reader, new_reader},
+            timeout=self.overlap_timeout,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        aligned.cancel()
+
+        if new_reader.done():
+            # 新连接在重叠期内断开，继续使用旧连接
+            logger.warning(f"Stream rotation aborted for {self.url}: new connection closed")
+            self._dedup_until = 0.0
+            await self._retire(new_ws)
+            await self._drain_reader(new_reader)
+            return old_ws, old_reader
+
+        # 先关闭旧连接再等待其读取任务自然结束，正在处理的消息不会被取消打断
+        await self._retire(old_ws)
+        await self._drain_reader(old_reader)
+        # 新连接可能落后于旧连接，关闭旧连接后继续去重一段时间
+        self._dedup_until = loop.time() + self.overlap_timeout
+        self.rotations += 1
+        logger.info(f"Stream rotated: {self.url} (duplicates dropped: {self.duplicates})")
+        return new_ws, new_reader
+
+    async def _drain_reader(self, reader: asyncio.Task[None]) -> None:
+        """等待已关闭连接的读取任务结束并取回其异常；超过 overlap_timeout 仍未结束时取消"""
+        done, _ = await asyncio.wait({reader}, timeout=self.overlap_timeout)
+        if not done:
+            reader.cancel()
+            return
+        if not reader.cancelled() and (error := reader.exception()) is not None:
+            logger.warning(f"Retired connection for {self.url} ended with error: {error}")
+
+    def _is_duplicate(self, message: str) -> bool:
+        key = self.key_func(message)
+        if key is None:
+            return False
+        if key in self._seen:
+            self.duplicates += 1
+            if self._aligned is not None:
+                self._aligned.set()
+            return True
+        self._seen[key] = None
+        if len(self._seen) > DEDUP_MAX_KEYS:
+            self._seen.popitem(last=False)
+        return False
+
+    async def _read(self, ws: Any) -> None:
+        loop = asyncio.get_running_loop()
+        async for message in ws:
+            if isinstance(message, bytes):
+                message = message.decode("utf-8")
+            # 仅在轮换重叠期解析去重键，平时零额外开销
+            if self._dedup_until and loop.time() < self._dedup_until:
+                if self._is_duplicate(message):
+                    continue
+            elif self._dedup_until:
+                self._dedup_until = 0.0
+                self._seen.clear()
+            if self.recorder is not None:
+                self.recorder.record(self.source, message)
+            try:
+                await self.on_message(message)
+            except Exception as e:
+                # 单条消息处理失败不应断开连接
+                logger.error(f"Stream handler error ({self.url}): {e}")
+
+
+async def _default_connect(url: str) -> Any:
+    import websockets
+
+    return await websockets.connect(url)
@@ -0,0 +1,147 @@
+"""合约代码注册表：交易所原始代码与内部统一代码互转"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.client.models import SymbolInfo
+
+if TYPE_CHECKING:
+    from src.client.binance import BinanceClient
+
+logger = logging.getLogger(__name__)
+
+# exchangeInfo 快照刷新间隔（新币上线频率很低）
+REFRESH_SECONDS = 6 * 3600
+# 未加载 exchangeInfo 时按后缀猜测的计价币种
+KNOWN_QUOTES = ("USDT", "USDC")
+
+
+def to_raw(symbol: str) -> str:
+    """内部代码 -> 交易所代码: BTC/USDT:USDT -> BTCUSDT"""
+    return symbol.split(":", 1)[0].replace("/", "")
+
+
+def base_asset(symbol: str) -> str:
+    """内部代码 -> 币种简称: BTC/USDT:USDT -> BTC（价位监控、事件统计按简称存储）"""
+    return symbol.split("/", 1)[0]
+
+
+class SymbolRegistry:
+    """
+    由 exchangeInfo 驱动的合约代码映射
+
+    内部统一使用 "BASE/QUOTE:MARGIN" 格式（如 BTC/USDT:USDT），只收录永续合约。
+    快照中没有的代码（未加载、刷新失败或新上线）按计价币种后缀推断，不会阻塞行情处理。
+    symbols 为配置的监控币种，币种简称优先解析为其中的合约。
+    """
+
+    def __init__(self, infos: list[SymbolInfo] | None = None, symbols: Iterable[str] = ()):
+        self._by_raw: dict[str, SymbolInfo] = {}
+        self.symbols = list(symbols)
+        self.loaded_at = 0.0
+        if infos:
+            self.update(infos)
+
+    def __len__(self) -> int:
+        return len(self._by_raw)
+
+    def update(self, infos: list[SymbolInfo], loaded_at: float | None = None) -> None:
+        self._by_raw = {info.symbol: info for info in infos if info.contract_type == "PERPETUAL"}
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+
+    async def load(
+        self,
+        client: BinanceClient,
+        max_age: float = REFRESH_SECONDS,
+        cache_path: str | Path | None = None,
+    ) -> None:
+        """
+        快照过期时刷新
+
+        优先使用未过期的磁盘快照（启动时免去一次 exchangeInfo 请求），
+        否则请求交易所并写回磁盘；请求失败时保留现有映射，没有映射时退而使用过期的磁盘快照。
+        """
+        if self._by_raw and time.time() - self.loaded_at < max_age:
+            return
+        path = Path(cache_path) if cache_path else None
+        cached = self._read_cache(path) if path else None
+        if cached is not None and time.time() - cached[1] < max_age:
+            self.update(*cached)
+            logger.info(f"Symbol registry loaded from {path}: {len(self)} perpetuals")
+            return
+        try:
+            infos = await client.get_exchange_info()
+        except Exception as e:
+            logger.warning(f"Failed to load exchangeInfo: {e}")
+            if cached is not None and not self._by_raw:
+                self.update(*cached)
+            return
+        self.update(infos)
+        logger.info(f"Symbol registry loaded: {len(self)} perpetuals")
+        if path:
+            self._write_cache(path, infos)
+
+    def _read_cache(self, path: Path) -> tuple[list[SymbolInfo], float] | None:
+        try:
+            data = json.loads(path.read_text())
+            return [SymbolInfo(**info) for info in data["symbols"]], float(data["loaded_at"])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring corrupt symbol cache {path}: {e}")
+            return None
+
+    def _write_cache(self, path: Path, infos: list[SymbolInfo]) -> None:
+        data = {"loaded_at": self.loaded_at, "symbols": [asdict(info) for info in infos]}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，避免进程中断留下半个文件
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write symbol cache {path}: {e}")
+
+    @staticmethod
+    def _internal(info: SymbolInfo) -> str:
+        return f"{info.base_asset}/{info.quote_asset}:{info.margin_asset}"
+
+    def normalize(self, raw: str) -> str | None:
+        """交易所代码 -> 内部代码；非永续合约或无法识别时返回 None"""
+        info = self._by_raw.get(raw)
+        if info is not None:
+            return self._internal(info)
+        # 快照之后新上线的合约；交割合约带日期后缀（BTCUSDT_250328），不会被误判
+        for quote in KNOWN_QUOTES:
+            if raw.endswith(quote) and len(raw) > len(quote):
+                return f"{raw[: -len(quote)]}/{quote}:{quote}"
+        return None
+
+    def resolve(self, base: str) -> str | None:
+        """
+        币种简称 -> 内部代码（价位监控、报告命令和极端事件按简称存储）
+
+        优先匹配配置的监控币种（如 X/USDC:USDC），其次为快照中该币种交易中的永续合约
+        （按 KNOWN_QUOTES 顺序），都没有时返回 None。
+        """
+        base = base.upper()
+        for symbol in self.symbols:
+            if base_asset(symbol) == base:
+                return symbol
+        by_quote = {
+            info.quote_asset: info
+            for info in self._by_raw.values()
+            if info.base_asset == base and info.status == "TRADING"
+        }
+        for quote in KNOWN_QUOTES:
+            if quote in by_quote:
+                return self._internal(by_quote[quote])
+        return None
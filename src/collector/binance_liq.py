@@ -2,11 +2,14 @@
 import asyncio
 import json
 import logging
+import time
 from collections.abc import Callable, Coroutine
 from typing import Any
 
-import websockets
-
+from src.aggregator.liquidation import LiquidationWindow
+from src.client.journal import Recorder
+from src.client.stream import ReconnectBackoff, RotatingStream, force_order_key
+from src.client.symbols import SymbolRegistry, to_raw
 from src.storage.models import Liquidation
 
 from .base import BaseCollector
@@ -14,42 +17,64 @@ from .base import BaseCollector
 logger = logging.getLogger(__name__)
 
 BINANCE_FUTURES_WS = "wss://fstream.binance.com/ws"
+# 全市场爆仓流：每个币种每秒最多推送一笔最新爆仓
+MARKET_STREAM = "!forceOrder@arr"
 
 
 class BinanceLiquidationCollector(BaseCollector):
-    SYMBOL_MAP = {
-        "BTCUSDT": "BTC/USDT:USDT",
-        "ETHUSDT": "ETH/USDT:USDT",
-    }
+    """
+    爆仓采集
+
+    market_wide=True 时只订阅一条 !forceOrder@arr 全市场流：所有币种计入 window
+    做全市场统计，只有配置的 symbols 逐条回调 on_liquidation 落库；
+    否则按币种订阅 <symbol>@forceOrder。on_market 在每笔爆仓计入 window 后同步调用
+    （用于触发全市场告警评估）。
+    """
 
     def __init__(
         self,
         symbols: list[str],
         on_liquidation: Callable[[Liquidation], Coroutine[Any, Any, None]],
+        recorder: Recorder | None = None,
+        ws_url: str = BINANCE_FUTURES_WS,
+        market_wide: bool = False,
+        registry: SymbolRegistry | None = None,
+        window: LiquidationWindow | None = None,
+        on_market: Callable[[Liquidation], None] | None = None,
     ):
         super().__init__("liquidations")
         self.symbols = symbols
         self.on_liquidation = on_liquidation
-        self.ws: Any = None
+        self.recorder = recorder
+        self.ws_url = ws_url
+        self.market_wide = market_wide
+        self.registry = registry or SymbolRegistry()
+        self.window = window
+        self.on_market = on_market
+        self.stream: RotatingStream | None = None
+        self._tracked = set(symbols)
+
+    def _build_url(self) -> str:
+        if self.market_wide:
+            return f"{self.ws_url}/{MARKET_STREAM}"
+        streams = [f"{to_raw(s).lower()}@forceOrder" for s in self.symbols]
+        return f"{self.ws_url}/{'/'.join(streams)}"
 
     async def connect(self) -> None:
-        streams = [
-            f"{s.replace('/', '').replace(':USDT', '').lower()}@forceOrder" for s in self.symbols
-        ]
-        url = f"{BINANCE_FUTURES_WS}/{'/'.join(streams)}"
-        self.ws = await websockets.connect(url)
+        self.stream = RotatingStream(
+            self._build_url(), self._process_message, force_order_key, recorder=self.recorder
+        )
 
     async def disconnect(self) -> None:
-        if self.ws:
-            await self.ws.close()
+        if self.stream:
+            await self.stream.close()
 
     def _parse_liquidation(self, data: dict[str, Any]) -> Liquidation | None:
         if data.get("e") != "forceOrder":
             return None
 
         order = data["o"]
-        raw_symbol = order["s"]
-        symbol = self.SYMBOL_MAP.get(raw_symbol)
+        symbol = self.registry.normalize(order["s"])
         if not symbol:
             return None
 
@@ -72,40 +97,31 @@ class BinanceLiquidationCollector(BaseCollector):
         try:
             data = json.loads(message)
             liq = self._parse_liquidation(data)
-            if liq:
+            if liq is None:
+                return
+            if self.window is not None:
+                self.window.add(liq)
+            if self.on_market is not None:
+                self.on_market(liq)
+            if liq.symbol in self._tracked:
                 await self.on_liquidation(liq)
         except json.JSONDecodeError:
             logger.warning(f"Failed to parse liquidation message: {message}")
 
     async def _run(self) -> None:
-        # 指数退避参数
-        base_delay = 1.0
-        max_delay = 60.0
-        current_delay = base_delay
-
-        await self.connect()
-        assert self.ws is not None
-
+        backoff = ReconnectBackoff()
         while self.running:
+            started = time.monotonic()
             try:
-                message = await self.ws.recv()
-                await self._process_message(message)
-                # 成功接收消息后重置延迟
-                current_delay = base_delay
+                await self.connect()
+                assert self.stream is not None
+                # 连接到期前由 RotatingStream 主动轮换，这里只处理断开后的重连
+                await self.stream.run()
+                reason = "closed"
             except asyncio.CancelledError:
                 break
-            except websockets.ConnectionClosed:
-                logger.warning(
-                    f"Binance liquidation WS disconnected, reconnecting in {current_delay:.1f}s"
-                )
-                await asyncio.sleep(current_delay)
-                current_delay = min(current_delay * 2, max_delay)
-                try:
-                    await self.connect()
-                except Exception as e:
-                    logger.error(f"Failed to reconnect: {e}")
-                    continue  # 跳过本次循环，等待下次重试
             except Exception as e:
-                logger.error(f"Binance liquidation error: {e}, retrying in {current_delay:.1f}s")
-                await asyncio.sleep(current_delay)
-                current_delay = min(current_delay * 2, max_delay)
+                reason = f"error: {e}"
+            delay = backoff.next_delay(time.monotonic() - started)
+            logger.warning(f"Binance liquidation WS {reason}, reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
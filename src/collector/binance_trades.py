@@ -1,10 +1,13 @@
 # src/collector/binance_trades.py
 import asyncio
 import logging
+import time
 from collections.abc import Callable, Coroutine
 from typing import Any
 
 from src.client.binance import BinanceClient
+from src.client.stream import ReconnectBackoff
+from src.client.symbols import to_raw
 from src.storage.models import Trade
 
 from .base import BaseCollector
@@ -18,11 +21,16 @@ class BinanceTradesCollector(BaseCollector):
         symbol: str,
         threshold_usd: float,
         on_trade: Callable[[Trade], Coroutine[Any, Any, None]],
+        on_tick: Callable[[str, float, float, int], Coroutine[Any, Any, None]] | None = None,
+        client: BinanceClient | None = None,
     ):
         super().__init__(symbol)
         self.threshold_usd = threshold_usd
         self.on_trade = on_trade
-        self._client = BinanceClient()
+        # 每笔成交都会回调 (symbol, price, quantity, timestamp)，不受大单阈值过滤
+        self.on_tick = on_tick
+        # WebSocket 订阅不占用 HTTP 会话，可直接共用主程序的 client
+        self._client = client or BinanceClient()
 
     async def connect(self) -> None:
         pass  # WebSocket 连接在 subscribe 时建立
@@ -35,6 +43,11 @@ class BinanceTradesCollector(BaseCollector):
 
     async def _handle_trade(self, trade_data: dict[str, Any]) -> None:
         """处理交易数据"""
+        if self.on_tick:
+            await self.on_tick(
+                self.symbol, trade_data["price"], trade_data["quantity"], trade_data["timestamp"]
+            )
+
         value_usd = trade_data["price"] * trade_data["quantity"]
         if value_usd < self.threshold_usd:
             return
@@ -52,23 +65,18 @@ class BinanceTradesCollector(BaseCollector):
         await self.on_trade(trade)
 
     async def _run(self) -> None:
-        # 转换 symbol 格式: BTC/USDT:USDT -> BTCUSDT
-        ws_symbol = self.symbol.replace("/", "").replace(":USDT", "")
-
-        # 指数退避参数
-        base_delay = 1.0
-        max_delay = 60.0
-        current_delay = base_delay
+        ws_symbol = to_raw(self.symbol)
 
+        backoff = ReconnectBackoff()
         while self.running:
+            started = time.monotonic()
             try:
                 await self._client.subscribe_agg_trades(ws_symbol, self._handle_trade)
-                # 连接成功后重置延迟
-                current_delay = base_delay
+                reason = "closed"
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Binance trades error: {e}, reconnecting in {current_delay:.1f}s")
-                await asyncio.sleep(current_delay)
-                # 指数退避，最大 60 秒
-                current_delay = min(current_delay * 2, max_delay)
+                reason = f"error: {e}"
+            delay = backoff.next_delay(time.monotonic() - started)
+            logger.error(f"Binance trades {reason}, reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
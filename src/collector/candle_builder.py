@@ -0,0 +1,66 @@
+# src/collector/candle_builder.py
+import logging
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from src.storage.models import Candle
+
+logger = logging.getLogger(__name__)
+
+CANDLE_MS = 60 * 1000
+
+
+class CandleBuilder:
+    """把逐笔成交（全部成交，不只是大单）聚合为 1 分钟 K 线，收盘后持久化"""
+
+    def __init__(self, on_candles: Callable[[list[Candle]], Coroutine[Any, Any, None]]):
+        self.on_candles = on_candles
+        self._current: dict[str, Candle] = {}
+
+    def current(self, symbol: str) -> Candle | None:
+        """当前未收盘的 K 线"""
+        return self._current.get(symbol)
+
+    async def add_trade(self, symbol: str, price: float, quantity: float, timestamp: int) -> None:
+        open_time = timestamp - timestamp % CANDLE_MS
+        bar = self._current.get(symbol)
+
+        if bar is not None and open_time == bar.open_time:
+            if price > bar.high:
+                bar.high = price
+            elif price < bar.low:
+                bar.low = price
+            bar.close = price
+            bar.volume += quantity
+            bar.value_usd += price * quantity
+            bar.trades += 1
+            return
+
+        if bar is not None and open_time < bar.open_time:
+            # 上一分钟的迟到成交（仅在连接轮换时可能出现），已收盘不再修改
+            return
+
+        self._current[symbol] = Candle(
+            symbol=symbol,
+            open_time=open_time,
+            open=price,
+            high=price,
+            low=price,
+            close=price,
+            volume=quantity,
+            value_usd=price * quantity,
+            trades=1,
+        )
+        if bar is not None:
+            await self._persist([bar])
+
+    async def flush(self) -> None:
+        """写入所有未收盘的 K 线（停止时调用）"""
+        if self._current:
+            await self._persist(list(self._current.values()))
+
+    async def _persist(self, candles: list[Candle]) -> None:
+        try:
+            await self.on_candles(candles)
+        except Exception as e:
+            logger.error(f"Failed to persist candles: {e}")
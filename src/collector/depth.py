@@ -0,0 +1,245 @@
+# src/collector/depth.py
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.aggregator.orderbook import BookMetrics, OrderBook, book_metrics
+from src.client.binance import BinanceClient
+from src.client.journal import Recorder
+from src.client.models import DepthSnapshot
+from src.client.stream import ReconnectBackoff, RotatingStream, depth_key
+from src.client.symbols import to_raw
+
+from .base import BaseCollector
+
+logger = logging.getLogger(__name__)
+
+BINANCE_FUTURES_WS = "wss://fstream.binance.com/ws"
+# 等待快照期间每个币种最多缓存的增量事件数
+MAX_BUFFERED_EVENTS = 2000
+# 快照请求失败后的重试间隔
+SNAPSHOT_RETRY_SECONDS = 5.0
+
+
+@dataclass
+class _SyncState:
+    """单个币种的同步状态"""
+
+    synced: bool = False
+    first_pending: bool = True  # 快照后的首个事件需满足 U <= lastUpdateId <= u
+    syncing: bool = False
+    next_sync_at: float = 0.0
+    buffer: list[dict[str, Any]] = field(default_factory=list)
+
+
+class DepthCollector(BaseCollector):
+    """
+    订阅 <symbol>@depth@100ms 增量深度，在本地维护 L2 订单簿
+
+    同步流程（Binance 合约文档）：先缓存增量事件，再拉取 REST 快照；丢弃 u < lastUpdateId
+    的事件，首个事件需满足 U <= lastUpdateId <= u，之后每个事件的 pu 必须等于上一个事件的 u，
+    否则判定丢包并重新同步。所有币种共用一条连接。
+
+    订单簿为有序数组实现（见 aggregator.orderbook），盘口指标按需计算，不在每条事件上重复计算。
+    单币种吞吐可用 replay_journal 回放录制的深度流测量。
+
+    client 为 None 时不主动拉取快照，由调用方通过 load_snapshot 提供（日志回放）。
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        client: BinanceClient | None,
+        ws_url: str = BINANCE_FUTURES_WS,
+        recorder: Recorder | None = None,
+        snapshot_limit: int = 1000,
+    ):
+        super().__init__("depth")
+        self.symbols = symbols
+        self.client = client
+        self.ws_url = ws_url
+        self.recorder = recorder
+        self.snapshot_limit = snapshot_limit
+        self.books: dict[str, OrderBook] = {s: OrderBook(s) for s in symbols}
+        self.stream: RotatingStream | None = None
+        self._symbol_map = {to_raw(s): s for s in symbols}
+        self._states: dict[str, _SyncState] = {s: _SyncState() for s in symbols}
+        self._sync_tasks: set[asyncio.Task[None]] = set()
+
+        self.updates = 0
+        self.resyncs = 0
+
+    def _build_url(self) -> str:
+        streams = [f"{raw.lower()}@depth@100ms" for raw in self._symbol_map]
+        return f"{self.ws_url}/{'/'.join(streams)}"
+
+    async def connect(self) -> None:
+        # 重连后增量序列不再连续，全部重新同步
+        for symbol in self.symbols:
+            self._reset(symbol)
+        self.stream = RotatingStream(
+            self._build_url(), self._process_message, depth_key, recorder=self.recorder
+        )
+
+    async def disconnect(self) -> None:
+        for task in self._sync_tasks:
+            task.cancel()
+        if self.stream:
+            await self.stream.close()
+
+    def is_synced(self, symbol: str) -> bool:
+        state = self._states.get(symbol)
+        return state is not None and state.synced
+
+    def metrics(self, symbol: str, **kwargs: Any) -> BookMetrics | None:
+        """盘口衍生指标（参数同 book_metrics），未同步时返回 None"""
+        if not self.is_synced(symbol):
+            return None
+        return book_metrics(self.books[symbol], **kwargs)
+
+    def _reset(self, symbol: str) -> None:
+        state = self._states[symbol]
+        state.synced = False
+        state.first_pending = True
+        state.buffer.clear()
+        self.books[symbol].clear()
+
+    async def _process_message(self, message: str) -> None:
+        try:
+            data = json.loads(message)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse depth message: {message[:200]}")
+            return
+        if data.get("e") != "depthUpdate":
+            return
+        symbol = self._symbol_map.get(data["s"])
+        if symbol is None:
+            return
+
+        state = self._states[symbol]
+        if not state.synced:
+            state.buffer.append(data)
+            if len(state.buffer) > MAX_BUFFERED_EVENTS:
+                del state.buffer[0]
+            self._schedule_sync(symbol)
+            return
+        if not self._apply(symbol, data):
+            self._resync(symbol, data)
+
+    def _apply(self, symbol: str, data: dict[str, Any]) -> bool:
+        """按更新 ID 校验并应用事件，序列不连续时返回 False"""
+        state = self._states[symbol]
+        book = self.books[symbol]
+        if data["u"] < book.last_update_id:
+            return True  # 快照之前的事件
+        if state.first_pending:
+            # 快照晚于全部缓存事件时，首个事件直接接在快照之后（pu == lastUpdateId）
+            if data["U"] > book.last_update_id and data["pu"] != book.last_update_id:
+                return False
+            state.first_pending = False
+        elif data["pu"] != book.last_update_id:
+            return False
+        book.apply(_levels(data["b"]), _levels(data["a"]), data["u"], data.get("E", 0))
+        self.updates += 1
+        return True
+
+    def _resync(self, symbol: str, data: dict[str, Any]) -> None:
+        self.resyncs += 1
+        logger.warning(
+            f"Depth gap for {symbol}: pu={data['pu']} "
+            f"last={self.books[symbol].last_update_id}, resyncing"
+        )
+        self._reset(symbol)
+        self._states[symbol].buffer.append(data)
+        self._schedule_sync(symbol)
+
+    def _schedule_sync(self, symbol: str) -> None:
+        state = self._states[symbol]
+        if self.client is None or state.syncing or time.monotonic() < state.next_sync_at:
+            return
+        state.syncing = True
+        task = asyncio.create_task(self._sync(symbol))
+        self._sync_tasks.add(task)
+        task.add_done_callback(self._sync_tasks.discard)
+
+    async def _sync(self, symbol: str) -> None:
+        state = self._states[symbol]
+        assert self.client is not None
+        try:
+            snapshot = await self.client.get_depth(to_raw(symbol), self.snapshot_limit)
+        except Exception as e:
+            logger.error(f"Failed to fetch depth snapshot for {symbol}: {e}")
+            state.next_sync_at = time.monotonic() + SNAPSHOT_RETRY_SECONDS
+            return
+        finally:
+            state.syncing = False
+        if self.recorder is not None:
+            self.recorder.record(f"{to_raw(symbol).lower()}@depthSnapshot", _dump(snapshot))
+        self.load_snapshot(symbol, snapshot)
+
+    def load_snapshot(self, symbol: str, snapshot: DepthSnapshot) -> None:
+        """载入快照并回放缓存的增量事件"""
+        state = self._states[symbol]
+        book = self.books[symbol]
+        book.load_snapshot(snapshot.last_update_id, snapshot.bids, snapshot.asks)
+        state.synced = True
+        state.first_pending = True
+        buffered, state.buffer = state.buffer, []
+        for data in buffered:
+            if not self._apply(symbol, data):
+                # 快照早于缓存的最早事件，稍后重新拉取
+                self._resync(symbol, data)
+                return
+        logger.info(
+            f"Depth synced for {symbol}: lastUpdateId={snapshot.last_update_id}, "
+            f"{len(buffered)} buffered events"
+        )
+
+    async def _run(self) -> None:
+        backoff = ReconnectBackoff()
+        while self.running:
+            started = time.monotonic()
+            try:
+                await self.connect()
+                assert self.stream is not None
+                await self.stream.run()
+                reason = "closed"
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                reason = f"error: {e}"
+            delay = backoff.next_delay(time.monotonic() - started)
+            logger.warning(f"Binance depth WS {reason}, reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def _levels(raw: Iterable[list[str]]) -> list[tuple[float, float]]:
+    return [(float(p), float(q)) for p, q in raw]
+
+
+def _dump(snapshot: DepthSnapshot) -> str:
+    """快照写入录制日志的格式（与 REST 响应一致）"""
+    return json.dumps(
+        {
+            "s": snapshot.symbol,
+            "lastUpdateId": snapshot.last_update_id,
+            "bids": [[str(p), str(q)] for p, q in snapshot.bids],
+            "asks": [[str(p), str(q)] for p, q in snapshot.asks],
+        },
+        separators=(",", ":"),
+    )
+
+
+def parse_snapshot(message: str) -> DepthSnapshot:
+    """解析录制日志中的快照"""
+    data = json.loads(message)
+    return DepthSnapshot(
+        symbol=data["s"],
+        last_update_id=int(data["lastUpdateId"]),
+        bids=_levels(data["bids"]),
+        asks=_levels(data["asks"]),
+    )
@@ -1,13 +1,16 @@
 # src/collector/event_backfiller.py
+import bisect
 import logging
 import time
 from typing import TYPE_CHECKING
 
+from src.client.symbols import SymbolRegistry, to_raw
 from src.storage.database import Database
 from src.storage.models import ExtremeEvent
 
 if TYPE_CHECKING:
     from src.client.binance import BinanceClient
+    from src.client.models import Kline
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +22,25 @@ BACKFILL_OFFSETS = {
     "price_48h": 48 * 3600 * 1000,
 }
 
+# 批量回填使用 1 分钟 K 线，单次请求最多 1500 根
+KLINE_INTERVAL = "1m"
+KLINE_INTERVAL_MS = 60 * 1000
+MAX_KLINES_PER_REQUEST = 1500
+# 目标时间与最近一根 K 线的最大间隔，超过则视为缺失
+MAX_GAP_MS = 5 * 60 * 1000
+
+# (event_id, 字段, 目标时间)
+BackfillTarget = tuple[int, str, int]
+
 
 class EventBackfiller:
-    """极端事件后续价格回填"""
+    """极端事件后续价格回填（事件按币种简称存储，经 registry 解析为合约代码）"""
 
-    def __init__(self, db: Database, client: "BinanceClient"):
+    def __init__(self, db: Database, client: "BinanceClient", registry: SymbolRegistry):
         self.db = db
         self.client = client
+        self.registry = registry
+        self.requests = 0  # 最近一次 run 发出的 K 线请求数
 
     def _get_pending_fields(self, event: ExtremeEvent, now_ms: int) -> list[str]:
         """获取需要回填的字段"""
@@ -36,64 +51,110 @@ class EventBackfiller:
                 pending.append(field)
         return pending
 
-    async def _get_price_at(self, symbol: str, target_time_ms: int) -> float | None:
-        """获取指定时间的价格"""
-        try:
-            # 将内部 symbol (BTC) 转换为 Binance symbol (BTCUSDT)
-            binance_symbol = f"{symbol}USDT"
-            # 获取目标时间附近的 K 线（向前取 1 小时）
-            klines = await self.client.get_klines(
-                binance_symbol,
-                "1h",
-                limit=1,
-                start_time=target_time_ms,
-            )
-            if klines:
-                return klines[0].close
-            return None
-        except Exception as e:
-            logger.warning(f"Failed to get price for {symbol} at {target_time_ms}: {e}")
-            return None
-
-    async def backfill_one(self, event: ExtremeEvent, now_ms: int | None = None) -> int:
+    @staticmethod
+    def _cluster_targets(times: list[int]) -> list[tuple[int, int]]:
         """
-        回填单个事件的后续价格
+        把已排序的目标时间聚成若干区间，每个区间可由一次 K 线请求覆盖
 
         Returns:
-            回填的字段数量
+            [(区间起点 open_time, K 线根数)]
         """
-        if now_ms is None:
-            now_ms = int(time.time() * 1000)
-
-        pending_fields = self._get_pending_fields(event, now_ms)
-        if not pending_fields:
-            return 0
-
-        filled_count = 0
-        for field in pending_fields:
-            offset = BACKFILL_OFFSETS[field]
-            target_time = event.triggered_at + offset
-            price = await self._get_price_at(event.symbol, target_time)
-
-            if price is not None and event.id is not None:
-                await self.db.update_extreme_event_price(event.id, field, price)
-                filled_count += 1
-                logger.info(f"Backfilled {field} for event {event.id}: {price}")
-
-        return filled_count
+        ranges: list[tuple[int, int]] = []
+        span_ms = (MAX_KLINES_PER_REQUEST - 1) * KLINE_INTERVAL_MS
+        start: int | None = None
+        end = 0
+        for t in times:
+            open_time = t - t % KLINE_INTERVAL_MS
+            if start is None or open_time - start > span_ms:
+                if start is not None:
+                    ranges.append((start, (end - start) // KLINE_INTERVAL_MS + 1))
+                start = open_time
+            end = open_time
+        if start is not None:
+            ranges.append((start, (end - start) // KLINE_INTERVAL_MS + 1))
+        return ranges
+
+    @staticmethod
+    def _resolve(klines: list["Kline"], target_time_ms: int) -> float | None:
+        """从按时间排序的 K 线中取覆盖目标时间的收盘价"""
+        open_times = [k.open_time for k in klines]
+        idx = bisect.bisect_right(open_times, target_time_ms) - 1
+        if idx < 0 or target_time_ms - klines[idx].open_time > MAX_GAP_MS:
+            return None
+        return klines[idx].close
+
+    async def _fetch_symbol(
+        self, symbol: str, targets: list[BackfillTarget]
+    ) -> list[tuple[int, str, float]]:
+        """解析单个币种的全部目标价格：本地 K 线优先，其余按区间批量请求"""
+        resolved: list[tuple[int, str, float]] = []
+        full_symbol = self.registry.resolve(symbol)
+        if full_symbol is None:
+            logger.warning(f"Skipping backfill for {symbol}: no perpetual contract found")
+            return resolved
+        remote: list[BackfillTarget] = []
+        for target in targets:
+            local = await self.db.get_price_at(full_symbol, target[2])
+            if local is not None:
+                resolved.append((target[0], target[1], local))
+            else:
+                remote.append(target)
+
+        remote.sort(key=lambda t: t[2])
+        klines: list[Kline] = []
+        for start, count in self._cluster_targets([t[2] for t in remote]):
+            try:
+                self.requests += 1
+                klines.extend(
+                    await self.client.get_klines(
+                        to_raw(full_symbol), KLINE_INTERVAL, limit=count, start_time=start
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Failed to get klines for {symbol} from {start}: {e}")
+
+        klines.sort(key=lambda k: k.open_time)
+        for event_id, field, target_time in remote:
+            price = self._resolve(klines, target_time)
+            if price is not None:
+                resolved.append((event_id, field, price))
+        return resolved
 
     async def run(self) -> int:
         """
         运行回填任务
 
+        按币种汇总所有待回填的目标时间，批量拉取覆盖区间的 K 线后在内存中解析，
+        最后在一个事务内写入全部更新。
+
         Returns:
             回填的总字段数
         """
-        events = await self.db.get_pending_backfill_events()
-        total_filled = 0
+        started = time.monotonic()
+        self.requests = 0
+        now_ms = int(time.time() * 1000)
 
+        events = await self.db.get_pending_backfill_events()
+        targets_by_symbol: dict[str, list[BackfillTarget]] = {}
         for event in events:
-            filled = await self.backfill_one(event)
-            total_filled += filled
-
-        return total_filled
+            if event.id is None:
+                continue
+            for field in self._get_pending_fields(event, now_ms):
+                target_time = event.triggered_at + BACKFILL_OFFSETS[field]
+                targets_by_symbol.setdefault(event.symbol, []).append(
+                    (event.id, field, target_time)
+                )
+
+        updates: list[tuple[int, str, float]] = []
+        for symbol, targets in targets_by_symbol.items():
+            updates.extend(await self._fetch_symbol(symbol, targets))
+
+        if updates:
+            await self.db.update_extreme_event_prices(updates)
+
+        if events:
+            logger.info(
+                f"Backfilled {len(updates)} fields for {len(events)} events: "
+                f"{self.requests} kline requests in {time.monotonic() - started:.2f}s"
+            )
+        return len(updates)
@@ -0,0 +1,334 @@
+# src/collector/history_bootstrap.py
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from src.client.rate_limiter import Priority, request_priority
+from src.client.symbols import to_raw
+from src.collector.indicator_fetcher import RATIO_PERIOD
+from src.storage.database import Database
+from src.storage.models import FundingRateRecord, MarketIndicator, OISnapshot
+
+if TYPE_CHECKING:
+    from src.client.binance import BinanceClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PERIOD_MS = {
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "30m": 30 * 60 * 1000,
+    "1h": 3600 * 1000,
+    "2h": 2 * 3600 * 1000,
+    "4h": 4 * 3600 * 1000,
+}
+# 统计接口只保留最近 30 天
+MAX_HISTORY_DAYS = 30
+HIST_PAGE_LIMIT = 500
+FUNDING_PAGE_LIMIT = 1000
+FUNDING_INTERVAL_MS = 8 * 3600 * 1000
+RATIO_TYPES = ("global", "top_account", "top_position")
+
+Range = tuple[int, int]
+
+
+def missing_ranges(existing: Range | None, start: int, end: int, step: int) -> list[Range]:
+    """已有数据范围之外、需要补齐的区间（只补头尾，不探测中间缺口）"""
+    if existing is None:
+        return [(start, end)]
+    lo, hi = existing
+    ranges: list[Range] = []
+    if lo - start > step:
+        ranges.append((start, lo - 1))
+    if end - hi > step:
+        ranges.append((max(hi + 1, start), end))
+    return ranges
+
+
+def merge_ranges(ranges: list[Range]) -> list[Range]:
+    """合并重叠或相邻的区间"""
+    merged: list[Range] = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _in_ranges(ts: int, ranges: list[Range]) -> bool:
+    return any(lo <= ts <= hi for lo, hi in ranges)
+
+
+class HistoryBootstrapper:
+    """
+    冷启动历史数据补齐
+
+    启动时并发拉取各币种的 OI、多空比、Taker 买卖比和资金费率历史并批量写入，
+    使基于百分位的告警在启动后即可使用，而不必等待数天积累数据。
+    只补齐已有数据之前/之后缺失的区间，重启时不会重复写入。
+    period 为 OI 历史粒度，多空比和市场指标使用与实时采集相同的粒度 (RATIO_PERIOD)。
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        client: "BinanceClient",
+        symbols: list[str],
+        days: int = 7,
+        period: str = "1h",
+        max_concurrency: int = 8,
+    ):
+        if period not in PERIOD_MS:
+            raise ValueError(f"Unsupported period: {period}")
+        self.db = db
+        self.client = client
+        self.symbols = symbols
+        self.days = min(days, MAX_HISTORY_DAYS)
+        self.period = period
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = 0
+
+    async def _call(self, awaitable: Awaitable[T]) -> T:
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            # 排队时被取消（如停机）：关闭尚未开始的请求协程
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        try:
+            self.requests += 1
+            return await awaitable
+        finally:
+            self._semaphore.release()
+
+    async def _paginate(
+        self,
+        fetch: Callable[[int, int], Awaitable[list[T]]],
+        ranges: list[Range],
+        step: int,
+        limit: int,
+    ) -> list[T]:
+        """按窗口切分区间，保证每个窗口内的数据点不超过单页上限"""
+        window = step * limit
+        requests = []
+        for lo, hi in ranges:
+            cursor = lo
+            while cursor <= hi:
+                window_end = min(cursor + window - 1, hi)
+                requests.append(self._call(fetch(cursor, window_end)))
+                cursor = window_end + 1
+        pages = await asyncio.gather(*requests)
+        return [item for page in pages for item in page]
+
+    async def _bootstrap_oi(self, symbol: str, ws_symbol: str, start: int, end: int) -> int:
+        step = PERIOD_MS[self.period]
+        existing = await self.db.get_time_range("oi_snapshots", symbol, end)
+        ranges = missing_ranges(existing, start, end, step)
+        if not ranges:
+            return 0
+        history = await self._paginate(
+            lambda lo, hi: self.client.get_open_interest_hist(
+                ws_symbol, self.period, limit=HIST_PAGE_LIMIT, start_time=lo, end_time=hi
+            ),
+            ranges,
+            step,
+            HIST_PAGE_LIMIT,
+        )
+        snapshots = [
+            OISnapshot(
+                id=None,
+                exchange="binance",
+                symbol=symbol,
+                timestamp=oi.timestamp,
+                open_interest=oi.open_interest,
+                open_interest_usd=oi.open_interest_value,
+            )
+            for oi in history
+            if _in_ranges(oi.timestamp, ranges)
+        ]
+        if snapshots:
+            await self.db.insert_oi_snapshots(snapshots)
+        return len(snapshots)
+
+    async def _fetch_ratios(
+        self, ws_symbol: str, period: str, ranges: dict[str, list[Range]]
+    ) -> dict[str, list[Any]]:
+        """按 period 拉取各类多空比在对应区间内的历史（去重并按时间排序）"""
+
+        def fetch(ratio_type: str) -> Callable[[int, int], Awaitable[list[Any]]]:
+            if ratio_type == "taker":
+                return lambda lo, hi: self.client.get_taker_long_short_ratio_hist(
+                    ws_symbol, period, HIST_PAGE_LIMIT, lo, hi
+                )
+            return lambda lo, hi: self.client.get_long_short_ratio_hist(
+                ratio_type, ws_symbol, period, HIST_PAGE_LIMIT, lo, hi
+            )
+
+        step = PERIOD_MS[period]
+        types = [ratio_type for ratio_type, r in ranges.items() if r]
+        results = await asyncio.gather(
+            *(self._paginate(fetch(t), ranges[t], step, HIST_PAGE_LIMIT) for t in types)
+        )
+        series: dict[str, list[Any]] = {ratio_type: [] for ratio_type in ranges}
+        for ratio_type, result in zip(types, results, strict=True):
+            unique = {r.timestamp: r for r in result if _in_ranges(r.timestamp, ranges[ratio_type])}
+            series[ratio_type] = sorted(unique.values(), key=lambda r: r.timestamp)
+        return series
+
+    async def _bootstrap_ratios(
+        self, symbol: str, ws_symbol: str, start: int, end: int
+    ) -> tuple[int, int]:
+        """
+        补齐 4 种多空比快照和市场指标
+
+        与实时采集一致，两张表来自同一份 RATIO_PERIOD 粒度的数据：
+        每种多空比按两张表缺口的并集只拉取一次，再按各自的缺口写入。
+        """
+        step = PERIOD_MS[RATIO_PERIOD]
+        ratio_types = (*RATIO_TYPES, "taker")
+        ls_ranges: dict[str, list[Range]] = {}
+        for ratio_type in ratio_types:
+            existing = await self.db.get_time_range(
+                "long_short_snapshots", symbol, end, ratio_type=ratio_type
+            )
+            ls_ranges[ratio_type] = missing_ranges(existing, start, end, step)
+        mi_ranges = missing_ranges(
+            await self.db.get_time_range("market_indicators", symbol, end), start, end, step
+        )
+
+        fetched = await self._fetch_ratios(
+            ws_symbol,
+            RATIO_PERIOD,
+            {t: merge_ranges(ls_ranges[t] + mi_ranges) for t in ratio_types},
+        )
+        series = {
+            t: [r for r in rows if _in_ranges(r.timestamp, ls_ranges[t])]
+            for t, rows in fetched.items()
+        }
+        mi_series = {
+            t: [r for r in rows if _in_ranges(r.timestamp, mi_ranges)]
+            for t, rows in fetched.items()
+        }
+
+        snapshots: list[dict[str, Any]] = []
+        for ratio_type in RATIO_TYPES:
+            snapshots.extend(
+                {
+                    "symbol": symbol,
+                    "timestamp": r.timestamp,
+                    "ratio_type": ratio_type,
+                    "long_ratio": r.long_ratio,
+                    "short_ratio": r.short_ratio,
+                    "long_short_ratio": r.long_short_ratio,
+                }
+                for r in series[ratio_type]
+            )
+        snapshots.extend(
+            {
+                "symbol": symbol,
+                "timestamp": t.timestamp,
+                "ratio_type": "taker",
+                "long_ratio": t.buy_vol,
+                "short_ratio": t.sell_vol,
+                "long_short_ratio": t.buy_sell_ratio,
+            }
+            for t in series["taker"]
+        )
+        if snapshots:
+            await self.db.insert_long_short_snapshots(snapshots)
+
+        # 四个序列在同一时间戳都有数据时才能组成一条市场指标
+        by_type = {k: {r.timestamp: r for r in v} for k, v in mi_series.items()}
+        indicators = [
+            MarketIndicator(
+                id=None,
+                symbol=symbol,
+                timestamp=ts,
+                top_account_ratio=by_type["top_account"][ts].long_short_ratio,
+                top_position_ratio=by_type["top_position"][ts].long_short_ratio,
+                global_account_ratio=g.long_short_ratio,
+                taker_buy_sell_ratio=by_type["taker"][ts].buy_sell_ratio,
+            )
+            for ts, g in by_type["global"].items()
+            if ts in by_type["top_account"]
+            and ts in by_type["top_position"]
+            and ts in by_type["taker"]
+        ]
+        if indicators:
+            await self.db.insert_market_indicators(indicators)
+        return len(snapshots), len(indicators)
+
+    async def _bootstrap_funding(self, symbol: str, ws_symbol: str, start: int, end: int) -> int:
+        existing = await self.db.get_time_range("funding_rates", symbol, end)
+        ranges = missing_ranges(existing, start, end, FUNDING_INTERVAL_MS)
+        if not ranges:
+            return 0
+        history = await self._paginate(
+            lambda lo, hi: self.client.get_funding_rate_hist(
+                ws_symbol, limit=FUNDING_PAGE_LIMIT, start_time=lo, end_time=hi
+            ),
+            ranges,
+            FUNDING_INTERVAL_MS,
+            FUNDING_PAGE_LIMIT,
+        )
+        records = [
+            FundingRateRecord(
+                symbol=symbol, funding_time=f.funding_time, funding_rate=f.funding_rate
+            )
+            for f in history
+        ]
+        if records:
+            await self.db.insert_funding_rates(records)
+        return len(records)
+
+    async def _bootstrap_symbol(self, symbol: str, start: int, end: int) -> dict[str, int]:
+        ws_symbol = to_raw(symbol)
+        oi, ratios, funding = await asyncio.gather(
+            self._bootstrap_oi(symbol, ws_symbol, start, end),
+            self._bootstrap_ratios(symbol, ws_symbol, start, end),
+            self._bootstrap_funding(symbol, ws_symbol, start, end),
+        )
+        return {
+            "oi": oi,
+            "long_short": ratios[0],
+            "market_indicators": ratios[1],
+            "funding": funding,
+        }
+
+    async def run(self) -> dict[str, int]:
+        """
+        补齐所有币种的历史数据
+
+        Returns:
+            各类数据写入的条数
+        """
+        started = time.monotonic()
+        self.requests = 0
+        end = int(time.time() * 1000)
+        start = end - self.days * 24 * 3600 * 1000
+
+        totals = {"oi": 0, "long_short": 0, "market_indicators": 0, "funding": 0}
+        with request_priority(Priority.BACKFILL):
+            results = await asyncio.gather(
+                *(self._bootstrap_symbol(symbol, start, end) for symbol in self.symbols),
+                return_exceptions=True,
+            )
+        for symbol, result in zip(self.symbols, results):
+            if isinstance(result, BaseException):
+                logger.error(f"History bootstrap failed for {symbol}: {result}")
+                continue
+            for key, count in result.items():
+                totals[key] += count
+
+        logger.info(
+            f"History bootstrap: {totals} for {len(self.symbols)} symbols, "
+            f"{self.requests} requests in {time.monotonic() - started:.2f}s"
+        )
+        return totals
@@ -0,0 +1,84 @@
+# src/collector/indicator_collector.py
+import logging
+import time
+from collections.abc import Callable
+
+from src.client.rate_limiter import DATA_LIMIT_PER_5MIN
+from src.collector.indicator_fetcher import IndicatorFetcher
+from src.collector.poller import StaggeredPoller
+from src.storage.database import Database
+
+logger = logging.getLogger(__name__)
+
+# 每个币种每轮多空比采集的 /futures/data 请求数（散户、大户账户、大户持仓、Taker）
+RATIO_REQUESTS_PER_SYMBOL = 4
+
+
+def ratio_requests_per_5min(symbols: int, interval: float) -> float:
+    """多空比采集的 /futures/data 请求数（每 5 分钟）"""
+    return RATIO_REQUESTS_PER_SYMBOL * symbols * 300 / interval
+
+
+class IndicatorCollector:
+    """
+    逐币种 REST 指标采集并落库
+
+    OI 和多空比各由一个 StaggeredPoller 按周期错开执行。多空比每轮每个币种只请求一次，
+    同一份结果同时写入多空比快照和市场指标；告警规则和报告从数据库读取，不再单独请求，
+    /futures/data 的用量因此只取决于币种数和采集周期。
+    """
+
+    def __init__(
+        self,
+        fetcher: IndicatorFetcher,
+        db: Database,
+        symbols: list[str],
+        oi_interval: float,
+        ratio_interval: float,
+        on_update: Callable[[str], None] = lambda symbol: None,
+        market_indicators: bool = True,
+    ):
+        self.fetcher = fetcher
+        self.db = db
+        self.on_update = on_update
+        self.market_indicators = market_indicators
+        self.pollers = [
+            StaggeredPoller("oi", symbols, oi_interval, self.collect_oi),
+            StaggeredPoller("ratios", symbols, ratio_interval, self.collect_ratios),
+        ]
+
+    @property
+    def data_requests_per_5min(self) -> float:
+        """按当前币种数和周期估算的 /futures/data 请求数（5 分钟）"""
+        ratios = self.pollers[1]
+        return ratio_requests_per_5min(len(ratios.symbols), ratios.interval)
+
+    def check_data_budget(self, limit: int = DATA_LIMIT_PER_5MIN) -> bool:
+        """/futures/data 用量超过额度时记录 warning（请求会在限流器中排队，数据逐渐过期）"""
+        planned = self.data_requests_per_5min
+        if planned <= limit:
+            return True
+        logger.warning(
+            f"Ratio polling needs {planned:.0f} /futures/data requests per 5 min, "
+            f"over the budget of {limit}; increase long_short_ratio.fetch_interval_minutes"
+        )
+        return False
+
+    async def collect_oi(self, symbol: str) -> None:
+        """单个币种的 OI 采集"""
+        oi = await self.fetcher.fetch_oi(symbol)
+        if oi:
+            await self.db.insert_oi_snapshot(oi)
+            self.on_update(symbol)
+
+    async def collect_ratios(self, symbol: str) -> None:
+        """单个币种的 4 种多空比采集，写入多空比快照和市场指标"""
+        ls = await self.fetcher.fetch_long_short_indicators(symbol)
+        if not ls:
+            return
+        timestamp = int(time.time() * 1000)
+        await self.db.insert_long_short_snapshots(ls.snapshots(symbol, timestamp))
+        if self.market_indicators:
+            await self.db.insert_market_indicator(ls.market_indicator(symbol, timestamp))
+        self.on_update(symbol)
+        logger.debug(f"Long short ratio: {symbol} saved")
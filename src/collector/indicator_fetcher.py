@@ -1,20 +1,32 @@
 # src/collector/indicator_fetcher.py
+import asyncio
+import inspect
 import logging
 import time
+from collections.abc import Awaitable
 from dataclasses import dataclass
+from typing import Any, TypeVar
 
 from src.client.binance import BinanceClient
+from src.client.models import LongShortRatio, TakerRatio
+from src.client.symbols import to_raw
+from src.collector.mark_price import MarkPrice, MarkPriceCollector
 from src.storage.models import MarketIndicator, OISnapshot
 
 logger = logging.getLogger(__name__)
 
+# 多空比统计接口的粒度。4 个 /futures/data 接口每个采集周期只请求一次，
+# 同一份结果同时写入多空比快照和市场指标；历史补齐使用同样的粒度，保证百分位历史与实时数据可比
+RATIO_PERIOD = "5m"
+
+T = TypeVar("T")
+
 
 @dataclass
 class Indicators:
-    funding_rate: float
-    long_short_ratio: float
-    spot_price: float
-    futures_price: float
+    funding_rate: float  # 当期预测资金费率（百分比）
+    spot_price: float  # 指数价格（现货加权）
+    futures_price: float  # 标记价格
 
     @property
     def spot_perp_spread(self) -> float:
@@ -44,21 +56,100 @@ class LongShortIndicators:
     taker_sell: float
     taker_ratio: float
 
+    def snapshots(self, symbol: str, timestamp: int) -> list[dict[str, Any]]:
+        """long_short_snapshots 表的 4 行（直接使用 API 返回的值）"""
+        return [
+            {
+                "symbol": symbol,
+                "timestamp": timestamp,
+                "ratio_type": ratio_type,
+                "long_ratio": long_ratio,
+                "short_ratio": short_ratio,
+                "long_short_ratio": ratio,
+            }
+            for ratio_type, long_ratio, short_ratio, ratio in (
+                ("global", self.global_long, self.global_short, self.global_ratio),
+                (
+                    "top_account",
+                    self.top_account_long,
+                    self.top_account_short,
+                    self.top_account_ratio,
+                ),
+                (
+                    "top_position",
+                    self.top_position_long,
+                    self.top_position_short,
+                    self.top_position_ratio,
+                ),
+                ("taker", self.taker_buy, self.taker_sell, self.taker_ratio),
+            )
+        ]
+
+    def market_indicator(self, symbol: str, timestamp: int) -> MarketIndicator:
+        """市场指标（用于洞察报告）"""
+        return MarketIndicator(
+            id=None,
+            symbol=symbol,
+            timestamp=timestamp,
+            top_account_ratio=self.top_account_ratio,
+            top_position_ratio=self.top_position_ratio,
+            global_account_ratio=self.global_ratio,
+            taker_buy_sell_ratio=self.taker_ratio,
+        )
+
+
+@dataclass
+class EndpointTiming:
+    """单个接口的耗时统计"""
+
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def record(self, elapsed_ms: float, ok: bool) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if not ok:
+            self.errors += 1
+
 
 class IndicatorFetcher:
-    def __init__(self, symbols: list[str]):
+    def __init__(
+        self,
+        symbols: list[str],
+        max_concurrency: int = 8,
+        client: BinanceClient | None = None,
+        mark_prices: MarkPriceCollector | None = None,
+        mark_price_stale_seconds: float = 5.0,
+    ):
         self.symbols = symbols
-        self._client: BinanceClient | None = None
+        self._client = client
+        # 外部传入的 client 由调用方负责关闭
+        self._owns_client = client is None
+        # 标记价格流，新鲜时代替 REST 获取价格和资金费率
+        self.mark_prices = mark_prices
+        self.mark_price_stale_seconds = mark_price_stale_seconds
+        # 限制同时在途的 REST 请求数
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.timings: dict[str, EndpointTiming] = {}
 
     async def init(self) -> None:
         """初始化持久化的 HTTP session"""
-        self._client = BinanceClient()
-        await self._client.__aenter__()
+        if self._client is None:
+            self._client = BinanceClient()
+            self._owns_client = True
+        await self._client.init()
 
     async def close(self) -> None:
         """关闭 HTTP session"""
-        if self._client:
-            await self._client.__aexit__(None, None, None)
+        if self._client and self._owns_client:
+            await self._client.close()
             self._client = None
 
     def _get_client(self) -> BinanceClient:
@@ -69,69 +160,148 @@ class IndicatorFetcher:
 
     def _to_ws_symbol(self, symbol: str) -> str:
         """转换 symbol 格式: BTC/USDT:USDT -> BTCUSDT"""
-        return symbol.replace("/", "").replace(":USDT", "")
-
-    async def fetch_all_oi(self) -> list[OISnapshot]:
-        """获取所有币种的 OI"""
-        results: list[OISnapshot] = []
-        client = self._get_client()
+        return to_raw(symbol)
 
-        for symbol in self.symbols:
+    async def _timed(self, endpoint: str, request: Awaitable[T]) -> T:
+        """在并发限制内执行请求，并按接口记录耗时"""
+        timing = self.timings.setdefault(endpoint, EndpointTiming())
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            # 排队时被取消：关闭尚未开始的请求协程，避免 "never awaited" 警告
+            if inspect.iscoroutine(request):
+                request.close()
+            raise
+        try:
+            start = time.perf_counter()
+            ok = False
             try:
-                ws_symbol = self._to_ws_symbol(symbol)
-                oi = await client.get_open_interest(ws_symbol)
-                klines = await client.get_klines(ws_symbol, "1h", limit=1)
+                result = await request
+                ok = True
+                return result
+            finally:
+                timing.record((time.perf_counter() - start) * 1000, ok)
+        finally:
+            self._semaphore.release()
 
-                price = klines[0].close if klines else 0
-                oi_usd = oi.open_interest * price
-
-                results.append(
-                    OISnapshot(
-                        id=None,
-                        exchange="binance",
-                        symbol=symbol,
-                        timestamp=oi.timestamp,
-                        open_interest=oi.open_interest,
-                        open_interest_usd=oi_usd,
-                    )
+    def format_timings(self) -> str:
+        """格式化各接口耗时统计"""
+        return ", ".join(
+            f"{name}: n={t.count} avg={t.avg_ms:.0f}ms max={t.max_ms:.0f}ms err={t.errors}"
+            for name, t in sorted(self.timings.items())
+        )
+
+    async def fetch_oi(self, symbol: str) -> OISnapshot | None:
+        """获取单个币种的 OI 快照（USD 价值按标记价格折算，流过期时回退到 K 线收盘价）"""
+        try:
+            ws_symbol = self._to_ws_symbol(symbol)
+            client = self._get_client()
+            mark = self._live_mark_price(symbol)
+            if mark is not None:
+                oi = await self._timed("openInterest", client.get_open_interest(ws_symbol))
+                price = mark.mark_price
+            else:
+                oi, klines = await asyncio.gather(
+                    self._timed("openInterest", client.get_open_interest(ws_symbol)),
+                    self._timed("klines", client.get_klines(ws_symbol, "1h", limit=1)),
                 )
-            except Exception as e:
-                logger.error(f"Failed to fetch OI for {symbol}: {e}")
+                price = klines[0].close if klines else 0
+            return OISnapshot(
+                id=None,
+                exchange="binance",
+                symbol=symbol,
+                timestamp=oi.timestamp,
+                open_interest=oi.open_interest,
+                open_interest_usd=oi.open_interest * price,
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch OI for {symbol}: {e}")
+            return None
 
-        return results
+    def _live_mark_price(self, symbol: str) -> MarkPrice | None:
+        if self.mark_prices is None:
+            return None
+        return self.mark_prices.get(symbol, self.mark_price_stale_seconds)
 
-    async def fetch_indicators(self, symbol: str) -> Indicators | None:
-        """获取基础指标"""
+    async def fetch_price(self, symbol: str) -> float | None:
+        """获取最新价格：优先标记价格流，流过期时回退到 REST"""
+        mark = self._live_mark_price(symbol)
+        if mark is not None:
+            return mark.mark_price
         try:
             ws_symbol = self._to_ws_symbol(symbol)
             client = self._get_client()
+            klines = await self._timed("klines", client.get_klines(ws_symbol, "1h", limit=1))
+            return klines[0].close if klines else None
+        except Exception as e:
+            logger.error(f"Failed to fetch price for {symbol}: {e}")
+            return None
 
-            funding = await client.get_funding_rate(ws_symbol)
-            klines = await client.get_klines(ws_symbol, "1h", limit=1)
-            global_ls = await client.get_global_long_short_ratio(ws_symbol, "1h")
-
-            price = klines[0].close if klines else 0
+    async def fetch_indicators(self, symbol: str) -> Indicators | None:
+        """
+        获取价格和资金费率（优先取自标记价格流，流过期时回退到 REST premiumIndex）
 
+        两条路径同源，资金费率都是当期预测费率（结算时即为该期的已结算费率）。
+        多空比不在这里请求：规则和报告读取 long_short_snapshots 中的最新快照，
+        /futures/data 的请求只来自逐币种的多空比采集。
+        """
+        mark = self._live_mark_price(symbol)
+        if mark is not None:
+            return Indicators(
+                funding_rate=mark.funding_rate * 100,  # 转为百分比
+                spot_price=mark.index_price,  # 指数价格即现货加权价
+                futures_price=mark.mark_price,
+            )
+        try:
+            ws_symbol = self._to_ws_symbol(symbol)
+            client = self._get_client()
+            premium = await self._timed("premiumIndex", client.get_premium_index(ws_symbol))
             return Indicators(
-                funding_rate=funding.funding_rate * 100,  # 转为百分比
-                long_short_ratio=global_ls.long_short_ratio,
-                spot_price=price,  # 简化：使用期货价格
-                futures_price=price,
+                funding_rate=premium.funding_rate * 100,  # 转为百分比
+                spot_price=premium.index_price,
+                futures_price=premium.mark_price,
             )
         except Exception as e:
             logger.error(f"Failed to fetch indicators for {symbol}: {e}")
             return None
 
+    def _ratio_requests(
+        self, ws_symbol: str, period: str
+    ) -> tuple[
+        Awaitable[LongShortRatio],
+        Awaitable[LongShortRatio],
+        Awaitable[LongShortRatio],
+        Awaitable[TakerRatio],
+    ]:
+        """4 种多空比请求: 散户、大户账户、大户持仓、Taker"""
+        client = self._get_client()
+        return (
+            self._timed(
+                "globalLongShortAccountRatio",
+                client.get_global_long_short_ratio(ws_symbol, period),
+            ),
+            self._timed(
+                "topLongShortAccountRatio",
+                client.get_top_long_short_account_ratio(ws_symbol, period),
+            ),
+            self._timed(
+                "topLongShortPositionRatio",
+                client.get_top_long_short_position_ratio(ws_symbol, period),
+            ),
+            self._timed(
+                "takerlongshortRatio",
+                client.get_taker_long_short_ratio(ws_symbol, period),
+            ),
+        )
+
     async def fetch_long_short_indicators(self, symbol: str) -> LongShortIndicators | None:
-        """获取 4 种多空比指标"""
+        """获取 4 种多空比指标（每个币种 4 次 /futures/data 请求）"""
         try:
             ws_symbol = self._to_ws_symbol(symbol)
-            client = self._get_client()
 
-            global_ls = await client.get_global_long_short_ratio(ws_symbol, "1h")
-            top_account = await client.get_top_long_short_account_ratio(ws_symbol, "1h")
-            top_position = await client.get_top_long_short_position_ratio(ws_symbol, "1h")
-            taker = await client.get_taker_long_short_ratio(ws_symbol, "1h")
+            global_ls, top_account, top_position, taker = await asyncio.gather(
+                *self._ratio_requests(ws_symbol, RATIO_PERIOD)
+            )
 
             return LongShortIndicators(
                 global_long=global_ls.long_ratio,
@@ -151,30 +321,6 @@ class IndicatorFetcher:
             logger.error(f"Failed to fetch long short indicators for {symbol}: {e}")
             return None
 
-    async def fetch_market_indicators(self, symbol: str) -> MarketIndicator | None:
-        """获取市场指标（用于洞察报告）"""
-        try:
-            ws_symbol = self._to_ws_symbol(symbol)
-            client = self._get_client()
-
-            top_account = await client.get_top_long_short_account_ratio(ws_symbol, "5m")
-            top_position = await client.get_top_long_short_position_ratio(ws_symbol, "5m")
-            global_account = await client.get_global_long_short_ratio(ws_symbol, "5m")
-            taker = await client.get_taker_long_short_ratio(ws_symbol, "5m")
-
-            return MarketIndicator(
-                id=None,
-                symbol=symbol,
-                timestamp=int(time.time() * 1000),
-                top_account_ratio=top_account.long_short_ratio,
-                top_position_ratio=top_position.long_short_ratio,
-                global_account_ratio=global_account.long_short_ratio,
-                taker_buy_sell_ratio=taker.buy_sell_ratio,
-            )
-        except Exception as e:
-            logger.error(f"Failed to fetch market indicators for {symbol}: {e}")
-            return None
-
     async def fetch_open_interest(self, symbol: str) -> float:
         """获取持仓量"""
         ws_symbol = self._to_ws_symbol(symbol)
@@ -0,0 +1,113 @@
+# src/collector/mark_price.py
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from src.client.journal import Recorder
+from src.client.stream import ReconnectBackoff, RotatingStream, mark_price_key
+from src.client.symbols import to_raw
+
+from .base import BaseCollector
+
+logger = logging.getLogger(__name__)
+
+BINANCE_FUTURES_WS = "wss://fstream.binance.com/ws"
+
+
+@dataclass
+class MarkPrice:
+    """标记价格流的最新快照"""
+
+    symbol: str
+    mark_price: float
+    index_price: float
+    funding_rate: float  # 当期预测资金费率（小数）
+    next_funding_time: int
+    event_time: int
+    received_at: float  # 本地接收时间 (monotonic)
+
+    def age(self) -> float:
+        return time.monotonic() - self.received_at
+
+
+class MarkPriceCollector(BaseCollector):
+    """订阅 <symbol>@markPrice@1s，在内存中维护各币种标记价格、指数价格和资金费率"""
+
+    def __init__(
+        self,
+        symbols: list[str],
+        ws_url: str = BINANCE_FUTURES_WS,
+        recorder: Recorder | None = None,
+    ):
+        super().__init__("markPrice")
+        self.symbols = symbols
+        self.ws_url = ws_url
+        self.recorder = recorder
+        self.prices: dict[str, MarkPrice] = {}
+        self.stream: RotatingStream | None = None
+        self._symbol_map = {to_raw(s): s for s in symbols}
+
+    def _build_url(self) -> str:
+        streams = [f"{raw.lower()}@markPrice@1s" for raw in self._symbol_map]
+        return f"{self.ws_url}/{'/'.join(streams)}"
+
+    async def connect(self) -> None:
+        self.stream = RotatingStream(
+            self._build_url(), self._process_message, mark_price_key, recorder=self.recorder
+        )
+
+    async def disconnect(self) -> None:
+        if self.stream:
+            await self.stream.close()
+
+    def get(self, symbol: str, max_age: float) -> MarkPrice | None:
+        """获取未过期的快照，超过 max_age 秒未更新则返回 None"""
+        mark = self.prices.get(symbol)
+        if mark is None or mark.age() > max_age:
+            return None
+        return mark
+
+    def _parse_mark_price(self, data: dict[str, Any]) -> MarkPrice | None:
+        if data.get("e") != "markPriceUpdate":
+            return None
+        symbol = self._symbol_map.get(data["s"])
+        if not symbol:
+            return None
+        return MarkPrice(
+            symbol=symbol,
+            mark_price=float(data["p"]),
+            index_price=float(data["i"]),
+            funding_rate=float(data["r"]),
+            next_funding_time=int(data["T"]),
+            event_time=int(data["E"]),
+            received_at=time.monotonic(),
+        )
+
+    async def _process_message(self, message: str) -> None:
+        try:
+            mark = self._parse_mark_price(json.loads(message))
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse mark price message: {message}")
+            return
+        if mark:
+            self.prices[mark.symbol] = mark
+
+    async def _run(self) -> None:
+        backoff = ReconnectBackoff()
+        while self.running:
+            started = time.monotonic()
+            try:
+                await self.connect()
+                assert self.stream is not None
+                await self.stream.run()
+                reason = "closed"
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                reason = f"error: {e}"
+            delay = backoff.next_delay(time.monotonic() - started)
+            logger.warning(f"Binance mark price WS {reason}, reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,86 @@
+# src/collector/poller.py
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class StaggeredPoller:
+    """
+    逐币种轮询，把每个周期内的请求均匀分散到整个周期
+
+    第 i 个币种在周期内的 i * interval / n 秒处执行，REST 负载保持平稳，
+    不会在周期开始时集中打满权重。上一轮同一币种仍未完成时跳过本轮，避免任务堆积。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        symbols: list[str],
+        interval: float,
+        work: Callable[[str], Awaitable[None]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.work = work
+        self._clock = clock
+        self._running: dict[str, asyncio.Task[None]] = {}
+        self._cycles: set[asyncio.Task[None]] = set()
+
+        self.cycles = 0
+        self.completed = 0
+        self.errors = 0
+        self.skipped = 0  # 上一轮未完成而跳过的次数
+
+    def offsets(self) -> list[tuple[float, str]]:
+        """各币种在周期内的执行时间偏移（秒）"""
+        step = self.interval / len(self.symbols) if self.symbols else 0.0
+        return [(i * step, symbol) for i, symbol in enumerate(self.symbols)]
+
+    async def tick(self) -> None:
+        """
+        由 Scheduler 触发的一轮（周期对齐由调度器负责）
+
+        分散执行的一轮要持续约 (n-1)/n 个周期，在后台启动后立即返回：
+        调度器不会因为上一轮仍在分散启动而跳过下一次触发（带抖动时下一次触发可能略早），
+        同一币种的重叠由 run_cycle 按币种跳过。
+        """
+        task = asyncio.create_task(self.run_cycle(self._clock()))
+        self._cycles.add(task)
+        task.add_done_callback(self._cycles.discard)
+
+    def cancel(self) -> None:
+        for task in [*self._cycles, *self._running.values()]:
+            task.cancel()
+
+    async def wait(self) -> None:
+        """等待已触发的轮次及其启动的任务全部结束"""
+        while self._cycles:
+            await asyncio.gather(*self._cycles)
+        await asyncio.gather(*self._running.values())
+
+    async def run_cycle(self, started: float) -> None:
+        """按偏移依次启动一轮任务（不等待任务完成）"""
+        self.cycles += 1
+        for offset, symbol in self.offsets():
+            delay = started + offset - self._clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            previous = self._running.get(symbol)
+            if previous is not None and not previous.done():
+                self.skipped += 1
+                logger.warning(f"{self.name}: {symbol} still running, skipping this cycle")
+                continue
+            self._running[symbol] = asyncio.create_task(self._run_one(symbol))
+
+    async def _run_one(self, symbol: str) -> None:
+        try:
+            await self.work(symbol)
+            self.completed += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"{self.name} failed for {symbol}: {e}")
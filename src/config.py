@@ -1,5 +1,6 @@
 # src/config.py
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from pydantic import BaseModel
@@ -7,6 +8,10 @@ from pydantic import BaseModel
 
 class ExchangeConfig(BaseModel):
     enabled: bool = True
+    rest_url: str = "https://fapi.binance.com"
+    ws_url: str = "wss://fstream.binance.com"
+    exchange_info_cache: str = "data/exchange_info.json"  # 合约元数据磁盘快照
+    exchange_info_max_age_hours: float = 6.0
 
 
 class ExchangesConfig(BaseModel):
@@ -45,17 +50,60 @@ class ImportantAlertConfig(BaseModel):
     cooldown_minutes: int = 30
 
 
+class AlertEvaluationConfig(BaseModel):
+    event_driven: bool = True  # 成交/爆仓/指标入库后立即评估对应币种
+    debounce_ms: int = 250  # 首个事件后等待多久再评估，合并同一波行情的多个事件
+    fallback_seconds: int = 60  # 兜底的全量评估周期
+    concurrency: int = 4  # 同时评估的币种数
+    symbol_timeout_seconds: float = 20  # 单个币种的评估时间预算，超时取消
+
+
+class RuleConfig(BaseModel):
+    """声明式告警规则，特征名见 src/alert/features.py"""
+
+    name: str
+    type: Literal["threshold", "percentile", "crossover", "confluence"]
+    enabled: bool = True
+    feature: str = ""
+    # threshold: feature 值（absolute 时取绝对值）落在 [above, below]
+    # percentile: feature 百分位高于 above（默认 90）
+    # confluence: 各维度百分位高于 above（默认 90）
+    above: float | None = None
+    below: float | None = None
+    absolute: bool = False
+    # crossover: feature 穿越 level；min_abs 要求穿越后的值绝对值不低于该值
+    level: float = 0.0
+    direction: Literal["up", "down", "both"] = "both"
+    min_abs: float | None = None
+    # confluence: 维度名 -> 百分位特征，极端维度数在 [min_dimensions, max_dimensions]
+    dimensions: dict[str, str] = {}
+    min_dimensions: int = 1
+    max_dimensions: int | None = None
+    # 历史数据下限：特征（列表）-> 最少数据点数，不足时跳过该规则
+    requires: dict[str, int] = {}
+    cooldown_minutes: int = 30
+    format: str = "rule"  # 消息格式，见 notifier.formatter.RULE_FORMATS
+    message: str | None = None  # 可引用 {direction} 和任意特征
+    up_label: str = "上穿"
+    down_label: str = "下穿"
+
+
 class AlertsConfig(BaseModel):
+    evaluation: AlertEvaluationConfig = AlertEvaluationConfig()
     whale_flow: AlertConfig = AlertConfig(threshold_usd=10000000)
     oi_change: AlertConfig = AlertConfig(threshold_pct=3)
     liquidation: AlertConfig = AlertConfig(threshold_usd=20000000)
     observe: ObserveAlertConfig = ObserveAlertConfig()
     important: ImportantAlertConfig = ImportantAlertConfig()
+    rules: list[RuleConfig] = []  # 追加在内置规则之后
 
 
 class TelegramConfig(BaseModel):
     bot_token: str
-    chat_id: str
+    chat_id: str  # 默认会话：接收全部告警，旧版本添加的价位监控归属该会话
+    api_url: str = "https://api.telegram.org/bot"
+    allowed_chat_ids: list[str] = []  # 允许订阅告警的其他会话，为空时不限制
+    threaded: bool = True  # Bot 在独立线程的事件循环中运行，不占用采集所在的主事件循环
 
 
 class DatabaseConfig(BaseModel):
@@ -98,7 +146,104 @@ class InsightConfig(BaseModel):
 
 class LongShortRatioConfig(BaseModel):
     periods: list[str] = ["15m", "1h"]
-    fetch_interval_minutes: int = 5
+    fetch_interval_minutes: int = 5  # 4 种多空比（同时写入市场指标）的采集周期
+
+
+class MarkPriceConfig(BaseModel):
+    enabled: bool = True
+    stale_seconds: float = 5.0  # 超过该时间未更新则回退到 REST
+
+
+class RestConfig(BaseModel):
+    max_concurrency: int = 8  # 同时在途的 REST 请求数上限
+    weight_limit_per_minute: int = 2400  # Binance IP 权重限额
+    weight_safety_ratio: float = 0.9  # 本进程最多使用的限额比例
+    max_attempts: int = 3  # 网络错误/超时/5xx 的最多尝试次数
+    retry_base_delay: float = 0.2  # 重试退避基础间隔（秒）
+    retry_max_delay: float = 5.0  # 重试退避最大间隔（秒）
+    hedge_alerts: bool = True  # 告警路径请求超过 p95 耗时后发出对冲请求
+    breaker_failures: int = 5  # 连续失败多少次后熔断
+    breaker_reset_seconds: float = 30.0  # 熔断持续时间
+    timeouts: dict[str, float] = {}  # 按接口覆盖默认超时，如 {"/fapi/v1/klines": 3}
+
+
+class HttpConfig(BaseModel):
+    limit: int = 100  # 连接池总连接数
+    limit_per_host: int = 20  # 单个 host 并发连接数
+    keepalive_timeout: float = 60.0  # 空闲连接保活（秒）
+    dns_cache_ttl: int = 300  # DNS 缓存（秒）
+    connect_timeout: float = 5.0  # 建立连接超时（秒）
+    read_timeout: float = 10.0  # 读取超时（秒）
+    total_timeout: float = 30.0  # 单请求总超时（秒）
+    compress: bool = True  # 请求压缩响应
+
+
+class JournalConfig(BaseModel):
+    enabled: bool = False  # 录制 WebSocket 原始消息，用于回放复现和基准测试
+    directory: str = "data/journal"  # 多进程模式下分别写入 ingest/ 和 analytics/ 子目录
+    max_file_mb: int = 64  # 单个文件未压缩大小上限
+    rotate_minutes: int = 60  # 单个文件最长写入时间
+    max_files: int = 48  # 保留的文件数
+
+
+class BootstrapConfig(BaseModel):
+    enabled: bool = True  # 启动时从统计接口补齐历史数据
+    days: int = 7  # 补齐天数（统计接口最多 30 天）
+    period: str = "1h"  # OI 历史粒度（多空比和市场指标按实时采集的粒度补齐）
+
+
+class LiquidationsConfig(BaseModel):
+    market_wide: bool = True  # 订阅 !forceOrder@arr 全市场流，只落库配置的币种
+    window_minutes: int = 5  # 全市场爆仓统计窗口
+    cascade_enabled: bool = True  # 全市场连环爆仓告警
+    cascade_usd: float = 50_000_000  # 窗口内全市场爆仓金额阈值
+    cascade_min_symbols: int = 10  # 窗口内至少涉及的币种数
+    cooldown_minutes: int = 30
+
+
+class OutboxConfig(BaseModel):
+    enabled: bool = True  # 告警先写入发送队列，由后台任务按限速发送
+    global_per_second: float = 25  # Telegram 全局上限约 30 条/秒
+    per_chat_interval_seconds: float = 1.0  # 同一会话的发送间隔（群组上限 20 条/分钟，可设为 3）
+    coalesce_ms: int = 1000  # 同一会话在该窗口内的多条消息合并为一条发送
+    max_attempts: int = 8
+    retry_base_delay: float = 2.0
+    retry_max_delay: float = 300.0
+    max_age_minutes: int = 60  # 重启后丢弃超过该时长的未送达消息
+    workers: int = 4  # 并发发送的会话数
+
+
+class DepthConfig(BaseModel):
+    enabled: bool = False  # 订阅 depth@100ms 增量深度，维护本地订单簿
+    symbols: list[str] = []  # 为空时使用全部监控币种
+    snapshot_limit: int = 1000  # REST 快照档数（1000 档权重 20）
+    imbalance_levels: int = 20  # 买卖失衡度统计档数
+    depth_bps: list[int] = [10, 50]  # 统计中间价 ± N bps 内的挂单金额
+    wall_multiple: float = 5.0  # 挂单金额超过该侧中位数多少倍视为挂单墙
+
+
+class ComputeConfig(BaseModel):
+    # 历史窗口聚合等纯计算的执行方式：inline（事件循环内）/ thread / process
+    mode: Literal["inline", "thread", "process"] = "thread"
+    workers: int = 2
+    loop_lag_interval_ms: int = 500  # 事件循环延迟采样间隔
+    loop_lag_warn_ms: int = 100  # 事件循环阻塞超过该值时记录 warning
+
+
+class SchedulerConfig(BaseModel):
+    align: bool = True  # 周期任务对齐墙钟整点（5 分钟任务在 :00/:05/... 触发）
+    stagger_seconds: float = 7  # 相邻任务依次错开的秒数
+    jitter_seconds: float = 2  # 每次触发的随机抖动上限
+
+
+class ProcessesConfig(BaseModel):
+    # 多进程模式：ingest 进程（WebSocket 采集、落库、REST 轮询）+ analytics 进程（告警、Telegram）
+    enabled: bool = False
+    ring_capacity: int = 65536  # 共享内存环形缓冲区记录数（每条 88 字节）
+    poll_interval_ms: int = 5  # analytics 进程读取缓冲区的轮询间隔
+    restart_backoff_seconds: float = 1  # 子进程退出后重启的初始等待，连续失败时翻倍
+    restart_max_backoff_seconds: float = 60
+    analytics_weight_share: float = 0.3  # analytics 进程分到的 REST 额度比例，其余归 ingest
 
 
 class Config(BaseModel):
@@ -114,6 +259,17 @@ class Config(BaseModel):
     percentile_levels: PercentileLevelsConfig = PercentileLevelsConfig()
     insight: InsightConfig = InsightConfig()
     long_short_ratio: LongShortRatioConfig = LongShortRatioConfig()
+    rest: RestConfig = RestConfig()
+    mark_price: MarkPriceConfig = MarkPriceConfig()
+    bootstrap: BootstrapConfig = BootstrapConfig()
+    http: HttpConfig = HttpConfig()
+    journal: JournalConfig = JournalConfig()
+    liquidations: LiquidationsConfig = LiquidationsConfig()
+    depth: DepthConfig = DepthConfig()
+    outbox: OutboxConfig = OutboxConfig()
+    scheduler: SchedulerConfig = SchedulerConfig()
+    compute: ComputeConfig = ComputeConfig()
+    processes: ProcessesConfig = ProcessesConfig()
 
 
 def load_config(path: Path) -> Config:
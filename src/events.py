@@ -0,0 +1,178 @@
+# src/events.py
+import asyncio
+import logging
+import struct
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+from src.storage.models import Liquidation, Trade
+from src.utils.shm_ring import RingReader, ShmRing
+
+logger = logging.getLogger(__name__)
+
+# 采集侧交给分析侧的事件
+TRADE = 1  # 大额成交（已落库）
+TICK = 2  # 逐笔成交价格，用于关注价位穿越
+LIQUIDATION = 3  # 爆仓（全市场流的每一笔，用于连环爆仓窗口）
+MARK = 4  # 某币种某类数据已入库（如 indicators），触发告警评估
+
+# kind, side, 标签（交易所 / MARK 的数据类型）, 币种, 时间戳, 价格, 数量, 金额
+RECORD = struct.Struct("<BB6x16s24sqddd")
+_SIDES = ("buy", "sell", "long", "short")
+
+
+class EventSink(Protocol):
+    def trade(self, trade: Trade) -> None: ...
+
+    def tick(self, symbol: str, price: float, quantity: float, timestamp: int) -> None: ...
+
+    def liquidation(self, liq: Liquidation) -> None: ...
+
+    def mark(self, symbol: str, kind: str) -> None: ...
+
+
+@dataclass
+class LocalEvents:
+    """单进程模式：事件直接交给同一进程内的分析逻辑"""
+
+    on_trade: Callable[[Trade], None]
+    on_tick: Callable[[str, float, float, int], None]
+    on_liquidation: Callable[[Liquidation], None]
+    on_mark: Callable[[str, str], None]
+
+    def trade(self, trade: Trade) -> None:
+        self.on_trade(trade)
+
+    def tick(self, symbol: str, price: float, quantity: float, timestamp: int) -> None:
+        self.on_tick(symbol, price, quantity, timestamp)
+
+    def liquidation(self, liq: Liquidation) -> None:
+        self.on_liquidation(liq)
+
+    def mark(self, symbol: str, kind: str) -> None:
+        self.on_mark(symbol, kind)
+
+
+def _text(value: bytes) -> str:
+    return value.rstrip(b"\0").decode()
+
+
+class RingPublisher:
+    """多进程模式的采集侧：事件编码为定长记录写入共享内存环形缓冲区"""
+
+    def __init__(self, ring: ShmRing):
+        self.ring = ring
+        self.published = 0
+
+    def _put(
+        self,
+        kind: int,
+        side: str,
+        tag: str,
+        symbol: str,
+        timestamp: int = 0,
+        price: float = 0.0,
+        amount: float = 0.0,
+        value: float = 0.0,
+    ) -> None:
+        side_code = _SIDES.index(side) if side in _SIDES else 0
+        self.ring.put(
+            RECORD.pack(
+                kind, side_code, tag.encode(), symbol.encode(), timestamp, price, amount, value
+            )
+        )
+        self.published += 1
+
+    def trade(self, trade: Trade) -> None:
+        self._put(
+            TRADE,
+            trade.side,
+            trade.exchange,
+            trade.symbol,
+            trade.timestamp,
+            trade.price,
+            trade.amount,
+            trade.value_usd,
+        )
+
+    def tick(self, symbol: str, price: float, quantity: float, timestamp: int) -> None:
+        self._put(TICK, "buy", "", symbol, timestamp, price, quantity)
+
+    def liquidation(self, liq: Liquidation) -> None:
+        self._put(
+            LIQUIDATION,
+            liq.side,
+            liq.exchange,
+            liq.symbol,
+            liq.timestamp,
+            liq.price,
+            liq.quantity,
+            liq.value_usd,
+        )
+
+    def mark(self, symbol: str, kind: str) -> None:
+        self._put(MARK, "buy", kind, symbol)
+
+
+def dispatch(payload: bytes, sink: EventSink) -> None:
+    """解码一条记录并交给 sink"""
+    kind, side_code, tag, raw_symbol, timestamp, price, amount, value = RECORD.unpack(payload)
+    symbol = _text(raw_symbol)
+    side = _SIDES[side_code]
+    if kind == TRADE:
+        sink.trade(Trade(None, _text(tag), symbol, timestamp, price, amount, side, value))
+    elif kind == TICK:
+        sink.tick(symbol, price, amount, timestamp)
+    elif kind == LIQUIDATION:
+        sink.liquidation(
+            Liquidation(None, _text(tag), symbol, timestamp, side, price, amount, value)
+        )
+    elif kind == MARK:
+        sink.mark(symbol, _text(tag))
+    else:
+        logger.warning(f"Unknown event record kind {kind}")
+
+
+class RingConsumer:
+    """
+    多进程模式的分析侧：轮询环形缓冲区并分发事件
+
+    缓冲区为空时 sleep poll_interval 秒，事件延迟不超过一个轮询间隔。
+    序号不连续（采集侧写入过快覆盖了未读记录）时记录丢失条数，
+    丢失只影响事件触发的及时性，兜底的周期评估仍会从数据库读取完整数据。
+    """
+
+    def __init__(
+        self,
+        reader: RingReader,
+        sink: EventSink,
+        poll_interval: float = 0.005,
+        batch: int = 1024,
+    ):
+        self.reader = reader
+        self.sink = sink
+        self.poll_interval = poll_interval
+        self.batch = batch
+        self.errors = 0
+
+    async def run(self) -> None:
+        reported_lost = 0
+        while True:
+            records = self.reader.read(self.batch)
+            if self.reader.lost > reported_lost:
+                logger.warning(
+                    f"Event ring overrun: lost {self.reader.lost - reported_lost} records"
+                )
+                reported_lost = self.reader.lost
+            if not records:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            for payload in records:
+                try:
+                    dispatch(payload, self.sink)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Failed to dispatch event record: {e}")
+            # 每批之后让出事件循环
+            await asyncio.sleep(0)
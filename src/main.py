@@ -1,8 +1,10 @@
 # src/main.py
 import asyncio
 import logging
+import math
 import signal
 import time
+from collections.abc import Coroutine
 from pathlib import Path
 from typing import Any
 
@@ -10,29 +12,54 @@ from src.aggregator.event_stats import EventStats
 from src.aggregator.extreme_tracker import ExtremeTracker
 from src.aggregator.flow import calculate_flow
 from src.aggregator.insight import calculate_change, calculate_divergence, generate_summary
-from src.aggregator.liquidation import calculate_liquidations
-from src.aggregator.oi import calculate_oi_change, interpret_oi_price
-from src.alert.insight_trigger import check_insight_alerts
-from src.alert.price_monitor import check_price_alerts
-from src.alert.trigger import AlertLevel, check_tiered_alerts
+from src.aggregator.liquidation import LiquidationWindow, calculate_liquidations
+from src.aggregator.oi import calculate_oi_change, interpret_oi_price, oi_changes
+from src.aggregator.orderbook import BookMetrics
+from src.aggregator.series import hourly_sums
+from src.alert.dirty import MARKET, DirtySet, DirtyTracker
+from src.alert.features import BOOK_DEPTH_BPS, FeatureSources, funding_history
+from src.alert.price_index import PriceCrossing, PriceLevelIndex
+from src.alert.rules import RuleEngine, default_rules
 from src.client.binance import BinanceClient
+from src.client.http import HttpPool, HttpSettings
+from src.client.journal import JournalWriter
+from src.client.rate_limiter import (
+    DATA_LIMIT_PER_5MIN,
+    Priority,
+    WeightLimiter,
+    set_request_priority,
+)
+from src.client.resilience import ENDPOINT_TIMEOUTS, RetryPolicy
+from src.client.symbols import SymbolRegistry, base_asset
 from src.collector.binance_liq import BinanceLiquidationCollector
 from src.collector.binance_trades import BinanceTradesCollector
+from src.collector.candle_builder import CandleBuilder
+from src.collector.depth import DepthCollector
 from src.collector.event_backfiller import EventBackfiller
+from src.collector.history_bootstrap import HistoryBootstrapper
+from src.collector.indicator_collector import IndicatorCollector, ratio_requests_per_5min
 from src.collector.indicator_fetcher import IndicatorFetcher
+from src.collector.mark_price import MarkPriceCollector
 from src.config import Config, load_config
+from src.events import EventSink, LocalEvents, RingConsumer, RingPublisher
 from src.notifier.formatter import (
-    format_important_alert,
+    RULE_FORMATS,
+    format_cascade_alert,
     format_insight_report_with_history,
-    format_liquidation_alert,
-    format_observe_alert,
-    format_oi_alert,
+    format_price_alert,
     format_report,
-    format_whale_alert,
 )
+from src.notifier.outbox import Outbox
+from src.notifier.router import ANY, AlertRouter
 from src.notifier.telegram import TelegramNotifier
 from src.storage.database import Database
-from src.storage.models import Liquidation, PriceAlert, Trade
+from src.storage.models import Liquidation, PriceAlert, Subscription, Trade
+from src.supervisor import Supervisor
+from src.utils.compute import ComputeExecutor
+from src.utils.fanout import SymbolFanout
+from src.utils.looplag import LoopLagMonitor
+from src.utils.scheduler import Scheduler
+from src.utils.shm_ring import ShmRing
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,28 +69,224 @@ logger = logging.getLogger(__name__)
 
 
 class CryptoMonitor:
-    def __init__(self, config: Config):
+    """
+    role 为 all 时单进程运行全部组件；多进程模式下（见 src/supervisor.py）：
+    ingest 运行 WebSocket 采集、落库和 REST 轮询，把事件写入共享内存环形缓冲区 ring；
+    analytics 从 ring 读取事件，运行告警评估、报告和 Telegram。
+    """
+
+    def __init__(self, config: Config, role: str = "all", ring: ShmRing | None = None):
         self.config = config
-        self.db = Database(config.database.path)
-        self.notifier = TelegramNotifier(config.telegram.bot_token, config.telegram.chat_id)
-        self.indicator_fetcher = IndicatorFetcher(config.symbols)
-        self.binance_client = BinanceClient()
+        self.role = role
+        self.ingest = role in ("all", "ingest")
+        self.analytics = role in ("all", "analytics")
+        self.db = Database(config.database.path, shared=role != "all")
+        self.notifier = TelegramNotifier(
+            config.telegram.bot_token,
+            config.telegram.chat_id,
+            base_url=config.telegram.api_url,
+            threaded=config.telegram.threaded,
+        )
+        # 告警经发送队列异步推送，Telegram 慢或限流不阻塞告警评估
+        outbox = config.outbox
+        self.outbox = Outbox(
+            self.notifier.send_message,
+            self.db,
+            config.telegram.chat_id,
+            enabled=outbox.enabled,
+            global_per_second=outbox.global_per_second,
+            per_chat_interval=outbox.per_chat_interval_seconds,
+            coalesce_seconds=outbox.coalesce_ms / 1000,
+            max_attempts=outbox.max_attempts,
+            retry_base_delay=outbox.retry_base_delay,
+            retry_max_delay=outbox.retry_max_delay,
+            max_age_seconds=outbox.max_age_minutes * 60,
+            workers=outbox.workers,
+        )
+        self.journal: JournalWriter | None = None
+        if config.journal.enabled:
+            # 多进程模式下各进程写入各自的子目录，文件命名和按数量清理互不干扰
+            journal_dir = Path(config.journal.directory)
+            self.journal = JournalWriter(
+                journal_dir if role == "all" else journal_dir / role,
+                max_bytes=config.journal.max_file_mb * 1024 * 1024,
+                max_age_seconds=config.journal.rotate_minutes * 60,
+                max_files=config.journal.max_files,
+            )
+        # 所有 REST 请求共用一个调优过的连接池
+        self.http_pool = HttpPool(HttpSettings(**config.http.model_dump()))
+        exchange = config.exchanges.binance
+        self.binance_client = BinanceClient(
+            base_url=exchange.rest_url,
+            ws_url=exchange.ws_url,
+            weight_limiter=WeightLimiter(
+                self._rest_share(config.rest.weight_limit_per_minute),
+                safety_ratio=config.rest.weight_safety_ratio,
+            ),
+            # 统计接口额度优先保证多空比采集（只在 ingest 侧运行），历史补齐只使用剩余部分
+            data_limiter=WeightLimiter(
+                self._rest_share(DATA_LIMIT_PER_5MIN),
+                window_seconds=300,
+                reserved=math.ceil(
+                    ratio_requests_per_5min(
+                        len(config.symbols), config.long_short_ratio.fetch_interval_minutes * 60
+                    )
+                )
+                if self.ingest
+                else 0,
+            ),
+            pool=self.http_pool,
+            retry_policy=RetryPolicy(
+                config.rest.max_attempts,
+                base_delay=config.rest.retry_base_delay,
+                max_delay=config.rest.retry_max_delay,
+            ),
+            timeouts={**ENDPOINT_TIMEOUTS, **config.rest.timeouts},
+            hedge_alerts=config.rest.hedge_alerts,
+            breaker_failures=config.rest.breaker_failures,
+            breaker_reset_seconds=config.rest.breaker_reset_seconds,
+            recorder=self.journal,
+        )
+        self.mark_price_collector: MarkPriceCollector | None = None
+        if config.mark_price.enabled and config.exchanges.binance.enabled:
+            self.mark_price_collector = MarkPriceCollector(
+                config.symbols, ws_url=f"{exchange.ws_url}/ws", recorder=self.journal
+            )
+        self.depth_collector: DepthCollector | None = None
+        if config.depth.enabled and config.exchanges.binance.enabled:
+            self.depth_collector = DepthCollector(
+                config.depth.symbols or config.symbols,
+                self.binance_client,
+                ws_url=f"{exchange.ws_url}/ws",
+                recorder=self.journal,
+                snapshot_limit=config.depth.snapshot_limit,
+            )
+        # 所有 REST 调用共用一个 client，共享同一份权重额度
+        self.indicator_fetcher = IndicatorFetcher(
+            config.symbols,
+            max_concurrency=config.rest.max_concurrency,
+            client=self.binance_client,
+            mark_prices=self.mark_price_collector,
+            mark_price_stale_seconds=config.mark_price.stale_seconds,
+        )
         self.extreme_tracker = ExtremeTracker(self.db, cooldown_hours=1)
         self.event_stats = EventStats(self.db)
-        self.event_backfiller = EventBackfiller(self.db, self.binance_client)
+        # 交易所合约快照；币种简称优先解析为配置的监控币种
+        self.symbol_registry = SymbolRegistry(symbols=config.symbols)
+        self.event_backfiller = EventBackfiller(self.db, self.binance_client, self.symbol_registry)
+        self.history_bootstrapper = HistoryBootstrapper(
+            self.db,
+            self.binance_client,
+            config.symbols,
+            days=config.bootstrap.days,
+            period=config.bootstrap.period,
+            max_concurrency=config.rest.max_concurrency,
+        )
+        # 由全部逐笔成交聚合的 1 分钟 K 线，用于价格涨跌幅和事件回填
+        self.candle_builder = CandleBuilder(self.db.insert_candles)
+        # 关注价位索引，逐笔成交检测穿越；状态以内存为准并写回数据库
+        self.price_index = PriceLevelIndex(config.price_alerts.cooldown_minutes * 60)
+        self.router = AlertRouter([config.telegram.chat_id])
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        # 逐币种 REST 采集（OI、多空比）按周期均匀错开，币种多时负载保持平稳
+        self.indicator_collector = IndicatorCollector(
+            self.indicator_fetcher,
+            self.db,
+            config.symbols,
+            oi_interval=config.intervals.oi_fetch_minutes * 60,
+            ratio_interval=config.long_short_ratio.fetch_interval_minutes * 60,
+            on_update=lambda symbol: self.events.mark(symbol, "indicators"),
+            market_indicators=config.insight.enabled,
+        )
+        self.pollers = self.indicator_collector.pollers
+        # 历史窗口聚合等纯计算放到线程池 / 进程池，事件循环延迟持续采样
+        compute = config.compute
+        self.compute = ComputeExecutor(compute.mode, compute.workers)
+        self.loop_lag = LoopLagMonitor(
+            compute.loop_lag_interval_ms / 1000, compute.loop_lag_warn_ms / 1000
+        )
+        # 所有周期任务统一调度：墙钟对齐、错开触发、上一次未结束时跳过
+        self.scheduler = Scheduler(
+            align=config.scheduler.align,
+            stagger=config.scheduler.stagger_seconds,
+            jitter=config.scheduler.jitter_seconds,
+        )
+        # 采集事件触发告警评估，固定周期的全量评估作为兜底
+        evaluation = config.alerts.evaluation
+        self.dirty = DirtyTracker(evaluation.event_driven, debounce=evaluation.debounce_ms / 1000)
+        # 告警循环内各币种并发评估，单个币种受时间预算限制
+        budget = evaluation.symbol_timeout_seconds
+        self.rule_fanout = SymbolFanout("rules", evaluation.concurrency, budget)
+        self.price_fanout = SymbolFanout("price_fallback", evaluation.concurrency, budget)
+        self.report_fanout = SymbolFanout("report", evaluation.concurrency)
+        # 声明式告警规则（内置规则 + alerts.rules），编译为共享的特征计划
+        self.rule_engine = RuleEngine(
+            default_rules(config) + config.alerts.rules,
+            {name: fmt.required for name, fmt in RULE_FORMATS.items()},
+        )
+        # 全市场爆仓滑动窗口，用于连环爆仓检测
+        self.liquidation_window = LiquidationWindow(config.liquidations.window_minutes * 60)
         self.collectors: list[Any] = []
         self.running = False
         self.start_time = time.time()
+        self._stop_event = asyncio.Event()
+        # 采集侧产生的事件：单进程直接交给分析逻辑，多进程经共享内存环形缓冲区传递
+        local = LocalEvents(
+            self._analyze_trade, self._analyze_tick, self._analyze_liquidation, self._analyze_mark
+        )
+        self.events: EventSink = local
+        self.ring_consumer: RingConsumer | None = None
+        if role == "ingest":
+            assert ring is not None
+            self.events = RingPublisher(ring)
+        elif role == "analytics":
+            assert ring is not None
+            self.ring_consumer = RingConsumer(
+                ring.reader(), local, poll_interval=config.processes.poll_interval_ms / 1000
+            )
+
+    def _rest_share(self, limit: int) -> int:
+        """多进程模式下两个进程按比例分摊同一 IP 的 REST 额度（权重和统计接口请求数）"""
+        share = self.config.processes.analytics_weight_share
+        if self.role == "ingest":
+            return int(limit * (1 - share))
+        if self.role == "analytics":
+            return int(limit * share)
+        return limit
 
     async def init(self) -> None:
         # Ensure data directory exists
         Path(self.config.database.path).parent.mkdir(parents=True, exist_ok=True)
 
         await self.db.init()
+        if self.analytics:
+            await self.outbox.start()
+            self.router.load(await self.db.get_subscriptions())
+            # 多会话之前创建的价位归属默认会话
+            await self.db.claim_price_alerts(self.config.telegram.chat_id)
+            self.price_index.load(await self.db.get_all_price_alerts())
         await self.indicator_fetcher.init()
         await self.binance_client.init()
+        await self._refresh_symbols()
 
         # Setup collectors
+        if self.ingest:
+            self._setup_ingest_collectors()
+        # 标记价格只保存在内存中，供本进程的 IndicatorFetcher 使用
+        if self.mark_price_collector and self.analytics:
+            self.collectors.append(self.mark_price_collector)
+
+        # Setup Telegram callbacks
+        self.notifier.on_watch = self._on_watch
+        self.notifier.on_unwatch = self._on_unwatch
+        self.notifier.on_list = self._on_list
+        self.notifier.on_subscribe = self._on_subscribe
+        self.notifier.on_unsubscribe = self._on_unsubscribe
+        self.notifier.on_subscriptions = self._on_subscriptions
+        self.notifier.on_report = self._on_report
+        self.notifier.on_status = self._on_status
+
+    def _setup_ingest_collectors(self) -> None:
         for symbol in self.config.symbols:
             if self.config.exchanges.binance.enabled:
                 self.collectors.append(
@@ -71,6 +294,8 @@ class CryptoMonitor:
                         symbol=symbol,
                         threshold_usd=self.config.thresholds.default_usd,
                         on_trade=self._on_trade,
+                        on_tick=self._on_tick,
+                        client=self.binance_client,
                     )
                 )
 
@@ -79,28 +304,164 @@ class CryptoMonitor:
                 BinanceLiquidationCollector(
                     symbols=self.config.symbols,
                     on_liquidation=self._on_liquidation,
+                    recorder=self.journal,
+                    ws_url=f"{self.config.exchanges.binance.ws_url}/ws",
+                    market_wide=self.config.liquidations.market_wide,
+                    registry=self.symbol_registry,
+                    on_market=self.events.liquidation,
                 )
             )
 
-        # Setup Telegram callbacks
-        self.notifier.on_watch = self._on_watch
-        self.notifier.on_unwatch = self._on_unwatch
-        self.notifier.on_list = self._on_list
-        self.notifier.on_report = self._on_report
-        self.notifier.on_status = self._on_status
+        if self.depth_collector:
+            self.collectors.append(self.depth_collector)
 
     async def _on_trade(self, trade: Trade) -> None:
         await self.db.insert_trade(trade)
+        self.events.trade(trade)
         logger.debug(f"Trade: {trade.exchange} {trade.symbol} {trade.side} ${trade.value_usd:,.0f}")
 
+    async def _on_tick(self, symbol: str, price: float, quantity: float, timestamp: int) -> None:
+        """逐笔成交：聚合 K 线，价格交给分析侧检测关注价位穿越"""
+        await self.candle_builder.add_trade(symbol, price, quantity, timestamp)
+        self.events.tick(symbol, price, quantity, timestamp)
+
+    def _analyze_trade(self, trade: Trade) -> None:
+        self.dirty.mark(trade.symbol, "trade")
+
+    def _analyze_tick(self, symbol: str, price: float, quantity: float, timestamp: int) -> None:
+        for crossings in self._group_crossings(
+            self.price_index.on_price(base_asset(symbol), price)
+        ):
+            self._spawn(self._on_price_crossing(symbol, crossings))
+
+    def _analyze_mark(self, symbol: str, kind: str) -> None:
+        if kind == "bootstrap":
+            # 回填改变了整个历史窗口，缓存的小时级历史特征需要重新计算
+            self.rule_engine.history.clear()
+            return
+        self.dirty.mark(symbol, kind)
+
+    def _analyze_liquidation(self, liq: Liquidation) -> None:
+        """全市场爆仓流的每一笔计入连环爆仓窗口"""
+        self.liquidation_window.add(liq)
+        self.dirty.mark(MARKET, "market_liquidation")
+
+    @staticmethod
+    def _group_crossings(crossings: list[PriceCrossing]) -> list[list[PriceCrossing]]:
+        """同一价位同一方向的穿越（不同会话的关注）合为一组，消息只生成一次"""
+        groups: dict[tuple[float, str], list[PriceCrossing]] = {}
+        for crossing in crossings:
+            groups.setdefault((crossing.alert.price, crossing.type), []).append(crossing)
+        return list(groups.values())
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        """在后台执行，不阻塞行情处理"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _on_price_crossing(self, symbol: str, crossings: list[PriceCrossing]) -> None:
+        try:
+            for crossing in crossings:
+                alert = crossing.alert
+                await self.db.update_price_alert(
+                    alert.id or 0,
+                    position=alert.last_position,
+                    triggered_at=alert.last_triggered_at if crossing.notify else None,
+                )
+            notify = [c for c in crossings if c.notify]
+            if not notify:
+                return
+            data = await self._price_alert_data(symbol, notify[0])
+            chats = {c.alert.chat_id or self.config.telegram.chat_id for c in notify}
+            await self.outbox.publish(format_price_alert(data), chats)
+            alert = notify[0].alert
+            logger.info(
+                f"Price alert: {alert.symbol} {notify[0].type} {alert.price} -> {len(chats)} chats"
+            )
+        except Exception as e:
+            logger.error(f"Failed to handle price alert for {symbol}: {e}")
+
+    async def _publish(
+        self, text: str, symbol: str, alert_type: str, value: float | None = None
+    ) -> None:
+        """按订阅路由发送：默认会话 + 订阅了 (币种, 类型) 且满足门槛的会话"""
+        await self.outbox.publish(text, self.router.route(symbol, alert_type, value))
+
+    async def _price_alert_data(self, symbol: str, crossing: PriceCrossing) -> dict[str, Any]:
+        from src.aggregator.percentile import calculate_percentile
+
+        window_hours = self.config.percentile.window_days * 24
+        flow = calculate_flow(await self.db.get_trades(symbol, hours=1))
+        liq_stats = calculate_liquidations(await self.db.get_liquidations(symbol, hours=1))
+        current_oi = await self.db.get_latest_oi(symbol)
+        oi_change = calculate_oi_change(current_oi, await self.db.get_oi_at(symbol, hours_ago=1))
+        indicators = await self.indicator_fetcher.fetch_indicators(symbol)
+        funding_rate = indicators.funding_rate if indicators else 0
+
+        # 按小时聚合历史 flow / 爆仓，用于百分位
+        flow_history, liq_history = await self._hourly_histories(symbol, window_hours)
+
+        return {
+            "symbol": crossing.alert.symbol,
+            "type": crossing.type,
+            "target_price": crossing.alert.price,
+            "current_price": crossing.price,
+            "price_change_1h": await self._price_change(symbol, 1, crossing.price),
+            "flow_1h": flow.net,
+            "flow_1h_pct": calculate_percentile(flow.net, flow_history),
+            "oi_change_1h": oi_change,
+            "oi_change_1h_pct": 50,  # 单次触发不回溯 OI 变化历史
+            "liq_1h_total": liq_stats.total,
+            "liq_1h_pct": calculate_percentile(liq_stats.total, liq_history),
+            "liq_1h_long": liq_stats.long,
+            "liq_1h_short": liq_stats.short,
+            "funding_rate": funding_rate,
+            "funding_rate_pct": calculate_percentile(
+                funding_rate, await self._funding_history(symbol, window_hours)
+            ),
+        }
+
+    async def _hourly_histories(
+        self, symbol: str, window_hours: int
+    ) -> tuple[list[float], list[float]]:
+        """窗口内按小时聚合的净流入和爆仓金额（聚合在计算线程池 / 进程池中执行）"""
+        trades = await self.db.get_trade_series(symbol, hours=window_hours)
+        liqs = await self.db.get_liquidation_series(symbol, hours=window_hours)
+        return (
+            await self.compute.run(hourly_sums, trades),
+            await self.compute.run(hourly_sums, liqs),
+        )
+
+    async def _oi_change_history(self, symbol: str, hours: int) -> list[float]:
+        """过去 hours 小时逐小时的 OI 变化 (%)，一次查询后在快照中二分"""
+        snapshots = await self.db.get_oi_history(symbol, hours=hours + 1)
+        return oi_changes(snapshots, int(time.time() * 1000), hours)
+
+    async def _price_change(self, symbol: str, hours: int, current_price: float) -> float:
+        """基于本地 1 分钟 K 线计算 N 小时涨跌幅 (%)，缺少历史数据时返回 0"""
+        if not current_price:
+            return 0.0
+        target_ms = int(time.time() * 1000) - hours * 3600 * 1000
+        past_price = await self.db.get_price_at(symbol, target_ms)
+        if not past_price:
+            return 0.0
+        return (current_price - past_price) / past_price * 100
+
+    async def _funding_history(self, symbol: str, hours: int) -> list[float]:
+        return await funding_history(self.db, symbol, hours)
+
     async def _on_liquidation(self, liq: Liquidation) -> None:
         await self.db.insert_liquidation(liq)
+        self.events.mark(liq.symbol, "liquidation")
         logger.debug(f"Liquidation: {liq.exchange} {liq.symbol} {liq.side} ${liq.value_usd:,.0f}")
 
-    async def _on_watch(self, symbol: str, price: float) -> None:
+    async def _on_watch(self, chat_id: str, symbol: str, price: float) -> None:
         # Get current price to determine position
-        indicators = await self.indicator_fetcher.fetch_indicators(f"{symbol}/USDT:USDT")
-        current_price = indicators.futures_price if indicators else 0
+        full_symbol = self.symbol_registry.resolve(symbol)
+        current_price = 0.0
+        if full_symbol is not None:
+            current_price = await self.indicator_fetcher.fetch_price(full_symbol) or 0
         position = "above" if current_price > price else "below"
 
         alert = PriceAlert(
@@ -109,16 +470,19 @@ class CryptoMonitor:
             price=price,
             last_position=position,
             last_triggered_at=None,
+            chat_id=chat_id,
         )
-        await self.db.insert_price_alert(alert)
+        alert.id = await self.db.insert_price_alert(alert)
+        self.price_index.add(alert)
 
-    async def _on_unwatch(self, symbol: str, price: float) -> None:
-        await self.db.delete_price_alert(symbol, price)
+    async def _on_unwatch(self, chat_id: str, symbol: str, price: float) -> None:
+        await self.db.delete_price_alert(symbol, price, chat_id)
+        self.price_index.remove(symbol, price, chat_id)
 
-    async def _on_list(self) -> str:
+    async def _on_list(self, chat_id: str) -> str:
         lines = ["📋 当前监控价位\n"]
-        for symbol in ["BTC", "ETH"]:
-            alerts = await self.db.get_price_alerts(symbol)
+        for symbol in (base_asset(s) for s in self.config.symbols):
+            alerts = self.price_index.alerts(symbol, chat_id)
             if alerts:
                 lines.append(f"{symbol}:")
                 for alert in alerts:
@@ -126,8 +490,54 @@ class CryptoMonitor:
                 lines.append("")
         return "\n".join(lines) if len(lines) > 1 else "暂无监控价位"
 
+    def _alert_types(self) -> set[str]:
+        return {rule.name for rule in self.rule_engine.rules} | {"cascade", "report", ANY}
+
+    def _chat_allowed(self, chat_id: str) -> bool:
+        allowed = self.config.telegram.allowed_chat_ids
+        return not allowed or chat_id == self.config.telegram.chat_id or chat_id in allowed
+
+    async def _on_subscribe(
+        self, chat_id: str, symbol: str, alert_type: str, threshold: float | None
+    ) -> str:
+        if not self._chat_allowed(chat_id):
+            return "❌ 当前会话不允许订阅告警"
+        if symbol == "ALL":
+            symbol = ANY
+        if symbol != ANY and symbol not in {base_asset(s) for s in self.config.symbols}:
+            return f"❌ 未监控的币种: {symbol}"
+        if alert_type not in self._alert_types():
+            types = ", ".join(sorted(self._alert_types() - {ANY}))
+            return f"❌ 未知告警类型: {alert_type}\n可选: {types}"
+
+        sub = Subscription(chat_id, symbol, alert_type, threshold)
+        await self.db.upsert_subscription(sub)
+        self.router.add(sub)
+        suffix = f" (门槛 {threshold:,.0f})" if threshold is not None else ""
+        return f"✅ 已订阅 {symbol} {alert_type}{suffix}"
+
+    async def _on_unsubscribe(self, chat_id: str, symbol: str, alert_type: str) -> str:
+        if symbol == "ALL":
+            symbol = ANY
+        if not self.router.remove(chat_id, symbol, alert_type):
+            return f"未找到订阅 {symbol} {alert_type}"
+        await self.db.delete_subscription(chat_id, symbol, alert_type)
+        return f"✅ 已取消订阅 {symbol} {alert_type}"
+
+    async def _on_subscriptions(self, chat_id: str) -> str:
+        subs = self.router.subscriptions(chat_id)
+        if not subs:
+            return "暂无订阅"
+        lines = ["📮 当前订阅\n"]
+        for sub in subs:
+            suffix = f" ≥ {sub.threshold:,.0f}" if sub.threshold is not None else ""
+            lines.append(f"  • {sub.symbol} {sub.alert_type}{suffix}")
+        return "\n".join(lines)
+
     async def _on_report(self, symbol: str) -> str:
-        full_symbol = f"{symbol}/USDT:USDT"
+        full_symbol = self.symbol_registry.resolve(symbol)
+        if full_symbol is None:
+            return f"❌ 未找到永续合约: {symbol.upper()}"
         if self.config.insight.enabled:
             return await self._generate_insight_report(full_symbol)
         return await self._generate_report(full_symbol)
@@ -137,15 +547,102 @@ class CryptoMonitor:
         days = int(uptime // 86400)
         hours = int((uptime % 86400) // 3600)
         minutes = int((uptime % 3600) // 60)
+        limiter = self.binance_client.weight_limiter
+        cache = self.binance_client.cache
+        http = self.http_pool.stats
+        market_liq = self.liquidation_window.market(int(time.time() * 1000))
+        polling = " / ".join(f"{p.name} 失败 {p.errors} 跳过 {p.skipped}" for p in self.pollers)
+        jobs = " / ".join(
+            f"{j.name} {j.runs}次 {j.avg_duration * 1000:.0f}ms"
+            + (f" 失败 {j.errors}" if j.errors else "")
+            + (f" 跳过 {j.skipped}" if j.skipped else "")
+            for j in self.scheduler.jobs
+        )
+        evaluation = " / ".join(
+            f"{d.name} {d.batches}+{d.full_runs}" for d in self.dirty.subscribers
+        )
+        fanout = " / ".join(
+            f"{f.name} {f.last_seconds:.1f}s"
+            + (f" (最慢 {f.last_slowest.symbol})" if f.last_slowest else "")
+            + f" 超时 {f.timeouts}"
+            for f in (self.rule_fanout, self.price_fanout)
+        )
+        depth = self._depth_status()
+        lag = self.loop_lag
+        ring = ""
+        if self.ring_consumer is not None:
+            reader = self.ring_consumer.reader
+            ring = (
+                f"\n事件通道 ({self.role}): 接收 {reader.received} / 丢失 {reader.lost} / "
+                f"积压 {reader.backlog}"
+            )
+        open_breakers = [
+            endpoint
+            for endpoint, breaker in self.binance_client.breakers.items()
+            if breaker.state != breaker.CLOSED
+        ]
 
         return f"""🔧 系统状态
 
 运行时间: {days}d {hours}h {minutes}m
-数据连接: 🟢 正常
+数据连接: 🟢 正常{ring}
+REST 权重: {limiter.used_weight}/{limiter.limit} (排队 {limiter.queued})
+REST 缓存: 命中 {cache.hits} / 合并 {cache.coalesced} / 未命中 {cache.misses}
+HTTP 连接: 新建 {http.connections_created} / 复用 {http.connections_reused} \
+(复用率 {http.reuse_ratio:.0%})
+REST 容错: 重试 {self.binance_client.retries} / 对冲 {self.binance_client.hedges} / \
+熔断 {", ".join(open_breakers) or "无"}
+REST 轮询: {polling}
+事件循环延迟: p50 {lag.percentile(50) * 1000:.0f}ms / p99 {lag.percentile(99) * 1000:.0f}ms / \
+最大 {lag.max_lag * 1000:.0f}ms (阻塞 {lag.slow} 次)
+计算任务 ({self.compute.mode}): {self.compute.tasks} 次 / 累计 {self.compute.busy_seconds:.1f}s
+定时任务: {jobs}
+告警评估 (事件+兜底): {evaluation}
+告警耗时 (并发 {self.rule_fanout.concurrency}): {fanout}
+通知队列: 待发送 {self.outbox.pending} / 已发送 {self.outbox.sent} \
+(合并 {self.outbox.coalesced}) / 重试 {self.outbox.retries} / 限流 {self.outbox.throttled} / \
+丢弃 {self.outbox.dropped}
+告警订阅: {len(self.router)}
+Telegram Bot: {"独立线程" if self.notifier.thread else "主事件循环"} / 命令 {self.notifier.commands}
+告警规则: {len(self.rule_engine.rules)} 条 / 特征 {len(self.rule_engine.plan)} 个 \
+(数据源 {len(self.rule_engine.sources)} 个) / 触发 {self.rule_engine.events} / \
+历史缓存 命中 {self.rule_engine.history.hits} 重算 {self.rule_engine.history.misses}
+全市场爆仓 {self.config.liquidations.window_minutes}m: \
+${market_liq.total:,.0f} ({self.liquidation_window.symbol_count} 个币种)
+订单簿: {depth}
 
 监控币种: {", ".join(self.config.symbols)}
 """
 
+    def _book_metrics(self, symbol: str) -> BookMetrics | None:
+        """本地订单簿的盘口指标，供 /status 和告警规则的盘口特征使用"""
+        if self.depth_collector is None:
+            return None
+        depth = self.config.depth
+        return self.depth_collector.metrics(
+            symbol,
+            imbalance_levels=depth.imbalance_levels,
+            depth_bps=sorted({*depth.depth_bps, *BOOK_DEPTH_BPS}),
+            wall_multiple=depth.wall_multiple,
+        )
+
+    def _depth_status(self) -> str:
+        """订单簿同步状态和各币种盘口失衡度"""
+        collector = self.depth_collector
+        if collector is None:
+            return "未启用"
+        parts = []
+        for symbol in collector.symbols:
+            metrics = self._book_metrics(symbol)
+            if metrics is None:
+                parts.append(f"{base_asset(symbol)} 同步中")
+            else:
+                parts.append(
+                    f"{base_asset(symbol)} 失衡 {metrics.imbalance:+.2f} "
+                    f"价差 {metrics.spread_bps:.1f}bps"
+                )
+        return f"{', '.join(parts)} (重新同步 {collector.resyncs})"
+
     async def _generate_report(self, symbol: str) -> str:
         from src.aggregator.percentile import calculate_percentile
 
@@ -173,46 +670,15 @@ class CryptoMonitor:
 
         indicators = await self.indicator_fetcher.fetch_indicators(symbol)
 
-        # 获取历史数据用于百分位计算
-        trades_history = await self.db.get_trades(symbol, hours=window_hours)
-        liqs_history = await self.db.get_liquidations(symbol, hours=window_hours)
-
-        # 按小时聚合历史 flow
-        flow_history: list[float] = []
-        hour_buckets: dict[int, list[float]] = {}
-        for t in trades_history:
-            hour = t.timestamp // 3600000
-            if hour not in hour_buckets:
-                hour_buckets[hour] = []
-            net = t.value_usd if t.side == "buy" else -t.value_usd
-            hour_buckets[hour].append(net)
-        for nets in hour_buckets.values():
-            flow_history.append(sum(nets))
-
-        # 按小时聚合历史爆仓
-        liq_history: list[float] = []
-        liq_buckets: dict[int, float] = {}
-        for liq in liqs_history:
-            hour = liq.timestamp // 3600000
-            liq_buckets[hour] = liq_buckets.get(hour, 0) + liq.value_usd
-        liq_history = list(liq_buckets.values())
-
-        # 计算 OI 变化历史
-        oi_change_history: list[float] = []
-        for h in range(1, min(window_hours, 48)):
-            oi_h = await self.db.get_oi_at(symbol, hours_ago=h)
-            oi_h_prev = await self.db.get_oi_at(symbol, hours_ago=h + 1)
-            if oi_h and oi_h_prev and oi_h_prev.open_interest_usd > 0:
-                change = (
-                    (oi_h.open_interest_usd - oi_h_prev.open_interest_usd)
-                    / oi_h_prev.open_interest_usd
-                    * 100
-                )
-                oi_change_history.append(change)
+        # 按小时聚合历史 flow / 爆仓，用于百分位计算
+        flow_history, liq_history = await self._hourly_histories(symbol, window_hours)
+
+        oi_change_history = await self._oi_change_history(symbol, min(window_hours, 48))
 
         # 获取多空比历史
         ls_history = await self.db.get_long_short_snapshots(symbol, "global", hours=window_hours)
         ls_ratio_history = [s["long_short_ratio"] for s in ls_history]
+        long_short_ratio = ls_ratio_history[-1] if ls_ratio_history else 1
 
         # 计算百分位
         flow_1h_pct = calculate_percentile(flow_1h.net, flow_history)
@@ -224,17 +690,19 @@ class CryptoMonitor:
         liq_4h_pct = calculate_percentile(liq_stats_4h.total, liq_history)
         funding_pct = calculate_percentile(
             indicators.funding_rate if indicators else 0,
-            [-0.01, 0, 0.01, 0.02, 0.03, 0.05],
-        )
-        ls_pct = calculate_percentile(
-            indicators.long_short_ratio if indicators else 1, ls_ratio_history
+            await self._funding_history(symbol, window_hours),
         )
+        ls_pct = calculate_percentile(long_short_ratio, ls_ratio_history)
+
+        price = indicators.futures_price if indicators else 0
+        price_change_1h = await self._price_change(symbol, 1, price)
+        price_change_24h = await self._price_change(symbol, 24, price)
 
         data = {
-            "symbol": symbol.split("/")[0],
-            "price": indicators.futures_price if indicators else 0,
-            "price_change_1h": 0,
-            "price_change_24h": 0,
+            "symbol": base_asset(symbol),
+            "price": price,
+            "price_change_1h": price_change_1h,
+            "price_change_24h": price_change_24h,
             "flow_1h": flow_1h.net,
             "flow_1h_pct": flow_1h_pct,
             "flow_4h": flow_4h.net,
@@ -247,7 +715,7 @@ class CryptoMonitor:
             "oi_change_1h_pct": oi_1h_pct,
             "oi_change_4h": oi_change_4h,
             "oi_change_4h_pct": oi_4h_pct,
-            "oi_interpretation": interpret_oi_price(oi_change_1h, 0),
+            "oi_interpretation": interpret_oi_price(oi_change_1h, price_change_1h),
             "liq_1h_total": liq_stats_1h.total,
             "liq_1h_pct": liq_1h_pct,
             "liq_1h_long": liq_stats_1h.long,
@@ -258,7 +726,7 @@ class CryptoMonitor:
             "liq_4h_short": liq_stats_4h.short,
             "funding_rate": indicators.funding_rate if indicators else 0,
             "funding_rate_pct": funding_pct,
-            "long_short_ratio": indicators.long_short_ratio if indicators else 1,
+            "long_short_ratio": long_short_ratio,
             "long_short_ratio_pct": ls_pct,
             "spot_perp_spread": indicators.spot_perp_spread if indicators else 0,
             "spot_perp_spread_pct": 50,  # 合约溢价暂无历史数据
@@ -346,31 +814,9 @@ class CryptoMonitor:
         global_acc_history = [mi.global_account_ratio for mi in history_mi]
         taker_history = [mi.taker_buy_sell_ratio for mi in history_mi]
 
-        # 获取 flow 历史
-        trades_history = await self.db.get_trades(symbol, hours=window_hours)
-        flow_history: list[float] = []
-        hour_buckets: dict[int, list[float]] = {}
-        for t in trades_history:
-            hour = t.timestamp // 3600000
-            if hour not in hour_buckets:
-                hour_buckets[hour] = []
-            net = t.value_usd if t.side == "buy" else -t.value_usd
-            hour_buckets[hour].append(net)
-        for nets in hour_buckets.values():
-            flow_history.append(sum(nets))
-
-        # 计算 OI 变化历史
-        oi_change_history: list[float] = []
-        for h in range(1, min(window_hours, 48)):
-            oi_h = await self.db.get_oi_at(symbol, hours_ago=h)
-            oi_h_prev = await self.db.get_oi_at(symbol, hours_ago=h + 1)
-            if oi_h and oi_h_prev and oi_h_prev.open_interest_usd > 0:
-                change = (
-                    (oi_h.open_interest_usd - oi_h_prev.open_interest_usd)
-                    / oi_h_prev.open_interest_usd
-                    * 100
-                )
-                oi_change_history.append(change)
+        flow_history, _ = await self._hourly_histories(symbol, window_hours)
+
+        oi_change_history = await self._oi_change_history(symbol, min(window_hours, 48))
 
         # 计算百分位
         top_pos_pct = calculate_percentile(current_mi.top_position_ratio, top_pos_history)
@@ -378,18 +824,19 @@ class CryptoMonitor:
         taker_pct = calculate_percentile(current_mi.taker_buy_sell_ratio, taker_history)
         flow_pct = calculate_percentile(flow_1h.net, flow_history)
         oi_pct = calculate_percentile(oi_change_1h, oi_change_history)
-        # 资金费率使用业界标准范围
+        # 资金费率优先使用历史结算费率，不足时使用业界标准范围
         funding_pct = calculate_percentile(
             indicators.funding_rate if indicators else 0,
-            [-0.01, 0, 0.01, 0.02, 0.03, 0.05],
+            await self._funding_history(symbol, self.config.percentile.window_days * 24),
         )
 
         # 组装报告数据（使用三窗口百分位格式）
-        short_symbol = symbol.split("/")[0]
+        short_symbol = base_asset(symbol)
+        price = indicators.futures_price if indicators else 0
         data = {
             "symbol": short_symbol,
-            "price": indicators.futures_price if indicators else 0,
-            "price_change_1h": 0,
+            "price": price,
+            "price_change_1h": await self._price_change(symbol, 1, price),
             "summary": summary,
             # 大户 vs 散户
             "top_position_ratio": current_mi.top_position_ratio,
@@ -453,568 +900,188 @@ class CryptoMonitor:
         return format_insight_report_with_history(data, history_data)
 
     async def _scheduled_report(self) -> None:
-        interval = self.config.intervals.report_hours * 3600
-        while self.running:
-            await asyncio.sleep(interval)
-            for symbol in self.config.symbols:
-                try:
-                    if self.config.insight.enabled:
-                        report = await self._generate_insight_report(symbol)
-                    else:
-                        report = await self._generate_report(symbol)
-                    await self.notifier.send_message(report)
-                except Exception as e:
-                    logger.error(f"Failed to send report for {symbol}: {e}")
-
-    async def _fetch_indicators(self) -> None:
-        interval = self.config.intervals.oi_fetch_minutes * 60
-        while self.running:
-            try:
-                # OI 采集
-                oi_snapshots = await self.indicator_fetcher.fetch_all_oi()
-                for oi in oi_snapshots:
-                    await self.db.insert_oi_snapshot(oi)
-
-                # 市场指标采集
-                if self.config.insight.enabled:
-                    for symbol in self.config.symbols:
-                        mi = await self.indicator_fetcher.fetch_market_indicators(symbol)
-                        if mi:
-                            await self.db.insert_market_indicator(mi)
-                            logger.debug(f"Market indicators: {symbol} saved")
-            except Exception as e:
-                logger.error(f"Failed to fetch indicators: {e}")
-            await asyncio.sleep(interval)
-
-    async def _fetch_long_short_ratio(self) -> None:
-        """采集多空比数据"""
-        interval = self.config.long_short_ratio.fetch_interval_minutes * 60
-        while self.running:
-            try:
-                for symbol in self.config.symbols:
-                    ls_indicators = await self.indicator_fetcher.fetch_long_short_indicators(symbol)
-                    if ls_indicators:
-                        timestamp = int(time.time() * 1000)
-
-                        # 存储 4 种多空比数据（直接使用 API 返回的值）
-                        await self.db.insert_long_short_snapshot(
-                            symbol=symbol,
-                            timestamp=timestamp,
-                            ratio_type="global",
-                            long_ratio=ls_indicators.global_long,
-                            short_ratio=ls_indicators.global_short,
-                            long_short_ratio=ls_indicators.global_ratio,
-                        )
-                        await self.db.insert_long_short_snapshot(
-                            symbol=symbol,
-                            timestamp=timestamp,
-                            ratio_type="top_account",
-                            long_ratio=ls_indicators.top_account_long,
-                            short_ratio=ls_indicators.top_account_short,
-                            long_short_ratio=ls_indicators.top_account_ratio,
-                        )
-                        await self.db.insert_long_short_snapshot(
-                            symbol=symbol,
-                            timestamp=timestamp,
-                            ratio_type="top_position",
-                            long_ratio=ls_indicators.top_position_long,
-                            short_ratio=ls_indicators.top_position_short,
-                            long_short_ratio=ls_indicators.top_position_ratio,
-                        )
-                        await self.db.insert_long_short_snapshot(
-                            symbol=symbol,
-                            timestamp=timestamp,
-                            ratio_type="taker",
-                            long_ratio=ls_indicators.taker_buy,
-                            short_ratio=ls_indicators.taker_sell,
-                            long_short_ratio=ls_indicators.taker_ratio,
-                        )
-                        logger.debug(f"Long short ratio: {symbol} saved")
-            except Exception as e:
-                logger.error(f"Failed to fetch long short ratio: {e}")
-            await asyncio.sleep(interval)
-
-    async def _check_alerts(self) -> None:
-        while self.running:
-            await asyncio.sleep(60)  # Check every minute
-
-            for symbol in self.config.symbols:
-                try:
-                    # Check price alerts
-                    short_symbol = symbol.split("/")[0]
-                    price_alerts = await self.db.get_price_alerts(short_symbol)
-                    indicators = await self.indicator_fetcher.fetch_indicators(symbol)
-
-                    if indicators and price_alerts:
-                        triggered = check_price_alerts(
-                            price_alerts,
-                            indicators.futures_price,
-                            self.config.price_alerts.cooldown_minutes * 60,
-                        )
-                        for result in triggered:
-                            # Update alert state
-                            new_position = (
-                                "above" if indicators.futures_price > result.price else "below"
-                            )
-                            await self.db.update_price_alert(
-                                result.alert_id,
-                                position=new_position,
-                                triggered_at=int(time.time()),
-                            )
-                            # Send notification
-                            # ... (would gather data and format)
-                except Exception as e:
-                    logger.error(f"Failed to check alerts for {symbol}: {e}")
-
-    async def _check_insight_alerts(self) -> None:
-        """检测市场异动"""
-        from src.aggregator.percentile import calculate_percentile
-
-        if not self.config.insight.enabled:
-            return
-
-        # 存储上一次的状态
-        previous_states: dict[str, dict[str, Any]] = {}
-        window_hours = self.config.percentile.window_days * 24
-
-        while self.running:
-            await asyncio.sleep(60)  # 每分钟检查
-
-            for symbol in self.config.symbols:
-                try:
-                    current_mi = await self.db.get_latest_market_indicator(symbol)
-                    if not current_mi:
-                        continue
+        await self.report_fanout.run(self.config.symbols, self._send_report)
 
-                    trades_1h = await self.db.get_trades(symbol, hours=1)
-                    flow = calculate_flow(trades_1h)
-
-                    # 计算分歧
-                    history_mi = await self.db.get_market_indicator_history(
-                        symbol, hours=window_hours
-                    )
-                    divergence_history = [
-                        abs(mi.top_position_ratio - mi.global_account_ratio) for mi in history_mi
-                    ]
-                    divergence_result = calculate_divergence(
-                        current_mi.top_position_ratio,
-                        current_mi.global_account_ratio,
-                        divergence_history,
-                    )
-
-                    # 计算 taker_ratio 百分位
-                    taker_history = [mi.taker_buy_sell_ratio for mi in history_mi]
-                    taker_pct = calculate_percentile(current_mi.taker_buy_sell_ratio, taker_history)
-
-                    current_state = {
-                        "divergence_level": divergence_result["level"],
-                        "top_ratio": current_mi.top_position_ratio,
-                        "flow_1h": flow.net,
-                        "taker_ratio": current_mi.taker_buy_sell_ratio,
-                        "taker_ratio_pct": taker_pct,
-                    }
-
-                    if symbol in previous_states:
-                        alerts = check_insight_alerts(
-                            current_state,
-                            previous_states[symbol],
-                            self.config.insight.alerts.flow_threshold_usd,
-                        )
-
-                        for alert in alerts:
-                            # 发送异动提醒
-                            short_symbol = symbol.split("/")[0]
-                            msg = f"⚡ {short_symbol} 市场异动\n\n{alert.message}"
-                            await self.notifier.send_message(msg)
-                            logger.info(f"Insight alert: {symbol} - {alert.type}")
-
-                    previous_states[symbol] = current_state
+    async def _send_report(self, symbol: str) -> None:
+        if self.config.insight.enabled:
+            report = await self._generate_insight_report(symbol)
+        else:
+            report = await self._generate_report(symbol)
+        await self._publish(report, base_asset(symbol), "report")
 
-                except Exception as e:
-                    logger.error(f"Failed to check insight alerts for {symbol}: {e}")
+    async def _next_symbols(self, dirty: DirtySet) -> list[str]:
+        """下一批需要评估的币种：事件触发时只评估有变化的币种，兜底周期评估全部币种"""
+        batch = await dirty.next_batch()
+        if batch is None:
+            return self.config.symbols
+        return [symbol for symbol in self.config.symbols if symbol in batch]
 
-    async def _check_tiered_alerts(self) -> None:
-        """检查分级告警（观察/重要提醒）"""
-        from src.aggregator.percentile import calculate_percentile
+    def _subscribe(self, name: str, *kinds: str) -> DirtySet:
+        return self.dirty.subscribe(name, kinds, self.config.alerts.evaluation.fallback_seconds)
 
-        observe_config = self.config.alerts.observe
-        important_config = self.config.alerts.important
+    async def _check_alerts(self) -> None:
+        """关注价位的兜底检查：成交流长时间没有更新的币种改用 REST 价格"""
+        set_request_priority(Priority.ALERT)
+        interval = self.config.alerts.evaluation.fallback_seconds
+        stale = [
+            short_symbol
+            for short_symbol in self.price_index.symbols()
+            if self.price_index.seconds_since_update(short_symbol) >= interval
+        ]
+        await self.price_fanout.run(stale, self._check_price_fallback)
 
-        if not observe_config.enabled and not important_config.enabled:
+    async def _check_price_fallback(self, short_symbol: str) -> None:
+        symbol = self.symbol_registry.resolve(short_symbol)
+        if symbol is None:
+            return
+        price = await self.indicator_fetcher.fetch_price(symbol)
+        if not price:
             return
+        for crossings in self._group_crossings(self.price_index.on_price(short_symbol, price)):
+            await asyncio.shield(self._on_price_crossing(symbol, crossings))
 
-        # 历史数据窗口（天数）
-        window_days = self.config.percentile.window_days
-        window_hours = window_days * 24
+    async def _evaluate_rules(self) -> None:
+        """告警规则评估：每个币种按共享特征计划计算一次特征，再逐条判断规则"""
+        if not self.rule_engine.rules:
+            return
 
-        # 冷却记录：{(symbol, level): last_sent_time}
-        last_sent: dict[tuple[str, str], float] = {}
+        set_request_priority(Priority.ALERT)
+        dirty = self._subscribe("rules", "trade", "liquidation", "indicators")
 
         while self.running:
-            await asyncio.sleep(60)  # 每分钟检查
-
-            for symbol in self.config.symbols:
-                try:
-                    # 获取当前数据
-                    trades_1h = await self.db.get_trades(symbol, hours=1)
-                    flow = calculate_flow(trades_1h)
-
-                    liqs_1h = await self.db.get_liquidations(symbol, hours=1)
-                    liq_stats = calculate_liquidations(liqs_1h)
-
-                    current_oi = await self.db.get_latest_oi(symbol)
-                    past_oi_1h = await self.db.get_oi_at(symbol, hours_ago=1)
-                    oi_change = calculate_oi_change(current_oi, past_oi_1h)
-
-                    indicators = await self.indicator_fetcher.fetch_indicators(symbol)
-                    if not indicators:
-                        continue
-
-                    # 获取市场指标（大户/散户持仓）
-                    current_mi = await self.db.get_latest_market_indicator(symbol)
-                    if not current_mi:
-                        continue
-
-                    # 获取历史数据用于计算百分位
-                    trades_history = await self.db.get_trades(symbol, hours=window_hours)
-                    liqs_history = await self.db.get_liquidations(symbol, hours=window_hours)
-                    history_mi = await self.db.get_market_indicator_history(
-                        symbol, hours=window_hours
-                    )
+            symbols = await self._next_symbols(dirty)
+            await self.rule_fanout.run(symbols, self._evaluate_symbol)
 
-                    # 按小时聚合历史 flow 数据
-                    flow_history: list[float] = []
-                    hour_buckets: dict[int, list[float]] = {}
-                    for t in trades_history:
-                        hour = t.timestamp // 3600000
-                        if hour not in hour_buckets:
-                            hour_buckets[hour] = []
-                        net = t.value_usd if t.side == "buy" else -t.value_usd
-                        hour_buckets[hour].append(net)
-                    for nets in hour_buckets.values():
-                        flow_history.append(abs(sum(nets)))
-
-                    # 按小时聚合历史爆仓数据
-                    liq_history: list[float] = []
-                    liq_buckets: dict[int, float] = {}
-                    for liq in liqs_history:
-                        hour = liq.timestamp // 3600000
-                        liq_buckets[hour] = liq_buckets.get(hour, 0) + liq.value_usd
-                    liq_history = list(liq_buckets.values())
-
-                    # 计算 OI 变化历史（遍历过去 N 小时）
-                    oi_change_history: list[float] = []
-                    for h in range(1, min(window_hours, 168)):  # 最多 168 小时 (7天)
-                        oi_h = await self.db.get_oi_at(symbol, hours_ago=h)
-                        oi_h_prev = await self.db.get_oi_at(symbol, hours_ago=h + 1)
-                        if oi_h and oi_h_prev and oi_h_prev.open_interest_usd > 0:
-                            change = (
-                                (oi_h.open_interest_usd - oi_h_prev.open_interest_usd)
-                                / oi_h_prev.open_interest_usd
-                                * 100
-                            )
-                            oi_change_history.append(abs(change))
-
-                    # 获取多空比历史
-                    ls_history = await self.db.get_long_short_snapshots(
-                        symbol, "global", hours=window_hours
-                    )
-                    ls_ratio_history = [s["long_short_ratio"] for s in ls_history]
-
-                    # 大户/散户持仓历史
-                    top_pos_history = [mi.top_position_ratio for mi in history_mi]
-                    global_acc_history = [mi.global_account_ratio for mi in history_mi]
-
-                    # 历史数据不足时跳过（需要至少 10 个数据点才能计算有意义的百分位）
-                    min_history = 10
-                    oi_len, ls_len = len(oi_change_history), len(ls_ratio_history)
-                    if oi_len < min_history or ls_len < min_history:
-                        logger.debug(f"Skip tiered alerts {symbol}: OI={oi_len} LS={ls_len}")
-                        continue
-
-                    # 计算各维度百分位
-                    top_pos_pct = calculate_percentile(
-                        current_mi.top_position_ratio, top_pos_history
-                    )
-                    global_acc_pct = calculate_percentile(
-                        current_mi.global_account_ratio, global_acc_history
-                    )
-
-                    percentiles: dict[str, float] = {
-                        "主力资金": calculate_percentile(flow.net, flow_history),
-                        "OI变化": calculate_percentile(oi_change, oi_change_history),
-                        "爆仓": calculate_percentile(liq_stats.total, liq_history),
-                        "资金费率": calculate_percentile(
-                            indicators.funding_rate,
-                            [-0.01, 0, 0.01, 0.02, 0.03, 0.05],  # 业界标准范围
-                        ),
-                        "多空比": calculate_percentile(
-                            indicators.long_short_ratio, ls_ratio_history
-                        ),
-                        "大户持仓": top_pos_pct,
-                        "散户持仓": global_acc_pct,
-                    }
-
-                    # 记录极端事件 (P90+)
-                    short_symbol = symbol.split("/")[0]
-                    current_price = indicators.futures_price
-                    dimension_map = {
-                        "主力资金": ("flow_1h", flow.net),
-                        "OI变化": ("oi_change_1h", oi_change),
-                        "爆仓": ("liq_1h", liq_stats.total),
-                        "资金费率": ("funding_rate", indicators.funding_rate),
-                        "多空比": ("long_short_ratio", indicators.long_short_ratio),
-                        "大户持仓": ("top_position_ratio", current_mi.top_position_ratio),
-                        "散户持仓": ("global_account_ratio", current_mi.global_account_ratio),
-                    }
-                    for dim_name, pct in percentiles.items():
-                        if pct >= 90 and dim_name in dimension_map:
-                            dim_key, value = dimension_map[dim_name]
-                            # 使用配置的窗口记录（实时运行受 retention_days 限制）
-                            # 三窗口（7d/30d/90d）在回测脚本 detector.py 中实现
-                            await self.extreme_tracker.record_event(
-                                symbol=short_symbol,
-                                dimension=dim_key,
-                                window_days=7,
-                                value=value,
-                                percentile=pct,
-                                price=current_price,
-                            )
-
-                    # 检查分级告警
-                    threshold = observe_config.percentile_threshold
-                    min_dims = important_config.min_dimensions
-                    alerts = check_tiered_alerts(percentiles, threshold, min_dims)
-
-                    for alert in alerts:
-                        short_symbol = symbol.split("/")[0]
-                        now = time.time()
-
-                        # 检查冷却
-                        cooldown_key = (symbol, alert.level.value)
-                        cooldown_minutes = (
-                            observe_config.cooldown_minutes
-                            if alert.level == AlertLevel.OBSERVE
-                            else important_config.cooldown_minutes
-                        )
-                        if cooldown_key in last_sent:
-                            elapsed = now - last_sent[cooldown_key]
-                            if elapsed < cooldown_minutes * 60:
-                                logger.debug(
-                                    f"Skip {alert.level.value} alert {symbol}: "
-                                    f"cooldown {int(elapsed)}s/{cooldown_minutes * 60}s"
-                                )
-                                continue
-
-                        timestamp = time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime())
-
-                        # 构建详细数据
-                        data = {
-                            "symbol": short_symbol,
-                            "price": indicators.futures_price if indicators else 0,
-                            "price_change_1h": 0,
-                            "dimensions": alert.dimensions,
-                            "timestamp": timestamp,
-                            # 大户/散户详细数据
-                            "top_position_ratio": current_mi.top_position_ratio,
-                            "top_position_pct": top_pos_pct,
-                            "global_account_ratio": current_mi.global_account_ratio,
-                            "global_account_pct": global_acc_pct,
-                            # 其他指标原始值
-                            "flow_net": flow.net,
-                            "oi_change": oi_change,
-                            "liq_total": liq_stats.total,
-                            "funding_rate": indicators.funding_rate,
-                        }
-
-                        if alert.level == AlertLevel.OBSERVE and observe_config.enabled:
-                            msg = format_observe_alert(data)
-                            await self.notifier.send_message(msg)
-                            last_sent[cooldown_key] = now
-                            logger.info(f"Observe alert: {symbol}")
-                        elif alert.level == AlertLevel.IMPORTANT and important_config.enabled:
-                            msg = format_important_alert(data)
-                            await self.notifier.send_message(msg)
-                            last_sent[cooldown_key] = now
-                            logger.info(f"Important alert: {symbol}")
-
-                except Exception as e:
-                    logger.error(f"Failed to check tiered alerts for {symbol}: {e}")
-
-    async def _check_absolute_alerts(self) -> None:
-        """检查绝对阈值告警 (whale_flow, oi_change, liquidation)"""
-        from src.aggregator.percentile import calculate_percentile
-
-        whale_config = self.config.alerts.whale_flow
-        oi_config = self.config.alerts.oi_change
-        liq_config = self.config.alerts.liquidation
-
-        # 如果全部禁用则退出
-        if not (whale_config.enabled or oi_config.enabled or liq_config.enabled):
-            return
+    async def _evaluate_symbol(self, symbol: str) -> None:
+        engine = self.rule_engine
+        window_hours = self.config.percentile.window_days * 24
+        sources = FeatureSources(
+            self.db,
+            self.indicator_fetcher,
+            window_hours,
+            int(time.time() * 1000),
+            compute=self.compute,
+            book=self._book_metrics,
+        )
+        values = await engine.compute(sources, symbol)
+        short_symbol = base_asset(symbol)
+
+        # 记录极端事件 (P90+)
+        # 使用配置的窗口记录（实时运行受 retention_days 限制）
+        # 三窗口（7d/30d/90d）在回测脚本 detector.py 中实现
+        for dimension, value, pct in engine.extremes(values):
+            await self.extreme_tracker.record_event(
+                symbol=short_symbol,
+                dimension=dimension,
+                window_days=7,
+                value=value,
+                percentile=pct,
+                price=values.get("price") or 0,
+            )
 
-        # 冷却记录：{(symbol, alert_type): last_sent_time}
-        last_sent: dict[tuple[str, str], float] = {}
-        cooldown_seconds = 30 * 60  # 30 分钟冷却
+        for event in engine.evaluate(symbol, values):
+            fmt = RULE_FORMATS[event.rule.format]
+            data = fmt.data(
+                values,
+                symbol=short_symbol,
+                rule=event.rule.name,
+                message=event.message,
+                dimensions=event.dimensions,
+                timestamp=time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime()),
+            )
+            # 规则已进入冷却，超出时间预算也要把告警发出去
+            await asyncio.shield(
+                self._publish(fmt.render(data), short_symbol, event.rule.name, event.value)
+            )
+            logger.info(f"Rule alert: {symbol} {event.rule.name} {event.message}")
 
-        window_hours = self.config.percentile.window_days * 24
+    async def _check_liquidation_cascade(self) -> None:
+        """全市场连环爆仓告警（基于内存滑动窗口，不查询数据库）"""
+        liq_config = self.config.liquidations
+        last_sent = 0.0
+        dirty = self.dirty.subscribe("cascade", ["market_liquidation"], fallback=15)
 
         while self.running:
-            await asyncio.sleep(60)  # 每分钟检查
-
-            for symbol in self.config.symbols:
-                try:
-                    short_symbol = symbol.split("/")[0]
-                    now = time.time()
-
-                    # 获取当前数据
-                    trades_1h = await self.db.get_trades(symbol, hours=1)
-                    flow = calculate_flow(trades_1h)
-
-                    current_oi = await self.db.get_latest_oi(symbol)
-                    past_oi_1h = await self.db.get_oi_at(symbol, hours_ago=1)
-                    oi_change = calculate_oi_change(current_oi, past_oi_1h)
-
-                    liqs_1h = await self.db.get_liquidations(symbol, hours=1)
-                    liq_stats = calculate_liquidations(liqs_1h)
-
-                    indicators = await self.indicator_fetcher.fetch_indicators(symbol)
-                    if not indicators:
-                        continue
-
-                    # 获取历史数据用于百分位计算
-                    trades_history = await self.db.get_trades(symbol, hours=window_hours)
-                    flow_history: list[float] = []
-                    hour_buckets: dict[int, list[float]] = {}
-                    for t in trades_history:
-                        hour = t.timestamp // 3600000
-                        if hour not in hour_buckets:
-                            hour_buckets[hour] = []
-                        net = t.value_usd if t.side == "buy" else -t.value_usd
-                        hour_buckets[hour].append(net)
-                    for nets in hour_buckets.values():
-                        flow_history.append(sum(nets))
-
-                    liqs_history = await self.db.get_liquidations(symbol, hours=window_hours)
-                    liq_buckets: dict[int, float] = {}
-                    for liq in liqs_history:
-                        hour = liq.timestamp // 3600000
-                        liq_buckets[hour] = liq_buckets.get(hour, 0) + liq.value_usd
-                    liq_history = list(liq_buckets.values())
-
-                    oi_change_history: list[float] = []
-                    for h in range(1, min(window_hours, 48)):
-                        oi_h = await self.db.get_oi_at(symbol, hours_ago=h)
-                        oi_h_prev = await self.db.get_oi_at(symbol, hours_ago=h + 1)
-                        if oi_h and oi_h_prev and oi_h_prev.open_interest_usd > 0:
-                            change = (
-                                (oi_h.open_interest_usd - oi_h_prev.open_interest_usd)
-                                / oi_h_prev.open_interest_usd
-                                * 100
-                            )
-                            oi_change_history.append(change)
-
-                    # 计算百分位
-                    flow_pct = calculate_percentile(flow.net, flow_history)
-                    oi_pct = calculate_percentile(oi_change, oi_change_history)
-                    liq_pct = calculate_percentile(liq_stats.total, liq_history)
-
-                    timestamp = time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime())
-
-                    # 1. 大单流向告警
-                    if whale_config.enabled and whale_config.threshold_usd:
-                        if abs(flow.net) >= whale_config.threshold_usd:
-                            cooldown_key = (symbol, "whale_flow")
-                            if cooldown_key not in last_sent or (
-                                now - last_sent[cooldown_key] >= cooldown_seconds
-                            ):
-                                data = {
-                                    "symbol": short_symbol,
-                                    "price": indicators.futures_price,
-                                    "price_change_1h": 0,
-                                    "flow_1h": flow.net,
-                                    "flow_1h_pct": flow_pct,
-                                    "flow_binance": flow.by_exchange.get("binance", 0),
-                                    "timestamp": timestamp,
-                                }
-                                msg = format_whale_alert(data)
-                                await self.notifier.send_message(msg)
-                                last_sent[cooldown_key] = now
-                                logger.info(f"Whale flow alert: {symbol} {flow.net:,.0f}")
-
-                    # 2. OI 变化告警
-                    if oi_config.enabled and oi_config.threshold_pct:
-                        if abs(oi_change) >= oi_config.threshold_pct:
-                            cooldown_key = (symbol, "oi_change")
-                            if cooldown_key not in last_sent or (
-                                now - last_sent[cooldown_key] >= cooldown_seconds
-                            ):
-                                data = {
-                                    "symbol": short_symbol,
-                                    "price": indicators.futures_price,
-                                    "price_change_1h": 0,
-                                    "oi_change_1h": oi_change,
-                                    "oi_change_1h_pct": oi_pct,
-                                    "oi_value": current_oi.open_interest_usd if current_oi else 0,
-                                    "timestamp": timestamp,
-                                }
-                                msg = format_oi_alert(data)
-                                await self.notifier.send_message(msg)
-                                last_sent[cooldown_key] = now
-                                logger.info(f"OI change alert: {symbol} {oi_change:+.2f}%")
-
-                    # 3. 爆仓告警
-                    if liq_config.enabled and liq_config.threshold_usd:
-                        if liq_stats.total >= liq_config.threshold_usd:
-                            cooldown_key = (symbol, "liquidation")
-                            if cooldown_key not in last_sent or (
-                                now - last_sent[cooldown_key] >= cooldown_seconds
-                            ):
-                                liq_long_ratio = (
-                                    liq_stats.long / liq_stats.total if liq_stats.total > 0 else 0.5
-                                )
-                                data = {
-                                    "symbol": short_symbol,
-                                    "price": indicators.futures_price,
-                                    "price_change_1h": 0,
-                                    "liq_1h_total": liq_stats.total,
-                                    "liq_1h_pct": liq_pct,
-                                    "liq_long_ratio": liq_long_ratio,
-                                    "timestamp": timestamp,
-                                }
-                                msg = format_liquidation_alert(data)
-                                await self.notifier.send_message(msg)
-                                last_sent[cooldown_key] = now
-                                logger.info(f"Liquidation alert: {symbol} {liq_stats.total:,.0f}")
-
-                except Exception as e:
-                    logger.error(f"Failed to check absolute alerts for {symbol}: {e}")
+            await dirty.next_batch()
 
-    async def _backfill_events(self) -> None:
-        """定时回填极端事件的后续价格"""
-        while self.running:
-            await asyncio.sleep(3600)  # 每小时运行一次
+            now = time.time()
+            if now - last_sent < liq_config.cooldown_minutes * 60:
+                continue
             try:
-                filled = await self.event_backfiller.run()
-                if filled > 0:
-                    logger.info(f"Backfilled {filled} price fields")
+                cascade = self.liquidation_window.detect_cascade(
+                    liq_config.cascade_usd,
+                    liq_config.cascade_min_symbols,
+                    now_ms=int(now * 1000),
+                )
+                if cascade is None:
+                    continue
+                msg = format_cascade_alert(
+                    {
+                        "long": cascade.total.long,
+                        "short": cascade.total.short,
+                        "symbols": cascade.symbols,
+                        "window_minutes": liq_config.window_minutes,
+                        "top": cascade.top,
+                    }
+                )
+                await self._publish(msg, ANY, "cascade")
+                last_sent = now
+                logger.info(
+                    f"Liquidation cascade alert: {cascade.symbols} symbols "
+                    f"${cascade.total.total:,.0f}"
+                )
             except Exception as e:
-                logger.error(f"Failed to backfill events: {e}")
+                logger.error(f"Failed to check liquidation cascade: {e}")
 
-    async def _cleanup_old_data(self) -> None:
-        """定时清理过期数据"""
-        interval = self.config.intervals.cleanup_hours * 3600
-        retention_days = self.config.database.retention_days
+    async def _bootstrap_history(self) -> None:
+        """启动时补齐历史数据，失败不影响其他任务"""
+        try:
+            await self.history_bootstrapper.run()
+        except Exception as e:
+            logger.error(f"Failed to bootstrap history: {e}")
+        self.events.mark(MARKET, "bootstrap")
 
-        while self.running:
-            await asyncio.sleep(interval)
-            try:
-                deleted = await self.db.cleanup_old_data(retention_days)
-                total = sum(deleted.values())
-                if total > 0:
-                    logger.info(f"Cleaned up {total} old records: {deleted}")
-            except Exception as e:
-                logger.error(f"Failed to cleanup old data: {e}")
+    async def _backfill_events(self) -> None:
+        """回填极端事件的后续价格"""
+        set_request_priority(Priority.BACKFILL)
+        filled = await self.event_backfiller.run()
+        if filled > 0:
+            logger.info(f"Backfilled {filled} price fields")
+
+    async def _refresh_symbols(self) -> None:
+        """合约快照过期时刷新（另一进程已刷新时直接读取其写回的磁盘快照）"""
+        exchange = self.config.exchanges.binance
+        await self.symbol_registry.load(
+            self.binance_client,
+            max_age=exchange.exchange_info_max_age_hours * 3600,
+            cache_path=exchange.exchange_info_cache,
+        )
+
+    async def _cleanup_old_data(self) -> None:
+        """清理过期数据"""
+        deleted = await self.db.cleanup_old_data(self.config.database.retention_days)
+        total = sum(deleted.values())
+        if total > 0:
+            logger.info(f"Cleaned up {total} old records: {deleted}")
+
+    def _schedule_jobs(self) -> None:
+        scheduler = self.scheduler
+        intervals = self.config.intervals
+        # 每小时检查一次，快照过期后最多延迟一小时刷新（新上线合约、下架合约）
+        max_age = self.config.exchanges.binance.exchange_info_max_age_hours * 3600
+        scheduler.add("symbols", min(3600, max_age), self._refresh_symbols)
+        if self.ingest:
+            self.indicator_collector.check_data_budget(self.binance_client.data_limiter.budget)
+            for poller in self.pollers:
+                # 启动时立即采集一轮，之后按周期边界对齐
+                scheduler.add(poller.name, poller.interval, poller.tick, run_at_start=True)
+            scheduler.add("cleanup", intervals.cleanup_hours * 3600, self._cleanup_old_data)
+        if self.analytics:
+            scheduler.add(
+                "price_fallback", self.config.alerts.evaluation.fallback_seconds, self._check_alerts
+            )
+            scheduler.add("report", intervals.report_hours * 3600, self._scheduled_report)
+            scheduler.add("backfill", 3600, self._backfill_events)
 
     async def run(self) -> None:
         await self.init()
@@ -1025,50 +1092,70 @@ class CryptoMonitor:
             await collector.start()
 
         # Start Telegram bot
-        await self.notifier.start_polling()
-
-        # Start background tasks
-        tasks = [
-            asyncio.create_task(self._scheduled_report()),
-            asyncio.create_task(self._fetch_indicators()),
-            asyncio.create_task(self._fetch_long_short_ratio()),
-            asyncio.create_task(self._check_alerts()),
-            asyncio.create_task(self._check_insight_alerts()),
-            asyncio.create_task(self._check_tiered_alerts()),
-            asyncio.create_task(self._check_absolute_alerts()),
-            asyncio.create_task(self._backfill_events()),
-            asyncio.create_task(self._cleanup_old_data()),
-        ]
-
-        logger.info("Crypto Monitor started")
+        if self.analytics:
+            await self.notifier.start_polling()
+
+        # Start periodic jobs and event-driven tasks
+        self._schedule_jobs()
+        self.scheduler.start()
+        tasks = [asyncio.create_task(self.loop_lag.run())]
+        if self.ring_consumer:
+            tasks.append(asyncio.create_task(self.ring_consumer.run()))
+        if self.analytics:
+            tasks.append(asyncio.create_task(self._evaluate_rules()))
+        if self.ingest and self.config.bootstrap.enabled:
+            tasks.append(asyncio.create_task(self._bootstrap_history()))
+        liquidations = self.config.liquidations
+        if self.analytics and liquidations.market_wide and liquidations.cascade_enabled:
+            tasks.append(asyncio.create_task(self._check_liquidation_cascade()))
+
+        logger.info(f"Crypto Monitor started ({self.role})")
 
         # Wait for shutdown signal
-        stop_event = asyncio.Event()
         loop = asyncio.get_event_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, stop_event.set)
+            loop.add_signal_handler(sig, self._stop_event.set)
 
-        await stop_event.wait()
+        await self._stop_event.wait()
 
         # Cleanup
         self.running = False
         for task in tasks:
             task.cancel()
+        await self.scheduler.stop()
+        for poller in self.pollers:
+            poller.cancel()
         for collector in self.collectors:
             await collector.stop()
-        await self.notifier.stop_polling()
+        # 等待价位穿越的写回和推送完成
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.candle_builder.flush()
+        if self.analytics:
+            await self.outbox.stop()
+            await self.notifier.stop_polling()
+        self.compute.close()
         await self.indicator_fetcher.close()
         await self.binance_client.close()
+        await self.http_pool.close()
+        if self.journal:
+            self.journal.close()
         await self.db.close()
 
-        logger.info("Crypto Monitor stopped")
+        logger.info(f"Crypto Monitor stopped ({self.role})")
+
+    def stop(self) -> None:
+        """请求停止（run() 随后完成清理并返回）"""
+        self._stop_event.set()
 
 
-async def main() -> None:
-    config = load_config(Path("config.yaml"))
-    monitor = CryptoMonitor(config)
-    await monitor.run()
+def main() -> None:
+    config_path = Path("config.yaml")
+    config = load_config(config_path)
+    if config.processes.enabled:
+        Supervisor(config_path, config.processes).run()
+    else:
+        asyncio.run(CryptoMonitor(config).run())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -1,4 +1,6 @@
 # src/notifier/formatter.py
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
@@ -155,6 +157,26 @@ def format_liquidation_alert(data: dict[str, Any]) -> str:
 ⏰ {now}"""
 
 
+def format_cascade_alert(data: dict[str, Any]) -> str:
+    """格式化全市场连环爆仓告警"""
+    now = datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC")
+    total = data["long"] + data["short"]
+    long_pct = int(data["long"] / total * 100) if total > 0 else 50
+    side = "多头" if long_pct >= 50 else "空头"
+    top = "\n".join(
+        f"  {symbol.split('/')[0]}: {_format_usd(value)}" for symbol, value in data["top"]
+    )
+
+    return f"""🌊 全市场连环爆仓
+
+{data["window_minutes"]}m 内 {data["symbols"]} 个币种爆仓 {_format_usd(total)}
+  多 {long_pct}% / 空 {100 - long_pct}% → {side}被集中清算
+
+爆仓最多:
+{top}
+⏰ {now}"""
+
+
 def _ratio_to_pct(ratio: float) -> int:
     """将比率转换为多头百分比: 2.0 -> 67%"""
     if ratio <= 0:
@@ -713,3 +735,75 @@ def format_insight_report_with_history(
   合约溢价: {data["spot_perp_spread"]:+.2f}%
 {history_section}
 ⏰ {now}"""
+
+
+def format_insight_alert(data: dict[str, Any]) -> str:
+    """格式化市场异动提醒"""
+    return f"⚡ {data['symbol']} 市场异动\n\n{data['message']}"
+
+
+def format_rule_alert(data: dict[str, Any]) -> str:
+    """格式化自定义规则告警"""
+    return f"""🔔 {data["symbol"]} {data["rule"]}
+
+{data["message"]}
+
+💵 ${data["price"]:,.0f} ({data["price_change_1h"]:+.1f}% 1h)
+⏰ {data["timestamp"]}"""
+
+
+@dataclass
+class RuleFormat:
+    """
+    规则告警的消息格式
+
+    features 为消息需要的特征（与规则特征一起编译进特征计划），
+    aliases 为消息字段名 -> 特征名（沿用原有格式函数的字段名）。
+    """
+
+    render: Callable[[dict[str, Any]], str]
+    features: tuple[str, ...] = ()
+    aliases: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def required(self) -> list[str]:
+        return [*self.features, *self.aliases.values()]
+
+    def data(self, values: dict[str, Any], **extra: Any) -> dict[str, Any]:
+        data = {name: values[name] for name in self.features}
+        data.update({alias: values[name] for alias, name in self.aliases.items()})
+        data.update(extra)
+        return data
+
+
+_PRICE = ("price", "price_change_1h")
+_TIERED = RuleFormat(
+    format_observe_alert,
+    (
+        *_PRICE,
+        "top_position_ratio",
+        "top_position_pct",
+        "global_account_ratio",
+        "global_account_pct",
+        "funding_rate",
+    ),
+    {"flow_net": "flow_1h", "oi_change": "oi_change_1h", "liq_total": "liq_1h"},
+)
+
+RULE_FORMATS: dict[str, RuleFormat] = {
+    "whale_flow": RuleFormat(
+        format_whale_alert, (*_PRICE, "flow_1h", "flow_1h_pct", "flow_binance")
+    ),
+    "oi_change": RuleFormat(
+        format_oi_alert, (*_PRICE, "oi_change_1h", "oi_change_1h_pct", "oi_value")
+    ),
+    "liquidation": RuleFormat(
+        format_liquidation_alert,
+        (*_PRICE, "liq_1h_pct", "liq_long_ratio"),
+        {"liq_1h_total": "liq_1h"},
+    ),
+    "observe": _TIERED,
+    "important": RuleFormat(format_important_alert, _TIERED.features, _TIERED.aliases),
+    "insight": RuleFormat(format_insight_alert),
+    "rule": RuleFormat(format_rule_alert, _PRICE),
+}
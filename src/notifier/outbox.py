@@ -0,0 +1,245 @@
+# src/notifier/outbox.py
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import timedelta
+
+from telegram.error import BadRequest, ChatMigrated, Forbidden, InvalidToken, RetryAfter
+
+from src.storage.database import Database
+from src.storage.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# Telegram 单条消息长度上限
+MAX_MESSAGE_LENGTH = 4096
+# 合并发送时消息之间的分隔线
+SEPARATOR = "\n\n━━━━━━━━━━━━━━━━━━━━\n\n"
+# 重试也无法成功的错误（消息格式错误、被移出群组、token 无效等）
+PERMANENT_ERRORS = (BadRequest, Forbidden, InvalidToken, ChatMigrated)
+
+
+class Outbox:
+    """
+    告警发送队列
+
+    告警任务调用 put 入队后立即返回（只写一次本地数据库），由后台任务按限速发送：
+    全局最多 global_per_second 条/秒，同一会话两次发送至少间隔 per_chat_interval 秒；
+    同一会话首条消息入队后等待 coalesce_seconds，期间到达的消息合并为一条发送。
+    workers 个发送任务并发投递不同会话（同一会话同一时间只有一个任务在发送），
+    一条告警发给多个会话时 publish 只写一次数据库。
+    发送失败按指数退避重试，Telegram 返回 429 时按 retry_after 暂停该会话。
+    未送达的消息持久化在 outbox 表中，重启后继续发送（超过 max_age_seconds 的丢弃）。
+
+    enabled=False 时 put 直接同步发送（原有行为）。
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str], Awaitable[None]],
+        store: Database | None,
+        default_chat_id: str,
+        enabled: bool = True,
+        global_per_second: float = 25,
+        per_chat_interval: float = 1.0,
+        coalesce_seconds: float = 1.0,
+        max_attempts: int = 8,
+        retry_base_delay: float = 2.0,
+        retry_max_delay: float = 300.0,
+        max_age_seconds: float = 3600,
+        workers: int = 4,
+    ):
+        self._send = send
+        self.store = store
+        self.default_chat_id = default_chat_id
+        self.enabled = enabled
+        self.global_interval = 1 / global_per_second
+        self.per_chat_interval = per_chat_interval
+        self.coalesce_seconds = coalesce_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_age_seconds = max_age_seconds
+        self.workers = max(1, workers)
+
+        # 会话 -> [(消息, 入队时间)]，入队时间为 monotonic，重启恢复的消息为 0（立即发送）
+        self._queues: dict[str, deque[tuple[OutboxMessage, float]]] = {}
+        self._chat_next: dict[str, float] = {}  # 会话下一次允许发送的时间（限速 / 退避）
+        self._global_next = 0.0
+        self._in_flight: set[str] = set()  # 正在发送的会话
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self.sent = 0  # 实际发送的消息条数（合并后）
+        self.coalesced = 0  # 被合并进其他消息的条数
+        self.retries = 0
+        self.throttled = 0  # 收到 429 的次数
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def start(self) -> None:
+        """恢复未送达的消息并启动发送任务"""
+        if not self.enabled:
+            return
+        if self.store is not None:
+            expired = []
+            cutoff = int((time.time() - self.max_age_seconds) * 1000)
+            for message in await self.store.get_outbox_messages():
+                if message.created_at < cutoff:
+                    expired.append(message.id or 0)
+                else:
+                    self._queues.setdefault(message.chat_id, deque()).append((message, 0.0))
+            if expired:
+                await self.store.delete_outbox_messages(expired)
+                logger.warning(f"Dropped {len(expired)} expired outbox messages")
+            if self.pending:
+                logger.info(f"Restored {self.pending} undelivered outbox messages")
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """等待队列发送完毕（最多 drain_timeout 秒），剩余消息留在数据库中"""
+        if not self._tasks:
+            return
+        deadline = time.monotonic() + drain_timeout
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def put(self, text: str, chat_id: str | None = None) -> None:
+        await self.publish(text, [chat_id or self.default_chat_id])
+
+    async def publish(self, text: str, chat_ids: Iterable[str]) -> None:
+        """同一条消息发给多个会话"""
+        chats = list(chat_ids)
+        if not self.enabled:
+            for chat in chats:
+                await self._send(text, chat)
+            return
+        created_at = int(time.time() * 1000)
+        messages = [OutboxMessage(None, chat, text, created_at) for chat in chats]
+        if self.store is not None:
+            try:
+                await self.store.insert_outbox_messages(messages)
+            except Exception as e:
+                logger.error(f"Failed to persist outbox messages: {e}")
+        now = time.monotonic()
+        for message in messages:
+            self._queues.setdefault(message.chat_id, deque()).append((message, now))
+        self._wakeup.set()
+
+    def _next_chat(self) -> tuple[str | None, float]:
+        """最早可以发送的会话及其可发送时间"""
+        best: tuple[str | None, float] = (None, float("inf"))
+        for chat, queue in self._queues.items():
+            if not queue or chat in self._in_flight:
+                continue
+            ready = max(self._chat_next.get(chat, 0.0), queue[0][1] + self.coalesce_seconds)
+            if ready < best[1]:
+                best = (chat, ready)
+        return best
+
+    async def _run(self) -> None:
+        while True:
+            chat, ready = self._next_chat()
+            if chat is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delay = max(ready, self._global_next) - time.monotonic()
+            if delay > 0:
+                # 等待期间入队的消息可能属于更早可发送的会话
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
+                continue
+            self._in_flight.add(chat)
+            try:
+                await self._send_batch(chat)
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}")
+            finally:
+                self._in_flight.discard(chat)
+                self._wakeup.set()
+
+    async def _send_batch(self, chat: str) -> None:
+        queue = self._queues[chat]
+        batch = [queue[0][0]]
+        length = len(batch[0].text)
+        for message, _ in list(queue)[1:]:
+            length += len(SEPARATOR) + len(message.text)
+            if length > MAX_MESSAGE_LENGTH:
+                break
+            batch.append(message)
+
+        self._global_next = time.monotonic() + self.global_interval
+        try:
+            await self._send(SEPARATOR.join(m.text for m in batch), chat)
+        except Exception as e:
+            await self._on_failure(chat, batch, e)
+            return
+
+        self._remove(chat, len(batch))
+        self.sent += 1
+        self.coalesced += len(batch) - 1
+        self._chat_next[chat] = time.monotonic() + self.per_chat_interval
+        await self._delete(batch)
+
+    async def _on_failure(self, chat: str, batch: list[OutboxMessage], error: Exception) -> None:
+        now = time.monotonic()
+        if isinstance(error, RetryAfter):
+            retry_after = error.retry_after
+            seconds = (
+                retry_after.total_seconds()
+                if isinstance(retry_after, timedelta)
+                else float(retry_after)
+            )
+            self._chat_next[chat] = now + seconds
+            self.throttled += 1
+            logger.warning(f"Telegram rate limited chat {chat}, retry in {seconds:.0f}s")
+            return
+
+        attempts = max(m.attempts for m in batch) + 1
+        for message in batch:
+            message.attempts = attempts
+        if isinstance(error, PERMANENT_ERRORS) or attempts >= self.max_attempts:
+            self._remove(chat, len(batch))
+            self.dropped += len(batch)
+            logger.error(
+                f"Dropped {len(batch)} outbox messages for chat {chat} "
+                f"after {attempts} attempts: {error}"
+            )
+            await self._delete(batch)
+            return
+
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+        self._chat_next[chat] = now + delay
+        self.retries += 1
+        logger.warning(
+            f"Failed to send to chat {chat} (attempt {attempts}): {error}, retry in {delay:.0f}s"
+        )
+        if self.store is not None:
+            ids = [m.id for m in batch if m.id is not None]
+            await self.store.update_outbox_attempts(ids, attempts)
+
+    def _remove(self, chat: str, count: int) -> None:
+        # 发送期间新入队的消息在队尾，队首 count 条即本批次
+        queue = self._queues[chat]
+        for _ in range(count):
+            queue.popleft()
+
+    async def _delete(self, batch: list[OutboxMessage]) -> None:
+        if self.store is None:
+            return
+        ids = [m.id for m in batch if m.id is not None]
+        if ids:
+            await self.store.delete_outbox_messages(ids)
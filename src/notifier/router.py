@@ -0,0 +1,94 @@
+# src/notifier/router.py
+from bisect import bisect_right, insort
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from src.storage.models import Subscription
+
+# 订阅中表示“全部”的通配符
+ANY = "*"
+
+
+@dataclass
+class _Targets:
+    """同一 (币种, 告警类型) 的订阅会话"""
+
+    always: set[str] = field(default_factory=set)  # 无门槛
+    thresholds: list[tuple[float, str]] = field(default_factory=list)  # (门槛, 会话)，升序
+
+    def __bool__(self) -> bool:
+        return bool(self.always or self.thresholds)
+
+    def match(self, value: float | None, into: set[str]) -> None:
+        into |= self.always
+        if value is None:
+            # 告警没有可比较的数值时门槛不生效
+            into.update(chat for _, chat in self.thresholds)
+            return
+        end = bisect_right(self.thresholds, abs(value), key=lambda t: t[0])
+        into.update(chat for _, chat in self.thresholds[:end])
+
+
+class AlertRouter:
+    """
+    告警 -> 会话的订阅路由
+
+    按 (币种, 告警类型) 建索引，币种和类型都可以是通配符 "*"；路由一条告警只查询
+    (币种, 类型) / (币种, *) / (*, 类型) / (*, *) 四个键，带门槛的订阅按门槛有序存放并二分查找，
+    成本为 O(log n + k)，与订阅会话总数无关。同一会话命中多条订阅时只投递一次。
+    币种使用简称（BTC）。
+    """
+
+    def __init__(self, default_chats: Iterable[str] = ()):
+        # 默认会话接收全部告警，不持久化
+        self.default_chats = set(default_chats)
+        self._index: dict[tuple[str, str], _Targets] = {}
+        self._subs: dict[str, dict[tuple[str, str], Subscription]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(subs) for subs in self._subs.values())
+
+    def load(self, subscriptions: Iterable[Subscription]) -> None:
+        self._index.clear()
+        self._subs.clear()
+        for sub in subscriptions:
+            self.add(sub)
+
+    def add(self, sub: Subscription) -> None:
+        """新增订阅，同一会话同一 (币种, 类型) 的已有订阅被替换"""
+        self.remove(sub.chat_id, sub.symbol, sub.alert_type)
+        key = (sub.symbol, sub.alert_type)
+        targets = self._index.setdefault(key, _Targets())
+        if sub.threshold is None:
+            targets.always.add(sub.chat_id)
+        else:
+            insort(targets.thresholds, (abs(sub.threshold), sub.chat_id))
+        self._subs.setdefault(sub.chat_id, {})[key] = sub
+
+    def remove(self, chat_id: str, symbol: str, alert_type: str) -> bool:
+        key = (symbol, alert_type)
+        sub = self._subs.get(chat_id, {}).pop(key, None)
+        if sub is None:
+            return False
+        targets = self._index[key]
+        if sub.threshold is None:
+            targets.always.discard(chat_id)
+        else:
+            targets.thresholds.remove((abs(sub.threshold), chat_id))
+        if not targets:
+            del self._index[key]
+        if not self._subs[chat_id]:
+            del self._subs[chat_id]
+        return True
+
+    def subscriptions(self, chat_id: str) -> list[Subscription]:
+        return sorted(self._subs.get(chat_id, {}).values(), key=lambda s: (s.symbol, s.alert_type))
+
+    def route(self, symbol: str, alert_type: str, value: float | None = None) -> set[str]:
+        """订阅了该告警的会话（含默认会话）"""
+        chats = set(self.default_chats)
+        for key in ((symbol, alert_type), (symbol, ANY), (ANY, alert_type), (ANY, ANY)):
+            targets = self._index.get(key)
+            if targets is not None:
+                targets.match(value, chats)
+        return chats
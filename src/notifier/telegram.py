@@ -1,14 +1,24 @@
 # src/notifier/telegram.py
+import asyncio
+import concurrent.futures
 import logging
 import re
 from collections.abc import Callable, Coroutine
-from typing import Any
+from typing import Any, TypeVar
 
 from telegram import Bot, BotCommand, Update
 from telegram.ext import Application, CommandHandler, ContextTypes
 
+from src.utils.loop_thread import LoopThread
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+# 命令回调、参数、交回 Bot 线程的结果
+_Command = tuple[
+    Callable[..., Coroutine[Any, Any, Any]], tuple[Any, ...], "concurrent.futures.Future[Any]"
+]
+
 WELCOME_MESSAGE = """
 🔔 <b>Crypto Monitor</b> - BTC/ETH 永续合约监控
 
@@ -32,11 +42,17 @@ HELP_MESSAGE = """
 <b>🔔 价位提醒</b>
 /watch BTC 100000 - 添加价位监控
 /unwatch BTC 100000 - 取消价位监控
-/list - 查看所有监控价位
+/list - 查看本会话的监控价位
+
+<b>📮 告警订阅</b>
+/subscribe BTC [类型] [门槛] - 订阅告警（币种或类型为 * 表示全部）
+/unsubscribe BTC [类型] - 取消订阅
+/subscriptions - 查看本会话的订阅
 
 <b>💡 示例</b>
 • /report BTC - BTC 市场报告
 • /watch ETH 2500 - ETH 跌破/突破 2500 时提醒
+• /subscribe BTC whale_flow 50000000 - BTC 1h 大单超过 $50M 时提醒
 """
 
 BOT_COMMANDS = [
@@ -47,30 +63,85 @@ BOT_COMMANDS = [
     BotCommand("watch", "添加价位监控"),
     BotCommand("unwatch", "取消价位监控"),
     BotCommand("list", "查看监控列表"),
+    BotCommand("subscribe", "订阅告警"),
+    BotCommand("unsubscribe", "取消订阅"),
+    BotCommand("subscriptions", "查看订阅"),
 ]
 
 
 class TelegramNotifier:
-    def __init__(self, bot_token: str, chat_id: str):
+    """
+    threaded=True 时 Bot 的轮询、命令处理和消息发送都在独立线程的事件循环中进行：
+    发送消息提交到 Bot 线程执行；命令回调（读写数据库、生成报告）经线程安全的入队
+    进入主事件循环的命令队列，由单个任务依次执行后把结果交回 Bot 线程回复。
+    Telegram 请求慢或卡住、命令突发都不会占用主事件循环。
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: str,
+        base_url: str = "https://api.telegram.org/bot",
+        threaded: bool = False,
+    ):
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.bot = Bot(token=bot_token)
+        self.base_url = base_url
+        self.bot = Bot(token=bot_token, base_url=base_url)
         self.app: Application | None = None  # type: ignore[type-arg]
-
-        # Callbacks
-        self.on_watch: Callable[[str, float], Coroutine[Any, Any, None]] | None = None
-        self.on_unwatch: Callable[[str, float], Coroutine[Any, Any, None]] | None = None
-        self.on_list: Callable[[], Coroutine[Any, Any, str]] | None = None
+        self.thread = LoopThread("telegram-bot") if threaded else None
+        self._main_loop: asyncio.AbstractEventLoop | None = None
+        self._commands: asyncio.Queue[_Command] = asyncio.Queue()
+        self._command_task: asyncio.Task[None] | None = None
+        self.commands = 0  # 主事件循环执行的命令回调数
+
+        # Callbacks（首个参数为发起命令的会话）
+        self.on_watch: Callable[[str, str, float], Coroutine[Any, Any, None]] | None = None
+        self.on_unwatch: Callable[[str, str, float], Coroutine[Any, Any, None]] | None = None
+        self.on_list: Callable[[str], Coroutine[Any, Any, str]] | None = None
+        self.on_subscribe: (
+            Callable[[str, str, str, float | None], Coroutine[Any, Any, str]] | None
+        ) = None
+        self.on_unsubscribe: Callable[[str, str, str], Coroutine[Any, Any, str]] | None = None
+        self.on_subscriptions: Callable[[str], Coroutine[Any, Any, str]] | None = None
         self.on_report: Callable[[str], Coroutine[Any, Any, str]] | None = None
         self.on_status: Callable[[], Coroutine[Any, Any, str]] | None = None
 
-    async def send_message(self, text: str) -> None:
+    async def send_message(self, text: str, chat_id: str | None = None) -> None:
+        if self.thread is None:
+            await self._send(text, chat_id)
+            return
+        # 启动前（如发送队列恢复积压消息）也经 Bot 线程发送，Bot 的连接只在该线程使用
+        self.thread.start()
+        await self.thread.run(self._send(text, chat_id))
+
+    async def _send(self, text: str, chat_id: str | None) -> None:
         await self.bot.send_message(
-            chat_id=self.chat_id,
+            chat_id=chat_id or self.chat_id,
             text=text,
             parse_mode="HTML",
         )
 
+    async def _call(self, callback: Callable[..., Coroutine[Any, Any, T]], *args: Any) -> T:
+        """执行命令回调：线程模式下交给主事件循环的命令队列并等待结果"""
+        if self._main_loop is None:
+            self.commands += 1
+            return await callback(*args)
+        future: concurrent.futures.Future[T] = concurrent.futures.Future()
+        self._main_loop.call_soon_threadsafe(self._commands.put_nowait, (callback, args, future))
+        return await asyncio.wrap_future(future)
+
+    async def _serve_commands(self) -> None:
+        while True:
+            callback, args, future = await self._commands.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(await callback(*args))
+            except Exception as e:
+                future.set_exception(e)
+            self.commands += 1
+
     @staticmethod
     def _parse_watch_command(text: str) -> tuple[str, float] | None:
         match = re.match(r"/(?:un)?watch\s+(\w+)\s+([\d.]+)", text)
@@ -78,6 +149,21 @@ class TelegramNotifier:
             return match.group(1).upper(), float(match.group(2))
         return None
 
+    @staticmethod
+    def _parse_subscribe_command(text: str) -> tuple[str, str, float | None] | None:
+        """/subscribe SYMBOL [TYPE] [THRESHOLD] -> (币种, 类型, 门槛)"""
+        match = re.match(
+            r"/(?:un)?subscribe(?:@\w+)?\s+(\w+|\*)(?:\s+(\w+|\*))?(?:\s+([\d.]+))?\s*$", text
+        )
+        if not match:
+            return None
+        threshold = float(match.group(3)) if match.group(3) else None
+        return match.group(1).upper(), match.group(2) or "*", threshold
+
+    @staticmethod
+    def _chat_id(update: Update) -> str:
+        return str(update.effective_chat.id) if update.effective_chat else ""
+
     async def _handle_watch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not update.message or not update.message.text:
             return
@@ -89,7 +175,7 @@ class TelegramNotifier:
 
         symbol, price = result
         if self.on_watch:
-            await self.on_watch(symbol, price)
+            await self._call(self.on_watch, self._chat_id(update), symbol, price)
         await update.message.reply_text(f"✅ 已添加 {symbol} {int(price)} 监控")
 
     async def _handle_unwatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -103,7 +189,7 @@ class TelegramNotifier:
 
         symbol, price = result
         if self.on_unwatch:
-            await self.on_unwatch(symbol, price)
+            await self._call(self.on_unwatch, self._chat_id(update), symbol, price)
         await update.message.reply_text(f"✅ 已取消 {symbol} {int(price)} 监控")
 
     async def _handle_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -111,11 +197,54 @@ class TelegramNotifier:
             return
 
         if self.on_list:
-            text = await self.on_list()
+            text = await self._call(self.on_list, self._chat_id(update))
             await update.message.reply_text(text)
         else:
             await update.message.reply_text("暂无监控价位")
 
+    async def _handle_subscribe(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        if not update.message or not update.message.text:
+            return
+
+        result = self._parse_subscribe_command(update.message.text)
+        if not result:
+            await update.message.reply_text("用法: /subscribe BTC [类型] [门槛]")
+            return
+
+        if self.on_subscribe:
+            symbol, alert_type, threshold = result
+            text = await self._call(
+                self.on_subscribe, self._chat_id(update), symbol, alert_type, threshold
+            )
+            await update.message.reply_text(text)
+
+    async def _handle_unsubscribe(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        if not update.message or not update.message.text:
+            return
+
+        result = self._parse_subscribe_command(update.message.text)
+        if not result:
+            await update.message.reply_text("用法: /unsubscribe BTC [类型]")
+            return
+
+        if self.on_unsubscribe:
+            symbol, alert_type, _ = result
+            text = await self._call(self.on_unsubscribe, self._chat_id(update), symbol, alert_type)
+            await update.message.reply_text(text)
+
+    async def _handle_subscriptions(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        if not update.message:
+            return
+
+        if self.on_subscriptions:
+            await update.message.reply_text(
+                await self._call(self.on_subscriptions, self._chat_id(update))
+            )
+        else:
+            await update.message.reply_text("暂无订阅")
+
     async def _handle_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not update.message or not update.message.text:
             return
@@ -124,7 +253,7 @@ class TelegramNotifier:
         symbol = parts[1].upper() if len(parts) > 1 else "BTC"
 
         if self.on_report:
-            text = await self.on_report(symbol)
+            text = await self._call(self.on_report, symbol)
             await update.message.reply_text(text)
         else:
             await update.message.reply_text("报告生成中...")
@@ -134,7 +263,7 @@ class TelegramNotifier:
             return
 
         if self.on_status:
-            text = await self.on_status()
+            text = await self._call(self.on_status)
             await update.message.reply_text(text)
         else:
             await update.message.reply_text("系统运行中")
@@ -155,11 +284,34 @@ class TelegramNotifier:
         app.add_handler(CommandHandler("watch", self._handle_watch))
         app.add_handler(CommandHandler("unwatch", self._handle_unwatch))
         app.add_handler(CommandHandler("list", self._handle_list))
+        app.add_handler(CommandHandler("subscribe", self._handle_subscribe))
+        app.add_handler(CommandHandler("unsubscribe", self._handle_unsubscribe))
+        app.add_handler(CommandHandler("subscriptions", self._handle_subscriptions))
         app.add_handler(CommandHandler("report", self._handle_report))
         app.add_handler(CommandHandler("status", self._handle_status))
 
     async def start_polling(self) -> None:
-        self.app = Application.builder().token(self.bot_token).build()
+        if self.thread is None:
+            await self._start_app()
+            return
+        self._main_loop = asyncio.get_running_loop()
+        self._command_task = asyncio.create_task(self._serve_commands())
+        self.thread.start()
+        await self.thread.run(self._start_app())
+
+    async def stop_polling(self) -> None:
+        if self.thread is None:
+            await self._stop_app()
+            return
+        if self.thread.running:
+            await self.thread.run(self._stop_app())
+            await asyncio.to_thread(self.thread.stop)
+        if self._command_task:
+            self._command_task.cancel()
+        self._main_loop = None
+
+    async def _start_app(self) -> None:
+        self.app = Application.builder().token(self.bot_token).base_url(self.base_url).build()
         self.setup_handlers(self.app)
         await self.app.initialize()
         await self.app.start()
@@ -170,7 +322,7 @@ class TelegramNotifier:
         if self.app.updater:
             await self.app.updater.start_polling()
 
-    async def stop_polling(self) -> None:
+    async def _stop_app(self) -> None:
         if self.app:
             if self.app.updater:
                 await self.app.updater.stop()
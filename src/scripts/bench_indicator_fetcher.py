@@ -0,0 +1,107 @@
+"""逐币种指标采集基准测试
+
+对本地延迟注入替身服务，按实际运行时的路径（IndicatorCollector + StaggeredPoller）
+分别以串行 (concurrency=1) 和并发方式跑一轮 OI 和多空比采集：请求在 --interval 秒内
+错开启动，统计整轮耗时、完成 / 跳过 / 失败次数和各接口耗时。
+整轮耗时明显超过 interval，或出现跳过，说明该并发度下单个币种的请求跟不上错开节奏。
+
+用法:
+    python -m src.scripts.bench_indicator_fetcher --symbols 50 --latency-ms 100
+    python -m src.scripts.bench_indicator_fetcher --symbols 200 --interval 10 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.client.binance import BinanceClient
+from src.collector.indicator_collector import IndicatorCollector
+from src.collector.indicator_fetcher import IndicatorFetcher
+from src.scripts.mock_binance import MockBinanceServer
+from src.storage.database import Database
+
+
+@dataclass
+class CycleResult:
+    elapsed: float
+    completed: int
+    skipped: int
+    errors: int
+    timings: str
+
+
+async def run_cycle(
+    base_url: str, symbols: list[str], concurrency: int, interval: float, db_path: Path
+) -> CycleResult:
+    """两个轮询器各触发一轮，等待全部币种采集并落库后返回"""
+    client = BinanceClient(base_url=base_url)
+    fetcher = IndicatorFetcher(symbols, max_concurrency=concurrency, client=client)
+    db = Database(str(db_path))
+    await db.init()
+    await fetcher.init()
+    collector = IndicatorCollector(fetcher, db, symbols, interval, interval)
+    try:
+        start = time.perf_counter()
+        for poller in collector.pollers:
+            await poller.tick()
+        for poller in collector.pollers:
+            await poller.wait()
+        return CycleResult(
+            elapsed=time.perf_counter() - start,
+            completed=sum(p.completed for p in collector.pollers),
+            skipped=sum(p.skipped for p in collector.pollers),
+            errors=sum(p.errors for p in collector.pollers),
+            timings=fetcher.format_timings(),
+        )
+    finally:
+        await client.close()
+        await db.close()
+
+
+async def _bench(args: argparse.Namespace) -> None:
+    server = MockBinanceServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    base_url = await server.start()
+    symbols = [f"S{i}/USDT:USDT" for i in range(args.symbols)]
+    try:
+        print(
+            f"{args.symbols} symbols over {args.interval:g}s, "
+            f"{args.latency_ms:.0f}ms latency (+{args.jitter_ms:.0f}ms)"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for concurrency in (1, args.concurrency):
+                server.requests.clear()
+                result = await run_cycle(
+                    base_url,
+                    symbols,
+                    concurrency,
+                    args.interval,
+                    Path(tmp) / f"bench-{concurrency}.db",
+                )
+                total = sum(server.requests.values())
+                print(
+                    f"concurrency={concurrency:>3}: {result.elapsed:7.2f}s, {total} requests, "
+                    f"{result.completed} completed, {result.skipped} skipped, "
+                    f"{result.errors} errors"
+                )
+                print(f"  {result.timings}")
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="逐币种指标采集基准测试")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=5.0, help="一轮错开启动的时长（秒）")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(_bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
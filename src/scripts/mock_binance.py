@@ -0,0 +1,648 @@
+"""本地 Binance Futures 替身服务（REST + WebSocket，可注入延迟和断线）
+
+同时提供最小化的 Telegram Bot API（只记录发出的消息），
+用于在本地对完整的 CryptoMonitor 做压测和长时间稳定性测试。
+
+用法:
+    python -m src.scripts.mock_binance --port 8080 --latency-ms 100
+    python -m src.scripts.mock_binance --trade-rate 200 --disconnect-after 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+BASE_PRICE = 100_000.0
+# 行情推送任务的调度间隔（秒）
+MARKET_TICK_SECONDS = 0.01
+# exchangeInfo 返回的永续合约，也是全市场爆仓流覆盖的币种
+MARKET_SYMBOLS = [
+    f"{base}USDT"
+    for base in (
+        "BTC ETH SOL BNB XRP DOGE ADA AVAX LINK DOT TRX LTC BCH NEAR APT ARB OP SUI 1000PEPE WIF"
+    ).split()
+]
+# 模拟订单簿：每侧价位数和价位间距
+BOOK_LEVELS = 500
+BOOK_TICK = 0.5
+PERIOD_MS = {"5m": 300_000, "15m": 900_000, "30m": 1_800_000, "1h": 3_600_000, "4h": 14_400_000}
+# /futures/data/* 统计接口限额：每 IP 1000 次 / 5 分钟，超出返回 429
+DATA_LIMIT = 1000
+DATA_WINDOW_SECONDS = 300.0
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _ratio_row(symbol: str, timestamp: int) -> dict[str, Any]:
+    long_ratio = 0.5 + random.uniform(-0.1, 0.1)
+    return {
+        "symbol": symbol,
+        "longAccount": f"{long_ratio:.4f}",
+        "shortAccount": f"{1 - long_ratio:.4f}",
+        "longShortRatio": f"{long_ratio / (1 - long_ratio):.4f}",
+        "timestamp": timestamp,
+    }
+
+
+@dataclass
+class StreamSettings:
+    """WebSocket 推送参数"""
+
+    trade_rate: float = 20.0  # 每个币种每秒 aggTrade 条数
+    liquidation_rate: float = 0.5  # 每个币种每秒 forceOrder 条数
+    mark_price_interval: float = 1.0  # markPrice@1s 推送间隔（秒）
+    depth_interval: float = 0.1  # depth@100ms 推送间隔（秒）
+    depth_changes: int = 20  # 每条 depthUpdate 改动的价位数
+    latency_ms: float = 0.0  # 消息生成到发出的固定延迟
+    jitter_ms: float = 0.0  # 额外随机延迟上限
+    disconnect_after: float = 0.0  # 连接存活多少秒后由服务端断开，0 为不断开
+    disconnect_jitter: float = 0.0  # 断开时间随机浮动范围（秒）
+
+
+@dataclass(eq=False)
+class _Connection:
+    ws: web.WebSocketResponse
+    queue: asyncio.Queue[tuple[float, str, str]] = field(default_factory=asyncio.Queue)
+
+
+@dataclass
+class _StreamState:
+    """单个流的行情状态，所有订阅该流的连接收到相同的消息"""
+
+    price: float = BASE_PRICE
+    next_id: int = 1
+    due: float = 0.0  # 累计待发送条数（按速率累加）
+    last_sent: float = 0.0
+
+
+@dataclass
+class _MockBook:
+    """
+    单个币种的模拟订单簿
+
+    depth 增量流和 /fapi/v1/depth 快照共用同一份状态，快照的 lastUpdateId
+    始终等于最近一次增量的 u，与真实交易所的同步规则一致。
+    """
+
+    bids: dict[float, float] = field(default_factory=dict)
+    asks: dict[float, float] = field(default_factory=dict)
+    last_update_id: int = 1000
+
+    def __post_init__(self) -> None:
+        for i in range(1, BOOK_LEVELS + 1):
+            self.bids[round(BASE_PRICE - i * BOOK_TICK, 1)] = round(random.expovariate(1.0), 3)
+            self.asks[round(BASE_PRICE + i * BOOK_TICK, 1)] = round(random.expovariate(1.0), 3)
+
+    def update(self, changes: int) -> dict[str, Any]:
+        """随机改动靠近盘口的价位，返回 depthUpdate 的 U/u/pu 和改动列表"""
+        bids: list[list[str]] = []
+        asks: list[list[str]] = []
+        for _ in range(changes):
+            # 越靠近盘口改动越频繁；偶尔挂出大单形成挂单墙
+            offset = min(BOOK_LEVELS, 1 + int(random.expovariate(0.05)))
+            roll = random.random()
+            qty = 0.0 if roll < 0.2 else random.expovariate(1.0) * (20 if roll > 0.99 else 1)
+            qty = round(qty, 3)
+            if random.random() < 0.5:
+                price = round(BASE_PRICE - offset * BOOK_TICK, 1)
+                side, book = bids, self.bids
+            else:
+                price = round(BASE_PRICE + offset * BOOK_TICK, 1)
+                side, book = asks, self.asks
+            if qty:
+                book[price] = qty
+            else:
+                book.pop(price, None)
+            side.append([f"{price:.1f}", f"{qty:.3f}"])
+        previous = self.last_update_id
+        # 合约深度流的更新 ID 不连续，一条事件内包含多次撮合更新
+        self.last_update_id += random.randint(1, 5)
+        return {"U": previous + 1, "u": self.last_update_id, "pu": previous, "b": bids, "a": asks}
+
+    def snapshot(self, limit: int) -> dict[str, Any]:
+        bids = sorted(self.bids.items(), reverse=True)[:limit]
+        asks = sorted(self.asks.items())[:limit]
+        return {
+            "lastUpdateId": self.last_update_id,
+            "E": _now_ms(),
+            "T": _now_ms(),
+            "bids": [[f"{p:.1f}", f"{q:.3f}"] for p, q in bids],
+            "asks": [[f"{p:.1f}", f"{q:.3f}"] for p, q in asks],
+        }
+
+
+@dataclass
+class MockBinanceServer:
+    """
+    模拟 BinanceClient 使用的 REST 接口和行情 WebSocket
+
+    REST 请求注入固定延迟 + 随机抖动；WebSocket 按 streams 设置的速率推送
+    aggTrade / forceOrder / markPriceUpdate / depthUpdate，可注入推送延迟并定时断开连接。
+    aggTrade 的 T 为消息生成时间、a 按币种严格递增，便于测量端到端延迟和丢包。
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    streams: StreamSettings = field(default_factory=StreamSettings)
+    requests: Counter[str] = field(default_factory=Counter)
+    # 实际发出的 WebSocket 消息数（按流名称）
+    ws_sent: Counter[str] = field(default_factory=Counter)
+    ws_connections: int = 0
+    ws_disconnects: int = 0  # 服务端主动断开次数
+    # /futures/data 限额（0 为不限制），以及每次请求的时间（墙钟）和被拒绝次数
+    data_limit: int = DATA_LIMIT
+    data_window: float = DATA_WINDOW_SECONDS
+    data_requests: list[float] = field(default_factory=list)
+    data_rejected: int = 0
+    telegram_messages: list[dict[str, Any]] = field(default_factory=list)
+    _runner: web.AppRunner | None = field(default=None, repr=False)
+    _market_task: asyncio.Task[None] | None = field(default=None, repr=False)
+    _subscribers: defaultdict[str, set[_Connection]] = field(
+        default_factory=lambda: defaultdict(set), repr=False
+    )
+    _state: dict[str, _StreamState] = field(default_factory=dict, repr=False)
+    _books: dict[str, _MockBook] = field(default_factory=dict, repr=False)
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._latency_middleware])
+        app.router.add_get("/fapi/v1/exchangeInfo", self._exchange_info)
+        app.router.add_get("/fapi/v1/klines", self._klines)
+        app.router.add_get("/fapi/v1/depth", self._depth)
+        app.router.add_get("/fapi/v1/openInterest", self._open_interest)
+        app.router.add_get("/fapi/v1/fundingRate", self._funding_rate)
+        app.router.add_get("/fapi/v1/premiumIndex", self._premium_index)
+        app.router.add_get("/futures/data/openInterestHist", self._open_interest_hist)
+        for endpoint in (
+            "globalLongShortAccountRatio",
+            "topLongShortAccountRatio",
+            "topLongShortPositionRatio",
+        ):
+            app.router.add_get(f"/futures/data/{endpoint}", self._long_short_ratio)
+        app.router.add_get("/futures/data/takerlongshortRatio", self._taker_ratio)
+        app.router.add_get("/ws/{streams:.+}", self._websocket)
+        app.router.add_post("/bot{token}/{method}", self._telegram)
+        return app
+
+    async def start(self) -> str:
+        """启动服务，返回 base_url"""
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self._market_task = asyncio.create_task(self._market())
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._market_task:
+            self._market_task.cancel()
+            self._market_task = None
+        for conn in {c for conns in self._subscribers.values() for c in conns}:
+            await conn.ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _latency_middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        if request.path.startswith(("/ws/", "/bot")):
+            response: web.StreamResponse = await handler(request)
+            return response
+        self.requests[request.path] += 1
+        if request.path.startswith("/futures/data/") and not self._admit_data_request():
+            return web.json_response(
+                {"code": -1003, "msg": "Too many requests; /futures/data limit exceeded."},
+                status=429,
+                headers={"Retry-After": "10"},
+            )
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        response = await handler(request)
+        return response
+
+    def _admit_data_request(self) -> bool:
+        """
+        /futures/data 限额：与交易所的计数器一致按对齐的固定窗口计数，
+        当前窗口未超过限额时记录并放行
+        """
+        now = time.time()
+        if self.data_limit:
+            window_start = now - now % self.data_window
+            recent = len(self.data_requests) - bisect.bisect_left(self.data_requests, window_start)
+            if recent >= self.data_limit:
+                self.data_rejected += 1
+                return False
+        self.data_requests.append(now)
+        return True
+
+    def data_peak(self) -> int:
+        """单个 data_window 计数窗口内 /futures/data 请求数的最大值"""
+        windows = Counter(int(t // self.data_window) for t in self.data_requests)
+        return max(windows.values(), default=0)
+
+    @staticmethod
+    def _limit(request: web.Request, default: int = 30) -> int:
+        return int(request.query.get("limit", default))
+
+    def _series_times(
+        self, request: web.Request, step_ms: int | None = None, default_limit: int = 30
+    ) -> list[int]:
+        """按 period/startTime/endTime/limit 生成对齐的时间戳序列（升序）"""
+        step = step_ms or PERIOD_MS.get(request.query.get("period", "5m"), 300_000)
+        limit = self._limit(request, default_limit)
+        end = int(request.query.get("endTime", _now_ms()))
+        end -= end % step
+        start = int(request.query.get("startTime", end - (limit - 1) * step))
+        start += -start % step
+        times = list(range(start, end + 1, step))
+        return times[:limit]
+
+    async def _exchange_info(self, request: web.Request) -> web.Response:
+        symbols = [
+            {
+                "symbol": raw,
+                "baseAsset": raw[:-4],
+                "quoteAsset": "USDT",
+                "marginAsset": "USDT",
+                "contractType": "PERPETUAL",
+                "status": "TRADING",
+                "onboardDate": 1569398400000,
+            }
+            for raw in MARKET_SYMBOLS
+        ]
+        # 交割合约，不应出现在永续合约列表中
+        symbols.append(
+            {
+                "symbol": "BTCUSDT_260327",
+                "baseAsset": "BTC",
+                "quoteAsset": "USDT",
+                "marginAsset": "USDT",
+                "contractType": "CURRENT_QUARTER",
+                "status": "TRADING",
+                "onboardDate": 1569398400000,
+            }
+        )
+        return web.json_response({"timezone": "UTC", "serverTime": _now_ms(), "symbols": symbols})
+
+    def book(self, symbol: str) -> _MockBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _MockBook()
+        return book
+
+    async def _depth(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        return web.json_response(self.book(symbol).snapshot(self._limit(request, 500)))
+
+    async def _klines(self, request: web.Request) -> web.Response:
+        limit = self._limit(request, 500)
+        interval_ms = 60_000 if request.query.get("interval") == "1m" else 3_600_000
+        start = int(request.query.get("startTime", _now_ms() - limit * interval_ms))
+        start -= start % interval_ms
+        rows = []
+        for i in range(limit):
+            open_time = start + i * interval_ms
+            price = BASE_PRICE + random.uniform(-500, 500)
+            rows.append(
+                [
+                    open_time,
+                    f"{price:.2f}",
+                    f"{price + 100:.2f}",
+                    f"{price - 100:.2f}",
+                    f"{price:.2f}",
+                    "1000.0",
+                    open_time + interval_ms - 1,
+                ]
+            )
+        return web.json_response(rows)
+
+    async def _open_interest(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "symbol": request.query["symbol"],
+                "openInterest": f"{50_000 + random.uniform(-100, 100):.3f}",
+                "time": _now_ms(),
+            }
+        )
+
+    async def _open_interest_hist(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        rows = [
+            {
+                "symbol": symbol,
+                "sumOpenInterest": f"{50_000 + random.uniform(-100, 100):.3f}",
+                "sumOpenInterestValue": f"{5e9 + random.uniform(-1e7, 1e7):.2f}",
+                "timestamp": ts,
+            }
+            for ts in self._series_times(request)
+        ]
+        return web.json_response(rows)
+
+    async def _funding_rate(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        rows = [
+            {
+                "symbol": symbol,
+                "fundingRate": f"{random.uniform(-0.0002, 0.0003):.6f}",
+                "fundingTime": ts,
+            }
+            for ts in self._series_times(request, 8 * 3_600_000, 100)
+        ]
+        return web.json_response(rows)
+
+    async def _premium_index(self, request: web.Request) -> web.Response:
+        mark = json.loads(_mark_price(request.query["symbol"]))
+        return web.json_response(
+            {
+                "symbol": mark["s"],
+                "markPrice": mark["p"],
+                "indexPrice": mark["i"],
+                "lastFundingRate": mark["r"],
+                "nextFundingTime": mark["T"],
+                "time": mark["E"],
+            }
+        )
+
+    async def _long_short_ratio(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        rows = [_ratio_row(symbol, ts) for ts in self._series_times(request)]
+        return web.json_response(rows)
+
+    async def _taker_ratio(self, request: web.Request) -> web.Response:
+        rows = []
+        for ts in self._series_times(request):
+            buy = random.uniform(4000, 6000)
+            sell = random.uniform(4000, 6000)
+            rows.append(
+                {
+                    "buySellRatio": f"{buy / sell:.4f}",
+                    "buyVol": f"{buy:.2f}",
+                    "sellVol": f"{sell:.2f}",
+                    "timestamp": ts,
+                }
+            )
+        return web.json_response(rows)
+
+    # ---- WebSocket ----
+
+    def _lifetime(self) -> float | None:
+        settings = self.streams
+        if settings.disconnect_after <= 0:
+            return None
+        jitter = random.uniform(-settings.disconnect_jitter, settings.disconnect_jitter)
+        return max(0.1, settings.disconnect_after + jitter)
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        names = [name for name in request.match_info["streams"].split("/") if name]
+        conn = _Connection(ws)
+        for name in names:
+            self._subscribers[name].add(conn)
+        self.ws_connections += 1
+        sender = asyncio.create_task(self._send_loop(conn))
+        try:
+            async with asyncio.timeout(self._lifetime()):
+                async for _ in ws:
+                    pass  # 忽略客户端发来的消息
+        except TimeoutError:
+            self.ws_disconnects += 1
+        finally:
+            for name in names:
+                self._subscribers[name].discard(conn)
+            sender.cancel()
+            await ws.close()
+        return ws
+
+    async def _send_loop(self, conn: _Connection) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                send_at, name, message = await conn.queue.get()
+                delay = send_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await conn.ws.send_str(message)
+                self.ws_sent[name] += 1
+        except ConnectionResetError:
+            pass
+
+    async def _market(self) -> None:
+        """按设定速率为每个有订阅者的流生成消息，并放入各连接的发送队列"""
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(MARKET_TICK_SECONDS)
+            now = loop.time()
+            elapsed, last = now - last, now
+            for name, conns in list(self._subscribers.items()):
+                if not conns:
+                    continue
+                for message in self._generate(name, now, elapsed):
+                    settings = self.streams
+                    send_at = (
+                        now + (settings.latency_ms + random.uniform(0, settings.jitter_ms)) / 1000
+                    )
+                    for conn in conns:
+                        conn.queue.put_nowait((send_at, name, message))
+
+    def _generate(self, name: str, now: float, elapsed: float) -> list[str]:
+        state = self._state.get(name)
+        if state is None:
+            state = self._state[name] = _StreamState(last_sent=now)
+        raw, _, kind = name.partition("@")
+        settings = self.streams
+
+        if kind == "aggTrade":
+            state.due += settings.trade_rate * elapsed
+            count, state.due = int(state.due), state.due % 1
+            messages = []
+            for _ in range(count):
+                state.price *= 1 + random.gauss(0, 0.0002)
+                messages.append(self._agg_trade(raw.upper(), state))
+                state.next_id += 1
+            return messages
+        if kind == "forceOrder" or name == "!forceOrder@arr":
+            state.due += settings.liquidation_rate * elapsed
+            count, state.due = int(state.due), state.due % 1
+            symbols = [raw.upper()] if kind == "forceOrder" else MARKET_SYMBOLS
+            return [_force_order(random.choice(symbols)) for _ in range(count)]
+        if kind == "markPrice@1s":
+            if now - state.last_sent < settings.mark_price_interval:
+                return []
+            state.last_sent = now
+            return [_mark_price(raw.upper())]
+        if kind == "depth@100ms":
+            if now - state.last_sent < settings.depth_interval:
+                return []
+            state.last_sent = now
+            update = self.book(raw.upper()).update(settings.depth_changes)
+            now_ms = _now_ms()
+            return [
+                json.dumps(
+                    {"e": "depthUpdate", "E": now_ms, "T": now_ms, "s": raw.upper(), **update}
+                )
+            ]
+        return []
+
+    @staticmethod
+    def _agg_trade(symbol: str, state: _StreamState) -> str:
+        now = _now_ms()
+        return json.dumps(
+            {
+                "e": "aggTrade",
+                "E": now,
+                "s": symbol,
+                "a": state.next_id,
+                "p": f"{state.price:.2f}",
+                "q": f"{random.expovariate(2.0):.3f}",
+                "f": state.next_id,
+                "l": state.next_id,
+                "T": now,
+                "m": random.random() < 0.5,
+            }
+        )
+
+    # ---- Telegram Bot API ----
+
+    async def _telegram(self, request: web.Request) -> web.Response:
+        """最小化的 Bot API：polling 返回空更新，发出的消息只做记录"""
+        method = request.match_info["method"].lower()
+        params: dict[str, Any] = dict(await request.post())
+        result: Any = True
+        if method == "getme":
+            result = {"id": 1, "is_bot": True, "first_name": "mock", "username": "mock_bot"}
+        elif method == "getupdates":
+            await asyncio.sleep(min(float(params.get("timeout", 0)), 1.0))
+            result = []
+        elif method == "sendmessage":
+            self.telegram_messages.append(params)
+            result = {
+                "message_id": len(self.telegram_messages),
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+                "text": params.get("text", ""),
+            }
+        return web.json_response({"ok": True, "result": result})
+
+
+def _force_order(symbol: str) -> str:
+    now = _now_ms()
+    price = BASE_PRICE * (1 + random.uniform(-0.01, 0.01))
+    quantity = random.expovariate(1.0)
+    return json.dumps(
+        {
+            "e": "forceOrder",
+            "E": now,
+            "o": {
+                "s": symbol,
+                "S": random.choice(("BUY", "SELL")),
+                "o": "LIMIT",
+                "f": "IOC",
+                "q": f"{quantity:.3f}",
+                "p": f"{price:.2f}",
+                "ap": f"{price:.2f}",
+                "X": "FILLED",
+                "l": f"{quantity:.3f}",
+                "z": f"{quantity:.3f}",
+                "T": now,
+            },
+        }
+    )
+
+
+def _mark_price(symbol: str) -> str:
+    now = _now_ms()
+    price = BASE_PRICE * (1 + random.uniform(-0.001, 0.001))
+    return json.dumps(
+        {
+            "e": "markPriceUpdate",
+            "E": now,
+            "s": symbol,
+            "p": f"{price:.2f}",
+            "i": f"{price * 0.9999:.2f}",
+            "P": f"{price:.2f}",
+            "r": f"{random.uniform(-0.0002, 0.0003):.8f}",
+            "T": now - now % (8 * 3_600_000) + 8 * 3_600_000,
+        }
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = MockBinanceServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        streams=stream_settings(args),
+    )
+    url = await server.start()
+    print(f"Mock Binance listening on {url} (WebSocket: {server.ws_url}/ws/<streams>)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def add_stream_arguments(parser: argparse.ArgumentParser) -> None:
+    """WebSocket 推送相关的命令行参数（soak 脚本共用）"""
+    parser.add_argument("--trade-rate", type=float, default=20.0, help="每币种每秒 aggTrade 条数")
+    parser.add_argument("--liquidation-rate", type=float, default=0.5)
+    parser.add_argument(
+        "--depth-interval", type=float, default=0.1, help="depthUpdate 推送间隔秒数"
+    )
+    parser.add_argument("--ws-latency-ms", type=float, default=0.0)
+    parser.add_argument("--ws-jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--disconnect-after", type=float, default=0.0, help="服务端断开连接的间隔秒数，0 为不断开"
+    )
+    parser.add_argument("--disconnect-jitter", type=float, default=0.0)
+
+
+def stream_settings(args: argparse.Namespace) -> StreamSettings:
+    return StreamSettings(
+        trade_rate=args.trade_rate,
+        liquidation_rate=args.liquidation_rate,
+        depth_interval=args.depth_interval,
+        latency_ms=args.ws_latency_ms,
+        jitter_ms=args.ws_jitter_ms,
+        disconnect_after=args.disconnect_after,
+        disconnect_jitter=args.disconnect_jitter,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本地 Binance Futures 替身服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    add_stream_arguments(parser)
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
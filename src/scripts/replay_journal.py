@@ -0,0 +1,162 @@
+"""回放 WebSocket 录制日志
+
+把录制的原始消息按原始节奏（或 N 倍速 / 最大速度）送入采集器，
+用于复现行情高峰时的处理问题，也可作为吞吐量基准。
+
+用法:
+    python -m src.scripts.replay_journal data/journal --speed 0
+    python -m src.scripts.replay_journal data/journal/ingest --speed 0
+    python -m src.scripts.replay_journal data/journal/journal-20250101-000000-0001.tsv.gz --speed 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from src.client.binance import BinanceClient
+from src.client.journal import JournalEntry, journal_files, read_journal, replay
+from src.collector.binance_liq import BinanceLiquidationCollector
+from src.collector.binance_trades import BinanceTradesCollector
+from src.collector.candle_builder import CandleBuilder
+from src.collector.depth import DepthCollector, parse_snapshot
+from src.collector.mark_price import MarkPriceCollector
+from src.storage.models import Candle, Liquidation, Trade
+
+
+class CollectorFeed:
+    """按消息来源把日志分发给对应采集器的消息处理函数（不建立任何连接）"""
+
+    def __init__(
+        self,
+        on_trade: Callable[[Trade], Coroutine[Any, Any, None]],
+        on_liquidation: Callable[[Liquidation], Coroutine[Any, Any, None]],
+        on_tick: Callable[[str, float, float, int], Coroutine[Any, Any, None]] | None = None,
+        threshold_usd: float = 100_000,
+        symbols: list[str] | None = None,
+    ):
+        self.on_trade = on_trade
+        self.on_tick = on_tick
+        self.threshold_usd = threshold_usd
+        self.client = BinanceClient()
+        self.trades: dict[str, BinanceTradesCollector] = {}
+        symbols = symbols or ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+        self.liquidations = BinanceLiquidationCollector(symbols, on_liquidation)
+        self.mark_prices = MarkPriceCollector(symbols)
+        self.depth: dict[str, DepthCollector] = {}
+        # 各币种深度事件的处理耗时（秒），用于统计单币种订单簿吞吐
+        self.depth_seconds: defaultdict[str, float] = defaultdict(float)
+        self.counts: Counter[str] = Counter()
+
+    def _trades_collector(self, stream: str) -> BinanceTradesCollector:
+        raw = stream.split("@", 1)[0].upper()
+        collector = self.trades.get(raw)
+        if collector is None:
+            base = raw[:-4] if raw.endswith("USDT") else raw
+            collector = BinanceTradesCollector(
+                f"{base}/USDT:USDT",
+                self.threshold_usd,
+                self.on_trade,
+                on_tick=self.on_tick,
+                client=self.client,
+            )
+            self.trades[raw] = collector
+        return collector
+
+    def _depth_collector(self, raw: str) -> DepthCollector:
+        collector = self.depth.get(raw)
+        if collector is None:
+            base = raw[:-4] if raw.endswith("USDT") else raw
+            # 不传 client：快照来自日志中录制的 @depthSnapshot
+            collector = DepthCollector([f"{base}/USDT:USDT"], client=None)
+            self.depth[raw] = collector
+        return collector
+
+    async def _handle_depth(self, entry: JournalEntry) -> None:
+        if entry.source.endswith("@depthSnapshot"):
+            snapshot = parse_snapshot(entry.message)
+            collector = self._depth_collector(snapshot.symbol)
+            collector.load_snapshot(collector.symbols[0], snapshot)
+            self.counts["depthSnapshot"] += 1
+            return
+        raw = json.loads(entry.message).get("s", "")
+        collector = self._depth_collector(raw)
+        started = time.perf_counter()
+        await collector._process_message(entry.message)
+        self.depth_seconds[raw] += time.perf_counter() - started
+        self.counts["depth"] += 1
+
+    async def handle(self, entry: JournalEntry) -> None:
+        source = entry.source
+        if "@depth" in source:
+            await self._handle_depth(entry)
+        elif source.endswith("@aggTrade"):
+            collector = self._trades_collector(source)
+            await self.client._process_ws_message(entry.message, collector._handle_trade)
+            self.counts["aggTrade"] += 1
+        elif "forceOrder" in source:
+            await self.liquidations._process_message(entry.message)
+            self.counts["forceOrder"] += 1
+        elif "markPrice" in source:
+            await self.mark_prices._process_message(entry.message)
+            self.counts["markPrice"] += 1
+        else:
+            self.counts["unknown"] += 1
+
+
+async def _replay(args: argparse.Namespace) -> None:
+    whales = Counter[str]()
+    candles: list[Candle] = []
+
+    async def on_trade(trade: Trade) -> None:
+        whales[trade.symbol] += 1
+
+    async def on_liquidation(liq: Liquidation) -> None:
+        whales["liquidations"] += 1
+
+    async def on_candles(closed: list[Candle]) -> None:
+        candles.extend(closed)
+
+    builder = CandleBuilder(on_candles)
+    feed = CollectorFeed(
+        on_trade, on_liquidation, on_tick=builder.add_trade, threshold_usd=args.threshold_usd
+    )
+    files = journal_files(args.path)
+    pace = f"{args.speed:g}x" if args.speed else "max speed"
+    print(f"Replaying {len(files)} journal file(s) at {pace}")
+
+    stats = await replay(read_journal(files), feed.handle, speed=args.speed)
+
+    print(
+        f"{stats.messages} messages in {stats.elapsed:.2f}s "
+        f"({stats.rate:,.0f} msg/s, journal span {stats.journal_span:.1f}s)"
+    )
+    print(f"  by source: {dict(feed.counts)}")
+    print(f"  whale trades / liquidations: {dict(whales)}, closed candles: {len(candles)}")
+    for raw, collector in sorted(feed.depth.items()):
+        book = collector.books[collector.symbols[0]]
+        seconds = feed.depth_seconds[raw]
+        rate = collector.updates / seconds if seconds else 0.0
+        print(
+            f"  depth {raw}: {collector.updates} updates ({rate:,.0f} updates/s per symbol), "
+            f"{collector.resyncs} resyncs, {len(book.bids)}/{len(book.asks)} levels"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="回放 WebSocket 录制日志")
+    parser.add_argument("path", help="日志文件或日志目录")
+    parser.add_argument("--speed", type=float, default=1.0, help="回放倍速，0 为最大速度")
+    parser.add_argument("--threshold-usd", type=float, default=100_000)
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""长时间压测：在本地替身服务上运行完整的 CryptoMonitor
+
+启动 mock_binance（REST + WebSocket + Telegram Bot API），把 CryptoMonitor
+指向该服务运行指定时长，统计行情接入吞吐、端到端延迟（成交时间 → 进入 K 线聚合）、
+按 aggTrade ID 连续性计算的丢失 / 重复消息，以及 /futures/data 每 5 分钟的请求数
+（替身服务按 1000 次 / 5 分钟限额拒绝超出的请求）。
+
+用法:
+    python -m src.scripts.soak --duration 300 --symbols 20 --trade-rate 50
+    python -m src.scripts.soak --duration 600 --disconnect-after 60 --disconnect-jitter 20
+    python -m src.scripts.soak --duration 330 --symbols 200 --trade-rate 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.config import (
+    Config,
+    DatabaseConfig,
+    ExchangeConfig,
+    ExchangesConfig,
+    TelegramConfig,
+)
+from src.main import CryptoMonitor
+from src.scripts.mock_binance import MockBinanceServer, add_stream_arguments, stream_settings
+
+BASE_SYMBOLS = ["BTC", "ETH", "SOL", "BNB", "XRP", "DOGE", "ADA", "AVAX", "LINK", "DOT"]
+
+
+def soak_symbols(count: int) -> list[str]:
+    bases = BASE_SYMBOLS[:count] + [f"T{i:03d}" for i in range(count - len(BASE_SYMBOLS))]
+    return [f"{base}/USDT:USDT" for base in bases]
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+@dataclass
+class _IdRange:
+    first: int
+    last: int
+    unique: int = 1
+
+
+@dataclass
+class SoakProbe:
+    """
+    接在采集链路上的探针
+
+    record() 作为 Recorder 接收去重后的原始 aggTrade 消息，按币种检查 ID 连续性；
+    observe() 由包装后的 K 线聚合回调调用，测量成交时间到处理完成的端到端延迟。
+    """
+
+    received: int = 0
+    duplicates: int = 0
+    processed: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+    # 逐币种 REST 轮询：完成次数 / 上一轮未完成而跳过的次数
+    polls_completed: int = 0
+    polls_skipped: int = 0
+    ids: dict[str, _IdRange] = field(default_factory=dict)
+    _seen: dict[str, set[int]] = field(default_factory=dict)
+
+    def record(self, source: str, message: str) -> None:
+        if not source.endswith("@aggTrade"):
+            return
+        data = json.loads(message)
+        symbol, agg_id = data["s"], data["a"]
+        self.received += 1
+        seen = self._seen.setdefault(symbol, set())
+        if agg_id in seen:
+            self.duplicates += 1
+            return
+        seen.add(agg_id)
+        ids = self.ids.get(symbol)
+        if ids is None:
+            self.ids[symbol] = _IdRange(agg_id, agg_id)
+        else:
+            ids.first = min(ids.first, agg_id)
+            ids.last = max(ids.last, agg_id)
+            ids.unique += 1
+
+    def observe(self, timestamp_ms: int) -> None:
+        self.processed += 1
+        self.latencies_ms.append(time.time() * 1000 - timestamp_ms)
+
+    @property
+    def missing(self) -> int:
+        """各币种 [首个, 最后一个] ID 区间内未收到的消息数"""
+        return sum(r.last - r.first + 1 - r.unique for r in self.ids.values())
+
+
+def _soak_config(server: MockBinanceServer, symbols: list[str], db_path: Path) -> Config:
+    return Config(
+        exchanges=ExchangesConfig(
+            binance=ExchangeConfig(
+                rest_url=server.base_url,
+                ws_url=server.ws_url,
+                exchange_info_cache=str(db_path.with_name("exchange_info.json")),
+            )
+        ),
+        symbols=symbols,
+        telegram=TelegramConfig(bot_token="0:soak", chat_id="1", api_url=f"{server.base_url}/bot"),
+        database=DatabaseConfig(path=str(db_path)),
+    )
+
+
+def _report(
+    probe: SoakProbe, server: MockBinanceServer, elapsed: float, rss_start_kb: int
+) -> list[str]:
+    ordered = sorted(probe.latencies_ms)
+    sent = sum(n for name, n in server.ws_sent.items() if name.endswith("@aggTrade"))
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return [
+        f"Soak finished after {elapsed:.1f}s",
+        f"  ingest: {probe.processed} trades processed "
+        f"({probe.processed / elapsed:,.0f} msg/s), server sent {sent}",
+        f"  latency ms: p50={_percentile(ordered, 0.5):.1f} p95={_percentile(ordered, 0.95):.1f} "
+        f"p99={_percentile(ordered, 0.99):.1f} max={_percentile(ordered, 1.0):.1f}",
+        f"  dropped: {probe.missing} missing agg ids, {probe.duplicates} duplicates",
+        f"  connections: {server.ws_connections} opened, "
+        f"{server.ws_disconnects} server-side disconnects",
+        f"  rest requests: {sum(server.requests.values())}, "
+        f"telegram messages: {len(server.telegram_messages)}",
+        f"  futures/data: peak {server.data_peak()} per {server.data_window:.0f}s "
+        f"(limit {server.data_limit}), {server.data_rejected} rejected; "
+        f"polls {probe.polls_completed} completed, {probe.polls_skipped} skipped",
+        f"  peak rss: {rss_kb / 1024:.0f} MB (start {rss_start_kb / 1024:.0f} MB)",
+    ]
+
+
+async def run_soak(
+    server: MockBinanceServer,
+    symbols: list[str],
+    duration: float,
+    db_path: Path,
+    progress_every: float = 0.0,
+) -> tuple[SoakProbe, float]:
+    """运行 CryptoMonitor duration 秒，返回探针和实际运行时长"""
+    monitor = CryptoMonitor(_soak_config(server, symbols, db_path))
+    probe = SoakProbe()
+    monitor.binance_client.recorder = probe
+    add_trade = monitor.candle_builder.add_trade
+
+    async def on_tick(symbol: str, price: float, quantity: float, timestamp: int) -> None:
+        await add_trade(symbol, price, quantity, timestamp)
+        probe.observe(timestamp)
+
+    # _on_tick 每次调用时读取该属性
+    monitor.candle_builder.add_trade = on_tick  # type: ignore[method-assign]
+
+    task = asyncio.create_task(monitor.run())
+    started = time.monotonic()
+    try:
+        deadline = started + duration
+        last_processed = 0
+        while (remaining := deadline - time.monotonic()) > 0:
+            await asyncio.wait({task}, timeout=min(remaining, progress_every or remaining))
+            if task.done():
+                break
+            if progress_every:
+                rate = (probe.processed - last_processed) / progress_every
+                last_processed = probe.processed
+                print(
+                    f"[{time.monotonic() - started:6.0f}s] {rate:,.0f} msg/s, "
+                    f"missing {probe.missing}, connections {server.ws_connections}"
+                )
+    finally:
+        monitor.stop()
+        await task
+    probe.polls_completed = sum(p.completed for p in monitor.pollers)
+    probe.polls_skipped = sum(p.skipped for p in monitor.pollers)
+    return probe, time.monotonic() - started
+
+
+async def _soak(args: argparse.Namespace) -> None:
+    server = MockBinanceServer(latency_ms=args.latency_ms, streams=stream_settings(args))
+    await server.start()
+    symbols = soak_symbols(args.symbols)
+    rss_start_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        f"Soaking {len(symbols)} symbols for {args.duration:.0f}s "
+        f"at {args.trade_rate:g} trades/s per symbol against {server.base_url}"
+    )
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(args.db) if args.db else Path(tmp) / "soak.db"
+            probe, elapsed = await run_soak(
+                server, symbols, args.duration, db_path, progress_every=args.progress_every
+            )
+    finally:
+        await server.stop()
+    for line in _report(probe, server, elapsed, rss_start_kb):
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CryptoMonitor 本地长时间压测")
+    parser.add_argument("--duration", type=float, default=60.0, help="运行秒数")
+    parser.add_argument("--symbols", type=int, default=10, help="订阅币种数")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="REST 延迟")
+    parser.add_argument("--progress-every", type=float, default=10.0, help="进度输出间隔，0 关闭")
+    parser.add_argument("--db", help="数据库路径，默认使用临时目录")
+    add_stream_arguments(parser)
+    # src.main 导入时已按 INFO 配置日志，压测期间只保留告警
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(_soak(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,28 +5,66 @@ from typing import Any
 import aiosqlite
 
 from .models import (
+    Candle,
     ExtremeEvent,
+    FundingRateRecord,
     Liquidation,
     MarketIndicator,
     OISnapshot,
+    OutboxMessage,
     PriceAlert,
+    Series,
+    Subscription,
     Trade,
 )
 
+# 紧凑序列每次读取的行数（每块之间让出事件循环）
+SERIES_FETCH_SIZE = 5000
+
 
 class Database:
-    def __init__(self, path: str):
+    def __init__(self, path: str, shared: bool = False):
         self.path = path
+        self.shared = shared  # 多个进程同时读写同一数据库文件
         self.conn: aiosqlite.Connection | None = None
 
     async def init(self) -> None:
         self.conn = await aiosqlite.connect(self.path)
+        if self.shared:
+            # WAL 下读写互不阻塞，写锁冲突时等待而不是立即报 database is locked
+            await self.conn.execute("PRAGMA journal_mode=WAL")
+            await self.conn.execute("PRAGMA busy_timeout=5000")
         await self._create_tables()
 
     async def close(self) -> None:
         if self.conn:
             await self.conn.close()
 
+    async def _executemany(self, sql: str, rows: list[tuple[Any, ...]]) -> None:
+        """
+        批量执行并在 aiosqlite 工作线程内关闭游标
+
+        未关闭的游标会在事件循环线程被回收并重置其语句，与工作线程上并发复用
+        同一缓存语句的写入竞争（sqlite3 报 "bad parameter or other API misuse"）。
+        """
+        assert self.conn is not None
+        cursor = await self.conn.executemany(sql, rows)
+        await cursor.close()
+
+    async def _fetch_series(self, sql: str, params: tuple[Any, ...]) -> Series:
+        """
+        分块读取 (时间戳, 数值) 查询结果到紧凑数组
+
+        每块之间让出事件循环，7 天窗口几十万行时不会长时间阻塞 WebSocket 读取。
+        """
+        assert self.conn is not None
+        series = Series()
+        cursor = await self.conn.execute(sql, params)
+        while rows := await cursor.fetchmany(SERIES_FETCH_SIZE):
+            series.extend(rows)
+        await cursor.close()
+        return series
+
     async def _create_tables(self) -> None:
         assert self.conn is not None
         await self.conn.executescript("""
@@ -73,7 +111,8 @@ class Database:
                 price REAL NOT NULL,
                 last_position TEXT,
                 last_triggered_at INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                chat_id TEXT
             );
             CREATE INDEX IF NOT EXISTS idx_price_alerts_symbol ON price_alerts(symbol);
 
@@ -127,7 +166,48 @@ class Database:
             );
             CREATE INDEX IF NOT EXISTS idx_extreme_events_lookup
                 ON extreme_events(symbol, dimension, window_days, triggered_at);
+
+            CREATE TABLE IF NOT EXISTS candles_1m (
+                symbol TEXT NOT NULL,
+                open_time INTEGER NOT NULL,
+                open REAL NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                close REAL NOT NULL,
+                volume REAL NOT NULL,
+                value_usd REAL NOT NULL,
+                trades INTEGER NOT NULL,
+                PRIMARY KEY (symbol, open_time)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS funding_rates (
+                symbol TEXT NOT NULL,
+                funding_time INTEGER NOT NULL,
+                funding_rate REAL NOT NULL,
+                PRIMARY KEY (symbol, funding_time)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created_at INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                chat_id TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                alert_type TEXT NOT NULL,
+                threshold REAL,
+                PRIMARY KEY (chat_id, symbol, alert_type)
+            ) WITHOUT ROWID;
         """)
+        # 旧版本数据库的价位监控表没有 chat_id 列
+        cursor = await self.conn.execute("PRAGMA table_info(price_alerts)")
+        columns = {row[1] for row in await cursor.fetchall()}
+        if "chat_id" not in columns:
+            await self.conn.execute("ALTER TABLE price_alerts ADD COLUMN chat_id TEXT")
         await self.conn.commit()
 
     async def insert_trade(self, trade: Trade) -> int:
@@ -160,12 +240,29 @@ class Database:
         rows = await cursor.fetchall()
         return [Trade(*row) for row in rows]
 
+    async def get_trade_series(self, symbol: str, hours: int) -> Series:
+        """成交的紧凑序列（带方向的 USD 金额，买入为正），按时间升序"""
+        assert self.conn is not None
+        cutoff = int(time.time() * 1000) - hours * 3600 * 1000
+        return await self._fetch_series(
+            """SELECT timestamp, CASE WHEN side = 'buy' THEN value_usd ELSE -value_usd END
+               FROM trades WHERE symbol = ? AND timestamp >= ?
+               ORDER BY timestamp""",
+            (symbol, cutoff),
+        )
+
     async def insert_price_alert(self, alert: PriceAlert) -> int:
         assert self.conn is not None
         cursor = await self.conn.execute(
-            """INSERT INTO price_alerts (symbol, price, last_position, last_triggered_at)
-               VALUES (?, ?, ?, ?)""",
-            (alert.symbol, alert.price, alert.last_position, alert.last_triggered_at),
+            """INSERT INTO price_alerts (symbol, price, last_position, last_triggered_at, chat_id)
+               VALUES (?, ?, ?, ?, ?)""",
+            (
+                alert.symbol,
+                alert.price,
+                alert.last_position,
+                alert.last_triggered_at,
+                alert.chat_id,
+            ),
         )
         await self.conn.commit()
         return cursor.lastrowid or 0
@@ -173,20 +270,47 @@ class Database:
     async def get_price_alerts(self, symbol: str) -> list[PriceAlert]:
         assert self.conn is not None
         cursor = await self.conn.execute(
-            """SELECT id, symbol, price, last_position, last_triggered_at
+            """SELECT id, symbol, price, last_position, last_triggered_at, chat_id
                FROM price_alerts WHERE symbol = ?""",
             (symbol,),
         )
         rows = await cursor.fetchall()
         return [PriceAlert(*row) for row in rows]
 
-    async def delete_price_alert(self, symbol: str, price: float) -> None:
+    async def get_all_price_alerts(self) -> list[PriceAlert]:
         assert self.conn is not None
-        await self.conn.execute(
-            "DELETE FROM price_alerts WHERE symbol = ? AND price = ?",
-            (symbol, price),
+        cursor = await self.conn.execute(
+            """SELECT id, symbol, price, last_position, last_triggered_at, chat_id
+               FROM price_alerts"""
+        )
+        rows = await cursor.fetchall()
+        return [PriceAlert(*row) for row in rows]
+
+    async def delete_price_alert(
+        self, symbol: str, price: float, chat_id: str | None = None
+    ) -> None:
+        """删除价位监控，指定 chat_id 时只删除该会话的"""
+        assert self.conn is not None
+        if chat_id is None:
+            await self.conn.execute(
+                "DELETE FROM price_alerts WHERE symbol = ? AND price = ?",
+                (symbol, price),
+            )
+        else:
+            await self.conn.execute(
+                "DELETE FROM price_alerts WHERE symbol = ? AND price = ? AND chat_id = ?",
+                (symbol, price, chat_id),
+            )
+        await self.conn.commit()
+
+    async def claim_price_alerts(self, chat_id: str) -> int:
+        """把没有会话的价位监控（旧版本添加）归属到 chat_id"""
+        assert self.conn is not None
+        cursor = await self.conn.execute(
+            "UPDATE price_alerts SET chat_id = ? WHERE chat_id IS NULL", (chat_id,)
         )
         await self.conn.commit()
+        return cursor.rowcount
 
     async def update_price_alert(
         self, alert_id: int, position: str | None = None, triggered_at: int | None = None
@@ -239,6 +363,17 @@ class Database:
         rows = await cursor.fetchall()
         return [Liquidation(*row) for row in rows]
 
+    async def get_liquidation_series(self, symbol: str, hours: int) -> Series:
+        """爆仓的紧凑序列（USD 金额），按时间升序"""
+        assert self.conn is not None
+        cutoff = int(time.time() * 1000) - hours * 3600 * 1000
+        return await self._fetch_series(
+            """SELECT timestamp, value_usd FROM liquidations
+               WHERE symbol = ? AND timestamp >= ?
+               ORDER BY timestamp""",
+            (symbol, cutoff),
+        )
+
     async def insert_oi_snapshot(self, oi: OISnapshot) -> int:
         assert self.conn is not None
         cursor = await self.conn.execute(
@@ -250,6 +385,20 @@ class Database:
         await self.conn.commit()
         return cursor.lastrowid or 0
 
+    async def insert_oi_snapshots(self, snapshots: list[OISnapshot]) -> None:
+        """批量插入 OI 快照"""
+        assert self.conn is not None
+        await self._executemany(
+            """INSERT INTO oi_snapshots
+               (exchange, symbol, timestamp, open_interest, open_interest_usd)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (oi.exchange, oi.symbol, oi.timestamp, oi.open_interest, oi.open_interest_usd)
+                for oi in snapshots
+            ],
+        )
+        await self.conn.commit()
+
     async def get_latest_oi(self, symbol: str) -> OISnapshot | None:
         assert self.conn is not None
         cursor = await self.conn.execute(
@@ -273,6 +422,26 @@ class Database:
         row = await cursor.fetchone()
         return OISnapshot(*row) if row else None
 
+    async def get_oi_history(self, symbol: str, hours: int) -> list[OISnapshot]:
+        """
+        获取最近 N 小时的 OI 快照（按时间升序）
+
+        额外包含截止时间之前的最近一条，任意时间点的 get_oi_at 都可以在结果中二分得到。
+        """
+        assert self.conn is not None
+        cutoff = int(time.time() * 1000) - hours * 3600 * 1000
+        cursor = await self.conn.execute(
+            """SELECT id, exchange, symbol, timestamp, open_interest, open_interest_usd
+               FROM oi_snapshots
+               WHERE symbol = ? AND timestamp >= COALESCE(
+                   (SELECT MAX(timestamp) FROM oi_snapshots WHERE symbol = ? AND timestamp <= ?),
+                   ?)
+               ORDER BY timestamp ASC""",
+            (symbol, symbol, cutoff, cutoff),
+        )
+        rows = await cursor.fetchall()
+        return [OISnapshot(*row) for row in rows]
+
     async def insert_market_indicator(self, mi: MarketIndicator) -> int:
         assert self.conn is not None
         cursor = await self.conn.execute(
@@ -292,6 +461,28 @@ class Database:
         await self.conn.commit()
         return cursor.lastrowid or 0
 
+    async def insert_market_indicators(self, indicators: list[MarketIndicator]) -> None:
+        """批量插入市场指标"""
+        assert self.conn is not None
+        await self._executemany(
+            """INSERT INTO market_indicators
+               (symbol, timestamp, top_account_ratio, top_position_ratio,
+                global_account_ratio, taker_buy_sell_ratio)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    mi.symbol,
+                    mi.timestamp,
+                    mi.top_account_ratio,
+                    mi.top_position_ratio,
+                    mi.global_account_ratio,
+                    mi.taker_buy_sell_ratio,
+                )
+                for mi in indicators
+            ],
+        )
+        await self.conn.commit()
+
     async def get_latest_market_indicator(self, symbol: str) -> MarketIndicator | None:
         assert self.conn is not None
         cursor = await self.conn.execute(
@@ -337,6 +528,27 @@ class Database:
         await self.conn.commit()
         return cursor.lastrowid or 0
 
+    async def insert_long_short_snapshots(self, snapshots: list[dict[str, Any]]) -> None:
+        """批量插入多空比快照（字段同 get_long_short_snapshots 返回值）"""
+        assert self.conn is not None
+        await self._executemany(
+            """INSERT INTO long_short_snapshots
+               (symbol, timestamp, ratio_type, long_ratio, short_ratio, long_short_ratio)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    s["symbol"],
+                    s["timestamp"],
+                    s["ratio_type"],
+                    s["long_ratio"],
+                    s["short_ratio"],
+                    s["long_short_ratio"],
+                )
+                for s in snapshots
+            ],
+        )
+        await self.conn.commit()
+
     async def get_long_short_snapshots(
         self,
         symbol: str,
@@ -451,6 +663,22 @@ class Database:
         )
         await self.conn.commit()
 
+    async def update_extreme_event_prices(self, updates: list[tuple[int, str, float]]) -> None:
+        """批量更新事件后续价格 [(event_id, price_field, price)]，在同一事务内提交"""
+        assert self.conn is not None
+        valid_fields = {"price_4h", "price_12h", "price_24h", "price_48h"}
+        by_field: dict[str, list[tuple[float, int]]] = {}
+        for event_id, price_field, price in updates:
+            if price_field not in valid_fields:
+                raise ValueError(f"Invalid price field: {price_field}")
+            by_field.setdefault(price_field, []).append((price, event_id))
+        for price_field, rows in by_field.items():
+            await self._executemany(
+                f"UPDATE extreme_events SET {price_field} = ? WHERE id = ?",
+                rows,
+            )
+        await self.conn.commit()
+
     async def get_pending_backfill_events(self) -> list[ExtremeEvent]:
         """获取需要回填后续价格的事件"""
         assert self.conn is not None
@@ -493,6 +721,117 @@ class Database:
         row = await cursor.fetchone()
         return row is not None
 
+    async def insert_candles(self, candles: list[Candle]) -> None:
+        """写入 1 分钟 K 线（同一分钟重复写入时覆盖）"""
+        assert self.conn is not None
+        await self._executemany(
+            """INSERT OR REPLACE INTO candles_1m
+               (symbol, open_time, open, high, low, close, volume, value_usd, trades)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    c.symbol,
+                    c.open_time,
+                    c.open,
+                    c.high,
+                    c.low,
+                    c.close,
+                    c.volume,
+                    c.value_usd,
+                    c.trades,
+                )
+                for c in candles
+            ],
+        )
+        await self.conn.commit()
+
+    async def get_candles(self, symbol: str, start_ms: int, end_ms: int) -> list[Candle]:
+        """获取时间范围内的 1 分钟 K 线（按时间升序）"""
+        assert self.conn is not None
+        cursor = await self.conn.execute(
+            """SELECT symbol, open_time, open, high, low, close, volume, value_usd, trades
+               FROM candles_1m WHERE symbol = ? AND open_time >= ? AND open_time <= ?
+               ORDER BY open_time ASC""",
+            (symbol, start_ms, end_ms),
+        )
+        rows = await cursor.fetchall()
+        return [Candle(*row) for row in rows]
+
+    async def get_price_at(
+        self, symbol: str, timestamp_ms: int, tolerance_ms: int = 5 * 60 * 1000
+    ) -> float | None:
+        """
+        获取指定时间的价格
+
+        取覆盖该时间的 1 分钟 K 线收盘价；该分钟无成交时向前取最近一根，
+        超出 tolerance_ms 则视为无数据。
+        """
+        assert self.conn is not None
+        cursor = await self.conn.execute(
+            """SELECT close FROM candles_1m
+               WHERE symbol = ? AND open_time <= ? AND open_time >= ?
+               ORDER BY open_time DESC LIMIT 1""",
+            (symbol, timestamp_ms, timestamp_ms - tolerance_ms),
+        )
+        row = await cursor.fetchone()
+        return float(row[0]) if row else None
+
+    async def insert_funding_rates(self, rates: list[FundingRateRecord]) -> None:
+        """批量写入已结算资金费率（重复结算时间忽略）"""
+        assert self.conn is not None
+        await self._executemany(
+            """INSERT OR IGNORE INTO funding_rates (symbol, funding_time, funding_rate)
+               VALUES (?, ?, ?)""",
+            [(r.symbol, r.funding_time, r.funding_rate) for r in rates],
+        )
+        await self.conn.commit()
+
+    async def get_funding_rates(self, symbol: str, hours: int) -> list[FundingRateRecord]:
+        """获取历史资金费率（按时间升序）"""
+        assert self.conn is not None
+        cutoff = int(time.time() * 1000) - hours * 3600 * 1000
+        cursor = await self.conn.execute(
+            """SELECT symbol, funding_time, funding_rate FROM funding_rates
+               WHERE symbol = ? AND funding_time >= ? ORDER BY funding_time ASC""",
+            (symbol, cutoff),
+        )
+        rows = await cursor.fetchall()
+        return [FundingRateRecord(*row) for row in rows]
+
+    async def get_time_range(
+        self,
+        table: str,
+        symbol: str,
+        before_ms: int,
+        ratio_type: str | None = None,
+    ) -> tuple[int, int] | None:
+        """
+        获取某币种已有数据的时间范围（仅统计 before_ms 之前的记录）
+
+        Returns:
+            (最早时间, 最晚时间)，无数据时返回 None
+        """
+        assert self.conn is not None
+        time_columns = {
+            "oi_snapshots": "timestamp",
+            "market_indicators": "timestamp",
+            "long_short_snapshots": "timestamp",
+            "funding_rates": "funding_time",
+        }
+        if table not in time_columns:
+            raise ValueError(f"Invalid table: {table}")
+        column = time_columns[table]
+        sql = f"SELECT MIN({column}), MAX({column}) FROM {table} WHERE symbol = ? AND {column} < ?"
+        params: tuple[Any, ...] = (symbol, before_ms)
+        if ratio_type is not None:
+            sql += " AND ratio_type = ?"
+            params += (ratio_type,)
+        cursor = await self.conn.execute(sql, params)
+        row = await cursor.fetchone()
+        if not row or row[0] is None:
+            return None
+        return int(row[0]), int(row[1])
+
     async def cleanup_old_data(self, retention_days: int) -> dict[str, int]:
         """
         清理超过保留期的历史数据
@@ -514,6 +853,8 @@ class Database:
             ("oi_snapshots", "timestamp"),
             ("market_indicators", "timestamp"),
             ("long_short_snapshots", "timestamp"),
+            ("candles_1m", "open_time"),
+            ("funding_rates", "funding_time"),
         ]
 
         for table, ts_column in tables:
@@ -525,3 +866,64 @@ class Database:
             await self.conn.commit()
 
         return deleted
+
+    async def insert_outbox_messages(self, messages: list[OutboxMessage]) -> None:
+        """批量写入（单次提交），写入后回填 id"""
+        assert self.conn is not None
+        for message in messages:
+            cursor = await self.conn.execute(
+                "INSERT INTO outbox (chat_id, text, created_at, attempts) VALUES (?, ?, ?, ?)",
+                (message.chat_id, message.text, message.created_at, message.attempts),
+            )
+            message.id = cursor.lastrowid
+            await cursor.close()
+        await self.conn.commit()
+
+    async def get_outbox_messages(self) -> list[OutboxMessage]:
+        """未送达的通知（按入队顺序）"""
+        assert self.conn is not None
+        cursor = await self.conn.execute(
+            "SELECT id, chat_id, text, created_at, attempts FROM outbox ORDER BY id"
+        )
+        rows = await cursor.fetchall()
+        return [OutboxMessage(*row) for row in rows]
+
+    async def update_outbox_attempts(self, ids: list[int], attempts: int) -> None:
+        assert self.conn is not None
+        await self._executemany(
+            "UPDATE outbox SET attempts = ? WHERE id = ?", [(attempts, i) for i in ids]
+        )
+        await self.conn.commit()
+
+    async def delete_outbox_messages(self, ids: list[int]) -> None:
+        assert self.conn is not None
+        await self._executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+        await self.conn.commit()
+
+    async def upsert_subscription(self, sub: Subscription) -> None:
+        assert self.conn is not None
+        await self.conn.execute(
+            """INSERT INTO subscriptions (chat_id, symbol, alert_type, threshold)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (chat_id, symbol, alert_type)
+               DO UPDATE SET threshold = excluded.threshold""",
+            (sub.chat_id, sub.symbol, sub.alert_type, sub.threshold),
+        )
+        await self.conn.commit()
+
+    async def delete_subscription(self, chat_id: str, symbol: str, alert_type: str) -> bool:
+        assert self.conn is not None
+        cursor = await self.conn.execute(
+            "DELETE FROM subscriptions WHERE chat_id = ? AND symbol = ? AND alert_type = ?",
+            (chat_id, symbol, alert_type),
+        )
+        await self.conn.commit()
+        return cursor.rowcount > 0
+
+    async def get_subscriptions(self) -> list[Subscription]:
+        assert self.conn is not None
+        cursor = await self.conn.execute(
+            "SELECT chat_id, symbol, alert_type, threshold FROM subscriptions"
+        )
+        rows = await cursor.fetchall()
+        return [Subscription(*row) for row in rows]
@@ -1,5 +1,8 @@
 # src/storage/models.py
-from dataclasses import dataclass
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
 
 
 @dataclass
@@ -43,6 +46,7 @@ class PriceAlert:
     price: float
     last_position: str | None
     last_triggered_at: int | None
+    chat_id: str | None = None  # 添加该价位的会话
 
 
 @dataclass
@@ -70,3 +74,68 @@ class ExtremeEvent:
     price_12h: float | None  # 12h 后价格
     price_24h: float | None  # 24h 后价格
     price_48h: float | None  # 48h 后价格
+
+
+@dataclass
+class Candle:
+    symbol: str
+    open_time: int  # 分钟起始时间 (ms)
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float  # 成交量（币）
+    value_usd: float  # 成交额
+    trades: int  # 成交笔数
+
+
+@dataclass
+class FundingRateRecord:
+    symbol: str
+    funding_time: int
+    funding_rate: float  # 小数，非百分比
+
+
+@dataclass
+class OutboxMessage:
+    id: int | None
+    chat_id: str
+    text: str
+    created_at: int  # 入队时间 (ms)
+    attempts: int = 0  # 已失败的发送次数
+
+
+@dataclass
+class Subscription:
+    chat_id: str
+    symbol: str  # 币种简称（BTC），"*" 表示全部币种
+    alert_type: str  # 告警类型（规则名 / cascade / report），"*" 表示全部类型
+    threshold: float | None = None  # 告警数值（绝对值）不低于该值才推送
+
+
+@dataclass
+class Series:
+    """
+    紧凑时间序列：毫秒时间戳 (int64) + 数值 (float64) 两个平行数组，按时间升序
+
+    比 Trade / Liquidation 对象列表小一个数量级，传给线程池 / 进程池时序列化开销也小。
+    成交的数值为带方向的 USD 金额（买入为正），爆仓为 USD 金额。
+    """
+
+    timestamps: "array[int]" = field(default_factory=lambda: array("q"))
+    values: "array[float]" = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> "Series":
+        series = cls()
+        series.extend(rows)
+        return series
+
+    def extend(self, rows: Iterable[Sequence[Any]]) -> None:
+        """追加 (时间戳, 数值) 行"""
+        for timestamp, value in rows:
+            self.timestamps.append(timestamp)
+            self.values.append(value)
@@ -0,0 +1,154 @@
+# src/supervisor.py
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from types import FrameType
+
+from src.config import ProcessesConfig, load_config
+from src.events import RECORD
+from src.utils.shm_ring import ShmRing
+
+logger = logging.getLogger(__name__)
+
+ROLES = ("ingest", "analytics")
+# 子进程连续运行超过该时长视为恢复正常，重启退避清零
+STABLE_SECONDS = 60
+
+
+def run_role(role: str, config_path: str, ring_name: str) -> None:
+    """子进程入口：以指定角色运行 CryptoMonitor"""
+    from src.main import CryptoMonitor
+
+    config = load_config(Path(config_path))
+    ring = ShmRing.attach(ring_name)
+    try:
+        asyncio.run(CryptoMonitor(config, role=role, ring=ring).run())
+    finally:
+        ring.close()
+
+
+@dataclass
+class _Child:
+    role: str
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    restarts: int = 0
+    failures: int = 0  # 连续异常退出次数
+    restart_at: float | None = None
+
+
+class Supervisor:
+    """
+    多进程模式的父进程
+
+    创建共享内存环形缓冲区，以 spawn 方式启动 ingest / analytics 两个子进程并监控：
+    子进程退出后按指数退避重启（运行超过 STABLE_SECONDS 后退避清零），
+    环形缓冲区由父进程持有，子进程重启后继续使用（ingest 从头部序号继续写）。
+    收到 SIGINT / SIGTERM 时向子进程发送 SIGTERM 并等待退出，最后释放共享内存。
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        config: ProcessesConfig,
+        target: Callable[[str, str, str], None] = run_role,
+        roles: tuple[str, ...] = ROLES,
+        check_interval: float = 1.0,
+    ):
+        self.config_path = config_path
+        self.config = config
+        self.target = target
+        self.check_interval = check_interval
+        self.children = [_Child(role) for role in roles]
+        self.ring: ShmRing | None = None
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = False
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._on_signal)
+        signal.signal(signal.SIGTERM, self._on_signal)
+        self.start()
+        try:
+            while not self._stopping:
+                time.sleep(self.check_interval)
+                self.check()
+        finally:
+            self.shutdown()
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    def _on_signal(self, signum: int, frame: FrameType | None) -> None:
+        logger.info(f"Supervisor received signal {signum}, stopping")
+        self.stop()
+
+    def start(self) -> None:
+        self.ring = ShmRing.create(self.config.ring_capacity, RECORD.size)
+        logger.info(
+            f"Event ring {self.ring.name}: {self.config.ring_capacity} records "
+            f"x {self.ring.record_size} bytes"
+        )
+        for child in self.children:
+            self._spawn(child)
+
+    def _spawn(self, child: _Child) -> None:
+        assert self.ring is not None
+        process = self._context.Process(
+            target=self.target,
+            args=(child.role, str(self.config_path), self.ring.name),
+            name=f"crypto-monitor-{child.role}",
+        )
+        process.start()
+        child.process = process
+        child.started_at = time.monotonic()
+        child.restart_at = None
+        logger.info(f"Started {child.role} process (pid {process.pid})")
+
+    def check(self, now: float | None = None) -> None:
+        """检查子进程状态，退出的按退避时间重启"""
+        now = time.monotonic() if now is None else now
+        for child in self.children:
+            process = child.process
+            if process is not None and process.is_alive():
+                if child.failures and now - child.started_at > STABLE_SECONDS:
+                    child.failures = 0
+                continue
+            if self._stopping:
+                continue
+            if child.restart_at is None:
+                child.failures += 1
+                delay = min(
+                    self.config.restart_max_backoff_seconds,
+                    self.config.restart_backoff_seconds * 2 ** (child.failures - 1),
+                )
+                child.restart_at = now + delay
+                exitcode = process.exitcode if process is not None else None
+                logger.error(
+                    f"{child.role} process exited with code {exitcode}, restarting in {delay:.0f}s"
+                )
+            elif now >= child.restart_at:
+                child.restarts += 1
+                self._spawn(child)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        self._stopping = True
+        processes = [c.process for c in self.children if c.process is not None]
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"{process.name} did not exit in {timeout:.0f}s, killing")
+                process.kill()
+                process.join()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
@@ -0,0 +1,64 @@
+# src/utils/compute.py
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ComputeMode = Literal["inline", "thread", "process"]
+
+
+class ComputeExecutor:
+    """
+    纯计算任务的执行器，避免长时间计算阻塞事件循环（WebSocket 读取、Telegram 轮询）
+
+    - inline: 在事件循环中直接执行（原有行为）
+    - thread: 线程池，无序列化开销；纯 Python 计算仍受 GIL 限制，但事件循环会按
+      GIL 切换间隔（默认 5ms）得到执行，不会被整段计算阻塞
+    - process: 进程池（spawn），真正并行；参数和结果需要可 pickle，
+      应传紧凑数组（见 src/aggregator/series.py）而不是对象列表
+
+    提交的函数必须是模块级的纯函数。
+    """
+
+    def __init__(self, mode: ComputeMode = "thread", workers: int = 2):
+        self.mode = mode
+        self.workers = max(1, workers)
+        self._pool: Executor | None = None
+
+        self.tasks = 0
+        self.busy_seconds = 0.0  # 累计计算耗时（提交到返回）
+
+    def _executor(self) -> Executor | None:
+        if self.mode == "inline":
+            return None
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="compute")
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        started = time.monotonic()
+        try:
+            pool = self._executor()
+            if pool is None:
+                return fn(*args)
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        finally:
+            self.tasks += 1
+            self.busy_seconds += time.monotonic() - started
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
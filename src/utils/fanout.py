@@ -0,0 +1,85 @@
+# src/utils/fanout.py
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SymbolTiming:
+    symbol: str
+    seconds: float
+    status: str  # ok / timeout / error
+
+
+class SymbolFanout:
+    """
+    逐币种任务并发执行
+
+    最多 concurrency 个币种同时执行，单个币种超过 timeout 秒即取消（从获得执行槽开始计时），
+    一轮的耗时取决于最慢的币种而不是所有币种之和，慢币种或 REST 超时不会拖慢其他币种。
+    每个币种的耗时记录在 debug 日志中，超时和异常记录 warning / error。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int = 4,
+        timeout: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self._clock = clock
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        self.runs = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.last_seconds = 0.0  # 上一轮总耗时
+        self.last_slowest: SymbolTiming | None = None
+
+    async def run(
+        self, symbols: Iterable[str], work: Callable[[str], Awaitable[None]]
+    ) -> list[SymbolTiming]:
+        """执行一轮，返回各币种耗时（与 symbols 顺序一致）"""
+        symbols = list(symbols)
+        if not symbols:
+            return []
+        started = self._clock()
+        timings = list(await asyncio.gather(*(self._run_one(s, work) for s in symbols)))
+
+        self.runs += 1
+        self.last_seconds = self._clock() - started
+        self.last_slowest = max(timings, key=lambda t: t.seconds)
+        logger.debug(
+            f"{self.name}: {len(timings)} symbols in {self.last_seconds:.2f}s "
+            f"(slowest {self.last_slowest.symbol} {self.last_slowest.seconds:.2f}s, "
+            f"sum {sum(t.seconds for t in timings):.2f}s)"
+        )
+        return timings
+
+    async def _run_one(self, symbol: str, work: Callable[[str], Awaitable[None]]) -> SymbolTiming:
+        async with self._semaphore:
+            started = self._clock()
+            status = "ok"
+            try:
+                if self.timeout is None:
+                    await work(symbol)
+                else:
+                    await asyncio.wait_for(work(symbol), timeout=self.timeout)
+            except TimeoutError:
+                status = "timeout"
+                self.timeouts += 1
+                logger.warning(f"{self.name}: {symbol} exceeded {self.timeout:.0f}s budget")
+            except Exception as e:
+                status = "error"
+                self.errors += 1
+                logger.error(f"{self.name} failed for {symbol}: {e}")
+            seconds = self._clock() - started
+            logger.debug(f"{self.name}: {symbol} {status} in {seconds * 1000:.0f}ms")
+            return SymbolTiming(symbol, seconds, status)
@@ -0,0 +1,68 @@
+# src/utils/loop_thread.py
+import asyncio
+import concurrent.futures
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopThread:
+    """
+    在独立线程中运行的事件循环
+
+    submit 把协程交给该线程的事件循环执行（经 call_soon_threadsafe 进入其就绪队列），
+    run 在调用方的事件循环中等待结果而不阻塞调用方。
+    该线程里的慢 I/O 或卡住的请求只占用本线程，不会拖慢调用方的事件循环。
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """启动线程并等待事件循环就绪，重复调用无副作用"""
+        if self.running:
+            return
+        ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, args=(self.loop, ready), name=self.name, daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+        # 取消 stop 时仍未完成的任务，避免 "Task was destroyed but it is pending"
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        if self.loop is None or not self.running:
+            coro.close()
+            raise RuntimeError(f"{self.name} loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if self.loop is not None and self.running:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.loop = None
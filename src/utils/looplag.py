@@ -0,0 +1,44 @@
+# src/utils/looplag.py
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    事件循环延迟监控
+
+    每 interval 秒 sleep 一次，实际唤醒时间比预期晚多少即为事件循环被阻塞的时长
+    （同步计算、大批量对象构造等），保留最近 window 个样本用于统计分位数。
+    超过 warn_threshold 时记录 warning。
+    """
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.1, window: int = 600):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples: deque[float] = deque(maxlen=window)
+        self.max_lag = 0.0
+        self.slow = 0  # 超过 warn_threshold 的次数
+
+    def record(self, lag: float) -> None:
+        self.samples.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.warn_threshold:
+            self.slow += 1
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms")
+
+    def percentile(self, q: float) -> float:
+        """最近样本的 q 分位（0-100），没有样本时为 0"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    async def run(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.monotonic() - started - self.interval))
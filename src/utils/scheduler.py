@@ -0,0 +1,136 @@
+# src/utils/scheduler.py
+import asyncio
+import logging
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    name: str
+    interval: float  # 秒
+    work: Callable[[], Awaitable[None]]
+    offset: float = 0.0  # 相对整点边界的偏移（秒），用于错开不同任务
+    run_at_start: bool = False
+
+    runs: int = 0
+    skipped: int = 0  # 上一次仍在运行而跳过的次数
+    errors: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+    last_started: float | None = None  # 墙钟时间
+    _task: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def avg_duration(self) -> float:
+        return self.total_duration / self.runs if self.runs else 0.0
+
+
+class Scheduler:
+    """
+    统一的周期任务调度
+
+    触发时间按墙钟对齐到 interval 的整数倍（5 分钟任务在 :00 / :05 / ... 触发，与 Binance 的
+    5m 周期边界一致），每次都从墙钟重新计算下一个边界，长时间运行不会漂移。
+    未指定 offset 的任务按注册顺序依次错开 stagger 秒，每次触发再加 [0, jitter) 秒随机抖动，
+    避免所有任务在同一秒触发造成 CPU / 数据库尖峰。
+    上一次运行未结束时跳过本次触发；每个任务记录运行次数、失败次数和耗时。
+    align=False 时以 start() 的时间为起点而不是墙钟整点。
+    """
+
+    def __init__(
+        self,
+        align: bool = True,
+        stagger: float = 0.0,
+        jitter: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.align = align
+        self.stagger = stagger
+        self.jitter = jitter
+        self._clock = clock
+        self._origin = 0.0
+        self.jobs: list[Job] = []
+        self._drivers: list[asyncio.Task[None]] = []
+
+    def add(
+        self,
+        name: str,
+        interval: float,
+        work: Callable[[], Awaitable[None]],
+        offset: float | None = None,
+        run_at_start: bool = False,
+    ) -> Job:
+        if interval <= 0:
+            raise ValueError(f"Job {name} interval must be positive")
+        if offset is None:
+            offset = len(self.jobs) * self.stagger
+        job = Job(name, interval, work, offset % interval, run_at_start)
+        self.jobs.append(job)
+        return job
+
+    def next_run(self, job: Job, now: float) -> float:
+        """now 之后的下一个触发边界（不含抖动）"""
+        base = self._origin + job.offset
+        return base + (math.floor((now - base) / job.interval) + 1) * job.interval
+
+    def start(self) -> None:
+        self._origin = 0.0 if self.align else self._clock()
+        self._drivers = [asyncio.create_task(self._drive(job)) for job in self.jobs]
+
+    async def stop(self) -> None:
+        """停止调度并取消正在运行的任务"""
+        tasks = self._drivers + [job._task for job in self.jobs if job._task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._drivers = []
+
+    async def _drive(self, job: Job) -> None:
+        if job.run_at_start:
+            # 启动时先完整运行一次，再从之后的第一个边界开始对齐
+            self._launch(job)
+            if job._task is not None:
+                await asyncio.wait({job._task})
+        now = self._clock()
+        while True:
+            boundary = self.next_run(job, now)
+            target = boundary + random.uniform(0, min(self.jitter, job.interval / 2))
+            # 墙钟被调整时 sleep 可能提前返回，按墙钟重新确认
+            while (delay := target - self._clock()) > 0:
+                await asyncio.sleep(delay)
+            self._launch(job)
+            # 事件循环长时间阻塞（或系统休眠）时错过的边界不补跑
+            now = max(boundary, self._clock())
+
+    def _launch(self, job: Job) -> None:
+        if job.running:
+            job.skipped += 1
+            logger.warning(f"Job {job.name} still running, skipping this tick")
+            return
+        job._task = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: Job) -> None:
+        job.last_started = self._clock()
+        started = time.monotonic()
+        try:
+            await job.work()
+        except Exception as e:
+            job.errors += 1
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            job.last_duration = time.monotonic() - started
+            job.max_duration = max(job.max_duration, job.last_duration)
+            job.total_duration += job.last_duration
+            job.runs += 1
+            logger.debug(f"Job {job.name} finished in {job.last_duration * 1000:.0f}ms")
@@ -0,0 +1,122 @@
+# src/utils/shm_ring.py
+import struct
+from multiprocessing import shared_memory
+
+# 头部：下一个待写入的序号 / 容量 / 记录长度
+_HEADER = struct.Struct("<QQQ")
+HEADER_SIZE = 64
+# 每条记录的前 8 字节为序号，0 表示正在写入（或从未写入）
+_SEQ = struct.Struct("<Q")
+
+
+class ShmRing:
+    """
+    基于 multiprocessing.shared_memory 的定长记录环形缓冲区（单写多读）
+
+    写入方从不阻塞：缓冲区满时覆盖最旧的记录，读取方通过序号发现覆盖（丢失）。
+    记录先把序号置 0 再写内容、最后写入序号，读取方复制内容前后各读一次序号，
+    两次一致且等于期望序号才算读到完整记录，否则计为丢失。
+    序号从 1 开始，保存在共享内存头部，写入进程重启后从头部序号继续写。
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        assert shm.buf is not None
+        self._buf: memoryview = shm.buf
+        _, capacity, record_size = _HEADER.unpack_from(self._buf, 0)
+        self.capacity: int = capacity
+        self.record_size: int = record_size
+        self.payload_size = self.record_size - _SEQ.size
+
+    @staticmethod
+    def size(capacity: int, record_size: int) -> int:
+        return HEADER_SIZE + capacity * record_size
+
+    @classmethod
+    def create(cls, capacity: int, payload_size: int, name: str | None = None) -> "ShmRing":
+        record_size = _SEQ.size + payload_size
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=cls.size(capacity, record_size)
+        )
+        # 新建的共享内存已清零，所有槽位序号为 0
+        assert shm.buf is not None
+        _HEADER.pack_into(shm.buf, 0, 1, capacity, record_size)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmRing":
+        shm = shared_memory.SharedMemory(name=name)
+        # 子进程由创建方 spawn，共用其 resource_tracker，attach 时的重复登记不会导致误删
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def write_seq(self) -> int:
+        """下一条记录的序号（已写入 write_seq - 1 条）"""
+        return int(_HEADER.unpack_from(self._buf, 0)[0])
+
+    def _offset(self, seq: int) -> int:
+        return HEADER_SIZE + (seq % self.capacity) * self.record_size
+
+    def put(self, payload: bytes) -> int:
+        """写入一条记录，返回其序号"""
+        if len(payload) != self.payload_size:
+            raise ValueError(f"Payload must be {self.payload_size} bytes, got {len(payload)}")
+        seq = self.write_seq
+        offset = self._offset(seq)
+        _SEQ.pack_into(self._buf, offset, 0)
+        self._buf[offset + _SEQ.size : offset + self.record_size] = payload
+        _SEQ.pack_into(self._buf, offset, seq)
+        _SEQ.pack_into(self._buf, 0, seq + 1)
+        return seq
+
+    def reader(self, from_start: bool = False) -> "RingReader":
+        return RingReader(self, from_start)
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingReader:
+    """读取游标：默认从当前最新位置开始，只读之后写入的记录"""
+
+    def __init__(self, ring: ShmRing, from_start: bool = False):
+        self.ring = ring
+        head = ring.write_seq
+        self.next_seq = max(1, head - ring.capacity) if from_start else head
+        self.received = 0
+        self.lost = 0  # 被覆盖或读到一半被改写的记录数
+
+    @property
+    def backlog(self) -> int:
+        return self.ring.write_seq - self.next_seq
+
+    def read(self, max_records: int = 1024) -> list[bytes]:
+        ring = self.ring
+        buf = ring._buf
+        head = ring.write_seq
+        if head - self.next_seq > ring.capacity:
+            # 写入方已经绕过一圈，最旧的记录被覆盖
+            self.lost += head - self.next_seq - ring.capacity
+            self.next_seq = head - ring.capacity
+
+        records: list[bytes] = []
+        while self.next_seq < head and len(records) < max_records:
+            seq = self.next_seq
+            offset = ring._offset(seq)
+            before = _SEQ.unpack_from(buf, offset)[0]
+            payload = bytes(buf[offset + _SEQ.size : offset + ring.record_size])
+            after = _SEQ.unpack_from(buf, offset)[0]
+            self.next_seq += 1
+            if before != seq or after != seq:
+                self.lost += 1
+                continue
+            records.append(payload)
+        self.received += len(records)
+        return records
@@ -22,3 +22,47 @@ def test_calculate_liquidations_empty():
     assert stats.long == 0
     assert stats.short == 0
     assert stats.total == 0
+
+
+def _liq(symbol: str, ts: int, side: str, value: float) -> Liquidation:
+    return Liquidation(None, "binance", symbol, ts, side, 1.0, value, value)
+
+
+def test_liquidation_window_rolls_totals():
+    from src.aggregator.liquidation import LiquidationWindow
+
+    window = LiquidationWindow(window_seconds=60)
+    window.add(_liq("BTC/USDT:USDT", 0, "sell", 100))
+    window.add(_liq("ETH/USDT:USDT", 30_000, "buy", 50))
+    window.add(_liq("BTC/USDT:USDT", 50_000, "buy", 20))
+
+    assert window.market().total == 170
+    assert window.symbol("BTC/USDT:USDT").long == 100
+    assert window.symbol_count == 2
+    assert window.top(1) == [("BTC/USDT:USDT", 120)]
+
+    # 第一笔移出窗口
+    window.add(_liq("SOL/USDT:USDT", 61_000, "sell", 10))
+    assert window.market().long == 10
+    assert window.symbol("BTC/USDT:USDT").total == 20
+
+    # 按当前时间查询时全部过期
+    assert window.market(now_ms=200_000).total == 0
+    assert window.symbol_count == 0
+
+
+def test_detect_cascade():
+    from src.aggregator.liquidation import LiquidationWindow
+
+    window = LiquidationWindow(window_seconds=300)
+    for i in range(5):
+        window.add(_liq(f"T{i}/USDT:USDT", 1000 + i, "sell", 1_000_000))
+
+    assert window.detect_cascade(min_total_usd=10_000_000, min_symbols=3) is None
+    assert window.detect_cascade(min_total_usd=1_000_000, min_symbols=6) is None
+
+    cascade = window.detect_cascade(min_total_usd=5_000_000, min_symbols=5)
+    assert cascade is not None
+    assert cascade.symbols == 5
+    assert cascade.total.long == 5_000_000
+    assert len(cascade.top) == 5
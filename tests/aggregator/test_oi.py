@@ -1,5 +1,5 @@
 # tests/aggregator/test_oi.py
-from src.aggregator.oi import calculate_oi_change, interpret_oi_price
+from src.aggregator.oi import calculate_oi_change, interpret_oi_price, oi_at, oi_changes
 from src.storage.models import OISnapshot
 
 
@@ -37,3 +37,19 @@ def test_interpret_oi_price_long_close():
 
 def test_interpret_oi_price_stable():
     assert interpret_oi_price(oi_change=0.5, price_change=0.5) == "持仓稳定"
+
+
+def test_oi_at_and_hourly_changes():
+    hour = 3600 * 1000
+    now = 10 * hour
+    # 每小时一条快照，OI 每小时增长 1%
+    snapshots = [
+        OISnapshot(None, "binance", "BTC/USDT:USDT", now - h * hour, 1, 100 * 1.01 ** (10 - h))
+        for h in range(10, -1, -1)
+    ]
+    assert oi_at(snapshots, now - hour - 1) is snapshots[-3]
+    assert oi_at(snapshots, -1) is None
+
+    changes = oi_changes(snapshots, now, 5)
+    assert len(changes) == 4
+    assert all(abs(c - 1.0) < 1e-9 for c in changes)
@@ -0,0 +1,88 @@
+# tests/aggregator/test_orderbook.py
+import pytest
+
+from src.aggregator.orderbook import (
+    OrderBook,
+    book_metrics,
+    depth_within_bps,
+    find_walls,
+    imbalance,
+)
+
+
+def _book() -> OrderBook:
+    book = OrderBook("BTC/USDT:USDT")
+    book.load_snapshot(
+        100,
+        bids=[(99.0, 1.0), (100.0, 2.0), (98.0, 3.0)],
+        asks=[(102.0, 1.0), (101.0, 2.0), (103.0, 0.0)],
+    )
+    return book
+
+
+def test_snapshot_sorts_sides_and_drops_empty_levels():
+    book = _book()
+    assert book.bids.levels() == [(100.0, 2.0), (99.0, 1.0), (98.0, 3.0)]
+    assert book.asks.levels() == [(101.0, 2.0), (102.0, 1.0)]
+    assert book.last_update_id == 100
+    assert book.mid == 100.5
+    assert book.spread_bps == pytest.approx(1 / 100.5 * 10_000)
+
+
+def test_apply_updates_inserts_and_deletes_levels():
+    book = _book()
+    book.apply(bids=[(100.0, 0.0), (100.5, 4.0)], asks=[(101.0, 5.0), (104.0, 1.0)], update_id=105)
+
+    assert book.bids.best() == (100.5, 4.0)
+    assert book.bids.levels(2) == [(100.5, 4.0), (99.0, 1.0)]
+    assert book.asks.levels() == [(101.0, 5.0), (102.0, 1.0), (104.0, 1.0)]
+    assert book.last_update_id == 105
+
+
+def test_delete_missing_level_is_ignored():
+    book = _book()
+    book.apply(bids=[(50.0, 0.0)], asks=[], update_id=101)
+    assert len(book.bids) == 3
+
+
+def test_empty_book_has_no_mid():
+    book = OrderBook("BTC/USDT:USDT")
+    assert book.mid is None
+    assert book.spread_bps is None
+    assert book_metrics(book) is None
+    assert depth_within_bps(book, 10) == (0.0, 0.0)
+
+
+def test_imbalance_uses_notional_of_top_levels():
+    book = _book()
+    bid = 100 * 2 + 99 * 1
+    ask = 101 * 2 + 102 * 1
+    assert imbalance(book, levels=2) == pytest.approx((bid - ask) / (bid + ask))
+
+
+def test_depth_within_bps_includes_boundary_levels():
+    book = _book()
+    # mid 100.5，±100bps => [99.495, 101.505]
+    bid, ask = depth_within_bps(book, 100)
+    assert bid == 100 * 2
+    assert ask == 101 * 2
+
+
+def test_find_walls_against_side_median():
+    book = OrderBook("BTC/USDT:USDT")
+    book.load_snapshot(
+        1,
+        bids=[(100.0 - i, 1.0) for i in range(10)] + [(95.5, 50.0)],
+        asks=[(101.0 + i, 1.0) for i in range(10)],
+    )
+    walls = find_walls(book, levels=20, multiple=5.0)
+    assert [(w.side, w.price) for w in walls] == [("bid", 95.5)]
+    assert walls[0].notional == 95.5 * 50
+
+
+def test_book_metrics_collects_all_fields():
+    metrics = book_metrics(_book(), imbalance_levels=2, depth_bps=(10, 100))
+    assert metrics is not None
+    assert metrics.mid == 100.5
+    assert set(metrics.depth) == {10, 100}
+    assert metrics.depth[10] == (0.0, 0.0)
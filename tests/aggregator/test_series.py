@@ -0,0 +1,24 @@
+# tests/aggregator/test_series.py
+import pickle
+
+from src.aggregator.series import HOUR_MS, hourly_sums
+from src.storage.models import Series
+
+
+def test_hourly_sums_groups_consecutive_hours():
+    series = Series.from_rows(
+        [(0, 1.0), (HOUR_MS - 1, 2.0), (HOUR_MS, -5.0), (3 * HOUR_MS + 10, 4.0)]
+    )
+
+    assert hourly_sums(series) == [3.0, -5.0, 4.0]  # 没有数据的小时不出现
+    assert hourly_sums(Series()) == []
+
+
+def test_series_is_compact_and_picklable():
+    series = Series.from_rows((i * 1000, float(i)) for i in range(1000))
+
+    assert len(series) == 1000
+    assert series.timestamps.itemsize == 8
+    restored = pickle.loads(pickle.dumps(series))
+    assert restored == series
+    assert len(pickle.dumps(series)) < 20_000  # 两个 8 字节数组，约 16KB
@@ -0,0 +1,63 @@
+# tests/alert/test_dirty.py
+import asyncio
+
+from src.alert.dirty import DirtySet, DirtyTracker
+
+
+async def test_marked_symbols_are_batched_after_debounce():
+    dirty = DirtySet("test", ["trade"], debounce=0.01, fallback=60)
+
+    async def mark_later() -> None:
+        dirty.mark("BTC/USDT:USDT")
+        await asyncio.sleep(0.005)  # 在 debounce 窗口内，合并到同一批次
+        dirty.mark("ETH/USDT:USDT")
+
+    task = asyncio.create_task(mark_later())
+    batch = await asyncio.wait_for(dirty.next_batch(), timeout=1)
+    await task
+
+    assert batch == {"BTC/USDT:USDT", "ETH/USDT:USDT"}
+    assert dirty.batches == 1
+
+
+async def test_fallback_returns_none_without_events():
+    dirty = DirtySet("test", ["trade"], debounce=0, fallback=0.01)
+    assert await asyncio.wait_for(dirty.next_batch(), timeout=1) is None
+    assert dirty.full_runs == 1
+
+
+async def test_continuous_events_do_not_starve_fallback():
+    now = [0.0]
+    dirty = DirtySet("test", ["trade"], debounce=0, fallback=60, clock=lambda: now[0])
+
+    dirty.mark("BTC/USDT:USDT")
+    assert await dirty.next_batch() == {"BTC/USDT:USDT"}
+
+    now[0] = 61.0
+    dirty.mark("BTC/USDT:USDT")
+    assert await dirty.next_batch() is None
+    # 全量评估已覆盖，之前的标记被清空
+    now[0] = 62.0
+    dirty.mark("ETH/USDT:USDT")
+    assert await dirty.next_batch() == {"ETH/USDT:USDT"}
+
+
+async def test_tracker_routes_by_kind():
+    tracker = DirtyTracker(debounce=0)
+    trades = tracker.subscribe("trades", ["trade"], fallback=60)
+    all_events = tracker.subscribe("all", ["trade", "liquidation"], fallback=60)
+
+    tracker.mark("BTC/USDT:USDT", "liquidation")
+    tracker.mark("ETH/USDT:USDT", "trade")
+
+    assert await all_events.next_batch() == {"BTC/USDT:USDT", "ETH/USDT:USDT"}
+    assert await trades.next_batch() == {"ETH/USDT:USDT"}
+
+
+async def test_disabled_tracker_ignores_marks():
+    tracker = DirtyTracker(enabled=False, debounce=0)
+    dirty = tracker.subscribe("trades", ["trade"], fallback=0.01)
+    tracker.mark("BTC/USDT:USDT", "trade")
+
+    assert dirty.marks == 0
+    assert await asyncio.wait_for(dirty.next_batch(), timeout=1) is None
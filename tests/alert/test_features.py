@@ -0,0 +1,176 @@
+# tests/alert/test_features.py
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.aggregator.orderbook import OrderBook, book_metrics
+from src.alert.features import FEATURES, FeatureSources, HistoryCache, compute_plan, resolve
+from src.collector.indicator_fetcher import Indicators
+from src.storage.models import MarketIndicator, OISnapshot, Series, Trade
+from src.utils.compute import ComputeExecutor
+
+NOW = 1_700_000_000_000
+HOUR = 3600 * 1000
+
+
+def _trade(hours_ago: float, side: str, value: float) -> Trade:
+    ts = NOW - int(hours_ago * HOUR)
+    return Trade(None, "binance", "BTC/USDT:USDT", ts, 100.0, 1.0, side, value)
+
+
+def _oi(hours_ago: float, value: float) -> OISnapshot:
+    return OISnapshot(None, "binance", "BTC/USDT:USDT", NOW - int(hours_ago * HOUR), 1.0, value)
+
+
+def _sources(
+    indicators: Indicators | None = None, compute: ComputeExecutor | None = None
+) -> FeatureSources:
+    db = MagicMock()
+    trades = [_trade(3.5, "buy", 300), _trade(0.5, "buy", 500), _trade(0.2, "sell", 200)]
+    db.get_trades = AsyncMock(return_value=trades)
+    db.get_trade_series = AsyncMock(
+        return_value=Series.from_rows(
+            (t.timestamp, t.value_usd if t.side == "buy" else -t.value_usd)
+            for t in reversed(trades)
+        )
+    )
+    db.get_liquidations = AsyncMock(return_value=[])
+    db.get_liquidation_series = AsyncMock(return_value=Series())
+    db.get_oi_history = AsyncMock(return_value=[_oi(3, 100), _oi(1.5, 110), _oi(0, 121)])
+    db.get_latest_market_indicator = AsyncMock(
+        return_value=MarketIndicator(None, "BTC/USDT:USDT", NOW, 1.2, 1.3, 0.9, 1.1)
+    )
+    db.get_market_indicator_history = AsyncMock(return_value=[])
+    db.get_long_short_snapshots = AsyncMock(return_value=[])
+    db.get_latest_long_short_snapshot = AsyncMock(return_value={"long_short_ratio": 1.4})
+    db.get_funding_rates = AsyncMock(return_value=[])
+    db.get_price_at = AsyncMock(return_value=90.0)
+    fetcher = MagicMock()
+    fetcher.fetch_indicators = AsyncMock(return_value=indicators)
+    return FeatureSources(db, fetcher, window_hours=168, now_ms=NOW, compute=compute)
+
+
+def test_resolve_orders_dependencies_first_and_shares_nodes():
+    plan = resolve(["flow_1h_pct", "flow_1h_abs_pct", "flow_binance"])
+    names = [node.name for node in plan]
+
+    assert len(names) == len(set(names))
+    for node in plan:
+        for dep in node.deps:
+            assert names.index(dep) < names.index(node.name)
+    assert names.count("trade_series") == 1
+
+
+def test_resolve_rejects_unknown_feature():
+    with pytest.raises(ValueError, match="Unknown feature"):
+        resolve(["no_such_feature"])
+
+
+def test_percentile_features_record_their_value_feature():
+    assert FEATURES["oi_change_1h_abs_pct"].value_of == "oi_change_1h"
+    assert FEATURES["top_position_pct"].value_of == "top_position_ratio"
+
+
+async def test_each_source_is_queried_once_per_plan():
+    sources = _sources(Indicators(0.01, 100.0, 99.0))
+    plan = resolve(["flow_1h", "flow_1h_pct", "flow_1h_abs_pct", "oi_change_1h", "price_change_1h"])
+
+    values = await compute_plan(plan, sources, "BTC/USDT:USDT")
+
+    sources.db.get_trades.assert_awaited_once_with("BTC/USDT:USDT", hours=1)
+    sources.db.get_trade_series.assert_awaited_once_with("BTC/USDT:USDT", hours=168)
+    sources.db.get_oi_history.assert_awaited_once()
+    assert values["flow_1h"] == 300  # 只统计最近 1 小时
+    assert sum(values["flow_history"]) == 600  # 按整点小时聚合的窗口内净流入
+    assert values["oi_change_1h"] == pytest.approx(10.0)  # 121 vs 1 小时前的 110
+    assert values["price_change_1h"] == pytest.approx(10.0)
+
+
+async def test_oi_change_history_uses_snapshot_at_each_hour():
+    sources = _sources()
+    values = await compute_plan(resolve(["oi_change_history"]), sources, "BTC/USDT:USDT")
+
+    # 1h 前 = 110, 2h 前 = 100 (3h 前的快照), 3h 前 = 100
+    assert values["oi_change_history"][:2] == [pytest.approx(10.0), 0.0]
+
+
+async def test_missing_source_propagates_none():
+    sources = _sources(indicators=None)
+    values = await compute_plan(
+        resolve(["price", "funding_rate_pct", "flow_1h", "long_short_ratio"]),
+        sources,
+        "BTC/USDT:USDT",
+    )
+
+    assert values["price"] is None
+    assert values["funding_rate_pct"] is None
+    assert values["flow_1h"] == 300
+    # 多空比取自数据库中的最新快照，不依赖 REST 指标
+    assert values["long_short_ratio"] == 1.4
+
+
+async def test_offloaded_features_match_inline_results():
+    plan = resolve(["flow_1h_pct", "flow_history_abs", "liq_1h_pct"])
+    compute = ComputeExecutor("thread", workers=1)
+    try:
+        offloaded = await compute_plan(plan, _sources(compute=compute), "BTC/USDT:USDT")
+    finally:
+        compute.close()
+    inline = await compute_plan(plan, _sources(), "BTC/USDT:USDT")
+
+    assert FEATURES["flow_history"].offload
+    assert compute.tasks == 2  # flow_history + liq_history
+    assert offloaded == inline
+
+
+async def test_history_cache_reuses_hourly_features_within_the_hour():
+    targets = ["flow_1h", "flow_1h_pct", "oi_change_1h_pct", "top_position_pct"]
+    plan = resolve(targets)
+    cache = HistoryCache()
+    sources = _sources()
+    db = sources.db
+
+    first = await compute_plan(plan, sources, "BTC/USDT:USDT", cache, targets)
+    second = await compute_plan(plan, sources, "BTC/USDT:USDT", cache, targets)
+
+    # 事件触发的第二次评估只重新读取最近 1 小时的数据
+    assert db.get_trades.await_count == 2
+    assert db.get_oi_history.await_count == 3  # oi_recent x2 + oi_window x1
+    db.get_trade_series.assert_awaited_once()
+    db.get_market_indicator_history.assert_awaited_once()
+    assert {k: second[k] for k in targets} == {k: first[k] for k in targets}
+    assert cache.hits > 0
+
+    # 跨过整点后重新计算
+    sources.now_ms += HOUR
+    await compute_plan(plan, sources, "BTC/USDT:USDT", cache, targets)
+    assert db.get_trade_series.await_count == 2
+
+    cache.clear()
+    sources.now_ms += 1
+    await compute_plan(plan, sources, "BTC/USDT:USDT", cache, targets)
+    assert db.get_trade_series.await_count == 3
+
+
+async def test_book_features_come_from_local_order_book():
+    book = OrderBook("BTCUSDT")
+    book.load_snapshot(
+        1,
+        bids=[(99.9, 10), (99.8, 10), (99.0, 200)],
+        asks=[(100.1, 10), (100.2, 10), (101.0, 10)],
+    )
+    sources = _sources()
+    sources.book = lambda symbol: book_metrics(book, depth_bps=(10, 50), wall_multiple=5)
+    targets = ["book_imbalance", "bid_depth_10bps", "ask_depth_50bps", "bid_wall", "ask_wall"]
+    values = await compute_plan(resolve(targets), sources, "BTC/USDT:USDT")
+
+    assert values["book_imbalance"] > 0.7
+    assert values["bid_depth_10bps"] == pytest.approx(99.9 * 10)
+    assert values["ask_depth_50bps"] == pytest.approx(100.1 * 10 + 100.2 * 10)
+    assert values["bid_wall"] == pytest.approx(99.0 * 200)
+    assert values["ask_wall"] == 0
+
+    # 未启用订单簿时盘口特征为 None，依赖它的规则跳过
+    sources.book = None
+    values = await compute_plan(resolve(targets), sources, "BTC/USDT:USDT")
+    assert all(values[name] is None for name in targets)
@@ -0,0 +1,122 @@
+# tests/alert/test_price_index.py
+from src.alert.price_index import PriceLevelIndex
+from src.storage.models import PriceAlert
+
+
+def _alert(alert_id: int, price: float, position: str, symbol: str = "BTC") -> PriceAlert:
+    return PriceAlert(
+        id=alert_id,
+        symbol=symbol,
+        price=price,
+        last_position=position,
+        last_triggered_at=None,
+    )
+
+
+def _index(*alerts: PriceAlert, cooldown: int = 3600) -> PriceLevelIndex:
+    index = PriceLevelIndex(cooldown_seconds=cooldown)
+    index.load(alerts)
+    return index
+
+
+def test_crossing_between_ticks_is_detected():
+    index = _index(_alert(1, 100.0, "below"), _alert(2, 110.0, "below"))
+    assert index.on_price("BTC", 95.0, now=1000) == []
+
+    crossings = index.on_price("BTC", 105.0, now=1000)
+
+    assert [(c.alert.id, c.type, c.notify) for c in crossings] == [(1, "breakout", True)]
+    assert crossings[0].alert.last_position == "above"
+    assert crossings[0].alert.last_triggered_at == 1000
+
+
+def test_wick_through_level_and_back_triggers_both_ways():
+    index = _index(_alert(1, 100.0, "above"), cooldown=0)
+    index.on_price("BTC", 101.0)
+
+    down = index.on_price("BTC", 99.0, now=1000)
+    up = index.on_price("BTC", 101.0, now=1001)
+
+    assert [c.type for c in down] == ["breakdown"]
+    assert [c.type for c in up] == ["breakout"]
+
+
+def test_large_move_crosses_all_levels_in_range():
+    index = _index(*(_alert(i, 100.0 + i, "below") for i in range(10)))
+    index.on_price("BTC", 99.0)
+
+    crossings = index.on_price("BTC", 104.5, now=1000)
+
+    assert [c.alert.price for c in crossings] == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+
+def test_cooldown_updates_position_without_notifying():
+    index = _index(_alert(1, 100.0, "below"), cooldown=3600)
+    index.on_price("BTC", 99.0)
+    index.on_price("BTC", 101.0, now=1000)
+    index.on_price("BTC", 99.0, now=1100)
+
+    crossings = index.on_price("BTC", 101.0, now=1200)
+
+    assert [(c.type, c.notify) for c in crossings] == [("breakout", False)]
+    assert crossings[0].alert.last_position == "above"
+    assert crossings[0].alert.last_triggered_at == 1000
+
+
+def test_first_price_reconciles_stored_position():
+    # 离线期间价格已越过关注价位
+    index = _index(_alert(1, 100.0, "below"), _alert(2, 120.0, "above"))
+
+    crossings = index.on_price("BTC", 110.0, now=1000)
+
+    assert sorted((c.alert.id, c.type) for c in crossings) == [(1, "breakout"), (2, "breakdown")]
+
+
+def test_touching_level_counts_as_crossing():
+    index = _index(_alert(1, 100.0, "above"))
+    index.on_price("BTC", 101.0)
+    assert [c.type for c in index.on_price("BTC", 100.0, now=1000)] == ["breakdown"]
+
+
+def test_add_remove_and_listing():
+    index = _index(_alert(1, 100.0, "below"), _alert(2, 90.0, "above"))
+    index.add(_alert(3, 100.0, "below"))
+    index.add(_alert(4, 5.0, "below", symbol="ETH"))
+
+    assert [a.id for a in index.alerts("BTC")] == [2, 1, 3]
+    assert index.symbols() == ["BTC", "ETH"]
+    assert len(index) == 3
+
+    index.remove("BTC", 100.0)
+    index.remove("BTC", 12345.0)
+    index.remove("ETH", 5.0)
+
+    assert [a.id for a in index.alerts("BTC")] == [2]
+    assert index.symbols() == ["BTC"]
+    index.on_price("BTC", 95.0)
+    assert index.on_price("BTC", 101.0) == []
+
+
+def test_per_chat_remove_and_listing():
+    mine = _alert(1, 100.0, "below")
+    mine.chat_id = "100"
+    theirs = _alert(2, 100.0, "below")
+    theirs.chat_id = "200"
+    index = _index(mine, theirs)
+
+    assert [a.id for a in index.alerts("BTC", chat_id="200")] == [2]
+
+    index.remove("BTC", 100.0, chat_id="200")
+    assert [a.id for a in index.alerts("BTC")] == [1]
+    index.on_price("BTC", 95.0)
+    assert [c.alert.id for c in index.on_price("BTC", 101.0)] == [1]
+
+
+def test_other_symbols_and_unchanged_price_are_ignored():
+    index = _index(_alert(1, 100.0, "below"))
+    assert index.on_price("ETH", 200.0) == []
+    index.on_price("BTC", 99.0)
+    assert index.on_price("BTC", 99.0) == []
+    assert index.seconds_since_update("BTC") < 1
+    assert index.seconds_since_update("ETH") < 1
+    assert index.seconds_since_update("SOL") == float("inf")
@@ -0,0 +1,166 @@
+# tests/alert/test_rules.py
+import pytest
+
+from src.alert.features import FEATURES
+from src.alert.rules import TIERED_DIMENSIONS, RuleEngine, default_rules
+from src.config import Config, RuleConfig
+from src.notifier.formatter import RULE_FORMATS
+
+FORMAT_FEATURES = {name: fmt.required for name, fmt in RULE_FORMATS.items()}
+
+
+def _config(**alerts: object) -> Config:
+    return Config(
+        symbols=["BTC/USDT:USDT"],
+        telegram={"bot_token": "x", "chat_id": "1"},
+        alerts=alerts,
+    )
+
+
+def _values(**overrides: object) -> dict[str, object]:
+    """全部特征取中性值"""
+    values: dict[str, object] = {name: 0.0 for name in FEATURES}
+    values.update({name: [] for name in ("ls_history", "oi_change_history_abs")})
+    values.update(price=100.0, price_change_1h=0.0)
+    values.update(overrides)
+    return values
+
+
+def test_default_rules_compile_into_one_shared_plan():
+    engine = RuleEngine(default_rules(_config()), FORMAT_FEATURES)
+
+    names = [rule.name for rule in engine.rules]
+    assert names[:5] == ["whale_flow", "oi_change", "liquidation", "observe", "important"]
+    plan = [node.name for node in engine.plan]
+    assert len(plan) == len(set(plan))
+    # 规则数量不影响查询次数：每个数据源只出现一次
+    assert sorted(engine.sources) == sorted(set(engine.sources))
+    assert "oi_window" in engine.sources
+
+
+def test_threshold_rule_with_cooldown():
+    rule = RuleConfig(
+        name="whale", type="threshold", feature="flow_1h", absolute=True, above=1_000_000
+    )
+    engine = RuleEngine([rule], FORMAT_FEATURES)
+
+    assert engine.evaluate("BTC", _values(flow_1h=-500_000), now=0) == []
+    events = engine.evaluate("BTC", _values(flow_1h=-2_000_000), now=0)
+    assert [e.rule.name for e in events] == ["whale"]
+    # 冷却期内不再触发，冷却期按币种区分
+    assert engine.evaluate("BTC", _values(flow_1h=-2_000_000), now=60) == []
+    assert len(engine.evaluate("ETH", _values(flow_1h=-2_000_000), now=60)) == 1
+    assert len(engine.evaluate("BTC", _values(flow_1h=-2_000_000), now=1800)) == 1
+
+
+def test_rule_skipped_when_feature_missing():
+    rule = RuleConfig(name="whale", type="threshold", feature="flow_1h", above=1)
+    engine = RuleEngine([rule], FORMAT_FEATURES)
+
+    # 默认格式需要价格，指标缺失时不触发
+    assert engine.evaluate("BTC", _values(flow_1h=10, price=None)) == []
+
+
+def test_crossover_rule_needs_previous_value():
+    rule = RuleConfig(
+        name="flip",
+        type="crossover",
+        feature="top_position_ratio",
+        level=1,
+        cooldown_minutes=0,
+        message="大户方向反转：{direction}",
+        up_label="转多",
+        down_label="转空",
+        format="insight",
+    )
+    engine = RuleEngine([rule], FORMAT_FEATURES)
+
+    assert engine.evaluate("BTC", _values(top_position_ratio=1.2)) == []
+    events = engine.evaluate("BTC", _values(top_position_ratio=0.9))
+    assert [e.message for e in events] == ["大户方向反转：转空"]
+    assert engine.evaluate("BTC", _values(top_position_ratio=0.8)) == []
+    events = engine.evaluate("BTC", _values(top_position_ratio=1.1))
+    assert [e.message for e in events] == ["大户方向反转：转多"]
+
+
+def test_crossover_min_abs():
+    rule = RuleConfig(
+        name="reversal", type="crossover", feature="flow_1h", min_abs=5_000_000, cooldown_minutes=0
+    )
+    engine = RuleEngine([rule], FORMAT_FEATURES)
+
+    engine.evaluate("BTC", _values(flow_1h=-1_000_000))
+    assert engine.evaluate("BTC", _values(flow_1h=1_000_000)) == []
+    engine.evaluate("BTC", _values(flow_1h=-1_000_000))
+    assert len(engine.evaluate("BTC", _values(flow_1h=6_000_000))) == 1
+
+
+def test_percentile_rule_direction_label():
+    rules = [r for r in default_rules(_config()) if r.name == "taker_extreme"]
+    engine = RuleEngine(rules, FORMAT_FEATURES)
+
+    assert engine.evaluate("BTC", _values(taker_ratio=0.7, taker_ratio_pct=80)) == []
+    events = engine.evaluate("BTC", _values(taker_ratio=0.7, taker_ratio_pct=95))
+    assert [e.message for e in events] == ["主动卖出极端"]
+
+
+def test_tiered_confluence_rules_split_by_dimension_count():
+    engine = RuleEngine(
+        [r for r in default_rules(_config()) if r.type == "confluence"], FORMAT_FEATURES
+    )
+    history = [1.0] * 10
+    base = _values(oi_change_history_abs=history, ls_history=history)
+
+    one = {**base, "liq_1h_pct": 95.0}
+    assert [e.rule.name for e in engine.evaluate("A", one)] == ["observe"]
+
+    three = {**one, "funding_rate_pct": 92.0, "top_position_pct": 99.0}
+    events = engine.evaluate("B", three)
+    assert [e.rule.name for e in events] == ["important"]
+    assert events[0].dimensions == [("爆仓", 95.0), ("资金费率", 92.0), ("大户持仓", 99.0)]
+
+    # 历史数据不足时跳过
+    assert engine.evaluate("C", {**three, "ls_history": [1.0]}) == []
+
+
+def test_extremes_map_percentiles_to_value_features():
+    engine = RuleEngine(
+        [r for r in default_rules(_config()) if r.name == "important"], FORMAT_FEATURES
+    )
+    history = [1.0] * 10
+    values = _values(
+        oi_change_history_abs=history,
+        ls_history=history,
+        liq_1h=5_000_000.0,
+        liq_1h_pct=90.0,
+        flow_1h_abs_pct=89.0,
+    )
+
+    assert engine.extremes(values) == [("liq_1h", 5_000_000.0, 90.0)]
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError, match="unknown feature"):
+        RuleEngine([RuleConfig(name="x", type="threshold", feature="nope")])
+    with pytest.raises(ValueError, match="unknown format"):
+        RuleEngine(
+            [RuleConfig(name="x", type="threshold", feature="flow_1h", format="nope")],
+            FORMAT_FEATURES,
+        )
+    with pytest.raises(ValueError, match="Duplicate"):
+        rule = RuleConfig(name="x", type="threshold", feature="flow_1h")
+        RuleEngine([rule, rule])
+
+
+def test_disabled_legacy_sections_produce_no_rules():
+    config = _config(
+        whale_flow={"enabled": False},
+        observe={"enabled": False},
+        important={"enabled": False},
+    )
+    names = [rule.name for rule in default_rules(config)]
+
+    assert "whale_flow" not in names
+    assert "observe" not in names and "important" not in names
+    assert "oi_change" in names
+    assert set(TIERED_DIMENSIONS.values()) <= set(FEATURES)
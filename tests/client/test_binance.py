@@ -120,12 +120,19 @@ async def test_get_open_interest_hist():
 
 
 @pytest.mark.asyncio
-async def test_get_funding_rate():
-    from src.client.models import FundingRate
+async def test_get_premium_index():
+    from src.client.models import PremiumIndex
 
     client = BinanceClient()
 
-    mock_data = [{"symbol": "BTCUSDT", "fundingRate": "0.0001", "fundingTime": 1704067200000}]
+    mock_data = {
+        "symbol": "BTCUSDT",
+        "markPrice": "100050.0",
+        "indexPrice": "100000.0",
+        "lastFundingRate": "0.0001",
+        "nextFundingTime": 1704096000000,
+        "time": 1704067200000,
+    }
     mock_response = MagicMock()
     mock_response.status = 200
     mock_response.json = AsyncMock(return_value=mock_data)
@@ -134,9 +141,10 @@ async def test_get_funding_rate():
     mock_session.get = AsyncMock(return_value=mock_response)
     client._session = mock_session
 
-    fr = await client.get_funding_rate("BTCUSDT")
-    assert isinstance(fr, FundingRate)
-    assert fr.funding_rate == 0.0001
+    premium = await client.get_premium_index("BTCUSDT")
+    assert isinstance(premium, PremiumIndex)
+    assert premium.funding_rate == 0.0001
+    assert premium.index_price == 100000.0
 
 
 @pytest.mark.asyncio
@@ -246,3 +254,34 @@ async def test_get_taker_long_short_ratio():
     assert isinstance(ratio, TakerRatio)
     assert ratio.buy_sell_ratio == 1.10
     assert ratio.buy_vol == 5000.0
+
+
+@pytest.mark.asyncio
+async def test_get_long_short_ratio_hist_passes_time_range():
+    client = BinanceClient()
+
+    mock_data = [
+        {
+            "symbol": "BTCUSDT",
+            "longAccount": "0.6",
+            "shortAccount": "0.4",
+            "longShortRatio": "1.5",
+            "timestamp": 1704067200000,
+        }
+    ]
+    mock_response = MagicMock()
+    mock_response.status = 200
+    mock_response.json = AsyncMock(return_value=mock_data)
+
+    mock_session = MagicMock()
+    mock_session.get = AsyncMock(return_value=mock_response)
+    client._session = mock_session
+
+    ratios = await client.get_long_short_ratio_hist(
+        "top_position", "BTCUSDT", "1h", limit=500, start_time=1, end_time=2
+    )
+    assert ratios[0].long_short_ratio == 1.5
+    url = mock_session.get.call_args.args[0]
+    params = mock_session.get.call_args.kwargs["params"]
+    assert url.endswith("/futures/data/topLongShortPositionRatio")
+    assert params["startTime"] == 1 and params["endTime"] == 2
@@ -0,0 +1,136 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.client.binance import BinanceClient
+from src.client.cache import ResponseCache, cache_key
+from src.client.rate_limiter import Priority, current_priority, request_priority
+
+
+def test_cache_key_ignores_param_order():
+    assert cache_key("/x", {"a": 1, "b": "2"}) == cache_key("/x", {"b": 2, "a": "1"})
+
+
+async def test_cache_hit_within_ttl():
+    now = [0.0]
+    cache = ResponseCache({"/x": 5.0}, clock=lambda: now[0])
+    fetch = AsyncMock(return_value={"v": 1})
+
+    assert await cache.get_or_fetch("/x", {"s": "BTC"}, fetch) == {"v": 1}
+    assert await cache.get_or_fetch("/x", {"s": "BTC"}, fetch) == {"v": 1}
+    assert fetch.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 过期后重新请求
+    now[0] = 5.0
+    await cache.get_or_fetch("/x", {"s": "BTC"}, fetch)
+    assert fetch.call_count == 2
+
+
+async def test_cache_bypasses_endpoints_without_ttl():
+    cache = ResponseCache({"/x": 5.0})
+    fetch = AsyncMock(return_value=1)
+
+    await cache.get_or_fetch("/y", None, fetch)
+    await cache.get_or_fetch("/y", None, fetch)
+    assert fetch.call_count == 2
+    assert cache.misses == 0
+
+
+async def test_cache_coalesces_concurrent_requests():
+    cache = ResponseCache({"/x": 5.0})
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(cache.get_or_fetch("/x", None, fetch) for _ in range(5)))
+    assert results == [42] * 5
+    assert calls == 1
+    assert cache.coalesced == 4
+
+
+async def test_higher_priority_caller_does_not_wait_on_lower_priority_request():
+    cache = ResponseCache({"/x": 5.0})
+    release = asyncio.Event()
+    priorities: list[Priority] = []
+
+    async def fetch() -> Priority:
+        priority = current_priority()
+        priorities.append(priority)
+        if priority == Priority.BACKFILL:
+            await release.wait()  # 回填请求在限流队列中排队
+        return priority
+
+    with request_priority(Priority.BACKFILL):
+        backfill = asyncio.create_task(cache.get_or_fetch("/x", None, fetch))
+    await asyncio.sleep(0)
+
+    with request_priority(Priority.ALERT):
+        assert await cache.get_or_fetch("/x", None, fetch) == Priority.ALERT
+    # 告警请求完成后写入缓存，之后的调用方直接命中
+    assert await cache.get_or_fetch("/x", None, fetch) == Priority.ALERT
+    assert priorities == [Priority.BACKFILL, Priority.ALERT]
+
+    release.set()
+    assert await backfill == Priority.BACKFILL
+
+
+async def test_lower_priority_caller_joins_higher_priority_request():
+    cache = ResponseCache({"/x": 5.0})
+    fetch_calls = 0
+
+    async def fetch() -> int:
+        nonlocal fetch_calls
+        fetch_calls += 1
+        await asyncio.sleep(0.01)
+        return 1
+
+    with request_priority(Priority.ALERT):
+        alert = asyncio.create_task(cache.get_or_fetch("/x", None, fetch))
+    await asyncio.sleep(0)
+    with request_priority(Priority.BACKFILL):
+        assert await cache.get_or_fetch("/x", None, fetch) == 1
+    await alert
+
+    assert fetch_calls == 1
+    assert cache.coalesced == 1
+
+
+async def test_cache_does_not_store_errors():
+    cache = ResponseCache({"/x": 5.0})
+    fetch = AsyncMock(side_effect=[RuntimeError("boom"), 7])
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("/x", None, fetch)
+    assert await cache.get_or_fetch("/x", None, fetch) == 7
+
+
+async def test_client_caches_identical_get_requests():
+    client = BinanceClient()
+
+    mock_response = MagicMock()
+    mock_response.status = 200
+    mock_response.json = AsyncMock(
+        return_value={
+            "symbol": "BTCUSDT",
+            "markPrice": "100000.0",
+            "indexPrice": "99950.0",
+            "lastFundingRate": "0.0001",
+            "nextFundingTime": 1,
+            "time": 1,
+        }
+    )
+    mock_session = MagicMock()
+    mock_session.get = AsyncMock(return_value=mock_response)
+    client._session = mock_session
+
+    await asyncio.gather(*(client.get_premium_index("BTCUSDT") for _ in range(3)))
+    await client.get_premium_index("BTCUSDT")
+    await client.get_premium_index("ETHUSDT")
+
+    assert mock_session.get.call_count == 2
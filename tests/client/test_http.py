@@ -0,0 +1,43 @@
+from src.client.binance import BinanceClient
+from src.client.http import HttpPool, HttpSettings, create_session
+from src.scripts.mock_binance import MockBinanceServer
+
+
+async def test_create_session_applies_settings():
+    settings = HttpSettings(limit_per_host=7, dns_cache_ttl=120, read_timeout=3.0, compress=False)
+    session = create_session(settings)
+    try:
+        assert session.connector is not None
+        assert session.connector.limit_per_host == 7
+        assert session.timeout.sock_read == 3.0
+        assert session.headers["Accept-Encoding"] == "identity"
+    finally:
+        await session.close()
+
+
+async def test_pool_reuses_connections_across_clients():
+    server = MockBinanceServer()
+    base_url = await server.start()
+    pool = HttpPool()
+    try:
+        first = BinanceClient(base_url=base_url, pool=pool)
+        second = BinanceClient(base_url=base_url, pool=pool)
+        await first.init()
+        await second.init()
+        assert first._session is second._session
+
+        for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT"):
+            await first.get_open_interest(symbol)
+            await second.get_klines(symbol, "1m", limit=1)
+
+        assert pool.stats.requests == 6
+        assert pool.stats.connections_created == 1
+        assert pool.stats.connections_reused == 5
+
+        # 客户端关闭不影响共享会话
+        await first.close()
+        assert not pool.session().closed
+        await second.get_open_interest("BTCUSDT")
+    finally:
+        await pool.close()
+        await server.stop()
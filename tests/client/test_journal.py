@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from src.client.journal import JournalEntry, JournalWriter, journal_files, read_journal, replay
+from src.client.stream import RotatingStream, agg_trade_key
+from tests.client.test_stream import FakeWebSocket
+
+
+def _trade(agg_id: int) -> str:
+    return json.dumps({"e": "aggTrade", "s": "BTCUSDT", "a": agg_id, "p": "1", "q": "1"})
+
+
+def test_writer_round_trip_and_rotation(tmp_path):
+    now = [1000.0]
+    writer = JournalWriter(tmp_path, max_bytes=10**9, max_age_seconds=60, clock=lambda: now[0])
+    writer.record("btcusdt@aggTrade", _trade(1))
+    now[0] += 1
+    writer.record("btcusdt@forceOrder", '{"e":"forceOrder"}')
+    # 超过 max_age 后轮换到新文件
+    now[0] += 60
+    writer.record("btcusdt@aggTrade", _trade(2))
+    writer.close()
+
+    files = journal_files(tmp_path)
+    assert len(files) == 2
+    entries = list(read_journal(files))
+    assert [e.source for e in entries] == [
+        "btcusdt@aggTrade",
+        "btcusdt@forceOrder",
+        "btcusdt@aggTrade",
+    ]
+    assert entries[0].received_at == 1000.0
+    assert json.loads(entries[2].message)["a"] == 2
+
+
+def test_writer_prunes_old_files(tmp_path):
+    now = [0.0]
+    writer = JournalWriter(tmp_path, max_age_seconds=1, max_files=2, clock=lambda: now[0])
+    for i in range(5):
+        now[0] = float(i * 2)
+        writer.record("s", _trade(i))
+    writer.close()
+    assert len(journal_files(tmp_path)) == 2
+
+
+async def test_replay_respects_speed():
+    entries = [JournalEntry(100.0 + i * 0.1, "s", str(i)) for i in range(4)]
+    received: list[str] = []
+
+    async def handler(entry: JournalEntry) -> None:
+        received.append(entry.message)
+
+    # 原始跨度 0.3s，10 倍速约 0.03s
+    stats = await replay(entries, handler, speed=10)
+    assert received == ["0", "1", "2", "3"]
+    assert 0.025 <= stats.elapsed < 0.3
+    assert abs(stats.journal_span - 0.3) < 1e-6
+
+    stats = await replay(entries, handler, speed=None)
+    assert stats.messages == 4
+    assert stats.elapsed < 0.025
+
+
+async def test_stream_records_messages(tmp_path):
+    ws = FakeWebSocket()
+
+    async def connect(url: str) -> FakeWebSocket:
+        return ws
+
+    async def on_message(message: str) -> None:
+        pass
+
+    writer = JournalWriter(tmp_path)
+    stream = RotatingStream(
+        "wss://example/ws/btcusdt@aggTrade",
+        on_message,
+        agg_trade_key,
+        connect=connect,
+        recorder=writer,
+    )
+    task = asyncio.create_task(stream.run())
+    ws.feed(_trade(1))
+    ws.feed(_trade(2))
+    await asyncio.sleep(0.01)
+    await ws.close()
+    await task
+    writer.close()
+
+    entries = list(read_journal(journal_files(tmp_path)))
+    assert [e.source for e in entries] == ["btcusdt@aggTrade"] * 2
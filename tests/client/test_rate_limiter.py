@@ -0,0 +1,160 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.client.binance import BinanceAPIError, BinanceClient
+from src.client.rate_limiter import (
+    Priority,
+    WeightLimiter,
+    current_priority,
+    request_priority,
+    request_weight,
+)
+
+
+def test_request_weight_table():
+    assert request_weight("/fapi/v1/openInterest", {"symbol": "BTCUSDT"}) == 1
+    assert request_weight("/fapi/v1/klines", {"limit": 1}) == 1
+    assert request_weight("/fapi/v1/klines", {"limit": 100}) == 2
+    assert request_weight("/fapi/v1/klines", {"limit": 500}) == 5
+    assert request_weight("/fapi/v1/klines", {"limit": 1500}) == 10
+    assert request_weight("/fapi/v1/depth", {"limit": 1000}) == 20
+
+
+def test_request_priority_context():
+    assert current_priority() == Priority.REPORT
+    with request_priority(Priority.ALERT):
+        assert current_priority() == Priority.ALERT
+    assert current_priority() == Priority.REPORT
+
+
+async def test_limiter_within_budget_does_not_queue():
+    limiter = WeightLimiter(limit=10, safety_ratio=1.0)
+    await limiter.acquire(4)
+    await limiter.acquire(4)
+    assert limiter.used_weight == 8
+    assert limiter.throttled == 0
+
+
+async def test_limiter_waits_for_next_window():
+    now = [0.0]
+    limiter = WeightLimiter(limit=2, window_seconds=0.05, safety_ratio=1.0, clock=lambda: now[0])
+    await limiter.acquire(2)
+
+    waiter = asyncio.create_task(limiter.acquire(1))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    now[0] = 0.05
+    await asyncio.wait_for(waiter, timeout=1.0)
+    assert limiter.throttled == 1
+    assert limiter.used_weight == 1
+
+
+async def test_limiter_serves_higher_priority_first():
+    # 固定时钟，避免测试过程中窗口意外滚动
+    now = [0.0]
+    limiter = WeightLimiter(limit=1, window_seconds=0.1, safety_ratio=1.0, clock=lambda: now[0])
+    await limiter.acquire(1)
+
+    order: list[str] = []
+
+    async def request(name: str, priority: Priority) -> None:
+        await limiter.acquire(1, priority)
+        order.append(name)
+
+    backfill = asyncio.create_task(request("backfill", Priority.BACKFILL))
+    await asyncio.sleep(0)
+    alert = asyncio.create_task(request("alert", Priority.ALERT))
+    await asyncio.sleep(0)
+    assert limiter.queued == 2
+
+    # 进入下一个窗口，每个窗口只放行一个请求
+    now[0] = 0.1
+    await asyncio.sleep(0.15)
+    assert order == ["alert"]
+    now[0] = 0.2
+    await asyncio.wait_for(asyncio.gather(backfill, alert), timeout=1.0)
+    assert order == ["alert", "backfill"]
+
+
+async def test_backfill_leaves_reserved_budget_for_polling():
+    now = [0.0]
+    limiter = WeightLimiter(
+        limit=10, window_seconds=0.05, safety_ratio=1.0, reserved=8, clock=lambda: now[0]
+    )
+    await limiter.acquire(2, Priority.BACKFILL)
+
+    # 回填用完自己的额度后排队，之后到达的采集请求仍可使用预留额度
+    backfill = asyncio.create_task(limiter.acquire(1, Priority.BACKFILL))
+    await asyncio.sleep(0.01)
+    assert not backfill.done()
+    await asyncio.wait_for(limiter.acquire(8, Priority.REPORT), timeout=1.0)
+    assert limiter.used_weight == 10
+    assert not backfill.done()
+
+    now[0] = 0.05
+    await asyncio.wait_for(backfill, timeout=1.0)
+    assert limiter.used_weight == 1
+
+
+def test_limiter_sync_used_from_header():
+    limiter = WeightLimiter(limit=2400)
+    limiter.sync_used(1200)
+    assert limiter.used_weight == 1200
+    # 较早返回的响应头不应回退计数
+    limiter.sync_used(900)
+    assert limiter.used_weight == 1200
+
+
+def _response(status: int, headers: dict[str, str], body: str = "{}") -> MagicMock:
+    response = MagicMock()
+    response.status = status
+    response.headers = headers
+    response.text = AsyncMock(return_value=body)
+    response.json = AsyncMock(return_value={"ok": True})
+    return response
+
+
+async def test_request_syncs_used_weight_header():
+    client = BinanceClient()
+    mock_session = MagicMock()
+    mock_session.get = AsyncMock(return_value=_response(200, {"X-MBX-USED-WEIGHT-1M": "321"}))
+    client._session = mock_session
+
+    await client._request("GET", "/fapi/v1/openInterest", {"symbol": "BTCUSDT"})
+    assert client.weight_limiter.used_weight == 321
+
+
+async def test_request_retries_after_429():
+    client = BinanceClient()
+    mock_session = MagicMock()
+    responses = [
+        _response(429, {"Retry-After": "0.05"}, '{"code": -1003, "msg": "Too many"}'),
+        _response(200, {}),
+    ]
+    mock_session.get = AsyncMock(side_effect=responses)
+    client._session = mock_session
+
+    result = await client._request("GET", "/fapi/v1/openInterest", {"symbol": "BTCUSDT"})
+    assert result == {"ok": True}
+    assert mock_session.get.call_count == 2
+    assert client.weight_limiter.retry_after_events == 1
+    # 被限流的响应在重试前交还连接池
+    for response in responses:
+        response.release.assert_called_once()
+
+
+async def test_request_does_not_retry_418():
+    client = BinanceClient()
+    mock_session = MagicMock()
+    mock_session.get = AsyncMock(
+        return_value=_response(418, {"Retry-After": "0.01"}, '{"code": -1003, "msg": "banned"}')
+    )
+    client._session = mock_session
+
+    with pytest.raises(BinanceAPIError, match="banned"):
+        await client._request("GET", "/fapi/v1/openInterest", {"symbol": "BTCUSDT"})
+    assert mock_session.get.call_count == 1
+    mock_session.get.return_value.release.assert_called_once()
@@ -0,0 +1,173 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.client.binance import BinanceAPIError, BinanceClient, CircuitOpenError
+from src.client.rate_limiter import Priority, request_priority
+from src.client.resilience import CircuitBreaker, LatencyTracker, RetryPolicy, hedged
+
+
+def test_retry_delays_are_bounded():
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+    delays = policy.delays()
+    samples = [next(delays) for _ in range(50)]
+    assert all(0.1 <= d <= 1.0 for d in samples)
+
+
+def test_latency_tracker_p95():
+    tracker = LatencyTracker(min_samples=10)
+    for i in range(9):
+        tracker.record("/x", 0.01)
+    assert tracker.p95("/x") is None
+    for i in range(91):
+        tracker.record("/x", 0.01 if i < 86 else 1.0)
+    assert tracker.p95("/x") == 1.0
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    now[0] = 10.0
+    # 半开状态只放行一个探测请求
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_hedged_returns_faster_attempt():
+    delays = iter([0.5, 0.01])
+    calls = 0
+
+    async def attempt() -> float:
+        nonlocal calls
+        calls += 1
+        delay = next(delays)
+        await asyncio.sleep(delay)
+        return delay
+
+    result = await asyncio.wait_for(hedged(attempt, 0.02), timeout=0.3)
+    assert result == 0.01
+    assert calls == 2
+
+
+def _response(status: int, body: str = "{}") -> MagicMock:
+    response = MagicMock()
+    response.status = status
+    response.headers = {}
+    response.text = AsyncMock(return_value=body)
+    response.json = AsyncMock(return_value={"ok": True})
+    return response
+
+
+def _client(**kwargs) -> BinanceClient:
+    client = BinanceClient(retry_policy=RetryPolicy(3, base_delay=0.001, max_delay=0.002), **kwargs)
+    client.cache.ttls = {}
+    return client
+
+
+async def test_request_retries_server_errors():
+    client = _client()
+    session = MagicMock()
+    session.get = AsyncMock(side_effect=[_response(503, "busy"), _response(200)])
+    client._session = session
+
+    assert await client._request("GET", "/fapi/v1/openInterest", {}) == {"ok": True}
+    assert session.get.call_count == 2
+    assert client.retries == 1
+
+
+async def test_request_times_out_and_retries():
+    client = _client(timeouts={"/fapi/v1/openInterest": 0.02})
+
+    async def slow_then_fast(*args, **kwargs):
+        if session.get.call_count == 1:
+            await asyncio.sleep(1)
+        return _response(200)
+
+    session = MagicMock()
+    session.get = AsyncMock(side_effect=slow_then_fast)
+    client._session = session
+
+    result = await asyncio.wait_for(client._request("GET", "/fapi/v1/openInterest", {}), 0.5)
+    assert result == {"ok": True}
+    assert session.get.call_count == 2
+
+
+async def test_client_errors_are_not_retried():
+    client = _client()
+    session = MagicMock()
+    session.get = AsyncMock(return_value=_response(400, '{"code": -1121, "msg": "Invalid"}'))
+    client._session = session
+
+    with pytest.raises(BinanceAPIError, match="Invalid"):
+        await client._request("GET", "/fapi/v1/openInterest", {})
+    assert session.get.call_count == 1
+    assert client.breakers["/fapi/v1/openInterest"].state == CircuitBreaker.CLOSED
+
+
+async def test_circuit_opens_after_repeated_failures():
+    client = _client(breaker_failures=3)
+    session = MagicMock()
+    session.get = AsyncMock(return_value=_response(500, "down"))
+    client._session = session
+
+    with pytest.raises(BinanceAPIError):
+        await client._request("GET", "/fapi/v1/openInterest", {})
+    assert session.get.call_count == 3
+
+    with pytest.raises(CircuitOpenError):
+        await client._request("GET", "/fapi/v1/openInterest", {})
+    assert session.get.call_count == 3
+
+
+async def test_alert_requests_are_hedged_after_p95():
+    client = _client()
+    for _ in range(client.latency.min_samples):
+        client.latency.record("/fapi/v1/openInterest", 0.01)
+
+    async def get(*args, **kwargs):
+        if session.get.call_count == 1:
+            await asyncio.sleep(1)
+        return _response(200)
+
+    session = MagicMock()
+    session.get = AsyncMock(side_effect=get)
+    client._session = session
+
+    with request_priority(Priority.ALERT):
+        result = await asyncio.wait_for(
+            client._request("GET", "/fapi/v1/openInterest", {}), timeout=0.5
+        )
+    assert result == {"ok": True}
+    assert client.hedges == 1
+
+
+async def test_cancelled_probe_releases_half_open_breaker():
+    client = _client(breaker_failures=1, breaker_reset_seconds=0)
+    breaker = client._breaker("/fapi/v1/openInterest")
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    session = MagicMock()
+    session.get = AsyncMock(side_effect=hang)
+    client._session = session
+
+    # 探测请求被调用方取消（如超出告警时间预算）
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(client._request("GET", "/fapi/v1/openInterest", {}), 0.02)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    session.get = AsyncMock(return_value=_response(200))
+    assert await client._request("GET", "/fapi/v1/openInterest", {}) == {"ok": True}
+    assert breaker.state == CircuitBreaker.CLOSED
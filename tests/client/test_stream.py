@@ -0,0 +1,226 @@
+import asyncio
+import json
+
+import pytest
+
+from src.client.stream import ReconnectBackoff, RotatingStream, agg_trade_key, force_order_key
+
+
+class FakeWebSocket:
+    """可控的 WebSocket 替身：消息通过 feed 注入"""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self.closed = False
+
+    def feed(self, message: str) -> None:
+        self.queue.put_nowait(message)
+
+    async def close(self) -> None:
+        self.closed = True
+        self.queue.put_nowait(None)
+
+    def __aiter__(self) -> "FakeWebSocket":
+        return self
+
+    async def __anext__(self) -> str:
+        message = await self.queue.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+def _trade(agg_id: int) -> str:
+    return json.dumps(
+        {"e": "aggTrade", "s": "BTCUSDT", "a": agg_id, "p": "1", "q": "1", "T": 0, "m": False}
+    )
+
+
+def test_agg_trade_key():
+    assert agg_trade_key(_trade(42)) == ("aggTrade", "BTCUSDT", 42)
+    assert agg_trade_key(json.dumps({"e": "other"})) is None
+
+
+def test_force_order_key():
+    message = json.dumps(
+        {"e": "forceOrder", "o": {"s": "BTCUSDT", "T": 1, "S": "SELL", "q": "2.0"}}
+    )
+    assert force_order_key(message) == ("forceOrder", "BTCUSDT", 1, "SELL", "2.0")
+
+
+def test_reconnect_backoff_grows_until_connection_is_stable():
+    backoff = ReconnectBackoff(base_delay=1.0, max_delay=4.0, stable_after=60.0)
+    # 连上即断（包括服务端正常关闭）：间隔翻倍直到上限
+    assert [backoff.next_delay(0.1) for _ in range(4)] == [1.0, 2.0, 4.0, 4.0]
+    # 稳定运行后断开：回到基础间隔
+    assert backoff.next_delay(120.0) == 1.0
+    assert backoff.next_delay(0.1) == 2.0
+
+
+async def test_rotation_deduplicates_overlap():
+    sockets: list[FakeWebSocket] = []
+
+    async def connect(url: str) -> FakeWebSocket:
+        ws = FakeWebSocket()
+        sockets.append(ws)
+        return ws
+
+    received: list[int] = []
+
+    async def on_message(message: str) -> None:
+        received.append(json.loads(message)["a"])
+
+    stream = RotatingStream(
+        "ws://test", on_message, agg_trade_key, rotate_after=0.05, connect=connect
+    )
+    task = asyncio.create_task(stream.run())
+
+    await asyncio.sleep(0.01)
+    old = sockets[0]
+    old.feed(_trade(1))
+    old.feed(_trade(2))
+
+    # 等待新连接建立
+    while len(sockets) < 2:
+        await asyncio.sleep(0.01)
+    new = sockets[1]
+    stream.rotate_after = 60  # 测试期间不再触发下一次轮换
+
+    # 重叠期：新连接先收到 3、4，旧连接随后也收到 3（已对齐）
+    new.feed(_trade(3))
+    new.feed(_trade(4))
+    await asyncio.sleep(0.01)
+    old.feed(_trade(3))
+    await asyncio.sleep(0.01)
+
+    assert old.closed
+    assert not new.closed
+    new.feed(_trade(5))
+    await asyncio.sleep(0.01)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert received == [1, 2, 3, 4, 5]
+    assert stream.rotations >= 1
+    assert stream.duplicates == 1
+
+
+async def test_rotation_lets_in_flight_message_finish():
+    sockets: list[FakeWebSocket] = []
+
+    async def connect(url: str) -> FakeWebSocket:
+        ws = FakeWebSocket()
+        sockets.append(ws)
+        return ws
+
+    release = asyncio.Event()
+    handled: list[int] = []
+
+    async def on_message(message: str) -> None:
+        await release.wait()
+        handled.append(json.loads(message)["a"])
+
+    stream = RotatingStream(
+        "ws://test",
+        on_message,
+        agg_trade_key,
+        rotate_after=0.02,
+        overlap_timeout=0.2,
+        connect=connect,
+    )
+    task = asyncio.create_task(stream.run())
+    await asyncio.sleep(0.005)
+    # 旧连接的消息处理到一半时开始轮换
+    sockets[0].feed(_trade(1))
+    while not sockets[0].closed:
+        await asyncio.sleep(0.005)
+    stream.rotate_after = 60
+    release.set()
+    while not stream.rotations:
+        await asyncio.sleep(0.005)
+
+    assert handled == [1]
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def test_rotation_keeps_old_connection_when_new_fails():
+    attempts = 0
+    first = FakeWebSocket()
+
+    async def connect(url: str) -> FakeWebSocket:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            return first
+        raise ConnectionError("refused")
+
+    received: list[int] = []
+
+    async def on_message(message: str) -> None:
+        received.append(json.loads(message)["a"])
+
+    stream = RotatingStream(
+        "ws://test", on_message, agg_trade_key, rotate_after=0.02, connect=connect
+    )
+    task = asyncio.create_task(stream.run())
+
+    while attempts < 2:
+        await asyncio.sleep(0.01)
+    first.feed(_trade(1))
+    await asyncio.sleep(0.01)
+
+    assert not first.closed
+    assert received == [1]
+
+    await first.close()
+    await task
+
+
+async def test_failed_rotation_is_retried_after_short_backoff():
+    attempts = 0
+    first = FakeWebSocket()
+    second = FakeWebSocket()
+
+    async def connect(url: str) -> FakeWebSocket:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            return first
+        if attempts == 2:
+            raise ConnectionError("refused")
+        return second
+
+    async def on_message(message: str) -> None:
+        pass
+
+    stream = RotatingStream(
+        "ws://test",
+        on_message,
+        agg_trade_key,
+        rotate_after=0.02,
+        overlap_timeout=0.01,
+        rotate_retry=0.02,
+        connect=connect,
+    )
+    task = asyncio.create_task(stream.run())
+    while attempts < 2:
+        await asyncio.sleep(0.005)
+    # 第一次轮换失败后改为很长的轮换周期：重试按 rotate_retry 进行而不是等下一个周期
+    stream.rotate_after = 3600
+    for _ in range(50):
+        if stream.rotations:
+            break
+        await asyncio.sleep(0.01)
+
+    assert stream.rotation_failures == 1
+    assert stream.rotations == 1
+    assert first.closed
+    assert not second.closed
+
+    await second.close()
+    await task
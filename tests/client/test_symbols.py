@@ -0,0 +1,150 @@
+# tests/client/test_symbols.py
+from unittest.mock import AsyncMock, MagicMock
+
+from src.client.models import SymbolInfo
+from src.client.symbols import SymbolRegistry, to_raw
+
+
+def _info(raw: str, base: str, contract_type: str = "PERPETUAL", status: str = "TRADING"):
+    return SymbolInfo(raw, base, "USDT", "USDT", contract_type, status)
+
+
+def test_to_raw():
+    assert to_raw("BTC/USDT:USDT") == "BTCUSDT"
+    assert to_raw("1000PEPE/USDT:USDT") == "1000PEPEUSDT"
+
+
+def test_normalize_with_and_without_snapshot():
+    registry = SymbolRegistry()
+    assert registry.normalize("ETHUSDT") == "ETH/USDT:USDT"
+    assert registry.normalize("ETHBTC") is None
+
+    registry.update(
+        [
+            _info("BTCUSDT", "BTC"),
+            _info("BTCUSDT_260327", "BTC", contract_type="CURRENT_QUARTER"),
+            _info("LUNAUSDT", "LUNA", status="SETTLING"),
+        ]
+    )
+    assert len(registry) == 2
+    assert registry.normalize("BTCUSDT") == "BTC/USDT:USDT"
+    assert registry.normalize("BTCUSDT_260327") is None
+    # 快照之后上线的新币
+    assert registry.normalize("NEWUSDT") == "NEW/USDT:USDT"
+
+
+async def test_load_refreshes_only_when_stale():
+    client = MagicMock()
+    client.get_exchange_info = AsyncMock(return_value=[_info("BTCUSDT", "BTC")])
+    registry = SymbolRegistry()
+
+    await registry.load(client)
+    await registry.load(client)
+    assert client.get_exchange_info.await_count == 1
+
+    registry.loaded_at -= 7 * 3600
+    client.get_exchange_info.side_effect = RuntimeError("boom")
+    await registry.load(client)
+    # 刷新失败时保留原有快照
+    assert registry.normalize("BTCUSDT") == "BTC/USDT:USDT"
+    assert len(registry) == 1
+
+
+async def test_get_exchange_info_from_mock_server():
+    from src.client.binance import BinanceClient
+    from src.scripts.mock_binance import MockBinanceServer
+
+    server = MockBinanceServer(latency_ms=0)
+    base_url = await server.start()
+    try:
+        async with BinanceClient(base_url=base_url) as client:
+            registry = SymbolRegistry(await client.get_exchange_info())
+    finally:
+        await server.stop()
+
+    assert registry.resolve("BTC") == "BTC/USDT:USDT"
+    assert registry.normalize("BTCUSDT_260327") is None
+
+
+async def test_disk_cache_avoids_request(tmp_path):
+    cache = tmp_path / "exchange_info.json"
+    client = MagicMock()
+    client.get_exchange_info = AsyncMock(return_value=[_info("BTCUSDT", "BTC")])
+
+    await SymbolRegistry().load(client, cache_path=cache)
+    assert cache.exists()
+
+    # 新进程启动：磁盘快照未过期，不请求交易所
+    registry = SymbolRegistry()
+    await registry.load(client, cache_path=cache)
+    assert client.get_exchange_info.await_count == 1
+    assert registry.resolve("BTC") == "BTC/USDT:USDT"
+
+
+async def test_stale_disk_cache_used_when_refresh_fails(tmp_path):
+    import json
+
+    cache = tmp_path / "exchange_info.json"
+    cache.write_text(
+        json.dumps(
+            {
+                "loaded_at": 0,
+                "symbols": [
+                    {
+                        "symbol": "ETHUSDT",
+                        "base_asset": "ETH",
+                        "quote_asset": "USDT",
+                        "margin_asset": "USDT",
+                        "contract_type": "PERPETUAL",
+                        "status": "TRADING",
+                        "onboard_date": 0,
+                    }
+                ],
+            }
+        )
+    )
+    client = MagicMock()
+    client.get_exchange_info = AsyncMock(side_effect=RuntimeError("down"))
+
+    registry = SymbolRegistry()
+    await registry.load(client, cache_path=cache)
+
+    client.get_exchange_info.assert_awaited_once()
+    assert registry.resolve("ETH") == "ETH/USDT:USDT"
+
+
+async def test_corrupt_disk_cache_is_ignored(tmp_path):
+    cache = tmp_path / "exchange_info.json"
+    cache.write_text("{not json")
+    client = MagicMock()
+    client.get_exchange_info = AsyncMock(return_value=[_info("BTCUSDT", "BTC")])
+
+    registry = SymbolRegistry()
+    await registry.load(client, cache_path=cache)
+
+    assert len(registry) == 1
+    assert "BTCUSDT" in cache.read_text()
+
+
+def test_base_asset():
+    from src.client.symbols import base_asset
+
+    assert base_asset("BTC/USDT:USDT") == "BTC"
+
+
+def test_resolve_prefers_configured_symbols():
+    registry = SymbolRegistry(symbols=["BTC/USDT:USDT", "WLD/USDC:USDC"])
+    registry.update(
+        [
+            _info("ETHUSDT", "ETH"),
+            SymbolInfo("ETHUSDC", "ETH", "USDC", "USDC", "PERPETUAL", "TRADING"),
+            SymbolInfo("SOLUSDC", "SOL", "USDC", "USDC", "PERPETUAL", "TRADING"),
+            _info("LUNAUSDT", "LUNA", status="SETTLING"),
+        ]
+    )
+    assert registry.resolve("wld") == "WLD/USDC:USDC"
+    # 未配置的币种按快照解析，USDT 合约优先
+    assert registry.resolve("ETH") == "ETH/USDT:USDT"
+    assert registry.resolve("SOL") == "SOL/USDC:USDC"
+    assert registry.resolve("LUNA") is None
+    assert registry.resolve("NOPE") is None
@@ -1,5 +1,6 @@
 # tests/collector/test_binance_liq.py
-from unittest.mock import AsyncMock
+import json
+from unittest.mock import AsyncMock, MagicMock
 
 from src.collector.binance_liq import BinanceLiquidationCollector
 
@@ -33,3 +34,71 @@ def test_parse_liquidation_message():
     assert result.side == "sell"
     assert result.quantity == 1.5
     assert result.value_usd == 147750.0  # 1.5 * 98500
+
+
+def test_build_url_uses_configured_ws_url():
+    collector = BinanceLiquidationCollector(
+        symbols=["BTC/USDT:USDT", "ETH/USDT:USDT"],
+        on_liquidation=AsyncMock(),
+        ws_url="ws://127.0.0.1:8080/ws",
+    )
+
+    assert collector._build_url() == "ws://127.0.0.1:8080/ws/btcusdt@forceOrder/ethusdt@forceOrder"
+
+
+def _force_order(raw_symbol: str, side: str = "SELL") -> str:
+    return json.dumps(
+        {
+            "e": "forceOrder",
+            "E": 1706600000000,
+            "o": {"s": raw_symbol, "S": side, "q": "2", "ap": "10", "T": 1706600000000},
+        }
+    )
+
+
+def test_market_wide_build_url():
+    collector = BinanceLiquidationCollector(
+        symbols=["BTC/USDT:USDT"], on_liquidation=AsyncMock(), market_wide=True
+    )
+
+    assert collector._build_url() == "wss://fstream.binance.com/ws/!forceOrder@arr"
+
+
+async def test_market_wide_persists_only_configured_symbols():
+    from src.aggregator.liquidation import LiquidationWindow
+
+    on_liquidation = AsyncMock()
+    window = LiquidationWindow()
+    collector = BinanceLiquidationCollector(
+        symbols=["BTC/USDT:USDT"],
+        on_liquidation=on_liquidation,
+        market_wide=True,
+        window=window,
+    )
+
+    await collector._process_message(_force_order("BTCUSDT"))
+    await collector._process_message(_force_order("1000PEPEUSDT", "BUY"))
+    await collector._process_message(_force_order("BTCUSDT_260327"))
+
+    on_liquidation.assert_called_once()
+    assert on_liquidation.call_args.args[0].symbol == "BTC/USDT:USDT"
+    assert window.symbol_count == 2
+    assert window.symbol("1000PEPE/USDT:USDT").short == 20
+
+
+async def test_on_market_called_for_every_symbol():
+    on_market = MagicMock()
+    collector = BinanceLiquidationCollector(
+        symbols=["BTC/USDT:USDT"],
+        on_liquidation=AsyncMock(),
+        market_wide=True,
+        on_market=on_market,
+    )
+
+    await collector._process_message(_force_order("BTCUSDT"))
+    await collector._process_message(_force_order("1000PEPEUSDT", "BUY"))
+
+    assert [c.args[0].symbol for c in on_market.call_args_list] == [
+        "BTC/USDT:USDT",
+        "1000PEPE/USDT:USDT",
+    ]
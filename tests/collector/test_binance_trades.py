@@ -75,3 +75,34 @@ async def test_handle_trade_sets_correct_fields():
     assert received[0].amount == 1.5
     assert received[0].side == "sell"
     assert received[0].value_usd == 150000.0
+
+
+@pytest.mark.asyncio
+async def test_handle_trade_ticks_every_trade():
+    ticks: list[tuple[str, float, float, int]] = []
+
+    async def on_trade(trade: Trade) -> None:
+        pass
+
+    async def on_tick(symbol: str, price: float, quantity: float, timestamp: int) -> None:
+        ticks.append((symbol, price, quantity, timestamp))
+
+    collector = BinanceTradesCollector(
+        symbol="BTC/USDT:USDT",
+        threshold_usd=100000,
+        on_trade=on_trade,
+        on_tick=on_tick,
+    )
+
+    # 低于大单阈值的成交也要回调
+    await collector._handle_trade(
+        {
+            "symbol": "BTCUSDT",
+            "price": 42000.0,
+            "quantity": 0.01,
+            "timestamp": 1704067200000,
+            "side": "sell",
+        }
+    )
+
+    assert ticks == [("BTC/USDT:USDT", 42000.0, 0.01, 1704067200000)]
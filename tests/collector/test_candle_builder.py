@@ -0,0 +1,55 @@
+# tests/collector/test_candle_builder.py
+from unittest.mock import AsyncMock
+
+from src.collector.candle_builder import CandleBuilder
+
+MINUTE = 60_000
+BASE = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+
+
+async def test_aggregates_trades_within_minute():
+    on_candles = AsyncMock()
+    builder = CandleBuilder(on_candles)
+
+    await builder.add_trade("BTC/USDT:USDT", 100.0, 1.0, BASE + 1000)
+    await builder.add_trade("BTC/USDT:USDT", 105.0, 0.5, BASE + 2000)
+    await builder.add_trade("BTC/USDT:USDT", 95.0, 2.0, BASE + 3000)
+    await builder.add_trade("BTC/USDT:USDT", 98.0, 1.0, BASE + 59_999)
+
+    bar = builder.current("BTC/USDT:USDT")
+    assert bar is not None
+    assert bar.open_time == BASE
+    assert (bar.open, bar.high, bar.low, bar.close) == (100.0, 105.0, 95.0, 98.0)
+    assert bar.volume == 4.5
+    assert bar.value_usd == 100.0 + 52.5 + 190.0 + 98.0
+    assert bar.trades == 4
+    on_candles.assert_not_called()
+
+
+async def test_persists_closed_candle_on_rollover():
+    on_candles = AsyncMock()
+    builder = CandleBuilder(on_candles)
+
+    await builder.add_trade("BTC/USDT:USDT", 100.0, 1.0, BASE + 1000)
+    await builder.add_trade("BTC/USDT:USDT", 101.0, 1.0, BASE + MINUTE + 10)
+
+    on_candles.assert_awaited_once()
+    closed = on_candles.call_args.args[0]
+    assert [c.open_time for c in closed] == [BASE]
+    assert builder.current("BTC/USDT:USDT").open_time == BASE + MINUTE
+
+    # 上一分钟的迟到成交被忽略
+    await builder.add_trade("BTC/USDT:USDT", 50.0, 1.0, BASE + 5000)
+    assert builder.current("BTC/USDT:USDT").low == 101.0
+
+
+async def test_flush_writes_open_candles():
+    on_candles = AsyncMock()
+    builder = CandleBuilder(on_candles)
+
+    await builder.add_trade("BTC/USDT:USDT", 100.0, 1.0, BASE)
+    await builder.add_trade("ETH/USDT:USDT", 3000.0, 1.0, BASE)
+    await builder.flush()
+
+    flushed = on_candles.call_args.args[0]
+    assert {c.symbol for c in flushed} == {"BTC/USDT:USDT", "ETH/USDT:USDT"}
@@ -0,0 +1,126 @@
+# tests/collector/test_depth.py
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from src.client.models import DepthSnapshot
+from src.collector.depth import DepthCollector, parse_snapshot
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+def _update(first: int, last: int, prev: int, bids=(), asks=()) -> str:
+    return json.dumps(
+        {
+            "e": "depthUpdate",
+            "E": 1706600000000,
+            "s": "BTCUSDT",
+            "U": first,
+            "u": last,
+            "pu": prev,
+            "b": [[str(p), str(q)] for p, q in bids],
+            "a": [[str(p), str(q)] for p, q in asks],
+        }
+    )
+
+
+def _snapshot(last_update_id: int) -> DepthSnapshot:
+    return DepthSnapshot(
+        symbol="BTCUSDT",
+        last_update_id=last_update_id,
+        bids=[(100.0, 1.0), (99.0, 2.0)],
+        asks=[(101.0, 1.0), (102.0, 2.0)],
+    )
+
+
+async def test_buffers_until_snapshot_then_drains():
+    collector = DepthCollector([SYMBOL], client=None)
+    await collector._process_message(_update(90, 95, 89, bids=[(100.0, 9.0)]))
+    await collector._process_message(_update(96, 105, 95, bids=[(100.0, 3.0)]))
+    await collector._process_message(_update(106, 110, 105, asks=[(101.0, 0.0)]))
+    assert not collector.is_synced(SYMBOL)
+    assert collector.metrics(SYMBOL) is None
+
+    collector.load_snapshot(SYMBOL, _snapshot(100))
+
+    book = collector.books[SYMBOL]
+    assert collector.is_synced(SYMBOL)
+    # u=95 早于快照被丢弃，96..105 覆盖快照，之后按 pu 连续应用
+    assert book.bids.best() == (100.0, 3.0)
+    assert book.asks.best() == (102.0, 2.0)
+    assert book.last_update_id == 110
+    assert collector.updates == 2
+    assert collector.metrics(SYMBOL) is not None
+
+
+async def test_first_event_may_follow_snapshot_directly():
+    collector = DepthCollector([SYMBOL], client=None)
+    collector.load_snapshot(SYMBOL, _snapshot(100))
+    await collector._process_message(_update(103, 108, 100, bids=[(100.5, 1.0)]))
+
+    assert collector.books[SYMBOL].bids.best() == (100.5, 1.0)
+    assert collector.resyncs == 0
+
+
+async def test_gap_triggers_resync():
+    client = MagicMock()
+    client.get_depth = AsyncMock(return_value=_snapshot(120))
+    collector = DepthCollector([SYMBOL], client=client)
+    collector.load_snapshot(SYMBOL, _snapshot(100))
+    await collector._process_message(_update(101, 105, 100))
+
+    # pu=107 与上一个 u=105 不连续
+    await collector._process_message(_update(108, 121, 107, bids=[(100.0, 7.0)]))
+    assert collector.resyncs == 1
+    assert not collector.is_synced(SYMBOL)
+
+    for task in list(collector._sync_tasks):
+        await task
+    client.get_depth.assert_awaited_once_with("BTCUSDT", 1000)
+    assert collector.is_synced(SYMBOL)
+    assert collector.books[SYMBOL].last_update_id == 121
+    assert collector.books[SYMBOL].bids.best() == (100.0, 7.0)
+
+
+async def test_snapshot_older_than_buffer_resyncs():
+    collector = DepthCollector([SYMBOL], client=None)
+    await collector._process_message(_update(150, 160, 149))
+    collector.load_snapshot(SYMBOL, _snapshot(100))
+
+    assert collector.resyncs == 1
+    assert not collector.is_synced(SYMBOL)
+
+
+async def test_snapshot_failure_is_retried_later():
+    client = MagicMock()
+    client.get_depth = AsyncMock(side_effect=RuntimeError("boom"))
+    collector = DepthCollector([SYMBOL], client=client)
+    await collector._process_message(_update(1, 2, 0))
+    for task in list(collector._sync_tasks):
+        await task
+
+    await collector._process_message(_update(3, 4, 2))
+    # 重试间隔内不再请求
+    assert client.get_depth.await_count == 1
+    assert not collector.is_synced(SYMBOL)
+
+
+async def test_snapshot_is_recorded_for_replay():
+    recorder = MagicMock()
+    client = MagicMock()
+    client.get_depth = AsyncMock(return_value=_snapshot(100))
+    collector = DepthCollector([SYMBOL], client=client, recorder=recorder)
+    await collector._process_message(_update(99, 101, 98))
+    for task in list(collector._sync_tasks):
+        await task
+
+    source, message = recorder.record.call_args.args
+    assert source == "btcusdt@depthSnapshot"
+    assert parse_snapshot(message) == _snapshot(100)
+
+
+async def test_ignores_other_events_and_symbols():
+    collector = DepthCollector([SYMBOL], client=None)
+    await collector._process_message(json.dumps({"e": "aggTrade", "s": "BTCUSDT"}))
+    await collector._process_message(_update(1, 2, 0).replace("BTCUSDT", "ETHUSDT"))
+    await collector._process_message("not json")
+    assert collector._states[SYMBOL].buffer == []
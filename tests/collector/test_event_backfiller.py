@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.client.symbols import SymbolRegistry
 from src.collector.event_backfiller import EventBackfiller
 
 
@@ -24,7 +25,12 @@ def mock_client():
     return client
 
 
-async def test_backfill_determines_correct_fields(db, mock_client):
+@pytest.fixture
+def registry():
+    return SymbolRegistry(symbols=["BTC/USDT:USDT"])
+
+
+async def test_backfill_determines_correct_fields(db, mock_client, registry):
     from src.storage.models import ExtremeEvent
 
     now = int(time.time() * 1000)
@@ -46,24 +52,22 @@ async def test_backfill_determines_correct_fields(db, mock_client):
     )
     await db.insert_extreme_event(event)
 
-    backfiller = EventBackfiller(db, mock_client)
+    backfiller = EventBackfiller(db, mock_client, registry)
     fields = backfiller._get_pending_fields(event, now)
 
     assert "price_4h" in fields
     assert "price_12h" not in fields
 
 
-async def test_backfill_updates_price(db, mock_client):
+def _event(triggered_at: int):
     from src.storage.models import ExtremeEvent
 
-    now = int(time.time() * 1000)
-
-    event = ExtremeEvent(
+    return ExtremeEvent(
         id=None,
         symbol="BTC",
         dimension="flow_1h",
         window_days=30,
-        triggered_at=now - 5 * 3600 * 1000,
+        triggered_at=triggered_at,
         value=47_700_000.0,
         percentile=92.5,
         price_at_trigger=82000.0,
@@ -72,20 +76,107 @@ async def test_backfill_updates_price(db, mock_client):
         price_24h=None,
         price_48h=None,
     )
-    await db.insert_extreme_event(event)
 
-    # 从数据库获取带 id 的事件
-    events = await db.get_extreme_events("BTC", "flow_1h", 30)
-    event_with_id = events[0]
 
-    # Mock get_klines 返回价格
-    mock_kline = MagicMock()
-    mock_kline.close = 82500.0
-    mock_client.get_klines = AsyncMock(return_value=[mock_kline])
+async def test_backfill_updates_price(db, mock_client, registry):
+    from src.client.models import Kline
+
+    now = int(time.time() * 1000)
+    await db.insert_extreme_event(_event(now - 5 * 3600 * 1000))
+
+    # 覆盖 4h 目标时间的 1 分钟 K 线
+    async def get_klines(symbol, interval, limit=500, start_time=None, end_time=None):
+        assert symbol == "BTCUSDT"
+        return [Kline(start_time, 0.0, 0.0, 0.0, 82500.0, 0.0, start_time + 59_999)]
+
+    mock_client.get_klines = AsyncMock(side_effect=get_klines)
 
-    backfiller = EventBackfiller(db, mock_client)
-    await backfiller.backfill_one(event_with_id, now)
+    backfiller = EventBackfiller(db, mock_client, registry)
+    assert await backfiller.run() == 1
 
-    # 验证价格已更新
     events = await db.get_extreme_events("BTC", "flow_1h", 30)
     assert events[0].price_4h == 82500.0
+    assert events[0].price_12h is None
+
+
+async def test_backfill_prefers_local_candles(db, mock_client, registry):
+    from src.storage.models import Candle
+
+    now = int(time.time() * 1000)
+    triggered_at = now - 5 * 3600 * 1000
+    await db.insert_extreme_event(_event(triggered_at))
+    target = triggered_at + 4 * 3600 * 1000
+    open_time = target - target % 60000
+    await db.insert_candles(
+        [Candle("BTC/USDT:USDT", open_time, 83000.0, 83100.0, 82900.0, 83050.0, 1.0, 83050.0, 1)]
+    )
+    mock_client.get_klines = AsyncMock()
+
+    backfiller = EventBackfiller(db, mock_client, registry)
+    assert await backfiller.run() == 1
+
+    events = await db.get_extreme_events("BTC", "flow_1h", 30)
+    assert events[0].price_4h == 83050.0
+    assert backfiller.requests == 0
+    mock_client.get_klines.assert_not_called()
+
+
+async def test_run_batches_kline_requests_per_symbol(db, mock_client, registry):
+    from src.client.models import Kline
+    from src.storage.models import ExtremeEvent
+
+    now = int(time.time() * 1000)
+    # 10 个 BTC 事件，间隔 5 分钟，均只需回填 price_4h
+    for i in range(10):
+        await db.insert_extreme_event(
+            ExtremeEvent(
+                id=None,
+                symbol="BTC",
+                dimension="flow_1h",
+                window_days=30,
+                triggered_at=now - 5 * 3600 * 1000 + i * 300_000,
+                value=1.0,
+                percentile=95.0,
+                price_at_trigger=82000.0,
+                price_4h=None,
+                price_12h=None,
+                price_24h=None,
+                price_48h=None,
+            )
+        )
+
+    async def get_klines(symbol, interval, limit=500, start_time=None, end_time=None):
+        assert interval == "1m"
+        return [
+            Kline(
+                open_time=start_time + i * 60_000,
+                open=0.0,
+                high=0.0,
+                low=0.0,
+                close=float(start_time + i * 60_000),
+                volume=0.0,
+                close_time=start_time + (i + 1) * 60_000 - 1,
+            )
+            for i in range(limit)
+        ]
+
+    mock_client.get_klines = AsyncMock(side_effect=get_klines)
+
+    backfiller = EventBackfiller(db, mock_client, registry)
+    filled = await backfiller.run()
+
+    assert filled == 10
+    assert backfiller.requests == 1
+    for event in await db.get_extreme_events("BTC", "flow_1h", 30):
+        target = event.triggered_at + 4 * 3600 * 1000
+        assert event.price_4h == float(target - target % 60_000)
+
+
+def test_cluster_targets_splits_long_ranges():
+    minute = 60_000
+    times = [0, 10 * minute, 1499 * minute, 1500 * minute + 5, 4000 * minute]
+    assert EventBackfiller._cluster_targets(times) == [
+        (0, 1500),
+        (1500 * minute, 1),
+        (4000 * minute, 1),
+    ]
@@ -0,0 +1,125 @@
+# tests/collector/test_history_bootstrap.py
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.client.models import FundingRate, LongShortRatio, OpenInterest, TakerRatio
+from src.collector.history_bootstrap import (
+    PERIOD_MS,
+    HistoryBootstrapper,
+    merge_ranges,
+    missing_ranges,
+)
+
+HOUR = 3600 * 1000
+
+
+@pytest.fixture
+async def db(tmp_path):
+    from src.storage.database import Database
+
+    database = Database(str(tmp_path / "test.db"))
+    await database.init()
+    yield database
+    await database.close()
+
+
+def _times(start: int, end: int, step: int) -> list[int]:
+    first = start + (-start % step)
+    return list(range(first, end + 1, step))
+
+
+@pytest.fixture
+def mock_client():
+    client = MagicMock()
+
+    async def oi_hist(symbol, period, limit=30, start_time=None, end_time=None):
+        return [
+            OpenInterest(symbol, 50_000.0 + i, ts, open_interest_value=5e9)
+            for i, ts in enumerate(_times(start_time, end_time, HOUR))
+        ]
+
+    async def ratio_hist(ratio_type, symbol, period, limit=500, start_time=None, end_time=None):
+        step = PERIOD_MS[period]
+        return [
+            LongShortRatio(symbol, 0.6, 0.4, 1.5, ts) for ts in _times(start_time, end_time, step)
+        ]
+
+    async def taker_hist(symbol, period, limit=500, start_time=None, end_time=None):
+        step = PERIOD_MS[period]
+        return [
+            TakerRatio(symbol, 1.1, 110.0, 100.0, ts) for ts in _times(start_time, end_time, step)
+        ]
+
+    async def funding_hist(symbol, limit=1000, start_time=None, end_time=None):
+        return [FundingRate(symbol, 0.0001, ts) for ts in _times(start_time, end_time, 8 * HOUR)]
+
+    client.get_open_interest_hist = MagicMock(side_effect=oi_hist)
+    client.get_long_short_ratio_hist = MagicMock(side_effect=ratio_hist)
+    client.get_taker_long_short_ratio_hist = MagicMock(side_effect=taker_hist)
+    client.get_funding_rate_hist = MagicMock(side_effect=funding_hist)
+    return client
+
+
+def test_missing_ranges():
+    assert missing_ranges(None, 0, 100, 10) == [(0, 100)]
+    # 已覆盖整个区间
+    assert missing_ranges((5, 95), 0, 100, 10) == []
+    # 只有最近的数据：补齐之前的部分
+    assert missing_ranges((80, 100), 0, 100, 10) == [(0, 79)]
+    # 停机造成的尾部缺口
+    assert missing_ranges((0, 40), 0, 100, 10) == [(41, 100)]
+
+
+def test_merge_ranges():
+    assert merge_ranges([(50, 60), (0, 10), (11, 20), (55, 70)]) == [(0, 20), (50, 70)]
+    assert merge_ranges([]) == []
+
+
+async def test_bootstrap_fills_history(db, mock_client):
+    bootstrapper = HistoryBootstrapper(db, mock_client, ["BTC/USDT:USDT"], days=2)
+    totals = await bootstrapper.run()
+
+    assert totals["oi"] >= 47
+    # 多空比快照和市场指标按实时采集的 5m 粒度补齐，来自同一份数据
+    assert totals["market_indicators"] >= (totals["oi"] - 1) * 12
+    assert totals["long_short"] == totals["market_indicators"] * 4
+    calls = mock_client.get_long_short_ratio_hist.call_args_list
+    assert {c.args[2] for c in calls} == {"5m"}
+    # 每种多空比的每一页只请求一次
+    pages = [(c.args[0], c.args[4]) for c in calls]
+    assert len(pages) == len(set(pages))
+    assert totals["funding"] >= 5
+
+    ls = await db.get_long_short_snapshots("BTC/USDT:USDT", "global", hours=48)
+    assert len(ls) >= 10
+    assert await db.get_oi_at("BTC/USDT:USDT", hours_ago=5) is not None
+    assert len(await db.get_market_indicator_history("BTC/USDT:USDT", hours=48)) >= 10
+    assert len(await db.get_funding_rates("BTC/USDT:USDT", hours=48)) >= 5
+
+
+async def test_bootstrap_skips_existing_ranges(db, mock_client):
+    bootstrapper = HistoryBootstrapper(db, mock_client, ["BTC/USDT:USDT"], days=2)
+    await bootstrapper.run()
+
+    second = await bootstrapper.run()
+    assert second == {"oi": 0, "long_short": 0, "market_indicators": 0, "funding": 0}
+    assert bootstrapper.requests == 0
+
+
+async def test_bootstrap_only_fetches_before_existing_data(db, mock_client):
+    from src.storage.models import OISnapshot
+
+    now = int(time.time() * 1000)
+    await db.insert_oi_snapshot(
+        OISnapshot(None, "binance", "BTC/USDT:USDT", now - 10 * HOUR, 1.0, 1.0)
+    )
+
+    bootstrapper = HistoryBootstrapper(db, mock_client, ["BTC/USDT:USDT"], days=2)
+    await bootstrapper.run()
+
+    calls = mock_client.get_open_interest_hist.call_args_list
+    # 头部和尾部各一个区间，头部区间止于已有数据之前
+    assert len(calls) == 2
+    assert calls[0].kwargs["end_time"] == now - 10 * HOUR - 1
@@ -0,0 +1,61 @@
+# tests/collector/test_indicator_collector.py
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.client.models import LongShortRatio, TakerRatio
+from src.collector.indicator_collector import IndicatorCollector
+from src.collector.indicator_fetcher import IndicatorFetcher
+
+
+@pytest.fixture
+async def db(tmp_path):
+    from src.storage.database import Database
+
+    database = Database(str(tmp_path / "test.db"))
+    await database.init()
+    yield database
+    await database.close()
+
+
+def _client() -> MagicMock:
+    client = MagicMock()
+    ratio = AsyncMock(return_value=LongShortRatio("BTCUSDT", 0.6, 0.4, 1.5, 0))
+    client.get_global_long_short_ratio = ratio
+    client.get_top_long_short_account_ratio = ratio
+    client.get_top_long_short_position_ratio = ratio
+    client.get_taker_long_short_ratio = AsyncMock(
+        return_value=TakerRatio("BTCUSDT", 1.1, 110.0, 100.0, 0)
+    )
+    return client
+
+
+async def test_collect_ratios_writes_snapshots_and_market_indicator_from_one_fetch(db):
+    client = _client()
+    fetcher = IndicatorFetcher(["BTC/USDT:USDT"], client=client)
+    updated: list[str] = []
+    collector = IndicatorCollector(
+        fetcher, db, ["BTC/USDT:USDT"], 300, 300, on_update=updated.append
+    )
+
+    await collector.collect_ratios("BTC/USDT:USDT")
+
+    # 4 个 /futures/data 请求同时产出多空比快照和市场指标
+    assert client.get_global_long_short_ratio.await_count == 3
+    client.get_taker_long_short_ratio.assert_awaited_once()
+    latest = await db.get_latest_long_short_snapshot("BTC/USDT:USDT", "global")
+    assert latest is not None and latest["long_short_ratio"] == 1.5
+    mi = await db.get_latest_market_indicator("BTC/USDT:USDT")
+    assert mi is not None and mi.taker_buy_sell_ratio == 1.1
+    assert updated == ["BTC/USDT:USDT"]
+
+
+def test_data_budget_at_200_symbols(db):
+    symbols = [f"S{i}/USDT:USDT" for i in range(200)]
+    fetcher = IndicatorFetcher(symbols)
+    collector = IndicatorCollector(fetcher, db, symbols, 300, 300)
+
+    assert [p.name for p in collector.pollers] == ["oi", "ratios"]
+    assert collector.data_requests_per_5min == 800
+    assert collector.check_data_budget(900)
+    assert not collector.check_data_budget(700)
@@ -3,12 +3,12 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.client.models import FundingRate, Kline, LongShortRatio, OpenInterest, TakerRatio
+from src.client.models import Kline, LongShortRatio, OpenInterest, PremiumIndex, TakerRatio
 from src.collector.indicator_fetcher import IndicatorFetcher
 
 
 @pytest.mark.asyncio
-async def test_fetch_all_oi():
+async def test_fetch_oi():
     fetcher = IndicatorFetcher(symbols=["BTC/USDT:USDT"])
 
     mock_oi = OpenInterest(symbol="BTCUSDT", open_interest=50000.0, timestamp=1706600000000)
@@ -27,51 +27,46 @@ async def test_fetch_all_oi():
     mock_client.get_klines = AsyncMock(return_value=[mock_kline])
 
     fetcher._client = mock_client
-    results = await fetcher.fetch_all_oi()
+    result = await fetcher.fetch_oi("BTC/USDT:USDT")
 
-    assert len(results) == 1
-    assert results[0].open_interest == 50000.0
-    assert results[0].open_interest_usd == 5000000000.0  # 50000 * 100000
+    assert result is not None
+    assert result.open_interest == 50000.0
+    assert result.open_interest_usd == 5000000000.0  # 50000 * 100000
 
 
 @pytest.mark.asyncio
 async def test_fetch_indicators():
     fetcher = IndicatorFetcher(symbols=["BTC/USDT:USDT"])
 
-    mock_funding = FundingRate(symbol="BTCUSDT", funding_rate=0.0001, funding_time=1706600000000)
-    mock_kline = Kline(
-        open_time=1706600000000,
-        open=100000.0,
-        high=100500.0,
-        low=99500.0,
-        close=100000.0,
-        volume=1000.0,
-        close_time=1706603599999,
-    )
-    mock_ls = LongShortRatio(
+    mock_premium = PremiumIndex(
         symbol="BTCUSDT",
-        long_ratio=0.55,
-        short_ratio=0.45,
-        long_short_ratio=1.22,
+        mark_price=100000.0,
+        index_price=99950.0,
+        funding_rate=0.0001,
+        next_funding_time=1706601600000,
         timestamp=1706600000000,
     )
 
     mock_client = MagicMock()
-    mock_client.get_funding_rate = AsyncMock(return_value=mock_funding)
-    mock_client.get_klines = AsyncMock(return_value=[mock_kline])
-    mock_client.get_global_long_short_ratio = AsyncMock(return_value=mock_ls)
+    mock_client.get_premium_index = AsyncMock(return_value=mock_premium)
+    mock_client.get_klines = AsyncMock()
+    mock_client.get_global_long_short_ratio = AsyncMock()
 
     fetcher._client = mock_client
     result = await fetcher.fetch_indicators("BTC/USDT:USDT")
 
     assert result is not None
     assert result.funding_rate == 0.01  # 0.0001 * 100
-    assert result.long_short_ratio == 1.22
     assert result.futures_price == 100000.0
+    assert result.spot_price == 99950.0
+    # 与标记价格流同源：一次 premiumIndex 请求取得价格和当期预测资金费率
+    mock_client.get_klines.assert_not_called()
+    # 多空比从数据库读取，不占用 /futures/data 额度
+    mock_client.get_global_long_short_ratio.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_fetch_market_indicators():
+async def test_fetch_long_short_indicators_feeds_both_tables():
     fetcher = IndicatorFetcher(symbols=["BTC/USDT:USDT"])
 
     mock_top_account = LongShortRatio(
@@ -110,13 +105,18 @@ async def test_fetch_market_indicators():
     mock_client.get_taker_long_short_ratio = AsyncMock(return_value=mock_taker)
 
     fetcher._client = mock_client
-    result = await fetcher.fetch_market_indicators("BTC/USDT:USDT")
+    ls = await fetcher.fetch_long_short_indicators("BTC/USDT:USDT")
 
-    assert result is not None
+    assert ls is not None
+    mock_client.get_global_long_short_ratio.assert_awaited_once_with("BTCUSDT", "5m")
+    result = ls.market_indicator("BTC/USDT:USDT", 1706600000000)
     assert result.top_account_ratio == 1.5
     assert result.top_position_ratio == 1.6
     assert result.global_account_ratio == 0.9
     assert result.taker_buy_sell_ratio == 1.1
+    rows = {r["ratio_type"]: r for r in ls.snapshots("BTC/USDT:USDT", 1706600000000)}
+    assert rows["global"]["long_short_ratio"] == 0.9
+    assert rows["taker"]["long_ratio"] == 5000.0
 
 
 @pytest.mark.asyncio
@@ -125,3 +125,71 @@ async def test_to_ws_symbol():
 
     assert fetcher._to_ws_symbol("BTC/USDT:USDT") == "BTCUSDT"
     assert fetcher._to_ws_symbol("ETH/USDT:USDT") == "ETHUSDT"
+
+
+@pytest.mark.asyncio
+async def test_fetch_oi_failure_is_isolated():
+    fetcher = IndicatorFetcher(symbols=["BTC/USDT:USDT", "ETH/USDT:USDT"])
+
+    mock_kline = Kline(
+        open_time=1706600000000,
+        open=100.0,
+        high=100.0,
+        low=100.0,
+        close=100.0,
+        volume=1.0,
+        close_time=1706603599999,
+    )
+
+    async def get_open_interest(symbol: str) -> OpenInterest:
+        if symbol == "ETHUSDT":
+            raise RuntimeError("timeout")
+        return OpenInterest(symbol=symbol, open_interest=10.0, timestamp=1706600000000)
+
+    mock_client = MagicMock()
+    mock_client.get_open_interest = get_open_interest
+    mock_client.get_klines = AsyncMock(return_value=[mock_kline])
+
+    fetcher._client = mock_client
+    # 轮询器逐币种调用，ETH 失败返回 None，不影响 BTC
+    assert await fetcher.fetch_oi("ETH/USDT:USDT") is None
+    btc = await fetcher.fetch_oi("BTC/USDT:USDT")
+    assert btc is not None and btc.symbol == "BTC/USDT:USDT"
+    assert fetcher.timings["openInterest"].count == 2
+    assert fetcher.timings["openInterest"].errors == 1
+    assert fetcher.timings["klines"].count == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_respects_max_concurrency():
+    import asyncio
+
+    symbols = [f"S{i}/USDT:USDT" for i in range(10)]
+    fetcher = IndicatorFetcher(symbols=symbols, max_concurrency=3)
+
+    in_flight = 0
+    peak = 0
+
+    async def get_ratio(symbol: str, period: str) -> LongShortRatio:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return LongShortRatio(symbol, 0.5, 0.5, 1.0, 0)
+
+    async def get_taker(symbol: str, period: str) -> TakerRatio:
+        return TakerRatio(symbol, 1.0, 1.0, 1.0, 0)
+
+    mock_client = MagicMock()
+    mock_client.get_global_long_short_ratio = get_ratio
+    mock_client.get_top_long_short_account_ratio = get_ratio
+    mock_client.get_top_long_short_position_ratio = get_ratio
+    mock_client.get_taker_long_short_ratio = get_taker
+
+    fetcher._client = mock_client
+    # 轮询器启动的各币种任务可能重叠，共享同一个并发上限
+    results = await asyncio.gather(*(fetcher.fetch_long_short_indicators(s) for s in symbols))
+
+    assert all(r is not None for r in results)
+    assert peak <= 3
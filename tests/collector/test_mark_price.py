@@ -0,0 +1,97 @@
+# tests/collector/test_mark_price.py
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.collector.indicator_fetcher import IndicatorFetcher
+from src.collector.mark_price import MarkPriceCollector
+
+
+def _mark_price_message(symbol: str = "BTCUSDT") -> str:
+    return json.dumps(
+        {
+            "e": "markPriceUpdate",
+            "E": 1706600000000,
+            "s": symbol,
+            "p": "100050.0",
+            "i": "100000.0",
+            "P": "100010.0",
+            "r": "0.00010000",
+            "T": 1706601600000,
+        }
+    )
+
+
+async def test_process_mark_price_message():
+    collector = MarkPriceCollector(symbols=["BTC/USDT:USDT"])
+    await collector._process_message(_mark_price_message())
+
+    mark = collector.get("BTC/USDT:USDT", max_age=5)
+    assert mark is not None
+    assert mark.mark_price == 100050.0
+    assert mark.index_price == 100000.0
+    assert mark.funding_rate == 0.0001
+    assert mark.next_funding_time == 1706601600000
+
+
+async def test_ignores_unconfigured_symbol():
+    collector = MarkPriceCollector(symbols=["BTC/USDT:USDT"])
+    await collector._process_message(_mark_price_message("XRPUSDT"))
+    assert collector.prices == {}
+
+
+async def test_stale_mark_price_is_ignored():
+    collector = MarkPriceCollector(symbols=["BTC/USDT:USDT"])
+    await collector._process_message(_mark_price_message())
+    collector.prices["BTC/USDT:USDT"].received_at -= 10
+
+    assert collector.get("BTC/USDT:USDT", max_age=5) is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_indicators_uses_live_mark_price():
+    collector = MarkPriceCollector(symbols=["BTC/USDT:USDT"])
+    await collector._process_message(_mark_price_message())
+
+    mock_client = MagicMock()
+    mock_client.get_premium_index = AsyncMock()
+    mock_client.get_klines = AsyncMock()
+    mock_client.get_global_long_short_ratio = AsyncMock()
+
+    fetcher = IndicatorFetcher(symbols=["BTC/USDT:USDT"], mark_prices=collector)
+    fetcher._client = mock_client
+    result = await fetcher.fetch_indicators("BTC/USDT:USDT")
+
+    assert result is not None
+    assert result.futures_price == 100050.0
+    assert result.spot_price == 100000.0
+    assert result.funding_rate == pytest.approx(0.01)
+    assert result.spot_perp_spread == pytest.approx(0.05)
+    mock_client.get_premium_index.assert_not_called()
+    mock_client.get_klines.assert_not_called()
+    mock_client.get_global_long_short_ratio.assert_not_called()
+
+    assert await fetcher.fetch_price("BTC/USDT:USDT") == 100050.0
+    mock_client.get_klines.assert_not_called()
+
+
+async def test_fetch_oi_values_open_interest_at_mark_price():
+    from src.client.models import OpenInterest
+
+    collector = MarkPriceCollector(symbols=["BTC/USDT:USDT"])
+    await collector._process_message(_mark_price_message())
+
+    mock_client = MagicMock()
+    mock_client.get_open_interest = AsyncMock(
+        return_value=OpenInterest("BTCUSDT", 2.0, 1706600000000)
+    )
+    mock_client.get_klines = AsyncMock()
+
+    fetcher = IndicatorFetcher(symbols=["BTC/USDT:USDT"], mark_prices=collector)
+    fetcher._client = mock_client
+    oi = await fetcher.fetch_oi("BTC/USDT:USDT")
+
+    assert oi is not None
+    assert oi.open_interest_usd == pytest.approx(200100.0)
+    mock_client.get_klines.assert_not_called()
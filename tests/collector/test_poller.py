@@ -0,0 +1,96 @@
+# tests/collector/test_poller.py
+import asyncio
+import time
+
+from src.collector.poller import StaggeredPoller
+
+
+def test_offsets_spread_evenly():
+    poller = StaggeredPoller("test", ["A", "B", "C", "D"], 60, work=None)  # type: ignore[arg-type]
+    assert poller.offsets() == [(0.0, "A"), (15.0, "B"), (30.0, "C"), (45.0, "D")]
+
+
+async def test_cycle_staggers_work():
+    started_at: dict[str, float] = {}
+
+    async def work(symbol: str) -> None:
+        started_at[symbol] = time.monotonic()
+
+    poller = StaggeredPoller("test", ["A", "B", "C", "D"], 0.4, work)
+    begin = time.monotonic()
+    await poller.run_cycle(begin)
+    await asyncio.sleep(0.01)
+
+    assert list(started_at) == ["A", "B", "C", "D"]
+    assert started_at["A"] - begin < 0.05
+    assert 0.28 <= started_at["D"] - begin < 0.4
+    assert poller.completed == 4
+
+
+async def test_skips_symbol_still_running_and_counts_errors():
+    release = asyncio.Event()
+
+    async def work(symbol: str) -> None:
+        if symbol == "slow":
+            await release.wait()
+        elif symbol == "bad":
+            raise RuntimeError("boom")
+
+    poller = StaggeredPoller("test", ["slow", "bad"], 0.02, work)
+    await poller.run_cycle(time.monotonic())
+    await poller.run_cycle(time.monotonic())
+    release.set()
+    await asyncio.sleep(0.01)
+
+    assert poller.skipped == 1
+    assert poller.errors == 2
+    assert poller.completed == 1
+
+
+async def test_tick_runs_one_cycle_and_cancel_stops_work():
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def work(symbol: str) -> None:
+        started.append(symbol)
+        await release.wait()
+
+    poller = StaggeredPoller("test", ["A", "B"], 0.02, work)
+    await poller.tick()
+    await asyncio.sleep(0.03)
+    poller.cancel()
+    await asyncio.sleep(0.01)
+
+    assert started == ["A", "B"]
+    assert poller.cycles == 1
+    assert poller.completed == 0
+
+
+async def test_tick_returns_before_cycle_finishes_so_overlapping_ticks_are_not_dropped():
+    started: list[str] = []
+
+    async def work(symbol: str) -> None:
+        started.append(symbol)
+
+    poller = StaggeredPoller("test", ["A", "B"], 0.1, work)
+    await poller.tick()
+    await asyncio.sleep(0.01)
+    assert started == ["A"]  # B 在 0.05s 处启动，tick 已经返回
+
+    # 下一次触发早于上一轮结束（调度抖动），两轮都完整执行
+    await poller.tick()
+    await asyncio.sleep(0.08)
+    assert sorted(started) == ["A", "A", "B", "B"]
+    assert poller.cycles == 2
+    assert poller.skipped == 0
+
+
+async def test_wait_returns_after_cycle_and_work_finish():
+    async def work(symbol: str) -> None:
+        await asyncio.sleep(0.02)
+
+    poller = StaggeredPoller("test", ["A", "B"], 0.04, work)
+    await poller.tick()
+    await poller.wait()
+
+    assert poller.completed == 2
@@ -294,3 +294,21 @@ def test_format_insight_report_with_history():
     assert "主力资金" in result
     assert "24h: ↑45% / ↓55%" in result
     assert "最近:" in result
+
+
+def test_format_cascade_alert():
+    from src.notifier.formatter import format_cascade_alert
+
+    msg = format_cascade_alert(
+        {
+            "long": 60_000_000,
+            "short": 20_000_000,
+            "symbols": 14,
+            "window_minutes": 5,
+            "top": [("BTC/USDT:USDT", 30_000_000), ("SOL/USDT:USDT", 8_000_000)],
+        }
+    )
+
+    assert "14 个币种爆仓 $80.0M" in msg
+    assert "多 75% / 空 25%" in msg
+    assert "BTC: $30.0M" in msg
@@ -0,0 +1,188 @@
+# tests/notifier/test_outbox.py
+import asyncio
+import time
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from telegram.error import BadRequest, NetworkError, RetryAfter
+
+from src.notifier.outbox import SEPARATOR, Outbox
+from src.storage.database import Database
+from src.storage.models import OutboxMessage
+
+
+@pytest.fixture
+async def db(tmp_path):
+    database = Database(str(tmp_path / "test.db"))
+    await database.init()
+    yield database
+    await database.close()
+
+
+def _outbox(send: AsyncMock, store: Database | None = None, **kwargs: Any) -> Outbox:
+    options: dict[str, Any] = {
+        "global_per_second": 1000,
+        "per_chat_interval": 0.0,
+        "coalesce_seconds": 0.05,
+        "retry_base_delay": 0.01,
+        "retry_max_delay": 0.05,
+        **kwargs,
+    }
+    return Outbox(send, store, "100", **options)
+
+
+async def _drain(outbox: Outbox, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while outbox.pending and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def test_messages_for_same_chat_are_coalesced():
+    send = AsyncMock()
+    outbox = _outbox(send)
+    await outbox.start()
+
+    await outbox.put("a")
+    await outbox.put("b")
+    await outbox.put("c", chat_id="200")
+    await _drain(outbox)
+    await outbox.stop()
+
+    sent = sorted((call.args[1], call.args[0]) for call in send.await_args_list)
+    assert sent == [("100", f"a{SEPARATOR}b"), ("200", "c")]
+    assert outbox.sent == 2
+    assert outbox.coalesced == 1
+
+
+async def test_put_does_not_wait_for_slow_sender():
+    release = asyncio.Event()
+
+    async def slow_send(text: str, chat_id: str) -> None:
+        await release.wait()
+
+    outbox = _outbox(AsyncMock(side_effect=slow_send), coalesce_seconds=0)
+    await outbox.start()
+
+    await asyncio.wait_for(outbox.put("a"), timeout=0.1)
+    await asyncio.sleep(0.02)
+    await asyncio.wait_for(outbox.put("b"), timeout=0.1)
+    release.set()
+    await _drain(outbox)
+    await outbox.stop()
+
+
+async def test_per_chat_interval_is_respected():
+    times: list[float] = []
+
+    async def send(text: str, chat_id: str) -> None:
+        times.append(time.monotonic())
+
+    outbox = _outbox(AsyncMock(side_effect=send), per_chat_interval=0.2, coalesce_seconds=0)
+    await outbox.start()
+
+    await outbox.put("a")
+    await asyncio.sleep(0.02)
+    await outbox.put("b")
+    await _drain(outbox)
+    await outbox.stop()
+
+    assert len(times) == 2
+    assert times[1] - times[0] >= 0.19
+
+
+async def test_retry_after_pauses_chat_then_delivers():
+    send = AsyncMock(side_effect=[RetryAfter(0), None])
+    outbox = _outbox(send)
+    await outbox.start()
+
+    await outbox.put("a")
+    await _drain(outbox)
+    await outbox.stop()
+
+    assert send.await_count == 2
+    assert outbox.throttled == 1
+    assert outbox.sent == 1
+
+
+async def test_transient_errors_retry_and_permanent_errors_drop(db: Database):
+    send = AsyncMock(side_effect=[NetworkError("down"), None, BadRequest("bad html")])
+    outbox = _outbox(send, db)
+    await outbox.start()
+
+    await outbox.put("a")
+    await _drain(outbox)
+    await outbox.put("b")
+    await _drain(outbox)
+    await outbox.stop()
+
+    assert (outbox.retries, outbox.sent, outbox.dropped) == (1, 1, 1)
+    assert await db.get_outbox_messages() == []
+
+
+async def test_gives_up_after_max_attempts():
+    send = AsyncMock(side_effect=NetworkError("down"))
+    outbox = _outbox(send, max_attempts=3)
+    await outbox.start()
+
+    await outbox.put("a")
+    await _drain(outbox)
+    await outbox.stop()
+
+    assert send.await_count == 3
+    assert outbox.dropped == 1
+
+
+async def test_undelivered_messages_survive_restart(db: Database):
+    failing = _outbox(AsyncMock(side_effect=NetworkError("down")), db, retry_base_delay=60)
+    await failing.start()
+    await failing.put("a")
+    await asyncio.sleep(0.1)
+    await failing.stop(drain_timeout=0)
+    # 超过 max_age 的消息重启后丢弃
+    old = int((time.time() - 7200) * 1000)
+    await db.insert_outbox_messages([OutboxMessage(None, "100", "stale", old)])
+
+    send = AsyncMock()
+    restored = _outbox(send, db)
+    await restored.start()
+    await _drain(restored)
+    await restored.stop()
+
+    send.assert_awaited_once_with("a", "100")
+    assert await db.get_outbox_messages() == []
+
+
+async def test_disabled_outbox_sends_inline():
+    send = AsyncMock()
+    outbox = Outbox(send, None, "100", enabled=False)
+
+    await outbox.put("a", chat_id="200")
+
+    send.assert_awaited_once_with("a", "200")
+    assert outbox.pending == 0
+
+
+async def test_publish_persists_once_and_delivers_chats_concurrently(db: Database):
+    started: set[str] = set()
+    both_started = asyncio.Event()
+
+    async def send(text: str, chat_id: str) -> None:
+        started.add(chat_id)
+        if len(started) == 2:
+            both_started.set()
+        # 两个会话都开始发送后才返回，串行发送会在这里超时
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+
+    mock = AsyncMock(side_effect=send)
+    outbox = _outbox(mock, db, workers=2, coalesce_seconds=0)
+    await outbox.start()
+
+    await outbox.publish("a", ["100", "200"])
+    assert len(await db.get_outbox_messages()) == 2
+    await _drain(outbox)
+    await outbox.stop()
+
+    assert sorted(call.args for call in mock.await_args_list) == [("a", "100"), ("a", "200")]
+    assert outbox.sent == 2
+    assert await db.get_outbox_messages() == []
@@ -0,0 +1,58 @@
+# tests/notifier/test_router.py
+from src.notifier.router import ANY, AlertRouter
+from src.storage.models import Subscription
+
+
+def _router(*subs: Subscription) -> AlertRouter:
+    router = AlertRouter(["default"])
+    router.load(subs)
+    return router
+
+
+def test_route_matches_exact_and_wildcard_subscriptions():
+    router = _router(
+        Subscription("a", "BTC", "whale_flow"),
+        Subscription("b", "BTC", ANY),
+        Subscription("c", ANY, "whale_flow"),
+        Subscription("d", ANY, ANY),
+        Subscription("e", "ETH", "whale_flow"),
+    )
+
+    assert router.route("BTC", "whale_flow") == {"default", "a", "b", "c", "d"}
+    assert router.route("BTC", "cascade") == {"default", "b", "d"}
+    assert router.route("ETH", "observe") == {"default", "d"}
+
+
+def test_thresholds_filter_by_absolute_value():
+    router = _router(
+        Subscription("small", "BTC", "whale_flow", threshold=1e6),
+        Subscription("big", "BTC", "whale_flow", threshold=5e7),
+        Subscription("mid", "BTC", "whale_flow", threshold=-1e7),
+    )
+
+    assert router.route("BTC", "whale_flow", 2e6) == {"default", "small"}
+    assert router.route("BTC", "whale_flow", -2e7) == {"default", "small", "mid"}
+    assert router.route("BTC", "whale_flow", 5e7) == {"default", "small", "mid", "big"}
+    # 没有数值的告警不受门槛限制
+    assert router.route("BTC", "whale_flow") == {"default", "small", "mid", "big"}
+
+
+def test_chat_matching_several_subscriptions_is_routed_once():
+    router = _router(Subscription("a", "BTC", ANY), Subscription("a", ANY, ANY))
+
+    assert router.route("BTC", "observe") == {"default", "a"}
+    assert len(router) == 2
+
+
+def test_add_replaces_and_remove_cleans_up():
+    router = _router(Subscription("a", "BTC", "oi_change", threshold=10))
+    router.add(Subscription("a", "BTC", "oi_change", threshold=1))
+
+    assert router.route("BTC", "oi_change", 5) == {"default", "a"}
+    assert router.subscriptions("a") == [Subscription("a", "BTC", "oi_change", threshold=1)]
+
+    assert router.remove("a", "BTC", "oi_change")
+    assert not router.remove("a", "BTC", "oi_change")
+    assert router.route("BTC", "oi_change", 5) == {"default"}
+    assert router.subscriptions("a") == []
+    assert len(router) == 0
@@ -1,6 +1,8 @@
 # tests/notifier/test_telegram.py
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 
 async def test_send_message():
     with patch("src.notifier.telegram.Bot") as MockBot:
@@ -31,3 +33,71 @@ def test_parse_watch_command():
 
     result = TelegramNotifier._parse_watch_command("/watch invalid")
     assert result is None
+
+
+def test_parse_subscribe_command():
+    from src.notifier.telegram import TelegramNotifier
+
+    parse = TelegramNotifier._parse_subscribe_command
+    assert parse("/subscribe btc") == ("BTC", "*", None)
+    assert parse("/subscribe * whale_flow 50000000") == ("*", "whale_flow", 50000000.0)
+    assert parse("/unsubscribe ETH observe") == ("ETH", "observe", None)
+    assert parse("/subscribe") is None
+
+
+async def test_threaded_send_message_runs_on_bot_thread():
+    import threading
+
+    with patch("src.notifier.telegram.Bot") as MockBot:
+        threads = []
+        mock_bot = MagicMock()
+        mock_bot.send_message = AsyncMock(
+            side_effect=lambda **kwargs: threads.append(threading.get_ident())
+        )
+        MockBot.return_value = mock_bot
+
+        from src.notifier.telegram import TelegramNotifier
+
+        notifier = TelegramNotifier(bot_token="test", chat_id="123", threaded=True)
+        try:
+            await notifier.send_message("Hello", chat_id="456")
+        finally:
+            notifier.thread.stop()
+
+        mock_bot.send_message.assert_called_once_with(
+            chat_id="456", text="Hello", parse_mode="HTML"
+        )
+        assert threads and threads[0] != threading.get_ident()
+
+
+async def test_threaded_commands_run_on_main_loop():
+    import asyncio
+    import threading
+
+    from src.notifier.telegram import TelegramNotifier
+
+    notifier = TelegramNotifier(bot_token="test", chat_id="123", threaded=True)
+    main_thread = threading.get_ident()
+    seen = []
+
+    async def on_status() -> str:
+        seen.append(threading.get_ident())
+        return "ok"
+
+    async def on_report(symbol: str) -> str:
+        raise RuntimeError(symbol)
+
+    # 只启动命令队列和 Bot 线程，不连接 Telegram
+    notifier._main_loop = asyncio.get_running_loop()
+    notifier._command_task = asyncio.create_task(notifier._serve_commands())
+    notifier.thread.start()
+    try:
+        assert await notifier.thread.run(notifier._call(on_status)) == "ok"
+        with pytest.raises(RuntimeError, match="BTC"):
+            await notifier.thread.run(notifier._call(on_report, "BTC"))
+    finally:
+        notifier.thread.stop()
+        notifier._command_task.cancel()
+
+    assert seen == [main_thread]
+    assert notifier.commands == 2
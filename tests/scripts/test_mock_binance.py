@@ -0,0 +1,116 @@
+# tests/scripts/test_mock_binance.py
+import asyncio
+import json
+
+import aiohttp
+
+from src.scripts.mock_binance import MockBinanceServer, StreamSettings
+
+
+async def test_agg_trade_stream_rate_and_ids():
+    server = MockBinanceServer(streams=StreamSettings(trade_rate=200))
+    await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"{server.ws_url}/ws/btcusdt@aggTrade") as ws:
+                messages = [json.loads((await ws.receive(timeout=2)).data) for _ in range(20)]
+    finally:
+        await server.stop()
+
+    assert {m["e"] for m in messages} == {"aggTrade"}
+    assert {m["s"] for m in messages} == {"BTCUSDT"}
+    ids = [m["a"] for m in messages]
+    assert ids == list(range(ids[0], ids[0] + 20))
+    assert server.ws_sent["btcusdt@aggTrade"] >= 20
+
+
+async def test_combined_path_streams_mark_price_and_liquidations():
+    server = MockBinanceServer(
+        streams=StreamSettings(liquidation_rate=100, mark_price_interval=0.05)
+    )
+    await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            url = f"{server.ws_url}/ws/btcusdt@forceOrder/ethusdt@markPrice@1s"
+            async with session.ws_connect(url) as ws:
+                events = {json.loads((await ws.receive(timeout=2)).data)["e"] for _ in range(20)}
+    finally:
+        await server.stop()
+
+    assert events == {"forceOrder", "markPriceUpdate"}
+
+
+async def test_server_disconnects_after_lifetime():
+    server = MockBinanceServer(streams=StreamSettings(disconnect_after=0.2))
+    await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"{server.ws_url}/ws/btcusdt@aggTrade") as ws:
+                async with asyncio.timeout(2):
+                    async for _ in ws:
+                        pass
+                assert ws.closed
+    finally:
+        await server.stop()
+
+    assert server.ws_disconnects == 1
+
+
+async def test_telegram_send_message_is_recorded():
+    from src.notifier.telegram import TelegramNotifier
+
+    server = MockBinanceServer(latency_ms=0)
+    base_url = await server.start()
+    try:
+        notifier = TelegramNotifier("0:test", "42", base_url=f"{base_url}/bot")
+        async with notifier.bot:
+            await notifier.send_message("hello")
+    finally:
+        await server.stop()
+
+    assert len(server.telegram_messages) == 1
+    assert server.telegram_messages[0]["text"] == "hello"
+    assert server.telegram_messages[0]["chat_id"] == "42"
+
+
+async def test_depth_stream_matches_snapshot():
+    server = MockBinanceServer(latency_ms=0, streams=StreamSettings(depth_interval=0.01))
+    await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(
+                f"{server.base_url}/fapi/v1/depth", params={"symbol": "BTCUSDT", "limit": 5}
+            ) as resp:
+                snapshot = await resp.json()
+            async with session.ws_connect(f"{server.ws_url}/ws/btcusdt@depth@100ms") as ws:
+                updates = [json.loads((await ws.receive(timeout=2)).data) for _ in range(5)]
+    finally:
+        await server.stop()
+
+    assert len(snapshot["bids"]) == len(snapshot["asks"]) == 5
+    assert float(snapshot["bids"][0][0]) < float(snapshot["asks"][0][0])
+    assert updates[0]["pu"] == snapshot["lastUpdateId"]
+    for prev, update in zip(updates, updates[1:], strict=False):
+        assert update["pu"] == prev["u"]
+        assert update["U"] == prev["u"] + 1
+    assert server.book("BTCUSDT").last_update_id == updates[-1]["u"]
+
+
+async def test_futures_data_limit_rejects_over_budget():
+    server = MockBinanceServer(latency_ms=0, data_limit=3)
+    await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            url = f"{server.base_url}/futures/data/globalLongShortAccountRatio"
+            statuses = []
+            for _ in range(4):
+                async with session.get(url, params={"symbol": "BTCUSDT", "period": "5m"}) as r:
+                    statuses.append(r.status)
+            async with session.get(f"{server.base_url}/fapi/v1/openInterest?symbol=BTCUSDT") as r:
+                assert r.status == 200
+    finally:
+        await server.stop()
+
+    assert statuses == [200, 200, 200, 429]
+    assert server.data_rejected == 1
+    assert server.data_peak() == 3
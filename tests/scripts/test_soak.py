@@ -0,0 +1,45 @@
+# tests/scripts/test_soak.py
+import json
+
+from src.scripts.mock_binance import MockBinanceServer, StreamSettings
+from src.scripts.soak import SoakProbe, run_soak, soak_symbols
+
+
+def _agg(symbol: str, agg_id: int) -> str:
+    return json.dumps({"e": "aggTrade", "s": symbol, "a": agg_id})
+
+
+def test_soak_symbols():
+    symbols = soak_symbols(12)
+    assert symbols[:2] == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+    assert len(set(symbols)) == 12
+
+
+def test_probe_counts_gaps_and_duplicates():
+    probe = SoakProbe()
+    for agg_id in (1, 2, 2, 5, 6):
+        probe.record("btcusdt@aggTrade", _agg("BTCUSDT", agg_id))
+    probe.record("ethusdt@aggTrade", _agg("ETHUSDT", 10))
+    probe.record("btcusdt@markPrice@1s", "{}")
+
+    assert probe.received == 6
+    assert probe.duplicates == 1
+    assert probe.missing == 2  # 3, 4
+
+
+async def test_run_soak_against_mock_server(tmp_path):
+    server = MockBinanceServer(latency_ms=0, streams=StreamSettings(trade_rate=100))
+    await server.start()
+    try:
+        probe, elapsed = await run_soak(
+            server, soak_symbols(2), duration=1.5, db_path=tmp_path / "soak.db"
+        )
+    finally:
+        await server.stop()
+
+    assert elapsed >= 1.5
+    assert probe.processed > 50
+    assert probe.missing == 0
+    assert probe.latencies_ms and max(probe.latencies_ms) < 1000
+    assert server.requests["/fapi/v1/openInterest"] > 0
+    assert server.data_rejected == 0
@@ -4,7 +4,7 @@ import time
 import pytest
 
 from src.storage.database import Database
-from src.storage.models import Liquidation, OISnapshot, PriceAlert, Trade
+from src.storage.models import Liquidation, OISnapshot, PriceAlert, Subscription, Trade
 
 
 @pytest.fixture
@@ -54,11 +54,45 @@ async def test_price_alerts_crud(db: Database):
     assert alerts[0].price == 100000.0
 
     # Delete
+    await db.insert_price_alert(
+        PriceAlert(
+            id=None, symbol="ETH", price=3000.0, last_position="above", last_triggered_at=None
+        )
+    )
+    assert {a.symbol for a in await db.get_all_price_alerts()} == {"BTC", "ETH"}
+
     await db.delete_price_alert("BTC", 100000.0)
     alerts = await db.get_price_alerts("BTC")
     assert len(alerts) == 0
 
 
+async def test_price_alerts_per_chat(db: Database):
+    for chat_id in (None, "200"):
+        await db.insert_price_alert(PriceAlert(None, "BTC", 100.0, "below", None, chat_id=chat_id))
+
+    assert await db.claim_price_alerts("100") == 1
+    assert sorted(a.chat_id or "" for a in await db.get_price_alerts("BTC")) == ["100", "200"]
+
+    await db.delete_price_alert("BTC", 100.0, chat_id="200")
+    assert [a.chat_id for a in await db.get_price_alerts("BTC")] == ["100"]
+
+
+async def test_subscriptions_crud(db: Database):
+    await db.upsert_subscription(Subscription("100", "BTC", "whale_flow", 1e6))
+    await db.upsert_subscription(Subscription("100", "BTC", "whale_flow", 5e6))
+    await db.upsert_subscription(Subscription("200", "*", "*"))
+
+    subs = sorted(await db.get_subscriptions(), key=lambda s: s.chat_id)
+    assert subs == [
+        Subscription("100", "BTC", "whale_flow", 5e6),
+        Subscription("200", "*", "*", None),
+    ]
+
+    assert await db.delete_subscription("100", "BTC", "whale_flow")
+    assert not await db.delete_subscription("100", "BTC", "whale_flow")
+    assert len(await db.get_subscriptions()) == 1
+
+
 async def test_insert_and_get_liquidations(db: Database):
     now = int(time.time() * 1000)
     liq = Liquidation(
@@ -78,6 +112,24 @@ async def test_insert_and_get_liquidations(db: Database):
     assert liqs[0].side == "sell"
 
 
+async def test_trade_and_liquidation_series(db: Database):
+    now = int(time.time() * 1000)
+    for offset, side in ((2000, "sell"), (1000, "buy")):
+        await db.insert_trade(
+            Trade(None, "binance", "BTC/USDT:USDT", now - offset, 100.0, 1.0, side, 50.0)
+        )
+    await db.insert_liquidation(
+        Liquidation(None, "binance", "BTC/USDT:USDT", now, "long", 100.0, 1.0, 80.0)
+    )
+
+    trades = await db.get_trade_series("BTC/USDT:USDT", hours=1)
+    assert list(trades.timestamps) == [now - 2000, now - 1000]  # 按时间升序
+    assert list(trades.values) == [-50.0, 50.0]  # 卖出为负
+    liqs = await db.get_liquidation_series("BTC/USDT:USDT", hours=1)
+    assert list(liqs.values) == [80.0]
+    assert len(await db.get_trade_series("ETH/USDT:USDT", hours=1)) == 0
+
+
 async def test_insert_and_get_oi(db: Database):
     now = int(time.time() * 1000)
     oi = OISnapshot(
@@ -95,6 +147,21 @@ async def test_insert_and_get_oi(db: Database):
     assert latest.open_interest_usd == 5000000000.0
 
 
+async def test_get_oi_history_includes_anchor_before_cutoff(db: Database):
+    now = int(time.time() * 1000)
+    hour = 3600 * 1000
+    for hours_ago, value in [(10, 1.0), (5, 2.0), (2, 3.0), (0, 4.0)]:
+        await db.insert_oi_snapshot(
+            OISnapshot(None, "binance", "BTC/USDT:USDT", now - hours_ago * hour, 1.0, value)
+        )
+
+    history = await db.get_oi_history("BTC/USDT:USDT", hours=3)
+
+    # 3 小时窗口 + 截止时间之前最近的一条（5 小时前），更早的不返回
+    assert [s.open_interest_usd for s in history] == [2.0, 3.0, 4.0]
+    assert await db.get_oi_history("ETH/USDT:USDT", hours=3) == []
+
+
 async def test_insert_and_get_market_indicator(tmp_path):
     from src.storage.database import Database
     from src.storage.models import MarketIndicator
@@ -353,3 +420,28 @@ async def test_check_cooldown(db: Database):
     # 不同窗口不受影响
     not_in_cooldown = await db.is_in_cooldown("BTC", "flow_1h", 7, cooldown_hours=1)
     assert not_in_cooldown is False
+
+
+async def test_insert_candles_and_get_price_at(db: Database):
+    from src.storage.models import Candle
+
+    base = 1_700_000_040_000 - 1_700_000_040_000 % 60000
+    candles = [
+        Candle("BTC/USDT:USDT", base, 100.0, 101.0, 99.0, 100.5, 2.0, 201.0, 3),
+        Candle("BTC/USDT:USDT", base + 60000, 100.5, 102.0, 100.0, 101.5, 1.0, 101.5, 2),
+    ]
+    await db.insert_candles(candles)
+
+    stored = await db.get_candles("BTC/USDT:USDT", base, base + 60000)
+    assert [c.close for c in stored] == [100.5, 101.5]
+
+    # 同一分钟重复写入时覆盖
+    await db.insert_candles(
+        [Candle("BTC/USDT:USDT", base, 100.0, 101.0, 99.0, 100.7, 3.0, 302.0, 4)]
+    )
+    assert await db.get_price_at("BTC/USDT:USDT", base + 30000) == 100.7
+
+    # 无成交的分钟向前取最近一根，超出容忍范围返回 None
+    assert await db.get_price_at("BTC/USDT:USDT", base + 3 * 60000) == 101.5
+    assert await db.get_price_at("BTC/USDT:USDT", base + 60 * 60000) is None
+    assert await db.get_price_at("ETH/USDT:USDT", base) is None
@@ -0,0 +1,62 @@
+# tests/test_events.py
+import asyncio
+from unittest.mock import MagicMock
+
+from src.events import RECORD, LocalEvents, RingConsumer, RingPublisher, dispatch
+from src.storage.models import Liquidation, Trade
+from src.utils.shm_ring import ShmRing
+
+TRADE = Trade(None, "binance", "BTC/USDT:USDT", 1706600000000, 100000.0, 1.5, "sell", 150000.0)
+LIQ = Liquidation(None, "binance", "ETH/USDT:USDT", 1706600000000, "long", 3000.0, 2.0, 6000.0)
+
+
+def make_sink() -> LocalEvents:
+    return LocalEvents(MagicMock(), MagicMock(), MagicMock(), MagicMock())
+
+
+def published(ring: ShmRing) -> list[bytes]:
+    return ring.reader(from_start=True).read()
+
+
+def test_round_trip_through_ring():
+    ring = ShmRing.create(capacity=16, payload_size=RECORD.size)
+    try:
+        publisher = RingPublisher(ring)
+        publisher.trade(TRADE)
+        publisher.tick("BTC/USDT:USDT", 100001.0, 0.01, 1706600000001)
+        publisher.liquidation(LIQ)
+        publisher.mark("ETH/USDT:USDT", "indicators")
+        assert publisher.published == 4
+
+        sink = make_sink()
+        for record in published(ring):
+            dispatch(record, sink)
+    finally:
+        ring.close()
+
+    sink.on_trade.assert_called_once_with(TRADE)
+    sink.on_tick.assert_called_once_with("BTC/USDT:USDT", 100001.0, 0.01, 1706600000001)
+    sink.on_liquidation.assert_called_once_with(LIQ)
+    sink.on_mark.assert_called_once_with("ETH/USDT:USDT", "indicators")
+
+
+async def test_consumer_dispatches_and_survives_errors():
+    ring = ShmRing.create(capacity=16, payload_size=RECORD.size)
+    try:
+        sink = make_sink()
+        sink.on_mark.side_effect = [RuntimeError("boom"), None]
+        consumer = RingConsumer(ring.reader(), sink, poll_interval=0.001)
+        task = asyncio.create_task(consumer.run())
+        publisher = RingPublisher(ring)
+        publisher.mark("BTC/USDT:USDT", "trade")
+        publisher.mark("BTC/USDT:USDT", "indicators")
+        for _ in range(100):
+            if consumer.reader.received == 2:
+                break
+            await asyncio.sleep(0.005)
+        task.cancel()
+    finally:
+        ring.close()
+
+    assert consumer.errors == 1
+    assert sink.on_mark.call_count == 2
@@ -0,0 +1,54 @@
+# tests/test_supervisor.py
+import sys
+import time
+from pathlib import Path
+
+from src.config import ProcessesConfig
+from src.supervisor import Supervisor
+
+
+def crash(role: str, config_path: str, ring_name: str) -> None:
+    sys.exit(3)
+
+
+def wait_exit(supervisor: Supervisor) -> None:
+    for child in supervisor.children:
+        assert child.process is not None
+        child.process.join(10)
+
+
+def test_restarts_exited_child_with_backoff():
+    config = ProcessesConfig(
+        ring_capacity=16, restart_backoff_seconds=1, restart_max_backoff_seconds=60
+    )
+    supervisor = Supervisor(Path("config.yaml"), config, target=crash, roles=("ingest",))
+    supervisor.start()
+    try:
+        child = supervisor.children[0]
+        wait_exit(supervisor)
+        now = time.monotonic()
+        supervisor.check(now)
+        assert child.failures == 1
+        assert child.restart_at == now + 1
+        supervisor.check(now + 0.5)
+        assert child.restarts == 0
+        supervisor.check(now + 1)
+        assert child.restarts == 1
+
+        # 连续失败时退避翻倍
+        wait_exit(supervisor)
+        later = time.monotonic()
+        supervisor.check(later)
+        assert child.restart_at == later + 2
+    finally:
+        supervisor.shutdown(timeout=5)
+    assert supervisor.ring is None
+
+
+def test_shutdown_does_not_restart():
+    config = ProcessesConfig(ring_capacity=16)
+    supervisor = Supervisor(Path("config.yaml"), config, target=crash, roles=("ingest",))
+    supervisor.start()
+    supervisor.shutdown(timeout=5)
+    supervisor.check()
+    assert supervisor.children[0].restart_at is None
@@ -0,0 +1,55 @@
+# tests/utils/test_compute.py
+import asyncio
+
+import pytest
+
+from src.aggregator.series import hourly_sums
+from src.storage.models import Series
+from src.utils.compute import ComputeExecutor
+from src.utils.looplag import LoopLagMonitor
+
+SERIES = Series.from_rows([(0, 1.0), (1, 2.0), (3_600_000, 3.0)])
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+async def test_modes_return_same_result(mode):
+    compute = ComputeExecutor(mode, workers=1)
+    try:
+        assert await compute.run(hourly_sums, SERIES) == [3.0, 3.0]
+    finally:
+        compute.close()
+    assert compute.tasks == 1
+
+
+async def test_thread_mode_keeps_event_loop_responsive():
+    def busy() -> int:
+        # 释放 GIL 的阻塞调用，模拟一段较长的计算
+        import time
+
+        time.sleep(0.2)
+        return 1
+
+    monitor = LoopLagMonitor(interval=0.01, warn_threshold=1)
+    sampler = asyncio.create_task(monitor.run())
+    compute = ComputeExecutor("thread", workers=1)
+    try:
+        assert await compute.run(busy) == 1
+    finally:
+        compute.close()
+        sampler.cancel()
+
+    assert len(monitor.samples) >= 10
+    assert monitor.max_lag < 0.1
+
+
+def test_loop_lag_statistics():
+    monitor = LoopLagMonitor(warn_threshold=0.05, window=3)
+    for lag in (0.01, 0.2, 0.02, 0.03):
+        monitor.record(lag)
+
+    assert list(monitor.samples) == [0.2, 0.02, 0.03]
+    assert monitor.percentile(50) == 0.03
+    assert monitor.percentile(99) == 0.2
+    assert monitor.max_lag == 0.2
+    assert monitor.slow == 1
+    assert LoopLagMonitor().percentile(99) == 0.0
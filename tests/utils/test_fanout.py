@@ -0,0 +1,56 @@
+# tests/utils/test_fanout.py
+import asyncio
+import time
+
+from src.utils.fanout import SymbolFanout
+
+
+async def test_symbols_run_concurrently_up_to_limit():
+    running = 0
+    peak = 0
+
+    async def work(symbol: str) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    fanout = SymbolFanout("test", concurrency=2)
+    started = time.monotonic()
+    timings = await fanout.run(["A", "B", "C", "D"], work)
+
+    assert peak == 2
+    assert [t.symbol for t in timings] == ["A", "B", "C", "D"]
+    assert time.monotonic() - started < 0.15  # 两批而不是四次串行
+
+
+async def test_slow_symbol_is_cancelled_without_delaying_others():
+    done: list[str] = []
+
+    async def work(symbol: str) -> None:
+        if symbol == "SLOW":
+            await asyncio.sleep(10)
+        done.append(symbol)
+
+    fanout = SymbolFanout("test", concurrency=4, timeout=0.05)
+    timings = await fanout.run(["SLOW", "A", "B"], work)
+
+    assert sorted(done) == ["A", "B"]
+    assert {t.symbol: t.status for t in timings} == {"SLOW": "timeout", "A": "ok", "B": "ok"}
+    assert fanout.timeouts == 1
+    assert fanout.last_slowest is not None and fanout.last_slowest.symbol == "SLOW"
+    assert fanout.last_seconds < 1
+
+
+async def test_errors_are_isolated_per_symbol():
+    async def work(symbol: str) -> None:
+        if symbol == "BAD":
+            raise RuntimeError("boom")
+
+    fanout = SymbolFanout("test")
+    timings = await fanout.run(["BAD", "OK"], work)
+
+    assert [t.status for t in timings] == ["error", "ok"]
+    assert fanout.errors == 1
+    assert await fanout.run([], work) == []
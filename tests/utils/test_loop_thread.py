@@ -0,0 +1,64 @@
+# tests/utils/test_loop_thread.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.loop_thread import LoopThread
+from src.utils.looplag import LoopLagMonitor
+
+
+async def test_run_executes_on_own_thread():
+    thread = LoopThread("test-loop")
+    thread.start()
+    try:
+
+        async def where() -> int:
+            return threading.get_ident()
+
+        assert await thread.run(where()) != threading.get_ident()
+    finally:
+        thread.stop()
+    assert not thread.running
+
+
+async def test_blocking_work_does_not_lag_caller_loop():
+    monitor = LoopLagMonitor(interval=0.02, warn_threshold=1.0)
+    lag_task = asyncio.create_task(monitor.run())
+    thread = LoopThread("test-loop")
+    thread.start()
+    try:
+
+        async def stuck() -> str:
+            # 模拟卡住的同步调用（sleep 释放 GIL，如阻塞的网络读）
+            time.sleep(0.3)
+            return "done"
+
+        assert await thread.run(stuck()) == "done"
+    finally:
+        thread.stop()
+        lag_task.cancel()
+    assert monitor.max_lag < 0.1
+
+
+async def test_exceptions_propagate_to_caller():
+    thread = LoopThread("test-loop")
+    thread.start()
+    try:
+
+        async def fail() -> None:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await thread.run(fail())
+    finally:
+        thread.stop()
+
+
+def test_submit_requires_running_loop():
+    async def noop() -> None:
+        pass
+
+    with pytest.raises(RuntimeError):
+        LoopThread("test-loop").submit(noop())
@@ -0,0 +1,79 @@
+# tests/utils/test_scheduler.py
+import asyncio
+
+import pytest
+
+from src.utils.scheduler import Scheduler
+
+
+async def _noop() -> None:
+    pass
+
+
+def test_next_run_is_aligned_to_wall_clock_with_offset():
+    scheduler = Scheduler()
+    job = scheduler.add("oi", 300, _noop)
+    staggered = scheduler.add("ls", 300, _noop, offset=7)
+
+    assert scheduler.next_run(job, 1_000_000_001) == 1_000_000_200  # 下一个 5 分钟边界
+    assert scheduler.next_run(job, 1_000_000_200) == 1_000_000_500  # 恰好在边界上取下一个
+    assert scheduler.next_run(staggered, 1_000_000_001) == 1_000_000_207
+
+
+def test_jobs_are_staggered_in_registration_order():
+    scheduler = Scheduler(stagger=7)
+    offsets = [scheduler.add(name, 60, _noop).offset for name in ("a", "b", "c")]
+
+    assert offsets == [0, 7, 14]
+    assert scheduler.add("short", 10, _noop).offset == 1  # 21 % 10
+
+    with pytest.raises(ValueError):
+        scheduler.add("bad", 0, _noop)
+
+
+async def test_unaligned_scheduler_counts_from_start():
+    scheduler = Scheduler(align=False, clock=lambda: 1234.5)
+    job = scheduler.add("a", 60, _noop)
+    scheduler.start()
+    await scheduler.stop()
+
+    assert scheduler.next_run(job, 1240) == 1294.5
+
+
+async def test_runs_on_ticks_and_records_stats():
+    calls = 0
+
+    async def work() -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("boom")
+
+    scheduler = Scheduler()
+    job = scheduler.add("fast", 0.05, work, run_at_start=True)
+    scheduler.start()
+    await asyncio.sleep(0.18)
+    await scheduler.stop()
+
+    assert 3 <= job.runs <= 5
+    assert job.errors == 1
+    assert job.last_started is not None
+    assert job.max_duration >= job.last_duration
+
+
+async def test_skips_tick_while_previous_run_is_active():
+    release = asyncio.Event()
+
+    async def slow() -> None:
+        await release.wait()
+
+    scheduler = Scheduler()
+    job = scheduler.add("slow", 0.03, slow)
+    scheduler.start()
+    await asyncio.sleep(0.15)
+    release.set()
+    await asyncio.sleep(0.01)
+    await scheduler.stop()
+
+    assert job.skipped >= 2
+    assert job.runs >= 1
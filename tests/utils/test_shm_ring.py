@@ -0,0 +1,75 @@
+# tests/utils/test_shm_ring.py
+import pytest
+
+from src.utils.shm_ring import ShmRing
+
+
+@pytest.fixture
+def ring():
+    ring = ShmRing.create(capacity=4, payload_size=8)
+    yield ring
+    ring.close()
+
+
+def payload(n: int) -> bytes:
+    return n.to_bytes(8, "little")
+
+
+def test_put_and_read_in_order(ring):
+    reader = ring.reader()
+    for n in range(3):
+        ring.put(payload(n))
+    assert reader.read() == [payload(0), payload(1), payload(2)]
+    assert reader.received == 3
+    assert reader.lost == 0
+    assert reader.read() == []
+
+
+def test_reader_starts_at_head_by_default(ring):
+    ring.put(payload(1))
+    assert ring.reader().read() == []
+    assert ring.reader(from_start=True).read() == [payload(1)]
+
+
+def test_overrun_counts_lost_records(ring):
+    reader = ring.reader()
+    for n in range(10):
+        ring.put(payload(n))
+    # 容量 4：最早的 6 条已被覆盖
+    assert reader.read() == [payload(n) for n in range(6, 10)]
+    assert reader.lost == 6
+    assert reader.backlog == 0
+
+
+def test_read_respects_max_records(ring):
+    reader = ring.reader()
+    for n in range(3):
+        ring.put(payload(n))
+    assert reader.read(max_records=2) == [payload(0), payload(1)]
+    assert reader.backlog == 1
+
+
+def test_torn_record_is_counted_as_lost(ring):
+    reader = ring.reader()
+    ring.put(payload(1))
+    # 模拟写入方正在改写该槽位（序号被置 0）
+    ring._buf[ring._offset(1) : ring._offset(1) + 8] = bytes(8)
+    assert reader.read() == []
+    assert reader.lost == 1
+
+
+def test_attach_by_name_shares_records(ring):
+    other = ShmRing.attach(ring.name)
+    try:
+        reader = other.reader()
+        ring.put(payload(7))
+        assert reader.read() == [payload(7)]
+        # 写入进程重启后从头部序号继续写
+        assert other.put(payload(8)) == ring.write_seq - 1
+    finally:
+        other.close()
+
+
+def test_put_rejects_wrong_size(ring):
+    with pytest.raises(ValueError):
+        ring.put(b"short")